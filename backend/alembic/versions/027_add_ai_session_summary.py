@@ -0,0 +1,44 @@
+"""Add rolling summary columns to AI conversation sessions
+
+Revision ID: 027
+Revises: 026
+Create Date: 2026-10-18
+
+Long conversations are no longer sent to OpenAI in full. Messages that fall
+outside the history token budget are folded into a persisted summary:
+- summary: rolling summary text of the folded messages
+- summarized_message_count: number of oldest messages covered by the summary
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "027"
+down_revision: str | None = "026"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ai_conversation_sessions",
+        sa.Column("summary", sa.Text(), nullable=True),
+    )
+    op.add_column(
+        "ai_conversation_sessions",
+        sa.Column(
+            "summarized_message_count",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("ai_conversation_sessions", "summarized_message_count")
+    op.drop_column("ai_conversation_sessions", "summary")
@@ -0,0 +1,54 @@
+"""Allow multiple webhook configs per event type
+
+Revision ID: 028
+Revises: 027
+Create Date: 2026-10-18
+
+Events are now fanned out to every active webhook subscribed to them:
+- event_type is no longer unique on its own
+- a receiver URL can subscribe to a given event type only once
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "028"
+down_revision: str | None = "027"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE webhook_configs "
+        "DROP CONSTRAINT IF EXISTS webhook_configs_event_type_key"
+    )
+    op.drop_index(op.f("ix_webhook_configs_event_type"), table_name="webhook_configs")
+    op.create_index(
+        op.f("ix_webhook_configs_event_type"),
+        "webhook_configs",
+        ["event_type"],
+    )
+    op.create_unique_constraint(
+        "uq_webhook_configs_event_type_url",
+        "webhook_configs",
+        ["event_type", "url"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_webhook_configs_event_type_url", "webhook_configs", type_="unique"
+    )
+    op.drop_index(op.f("ix_webhook_configs_event_type"), table_name="webhook_configs")
+    op.create_index(
+        op.f("ix_webhook_configs_event_type"),
+        "webhook_configs",
+        ["event_type"],
+        unique=True,
+    )
+    op.create_unique_constraint(
+        "webhook_configs_event_type_key", "webhook_configs", ["event_type"]
+    )
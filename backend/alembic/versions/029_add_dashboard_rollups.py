@@ -0,0 +1,371 @@
+"""Add dashboard rollup tables maintained by triggers
+
+Revision ID: 029
+Revises: 028
+Create Date: 2026-10-18
+
+The dashboard no longer aggregates every item and check-in/out on each load:
+- user_item_stats: per-user item count, quantity sum and item counts per
+  category and location
+- item_daily_activity: items created per user per UTC day
+- item_usage_stats: check-out count and latest activity per item
+
+Statement-level triggers on items and item_check_in_outs keep them current.
+Existing data is backfilled here; src.items.rollups can rebuild them later.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "029"
+down_revision: str | None = "028"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_DDL = [
+    # Add per-key deltas to a {key: count} object, dropping keys that reach 0
+    """
+    CREATE OR REPLACE FUNCTION item_rollup_merge(
+        counts jsonb, keys text[], deltas integer[]
+    ) RETURNS jsonb AS $$
+        SELECT coalesce(
+            jsonb_object_agg(key, total) FILTER (WHERE total > 0), '{}'::jsonb
+        )
+        FROM (
+            SELECT key, sum(delta) AS total
+            FROM (
+                SELECT key, value::integer FROM jsonb_each_text(counts)
+                UNION ALL
+                SELECT * FROM unnest(keys, deltas)
+            ) AS entries(key, delta)
+            GROUP BY key
+        ) AS totals
+    $$ LANGUAGE sql IMMUTABLE;
+    """,
+    # Apply item rows entering (+1) or leaving (-1) the rollups. Users are
+    # joined before inserting so a cascading user delete adds nothing.
+    """
+    CREATE OR REPLACE FUNCTION item_rollups_apply(
+        p_user_ids uuid[],
+        p_category_ids uuid[],
+        p_location_ids uuid[],
+        p_quantities integer[],
+        p_created_at timestamptz[],
+        p_deltas integer[]
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO user_item_stats (user_id)
+        SELECT DISTINCT c.user_id
+        FROM unnest(p_user_ids) AS c(user_id)
+        JOIN users u ON u.id = c.user_id
+        ON CONFLICT (user_id) DO NOTHING;
+
+        UPDATE user_item_stats s SET
+            total_items = s.total_items + d.items,
+            total_quantity = s.total_quantity + d.quantity,
+            category_counts = item_rollup_merge(
+                s.category_counts, d.category_keys, d.deltas
+            ),
+            location_counts = item_rollup_merge(
+                s.location_counts, d.location_keys, d.deltas
+            ),
+            updated_at = now()
+        FROM (
+            SELECT
+                c.user_id,
+                sum(c.delta) AS items,
+                sum(c.delta * coalesce(c.quantity, 0)) AS quantity,
+                array_agg(coalesce(c.category_id::text, '')) AS category_keys,
+                array_agg(coalesce(c.location_id::text, '')) AS location_keys,
+                array_agg(c.delta) AS deltas
+            FROM unnest(
+                p_user_ids, p_category_ids, p_location_ids, p_quantities, p_deltas
+            ) AS c(user_id, category_id, location_id, quantity, delta)
+            GROUP BY c.user_id
+        ) AS d
+        WHERE s.user_id = d.user_id;
+
+        INSERT INTO item_daily_activity (user_id, day, items_created)
+        SELECT c.user_id, (c.created_at AT TIME ZONE 'UTC')::date, sum(c.delta)
+        FROM unnest(p_user_ids, p_created_at, p_deltas)
+            AS c(user_id, created_at, delta)
+        JOIN users u ON u.id = c.user_id
+        GROUP BY 1, 2
+        HAVING sum(c.delta) <> 0
+        ON CONFLICT (user_id, day) DO UPDATE
+            SET items_created = item_daily_activity.items_created
+                + EXCLUDED.items_created;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION items_rollup_trigger() RETURNS trigger AS $$
+    DECLARE
+        c record;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT
+                array_agg(user_id) AS user_ids,
+                array_agg(category_id) AS category_ids,
+                array_agg(location_id) AS location_ids,
+                array_agg(quantity) AS quantities,
+                array_agg(created_at) AS created_at,
+                array_agg(1) AS deltas
+            INTO c FROM new_items;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT
+                array_agg(user_id) AS user_ids,
+                array_agg(category_id) AS category_ids,
+                array_agg(location_id) AS location_ids,
+                array_agg(quantity) AS quantities,
+                array_agg(created_at) AS created_at,
+                array_agg(-1) AS deltas
+            INTO c FROM old_items;
+        ELSE
+            -- Only rows whose rolled-up columns changed move between groups
+            WITH changed AS (
+                SELECT o.id
+                FROM old_items o
+                JOIN new_items n ON n.id = o.id
+                WHERE (o.user_id, o.category_id, o.location_id, o.quantity,
+                       o.created_at)
+                    IS DISTINCT FROM
+                      (n.user_id, n.category_id, n.location_id, n.quantity,
+                       n.created_at)
+            ), changes AS (
+                SELECT user_id, category_id, location_id, quantity, created_at,
+                       -1 AS delta
+                FROM old_items WHERE id IN (SELECT id FROM changed)
+                UNION ALL
+                SELECT user_id, category_id, location_id, quantity, created_at,
+                       1 AS delta
+                FROM new_items WHERE id IN (SELECT id FROM changed)
+            )
+            SELECT
+                array_agg(user_id) AS user_ids,
+                array_agg(category_id) AS category_ids,
+                array_agg(location_id) AS location_ids,
+                array_agg(quantity) AS quantities,
+                array_agg(created_at) AS created_at,
+                array_agg(delta) AS deltas
+            INTO c FROM changes;
+        END IF;
+
+        IF c.user_ids IS NOT NULL THEN
+            PERFORM item_rollups_apply(
+                c.user_ids, c.category_ids, c.location_ids, c.quantities,
+                c.created_at, c.deltas
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER items_rollup_insert_trigger
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_rollup_trigger();
+    """,
+    """
+    CREATE TRIGGER items_rollup_update_trigger
+    AFTER UPDATE ON items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_rollup_trigger();
+    """,
+    """
+    CREATE TRIGGER items_rollup_delete_trigger
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_rollup_trigger();
+    """,
+    # The latest record per item decides last_used_at/last_action_type
+    """
+    CREATE OR REPLACE FUNCTION item_usage_rollup_trigger() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO item_usage_stats (
+            item_id, user_id, check_out_count, last_used_at, last_action_type
+        )
+        SELECT DISTINCT ON (r.item_id)
+            r.item_id,
+            r.user_id,
+            count(*) FILTER (WHERE r.action_type = 'check_out')
+                OVER (PARTITION BY r.item_id),
+            r.occurred_at,
+            r.action_type
+        FROM new_records r
+        ORDER BY r.item_id, r.occurred_at DESC
+        ON CONFLICT (item_id) DO UPDATE SET
+            check_out_count = item_usage_stats.check_out_count
+                + EXCLUDED.check_out_count,
+            last_used_at = greatest(
+                item_usage_stats.last_used_at, EXCLUDED.last_used_at
+            ),
+            last_action_type = CASE
+                WHEN item_usage_stats.last_used_at IS NULL
+                    OR EXCLUDED.last_used_at >= item_usage_stats.last_used_at
+                THEN EXCLUDED.last_action_type
+                ELSE item_usage_stats.last_action_type
+            END;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER item_check_in_outs_rollup_trigger
+    AFTER INSERT ON item_check_in_outs
+    REFERENCING NEW TABLE AS new_records
+    FOR EACH STATEMENT EXECUTE FUNCTION item_usage_rollup_trigger();
+    """,
+]
+
+BACKFILL = [
+    """
+    INSERT INTO user_item_stats (
+        user_id, total_items, total_quantity, category_counts, location_counts
+    )
+    SELECT
+        user_id,
+        count(*),
+        coalesce(sum(quantity), 0),
+        item_rollup_merge(
+            '{}',
+            array_agg(coalesce(category_id::text, '')),
+            array_agg(1)
+        ),
+        item_rollup_merge(
+            '{}',
+            array_agg(coalesce(location_id::text, '')),
+            array_agg(1)
+        )
+    FROM items
+    GROUP BY user_id
+    """,
+    """
+    INSERT INTO item_daily_activity (user_id, day, items_created)
+    SELECT user_id, (created_at AT TIME ZONE 'UTC')::date, count(*)
+    FROM items
+    GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO item_usage_stats (
+        item_id, user_id, check_out_count, last_used_at, last_action_type
+    )
+    SELECT DISTINCT ON (item_id)
+        item_id,
+        user_id,
+        count(*) FILTER (WHERE action_type = 'check_out')
+            OVER (PARTITION BY item_id),
+        occurred_at,
+        action_type
+    FROM item_check_in_outs
+    ORDER BY item_id, occurred_at DESC
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_item_stats",
+        sa.Column(
+            "user_id",
+            sa.UUID(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("total_items", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "total_quantity", sa.BigInteger(), server_default="0", nullable=False
+        ),
+        sa.Column(
+            "category_counts",
+            postgresql.JSONB(),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column(
+            "location_counts",
+            postgresql.JSONB(),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_table(
+        "item_daily_activity",
+        sa.Column(
+            "user_id",
+            sa.UUID(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("items_created", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "item_usage_stats",
+        sa.Column(
+            "item_id",
+            sa.UUID(),
+            sa.ForeignKey("items.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "user_id",
+            sa.UUID(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("check_out_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_action_type", sa.String(20), nullable=True),
+    )
+    op.create_index(
+        "ix_item_usage_stats_user_check_outs",
+        "item_usage_stats",
+        ["user_id", sa.text("check_out_count DESC")],
+    )
+    op.create_index(
+        "ix_item_usage_stats_user_last_used",
+        "item_usage_stats",
+        ["user_id", sa.text("last_used_at DESC")],
+    )
+
+    # Triggers go in before the backfill is read, inside the same
+    # transaction, so no write is missed or counted twice
+    op.execute("LOCK TABLE items, item_check_in_outs IN SHARE MODE")
+    for statement in TRIGGER_DDL:
+        op.execute(statement)
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS item_check_in_outs_rollup_trigger ON item_check_in_outs"
+    )
+    op.execute("DROP TRIGGER IF EXISTS items_rollup_delete_trigger ON items")
+    op.execute("DROP TRIGGER IF EXISTS items_rollup_update_trigger ON items")
+    op.execute("DROP TRIGGER IF EXISTS items_rollup_insert_trigger ON items")
+    op.execute("DROP FUNCTION IF EXISTS item_usage_rollup_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS items_rollup_trigger()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS item_rollups_apply("
+        "uuid[], uuid[], uuid[], integer[], timestamptz[], integer[])"
+    )
+    op.execute("DROP FUNCTION IF EXISTS item_rollup_merge(jsonb, text[], integer[])")
+    op.drop_index("ix_item_usage_stats_user_last_used", table_name="item_usage_stats")
+    op.drop_index("ix_item_usage_stats_user_check_outs", table_name="item_usage_stats")
+    op.drop_table("item_usage_stats")
+    op.drop_table("item_daily_activity")
+    op.drop_table("user_item_stats")
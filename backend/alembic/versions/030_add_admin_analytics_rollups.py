@@ -0,0 +1,211 @@
+"""Add daily rollups for the admin analytics
+
+Revision ID: 030
+Revises: 029
+Create Date: 2026-10-18
+
+The admin statistics and AI usage analytics no longer scan users,
+credit_transactions and ai_usage_logs from the beginning on every request:
+- platform_daily_stats: signups and credits purchased/used per UTC day
+- pack_daily_sales: non-refunded purchases and revenue per pack per day
+- ai_usage_daily: AI calls, tokens and cost per day, user, model and operation
+
+Closed days are backfilled here; src.admin.rollups refreshes them daily.
+Triggers on the source tables mark a rolled-up day stale when it changes.
+users.created_at gets an index so today's signups are read by range.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "030"
+down_revision: str | None = "029"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+# users.created_at never changes and ai_usage_logs is append-only, so only
+# credit_transactions (refunds, deleted packs) needs an update trigger
+_STALE_TRIGGERS = [
+    ("users", "INSERT"),
+    ("users", "DELETE"),
+    ("credit_transactions", "INSERT"),
+    ("credit_transactions", "UPDATE"),
+    ("credit_transactions", "DELETE"),
+    ("ai_usage_logs", "INSERT"),
+    ("ai_usage_logs", "DELETE"),
+]
+
+TRIGGER_DDL = [
+    # Reset refreshed_at on every rolled-up day a statement touched; days not
+    # rolled up yet (today) have no row and are left alone
+    """
+    CREATE OR REPLACE FUNCTION analytics_mark_stale() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE platform_daily_stats SET refreshed_at = NULL
+            WHERE refreshed_at IS NOT NULL AND day IN (
+                SELECT (created_at AT TIME ZONE 'UTC')::date FROM old_rows
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE platform_daily_stats SET refreshed_at = NULL
+            WHERE refreshed_at IS NOT NULL AND day IN (
+                SELECT (created_at AT TIME ZONE 'UTC')::date FROM new_rows
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    *(
+        f"""
+        CREATE TRIGGER {table}_analytics_{op.lower()}_trigger
+        AFTER {op} ON {table}
+        REFERENCING {_TRANSITION_TABLES[op]}
+        FOR EACH STATEMENT EXECUTE FUNCTION analytics_mark_stale();
+        """
+        for table, op in _STALE_TRIGGERS
+    ),
+]
+
+_TODAY = "(now() AT TIME ZONE 'UTC')::date"
+_TODAY_START = f"{_TODAY}::timestamp AT TIME ZONE 'UTC'"
+
+BACKFILL = [
+    f"""
+    INSERT INTO platform_daily_stats (
+        day, signups, credits_purchased, credits_used, refreshed_at
+    )
+    SELECT d.day, coalesce(u.signups, 0), coalesce(c.purchased, 0),
+           coalesce(c.used, 0), now()
+    FROM (
+        SELECT generate_series(
+            (
+                SELECT least(
+                    (SELECT min(created_at) FROM users),
+                    (SELECT min(created_at) FROM credit_transactions),
+                    (SELECT min(created_at) FROM ai_usage_logs)
+                ) AT TIME ZONE 'UTC'
+            )::date,
+            {_TODAY} - 1,
+            interval '1 day'
+        )::date AS day
+    ) AS d
+    LEFT JOIN (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, count(*) AS signups
+        FROM users
+        GROUP BY 1
+    ) AS u ON u.day = d.day
+    LEFT JOIN (
+        SELECT
+            (created_at AT TIME ZONE 'UTC')::date AS day,
+            sum(amount) FILTER (
+                WHERE transaction_type = 'purchase' AND NOT is_refunded
+            ) AS purchased,
+            -sum(amount) FILTER (WHERE transaction_type = 'usage') AS used
+        FROM credit_transactions
+        GROUP BY 1
+    ) AS c ON c.day = d.day
+    """,
+    f"""
+    INSERT INTO pack_daily_sales (day, credit_pack_id, purchases, revenue_cents)
+    SELECT (t.created_at AT TIME ZONE 'UTC')::date, t.credit_pack_id, count(*),
+           sum(p.price_cents)
+    FROM credit_transactions t
+    JOIN credit_packs p ON p.id = t.credit_pack_id
+    WHERE t.transaction_type = 'purchase'
+        AND NOT t.is_refunded
+        AND t.created_at < {_TODAY_START}
+    GROUP BY 1, 2
+    """,
+    f"""
+    INSERT INTO ai_usage_daily (
+        day, user_id, model, operation_type, calls, prompt_tokens,
+        completion_tokens, total_tokens, cost_usd
+    )
+    SELECT (created_at AT TIME ZONE 'UTC')::date, user_id, model,
+           operation_type, count(*), sum(prompt_tokens), sum(completion_tokens),
+           sum(total_tokens), sum(estimated_cost_usd)
+    FROM ai_usage_logs
+    WHERE created_at < {_TODAY_START}
+    GROUP BY 1, 2, 3, 4
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_created_at", "users", ["created_at"])
+    op.create_table(
+        "platform_daily_stats",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("signups", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "credits_purchased", sa.BigInteger(), server_default="0", nullable=False
+        ),
+        sa.Column("credits_used", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_table(
+        "pack_daily_sales",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column(
+            "credit_pack_id",
+            sa.UUID(),
+            sa.ForeignKey("credit_packs.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("purchases", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("revenue_cents", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "ai_usage_daily",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.UUID(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("model", sa.String(100), primary_key=True),
+        sa.Column("operation_type", sa.String(50), primary_key=True),
+        sa.Column("calls", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("prompt_tokens", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column(
+            "completion_tokens", sa.BigInteger(), server_default="0", nullable=False
+        ),
+        sa.Column("total_tokens", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("cost_usd", sa.Numeric(14, 6), server_default="0", nullable=False),
+    )
+    op.create_index("ix_ai_usage_daily_user_id", "ai_usage_daily", ["user_id"])
+
+    # Triggers go in before the backfill is read, inside the same
+    # transaction, so no write is missed
+    op.execute("LOCK TABLE users, credit_transactions, ai_usage_logs IN SHARE MODE")
+    for statement in TRIGGER_DDL:
+        op.execute(statement)
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for table, op_name in reversed(_STALE_TRIGGERS):
+        op.execute(
+            f"DROP TRIGGER IF EXISTS {table}_analytics_{op_name.lower()}_trigger "
+            f"ON {table}"
+        )
+    op.execute("DROP FUNCTION IF EXISTS analytics_mark_stale()")
+    op.drop_index("ix_ai_usage_daily_user_id", table_name="ai_usage_daily")
+    op.drop_table("ai_usage_daily")
+    op.drop_table("pack_daily_sales")
+    op.drop_table("platform_daily_stats")
+    op.drop_index("ix_users_created_at", table_name="users")
@@ -0,0 +1,233 @@
+"""Partition the log tables by month
+
+Revision ID: 031
+Revises: 030
+Create Date: 2026-10-18
+
+ai_usage_logs, item_check_in_outs, webhook_executions and alert_history
+become range-partitioned by month on the timestamp written with each row,
+so old months can be detached by src.common.partitions instead of deleted
+row by row.
+
+The existing rows are not copied. Each table is renamed to <table>_legacy
+and attached to the new partitioned table as the partition for everything
+before next month:
+- a validated CHECK constraint proves the partition bound, so the attach
+  does not scan the table
+- the unique index backing the new (id, <timestamp>) primary key is built
+  concurrently beforehand
+- the other indexes, foreign keys and row level security policies already
+  exist on the legacy table and are reused by the attach
+The heavy work runs before the table locks are taken; the conversion itself
+only touches the catalogs. A default partition and the partitions for the
+next months are created here; src.common.partitions creates the later ones.
+
+The downgrade copies the rows back into plain tables. Partitions already
+detached by the retention job are left alone.
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "031"
+down_revision: str | None = "030"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Table -> partition key
+_TABLES = {
+    "ai_usage_logs": "created_at",
+    "item_check_in_outs": "created_at",
+    "webhook_executions": "executed_at",
+    "alert_history": "sent_at",
+}
+
+# Monthly partitions created after the legacy one
+_MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def _legacy_bound() -> date:
+    """First day of next month: the legacy partitions hold everything before."""
+    return _add_months(datetime.now(UTC).date().replace(day=1), 1)
+
+
+def _rows(sql: str, **params) -> list[sa.Row]:
+    return op.get_bind().execute(sa.text(sql), params).all()
+
+
+def _definition(table: str) -> list[str]:
+    """DDL recreating a table's foreign keys, indexes, policies and triggers.
+
+    The primary key is left out; it changes with the partitioning.
+    """
+    statements = [
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+        for name, definition in _rows(
+            """
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'
+            ORDER BY conname
+            """,
+            table=table,
+        )
+    ]
+    # Indexes of a partitioned table are defined "ON ONLY" the parent
+    statements += [
+        definition.replace(" ON ONLY ", " ON ")
+        for (definition,) in _rows(
+            """
+            SELECT pg_get_indexdef(indexrelid)
+            FROM pg_index
+            WHERE indrelid = CAST(:table AS regclass) AND NOT indisprimary
+            ORDER BY indexrelid
+            """,
+            table=table,
+        )
+    ]
+    if _rows(
+        "SELECT 1 FROM pg_class WHERE oid = CAST(:table AS regclass) "
+        "AND relrowsecurity",
+        table=table,
+    ):
+        statements.append(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY")
+    for name, permissive, roles, cmd, qual, with_check in _rows(
+        """
+        SELECT policyname, permissive, roles, cmd, qual, with_check
+        FROM pg_policies
+        WHERE schemaname = current_schema() AND tablename = :table
+        """,
+        table=table,
+    ):
+        policy = (
+            f"CREATE POLICY {name} ON {table} AS {permissive} FOR {cmd} "
+            f"TO {', '.join(roles)}"
+        )
+        if qual:
+            policy += f" USING ({qual})"
+        if with_check:
+            policy += f" WITH CHECK ({with_check})"
+        statements.append(policy)
+    statements += [
+        definition
+        for (definition,) in _rows(
+            """
+            SELECT pg_get_triggerdef(oid)
+            FROM pg_trigger
+            WHERE tgrelid = CAST(:table AS regclass) AND NOT tgisinternal
+            ORDER BY tgname
+            """,
+            table=table,
+        )
+    ]
+    return statements
+
+
+def _primary_key(table: str) -> str:
+    return _rows(
+        "SELECT conname FROM pg_constraint "
+        "WHERE conrelid = CAST(:table AS regclass) AND contype = 'p'",
+        table=table,
+    )[0][0]
+
+
+def upgrade() -> None:
+    bound = _legacy_bound()
+    definitions = {table: _definition(table) for table in _TABLES}
+
+    # Scan the tables without blocking writes: prove the legacy partition
+    # bound and build the new primary key index. This runs outside the
+    # revision's transaction and is safe to repeat if the conversion fails
+    with op.get_context().autocommit_block():
+        for table, key in _TABLES.items():
+            op.execute(
+                f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_legacy_bound"
+            )
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {table}_legacy_bound "
+                f"CHECK ({key} IS NOT NULL AND {key} < {_bound(bound)}) NOT VALID"
+            )
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_legacy_bound")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {table}_legacy_pkey")
+            op.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY {table}_legacy_pkey "
+                f"ON {table} (id, {key})"
+            )
+
+    for table, key in _TABLES.items():
+        legacy = f"{table}_legacy"
+
+        # Statement triggers with transition tables are not allowed on
+        # partitions; they are recreated on the partitioned table
+        for (trigger,) in _rows(
+            "SELECT tgname FROM pg_trigger "
+            "WHERE tgrelid = CAST(:table AS regclass) AND NOT tgisinternal",
+            table=table,
+        ):
+            op.execute(f"DROP TRIGGER {trigger} ON {table}")
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {_primary_key(table)}")
+        # Proven by the validated CHECK constraint, so no scan
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {key} SET NOT NULL")
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {legacy}_pkey "
+            f"PRIMARY KEY USING INDEX {legacy}_pkey"
+        )
+        op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        for (index,) in _rows(
+            "SELECT indexrelid::regclass::text FROM pg_index "
+            "WHERE indrelid = CAST(:table AS regclass) AND NOT indisprimary",
+            table=legacy,
+        ):
+            op.execute(f"ALTER INDEX {index} RENAME TO {index}_legacy")
+
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE ({key})"
+        )
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, {key})"
+        )
+        for statement in definitions[table]:
+            op.execute(statement)
+        op.execute(
+            f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+            f"FOR VALUES FROM (MINVALUE) TO ({_bound(bound)})"
+        )
+        op.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {table}_legacy_bound")
+
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        for offset in range(_MONTHS_AHEAD):
+            month = _add_months(bound, offset)
+            op.execute(
+                f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ({_bound(month)}) "
+                f"TO ({_bound(_add_months(month, 1))})"
+            )
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        definition = _definition(table)
+        op.execute(
+            f"CREATE TABLE {table}_unpartitioned (LIKE {table} INCLUDING DEFAULTS)"
+        )
+        op.execute(f"INSERT INTO {table}_unpartitioned SELECT * FROM {table}")
+        op.execute(f"DROP TABLE {table}")
+        op.execute(f"ALTER TABLE {table}_unpartitioned RENAME TO {table}")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+        for statement in definition:
+            op.execute(statement)
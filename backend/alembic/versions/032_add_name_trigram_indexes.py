@@ -0,0 +1,42 @@
+"""Add trigram indexes on item, category and location names
+
+Revision ID: 032
+Revises: 031
+Create Date: 2026-10-18
+
+The search suggestions (GET /api/v1/search/suggest) match names containing
+the typed text with ILIKE '%...%'. pg_trgm GIN indexes serve those
+patterns, which a btree index cannot. The indexes are built concurrently
+so typing in the search box keeps working while they are created.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "032"
+down_revision: str | None = "031"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_TABLES = ("items", "categories", "locations")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # A failed concurrent build leaves an invalid index behind; drop it so a
+    # rerun builds it again
+    with op.get_context().autocommit_block():
+        for table in _TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_name_trgm")
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY ix_{table}_name_trgm "
+                f"ON {table} USING gin (name gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in _TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_name_trgm")
@@ -0,0 +1,115 @@
+"""Recompute item search vectors only when their text changes
+
+Revision ID: 033
+Revises: 032
+Create Date: 2026-10-18
+
+The search_vector trigger from migration 026 re-parsed the name,
+description, tags and the whole attributes JSON on every UPDATE of an
+item, including quantity changes, moves and check-outs. It now fires only
+for updates setting one of those columns and recomputes only when one of
+them actually changed. Attributes contribute their string and number
+values instead of attributes::text, which also indexed the JSON keys
+("specifications", "key", "value") of every item.
+
+Items with attributes get their vector recomputed here.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "033"
+down_revision: str | None = "032"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION items_search_vector(
+        name text, description text, tags text[], attributes jsonb
+    ) RETURNS tsvector AS $$
+        SELECT
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(
+                to_tsvector('english', coalesce(array_to_string(tags, ' '), '')),
+                'C'
+            ) ||
+            setweight(
+                jsonb_to_tsvector(
+                    'english', coalesce(attributes, '{}'), '["string", "numeric"]'
+                ),
+                'D'
+            )
+    $$ LANGUAGE sql IMMUTABLE;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION items_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            IF NEW.name IS NOT DISTINCT FROM OLD.name
+                AND NEW.description IS NOT DISTINCT FROM OLD.description
+                AND NEW.tags IS NOT DISTINCT FROM OLD.tags
+                AND NEW.attributes IS NOT DISTINCT FROM OLD.attributes
+            THEN
+                RETURN NEW;
+            END IF;
+        END IF;
+        NEW.search_vector := items_search_vector(
+            NEW.name, NEW.description, NEW.tags, NEW.attributes
+        );
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER items_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, tags, attributes ON items
+    FOR EACH ROW EXECUTE FUNCTION items_search_vector_update();
+    """,
+]
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS items_search_vector_trigger ON items")
+    for statement in TRIGGER_DDL:
+        op.execute(statement)
+
+    # Only the attribute part changes; items without attributes keep theirs
+    op.execute("""
+        UPDATE items
+        SET search_vector = items_search_vector(name, description, tags, attributes)
+        WHERE attributes IS NOT NULL AND attributes <> '{}'::jsonb
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS items_search_vector_trigger ON items")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION items_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(array_to_string(NEW.tags, ' '), '')), 'C') ||
+                setweight(to_tsvector('english', coalesce(NEW.attributes::text, '')), 'D');
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER items_search_vector_trigger
+        BEFORE INSERT OR UPDATE ON items
+        FOR EACH ROW EXECUTE FUNCTION items_search_vector_update();
+    """)
+    op.execute("""
+        UPDATE items SET search_vector =
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(array_to_string(tags, ' '), '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(attributes::text, '')), 'D')
+        WHERE attributes IS NOT NULL AND attributes <> '{}'::jsonb
+    """)
+    op.execute("DROP FUNCTION IF EXISTS items_search_vector(text, text, text[], jsonb)")
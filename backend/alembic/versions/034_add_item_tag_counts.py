@@ -0,0 +1,156 @@
+"""Add a per-user tag dictionary
+
+Revision ID: 034
+Revises: 033
+Create Date: 2026-10-18
+
+The tag picker no longer unnests the tags of every item: item_tags holds
+each user's tags with the number of items carrying them, kept current by
+statement-level triggers on items like the dashboard rollups.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "034"
+down_revision: str | None = "033"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_DDL = [
+    # Add per-tag deltas to item_tags, dropping tags that reach 0. Users are
+    # joined before inserting so a cascading user delete adds nothing.
+    """
+    CREATE OR REPLACE FUNCTION item_tags_apply(
+        p_user_ids uuid[], p_tags text[], p_deltas integer[]
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO item_tags (user_id, tag, item_count)
+        SELECT c.user_id, c.tag, sum(c.delta)
+        FROM unnest(p_user_ids, p_tags, p_deltas) AS c(user_id, tag, delta)
+        JOIN users u ON u.id = c.user_id
+        GROUP BY 1, 2
+        HAVING sum(c.delta) <> 0
+        ON CONFLICT (user_id, tag) DO UPDATE
+            SET item_count = item_tags.item_count + EXCLUDED.item_count;
+
+        DELETE FROM item_tags t
+        USING unnest(p_user_ids, p_tags) AS c(user_id, tag)
+        WHERE t.user_id = c.user_id AND t.tag = c.tag AND t.item_count <= 0;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    # An item counts once per distinct tag
+    """
+    CREATE OR REPLACE FUNCTION item_tags_trigger() RETURNS trigger AS $$
+    DECLARE
+        c record;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT
+                array_agg(n.user_id) AS user_ids,
+                array_agg(t.tag) AS tags,
+                array_agg(1) AS deltas
+            INTO c
+            FROM new_items n, LATERAL (SELECT DISTINCT unnest(n.tags)) AS t(tag);
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT
+                array_agg(o.user_id) AS user_ids,
+                array_agg(t.tag) AS tags,
+                array_agg(-1) AS deltas
+            INTO c
+            FROM old_items o, LATERAL (SELECT DISTINCT unnest(o.tags)) AS t(tag);
+        ELSE
+            -- Only rows whose tags (or owner) changed
+            WITH changed AS (
+                SELECT o.id
+                FROM old_items o
+                JOIN new_items n ON n.id = o.id
+                WHERE (o.user_id, o.tags) IS DISTINCT FROM (n.user_id, n.tags)
+            ), changes AS (
+                SELECT o.user_id, t.tag, -1 AS delta
+                FROM old_items o, LATERAL (SELECT DISTINCT unnest(o.tags)) AS t(tag)
+                WHERE o.id IN (SELECT id FROM changed)
+                UNION ALL
+                SELECT n.user_id, t.tag, 1 AS delta
+                FROM new_items n, LATERAL (SELECT DISTINCT unnest(n.tags)) AS t(tag)
+                WHERE n.id IN (SELECT id FROM changed)
+            )
+            SELECT
+                array_agg(user_id) AS user_ids,
+                array_agg(tag) AS tags,
+                array_agg(delta) AS deltas
+            INTO c FROM changes;
+        END IF;
+
+        IF c.user_ids IS NOT NULL THEN
+            PERFORM item_tags_apply(c.user_ids, c.tags, c.deltas);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER items_tags_insert_trigger
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_tags_trigger();
+    """,
+    """
+    CREATE TRIGGER items_tags_update_trigger
+    AFTER UPDATE ON items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_tags_trigger();
+    """,
+    """
+    CREATE TRIGGER items_tags_delete_trigger
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_tags_trigger();
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "item_tags",
+        sa.Column(
+            "user_id",
+            sa.UUID(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("tag", sa.String(100), primary_key=True),
+        sa.Column("item_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_index(
+        "ix_item_tags_user_count",
+        "item_tags",
+        ["user_id", sa.text("item_count DESC")],
+    )
+
+    # Triggers go in before the backfill is read, inside the same
+    # transaction, so no write is missed or counted twice
+    op.execute("LOCK TABLE items IN SHARE MODE")
+    for statement in TRIGGER_DDL:
+        op.execute(statement)
+    op.execute("""
+        INSERT INTO item_tags (user_id, tag, item_count)
+        SELECT user_id, tag, count(DISTINCT id)
+        FROM items, unnest(tags) AS t(tag)
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS items_tags_delete_trigger ON items")
+    op.execute("DROP TRIGGER IF EXISTS items_tags_update_trigger ON items")
+    op.execute("DROP TRIGGER IF EXISTS items_tags_insert_trigger ON items")
+    op.execute("DROP FUNCTION IF EXISTS item_tags_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS item_tags_apply(uuid[], text[], integer[])")
+    op.drop_index("ix_item_tags_user_count", table_name="item_tags")
+    op.drop_table("item_tags")
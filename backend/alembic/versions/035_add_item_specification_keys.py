@@ -0,0 +1,226 @@
+"""Index item attributes with jsonb_path_ops and count specification keys
+
+Revision ID: 035
+Revises: 034
+Create Date: 2026-10-19
+
+Attribute filters only use containment (attributes @> {...}), which a
+jsonb_path_ops GIN index serves with a smaller, faster index than the two
+identical jsonb_ops indexes created by migrations 001 and 003; both are
+replaced by one jsonb_path_ops index.
+
+Classification hints no longer load the attributes of every item with
+specifications: item_specification_keys holds the number of each user's
+items having each specification key, kept current by statement-level
+triggers on items like item_tags.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "035"
+down_revision: str | None = "034"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_DDL = [
+    # Specification keys of an item, from the array format
+    # ([{"key": ..., "value": ...}]) or the legacy {key: value} object
+    """
+    CREATE OR REPLACE FUNCTION item_specification_keys(attributes jsonb)
+    RETURNS SETOF text AS $$
+        SELECT key
+        FROM (
+            SELECT spec ->> 'key'
+            FROM jsonb_array_elements(
+                CASE jsonb_typeof(attributes -> 'specifications')
+                    WHEN 'array' THEN attributes -> 'specifications'
+                    ELSE '[]'
+                END
+            ) AS spec
+            WHERE jsonb_typeof(spec) = 'object'
+            UNION
+            SELECT jsonb_object_keys(
+                CASE jsonb_typeof(attributes -> 'specifications')
+                    WHEN 'object' THEN attributes -> 'specifications'
+                    ELSE '{}'
+                END
+            )
+        ) AS keys(key)
+        WHERE key IS NOT NULL
+    $$ LANGUAGE sql IMMUTABLE;
+    """,
+    # Add per-key deltas to item_specification_keys, dropping keys that
+    # reach 0. Users are joined before inserting so a cascading user delete
+    # adds nothing.
+    """
+    CREATE OR REPLACE FUNCTION item_specification_keys_apply(
+        p_user_ids uuid[], p_keys text[], p_deltas integer[]
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO item_specification_keys (user_id, key, item_count)
+        SELECT c.user_id, c.key, sum(c.delta)
+        FROM unnest(p_user_ids, p_keys, p_deltas) AS c(user_id, key, delta)
+        JOIN users u ON u.id = c.user_id
+        GROUP BY 1, 2
+        HAVING sum(c.delta) <> 0
+        ON CONFLICT (user_id, key) DO UPDATE
+            SET item_count = item_specification_keys.item_count
+                + EXCLUDED.item_count;
+
+        DELETE FROM item_specification_keys k
+        USING unnest(p_user_ids, p_keys) AS c(user_id, key)
+        WHERE k.user_id = c.user_id AND k.key = c.key AND k.item_count <= 0;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION item_specification_keys_trigger()
+    RETURNS trigger AS $$
+    DECLARE
+        c record;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT
+                array_agg(n.user_id) AS user_ids,
+                array_agg(k.key) AS keys,
+                array_agg(1) AS deltas
+            INTO c
+            FROM new_items n, item_specification_keys(n.attributes) AS k(key);
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT
+                array_agg(o.user_id) AS user_ids,
+                array_agg(k.key) AS keys,
+                array_agg(-1) AS deltas
+            INTO c
+            FROM old_items o, item_specification_keys(o.attributes) AS k(key);
+        ELSE
+            -- Only rows whose specifications (or owner) changed
+            WITH changed AS (
+                SELECT o.id
+                FROM old_items o
+                JOIN new_items n ON n.id = o.id
+                WHERE (o.user_id, o.attributes -> 'specifications')
+                    IS DISTINCT FROM (n.user_id, n.attributes -> 'specifications')
+            ), changes AS (
+                SELECT o.user_id, k.key, -1 AS delta
+                FROM old_items o, item_specification_keys(o.attributes) AS k(key)
+                WHERE o.id IN (SELECT id FROM changed)
+                UNION ALL
+                SELECT n.user_id, k.key, 1 AS delta
+                FROM new_items n, item_specification_keys(n.attributes) AS k(key)
+                WHERE n.id IN (SELECT id FROM changed)
+            )
+            SELECT
+                array_agg(user_id) AS user_ids,
+                array_agg(key) AS keys,
+                array_agg(delta) AS deltas
+            INTO c FROM changes;
+        END IF;
+
+        IF c.user_ids IS NOT NULL THEN
+            PERFORM item_specification_keys_apply(c.user_ids, c.keys, c.deltas);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER items_specification_keys_insert_trigger
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_specification_keys_trigger();
+    """,
+    """
+    CREATE TRIGGER items_specification_keys_update_trigger
+    AFTER UPDATE ON items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_specification_keys_trigger();
+    """,
+    """
+    CREATE TRIGGER items_specification_keys_delete_trigger
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_specification_keys_trigger();
+    """,
+]
+
+
+def upgrade() -> None:
+    # Runs first, outside the revision's transaction, and is safe to repeat
+    # if the rest of the upgrade fails: a failed concurrent build leaves an
+    # invalid index behind, which is dropped and built again
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_items_attributes_path_ops")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_items_attributes_path_ops "
+            "ON items USING gin (attributes jsonb_path_ops)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_items_attributes")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_items_attributes_gin")
+
+    op.create_table(
+        "item_specification_keys",
+        sa.Column(
+            "user_id",
+            sa.UUID(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("key", sa.Text(), primary_key=True),
+        sa.Column("item_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_index(
+        "ix_item_specification_keys_user_count",
+        "item_specification_keys",
+        ["user_id", sa.text("item_count DESC")],
+    )
+
+    # Triggers go in before the backfill is read, inside the same
+    # transaction, so no write is missed or counted twice
+    op.execute("LOCK TABLE items IN SHARE MODE")
+    for statement in TRIGGER_DDL:
+        op.execute(statement)
+    op.execute("""
+        INSERT INTO item_specification_keys (user_id, key, item_count)
+        SELECT user_id, key, count(*)
+        FROM items, item_specification_keys(attributes) AS k(key)
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_items_attributes "
+            "ON items USING gin (attributes)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_items_attributes_gin "
+            "ON items USING gin (attributes)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_items_attributes_path_ops")
+
+    op.execute(
+        "DROP TRIGGER IF EXISTS items_specification_keys_delete_trigger ON items"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS items_specification_keys_update_trigger ON items"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS items_specification_keys_insert_trigger ON items"
+    )
+    op.execute("DROP FUNCTION IF EXISTS item_specification_keys_trigger()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS "
+        "item_specification_keys_apply(uuid[], text[], integer[])"
+    )
+    op.execute("DROP FUNCTION IF EXISTS item_specification_keys(jsonb)")
+    op.drop_index(
+        "ix_item_specification_keys_user_count", table_name="item_specification_keys"
+    )
+    op.drop_table("item_specification_keys")
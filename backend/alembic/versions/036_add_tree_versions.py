@@ -0,0 +1,166 @@
+"""Add version tokens for cached category and location trees
+
+Revision ID: 036
+Revises: 035
+Create Date: 2026-10-19
+
+tree_versions holds per-user tokens that triggers on categories, locations
+and items replace on every change the trees depend on. The tree endpoints
+and merged templates are cached by these tokens and use them as ETags.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "036"
+down_revision: str | None = "035"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_DDL = [
+    # Replace the given tokens of each user. Users are joined before
+    # inserting so a cascading user delete adds nothing.
+    """
+    CREATE OR REPLACE FUNCTION tree_versions_bump(
+        p_user_ids uuid[], p_categories boolean, p_locations boolean,
+        p_items boolean
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO tree_versions (user_id)
+        SELECT u.id FROM users u WHERE u.id = ANY(p_user_ids)
+        ON CONFLICT (user_id) DO UPDATE SET
+            categories = CASE WHEN p_categories
+                THEN gen_random_uuid() ELSE tree_versions.categories END,
+            locations = CASE WHEN p_locations
+                THEN gen_random_uuid() ELSE tree_versions.locations END,
+            items = CASE WHEN p_items
+                THEN gen_random_uuid() ELSE tree_versions.items END;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    # Categories and locations are written a row at a time
+    """
+    CREATE OR REPLACE FUNCTION tree_versions_row_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM tree_versions_bump(
+            ARRAY[coalesce(NEW.user_id, OLD.user_id)],
+            TG_TABLE_NAME = 'categories',
+            TG_TABLE_NAME = 'locations',
+            false
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER categories_tree_version_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON categories
+    FOR EACH ROW EXECUTE FUNCTION tree_versions_row_trigger();
+    """,
+    """
+    CREATE TRIGGER locations_tree_version_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON locations
+    FOR EACH ROW EXECUTE FUNCTION tree_versions_row_trigger();
+    """,
+    # Items once per statement; updates only count when they change what
+    # the trees count and sum
+    """
+    CREATE OR REPLACE FUNCTION items_tree_version_trigger() RETURNS trigger AS $$
+    DECLARE
+        user_ids uuid[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT array_agg(DISTINCT user_id) INTO user_ids FROM new_items;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT array_agg(DISTINCT user_id) INTO user_ids FROM old_items;
+        ELSE
+            SELECT array_agg(DISTINCT n.user_id) INTO user_ids
+            FROM old_items o
+            JOIN new_items n ON n.id = o.id
+            WHERE (o.user_id, o.category_id, o.location_id, o.price, o.quantity)
+                IS DISTINCT FROM
+                (n.user_id, n.category_id, n.location_id, n.price, n.quantity);
+        END IF;
+
+        IF user_ids IS NOT NULL THEN
+            PERFORM tree_versions_bump(user_ids, false, false, true);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER items_tree_version_insert_trigger
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_tree_version_trigger();
+    """,
+    """
+    CREATE TRIGGER items_tree_version_update_trigger
+    AFTER UPDATE ON items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_tree_version_trigger();
+    """,
+    """
+    CREATE TRIGGER items_tree_version_delete_trigger
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_tree_version_trigger();
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tree_versions",
+        sa.Column(
+            "user_id",
+            sa.UUID(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "categories",
+            sa.UUID(),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "locations",
+            sa.UUID(),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "items",
+            sa.UUID(),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+    )
+    for statement in TRIGGER_DDL:
+        op.execute(statement)
+    # Users without a row read as never having written anything
+    op.execute("""
+        INSERT INTO tree_versions (user_id)
+        SELECT id FROM users
+        ON CONFLICT (user_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS items_tree_version_delete_trigger ON items")
+    op.execute("DROP TRIGGER IF EXISTS items_tree_version_update_trigger ON items")
+    op.execute("DROP TRIGGER IF EXISTS items_tree_version_insert_trigger ON items")
+    op.execute("DROP TRIGGER IF EXISTS locations_tree_version_trigger ON locations")
+    op.execute("DROP TRIGGER IF EXISTS categories_tree_version_trigger ON categories")
+    op.execute("DROP FUNCTION IF EXISTS items_tree_version_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS tree_versions_row_trigger()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS tree_versions_bump(uuid[], boolean, boolean, boolean)"
+    )
+    op.drop_table("tree_versions")
@@ -0,0 +1,180 @@
+"""Add an inventory version token for cached AI tool results
+
+Revision ID: 037
+Revises: 036
+Create Date: 2026-10-19
+
+The AI assistant keyed its cached tool results by a count and the latest
+updated_at of all the user's items, a scan of the whole inventory on every
+turn. tree_versions gains an inventory token that the items trigger
+replaces on every item insert, update and delete, so the key is read with
+a primary key lookup.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "037"
+down_revision: str | None = "036"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION tree_versions_bump(
+        p_user_ids uuid[], p_categories boolean, p_locations boolean,
+        p_items boolean, p_inventory boolean
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO tree_versions (user_id)
+        SELECT u.id FROM users u WHERE u.id = ANY(p_user_ids)
+        ON CONFLICT (user_id) DO UPDATE SET
+            categories = CASE WHEN p_categories
+                THEN gen_random_uuid() ELSE tree_versions.categories END,
+            locations = CASE WHEN p_locations
+                THEN gen_random_uuid() ELSE tree_versions.locations END,
+            items = CASE WHEN p_items
+                THEN gen_random_uuid() ELSE tree_versions.items END,
+            inventory = CASE WHEN p_inventory
+                THEN gen_random_uuid() ELSE tree_versions.inventory END;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION tree_versions_row_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM tree_versions_bump(
+            ARRAY[coalesce(NEW.user_id, OLD.user_id)],
+            TG_TABLE_NAME = 'categories',
+            TG_TABLE_NAME = 'locations',
+            false,
+            false
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION items_tree_version_trigger() RETURNS trigger AS $$
+    DECLARE
+        user_ids uuid[];
+        tree_user_ids uuid[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT array_agg(DISTINCT user_id) INTO user_ids FROM new_items;
+            tree_user_ids := user_ids;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT array_agg(DISTINCT user_id) INTO user_ids FROM old_items;
+            tree_user_ids := user_ids;
+        ELSE
+            SELECT array_agg(DISTINCT user_id) INTO user_ids FROM new_items;
+            SELECT array_agg(DISTINCT n.user_id) INTO tree_user_ids
+            FROM old_items o
+            JOIN new_items n ON n.id = o.id
+            WHERE (o.user_id, o.category_id, o.location_id, o.price, o.quantity)
+                IS DISTINCT FROM
+                (n.user_id, n.category_id, n.location_id, n.price, n.quantity);
+        END IF;
+
+        IF tree_user_ids IS NOT NULL THEN
+            PERFORM tree_versions_bump(tree_user_ids, false, false, true, true);
+        END IF;
+        IF user_ids IS DISTINCT FROM tree_user_ids THEN
+            PERFORM tree_versions_bump(user_ids, false, false, false, true);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+]
+
+# Functions as migration 036 created them
+DOWNGRADE_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION tree_versions_bump(
+        p_user_ids uuid[], p_categories boolean, p_locations boolean,
+        p_items boolean
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO tree_versions (user_id)
+        SELECT u.id FROM users u WHERE u.id = ANY(p_user_ids)
+        ON CONFLICT (user_id) DO UPDATE SET
+            categories = CASE WHEN p_categories
+                THEN gen_random_uuid() ELSE tree_versions.categories END,
+            locations = CASE WHEN p_locations
+                THEN gen_random_uuid() ELSE tree_versions.locations END,
+            items = CASE WHEN p_items
+                THEN gen_random_uuid() ELSE tree_versions.items END;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION tree_versions_row_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM tree_versions_bump(
+            ARRAY[coalesce(NEW.user_id, OLD.user_id)],
+            TG_TABLE_NAME = 'categories',
+            TG_TABLE_NAME = 'locations',
+            false
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION items_tree_version_trigger() RETURNS trigger AS $$
+    DECLARE
+        user_ids uuid[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT array_agg(DISTINCT user_id) INTO user_ids FROM new_items;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT array_agg(DISTINCT user_id) INTO user_ids FROM old_items;
+        ELSE
+            SELECT array_agg(DISTINCT n.user_id) INTO user_ids
+            FROM old_items o
+            JOIN new_items n ON n.id = o.id
+            WHERE (o.user_id, o.category_id, o.location_id, o.price, o.quantity)
+                IS DISTINCT FROM
+                (n.user_id, n.category_id, n.location_id, n.price, n.quantity);
+        END IF;
+
+        IF user_ids IS NOT NULL THEN
+            PERFORM tree_versions_bump(user_ids, false, false, true);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+]
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tree_versions",
+        sa.Column(
+            "inventory",
+            sa.UUID(),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        "DROP FUNCTION IF EXISTS tree_versions_bump(uuid[], boolean, boolean, boolean)"
+    )
+    for statement in TRIGGER_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP FUNCTION IF EXISTS "
+        "tree_versions_bump(uuid[], boolean, boolean, boolean, boolean)"
+    )
+    for statement in DOWNGRADE_DDL:
+        op.execute(statement)
+    op.drop_column("tree_versions", "inventory")
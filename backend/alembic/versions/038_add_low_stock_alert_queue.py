@@ -0,0 +1,64 @@
+"""Queue low stock alerts for scheduled digests
+
+Revision ID: 038
+Revises: 037
+Create Date: 2026-10-19
+
+In digest mode check-outs queue their low stock items in
+low_stock_alert_queue, and src.notifications.digests sends each user's
+queue as one email when it runs.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "038"
+down_revision: str | None = "037"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "low_stock_alert_queue",
+        sa.Column(
+            "user_id",
+            sa.UUID(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "item_id",
+            sa.UUID(),
+            sa.ForeignKey("items.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("recipient_email", sa.String(255), nullable=False),
+        sa.Column("recipient_name", sa.String(255), nullable=False),
+        sa.Column(
+            "queued_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+    op.execute("ALTER TABLE low_stock_alert_queue ENABLE ROW LEVEL SECURITY")
+    op.execute("""
+        CREATE POLICY low_stock_alert_queue_tenant_isolation ON low_stock_alert_queue
+        FOR ALL
+        USING (user_id = current_setting('app.current_user_id', true)::uuid)
+        WITH CHECK (user_id = current_setting('app.current_user_id', true)::uuid)
+    """)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP POLICY IF EXISTS low_stock_alert_queue_tenant_isolation "
+        "ON low_stock_alert_queue"
+    )
+    op.drop_table("low_stock_alert_queue")
@@ -0,0 +1,65 @@
+"""Tenant isolation for the per-user rollup tables
+
+Revision ID: 039
+Revises: 038
+Create Date: 2026-10-19
+
+user_item_stats, item_daily_activity, item_usage_stats, item_tags,
+item_specification_keys and tree_versions get the RLS tenant policy every
+other per-user table has. Their trigger functions become SECURITY DEFINER,
+so writes made without the owner's tenant context (cascading deletes, admin
+changes) still maintain them.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "039"
+down_revision: str | None = "038"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = [
+    "user_item_stats",
+    "item_daily_activity",
+    "item_usage_stats",
+    "item_tags",
+    "item_specification_keys",
+    "tree_versions",
+]
+
+TRIGGER_FUNCTIONS = [
+    "items_rollup_trigger()",
+    "item_tags_trigger()",
+    "item_specification_keys_trigger()",
+    "item_usage_rollup_trigger()",
+    "tree_versions_row_trigger()",
+    "items_tree_version_trigger()",
+]
+
+
+def upgrade() -> None:
+    for function in TRIGGER_FUNCTIONS:
+        op.execute(
+            f"ALTER FUNCTION {function} SECURITY DEFINER SET search_path = public"
+        )
+
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY")
+        op.execute(f"""
+            CREATE POLICY {table}_tenant_isolation ON {table}
+            FOR ALL
+            USING (user_id = current_setting('app.current_user_id', true)::uuid)
+            WITH CHECK (user_id = current_setting('app.current_user_id', true)::uuid)
+        """)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP POLICY IF EXISTS {table}_tenant_isolation ON {table}")
+        op.execute(f"ALTER TABLE {table} DISABLE ROW LEVEL SECURITY")
+
+    for function in TRIGGER_FUNCTIONS:
+        op.execute(f"ALTER FUNCTION {function} SECURITY INVOKER RESET search_path")
@@ -0,0 +1,80 @@
+"""Add a change counter to the platform rollup days
+
+Revision ID: 040
+Revises: 039
+Create Date: 2026-10-19
+
+The admin rollup refresh locked users, credit_transactions and
+ai_usage_logs in SHARE mode while it recomputed, blocking signups,
+purchases and AI usage logging until it committed. platform_daily_stats
+gains a per-day change counter that the stale-marking trigger bumps, so the
+refresh can drop the locks and write a day only if nothing changed it while
+it was recomputed.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "040"
+down_revision: str | None = "039"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_MARK_STALE = """
+    CREATE OR REPLACE FUNCTION analytics_mark_stale() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE platform_daily_stats
+            SET refreshed_at = NULL, changes = changes + 1
+            WHERE day IN (
+                SELECT (created_at AT TIME ZONE 'UTC')::date FROM old_rows
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE platform_daily_stats
+            SET refreshed_at = NULL, changes = changes + 1
+            WHERE day IN (
+                SELECT (created_at AT TIME ZONE 'UTC')::date FROM new_rows
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+_MARK_STALE_030 = """
+    CREATE OR REPLACE FUNCTION analytics_mark_stale() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE platform_daily_stats SET refreshed_at = NULL
+            WHERE refreshed_at IS NOT NULL AND day IN (
+                SELECT (created_at AT TIME ZONE 'UTC')::date FROM old_rows
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE platform_daily_stats SET refreshed_at = NULL
+            WHERE refreshed_at IS NOT NULL AND day IN (
+                SELECT (created_at AT TIME ZONE 'UTC')::date FROM new_rows
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "platform_daily_stats",
+        sa.Column("changes", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.execute(_MARK_STALE)
+
+
+def downgrade() -> None:
+    op.execute(_MARK_STALE_030)
+    op.drop_column("platform_daily_stats", "changes")
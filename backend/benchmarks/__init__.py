@@ -0,0 +1 @@
+"""Performance benchmarks, run as modules: uv run python -m benchmarks.<name>"""
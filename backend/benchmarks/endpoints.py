@@ -0,0 +1,422 @@
+"""
+Latency of the hot API endpoints against a seeded inventory.
+
+Sends requests for the largest benchmark tenant (see benchmarks.seed)
+straight to the ASGI app, with real authentication and the database from
+DATABASE_URL, and reports p50/p95/p99 latency and SQL statements per
+request. Results are compared with the stored baselines; a scenario whose
+p50 is more than --tolerance slower than its baseline is reported as a
+regression and the run exits non-zero, as is one issuing more SQL
+statements than its baseline. Scenarios with an absolute p99 target (the
+typeahead suggestions, cached and not) also fail when they miss it.
+Baselines are machine specific: record them with --update-baseline on the
+machine that runs the comparison, against the same seeded size and a
+database migrated to head (the suggestions rely on the trigram indexes of
+migration 032).
+
+Usage:
+    uv run alembic upgrade head
+    uv run python -m benchmarks.seed --items 100000
+    uv run python -m benchmarks.endpoints [--requests N] [--only NAME]
+        [--tolerance 0.25] [--update-baseline]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+
+from benchmarks.seed import BENCH_EMAIL_DOMAIN
+from src.auth.service import AuthService
+from src.categories.models import Category
+from src.common.rate_limiter import limiter
+from src.common.request_context import get_query_stats
+from src.common.tree_cache import get_tree_cache
+from src.config import get_settings
+from src.database import close_db, get_session_factory, init_db
+from src.items.models import Item
+from src.locations.models import Location
+from src.main import app
+from src.search.cache import get_suggestion_cache
+from src.users.models import User
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "endpoints.json"
+
+# Differences below this are noise whatever the relative change
+MIN_REGRESSION_MS = 1.0
+
+# Scenarios with a p99 target send at least this many requests, so the
+# p99 is not just the slowest of a few
+P99_MIN_REQUESTS = 200
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One benchmarked request, optionally undone after each run."""
+
+    name: str
+    method: str
+    path: str
+    params: dict[str, Any] | None = None
+    body: dict[str, Any] | None = None
+    # Untimed request sent after each run, e.g. to check an item back in
+    cleanup_path: str | None = None
+    # Untimed call before each run, e.g. to empty a cache
+    setup: Callable[[], object] | None = None
+    # Absolute p99 latency the scenario must stay under, whatever the baseline
+    p99_target_ms: float | None = None
+
+
+@dataclass
+class Result:
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries: int | None
+
+
+@dataclass
+class Tenant:
+    """What the scenarios need to know about the seeded tenant."""
+
+    user_id: UUID
+    item_count: int
+    category_id: UUID
+    category_path: str
+    location_id: UUID
+    item_id: UUID
+
+
+async def load_tenant() -> Tenant:
+    """Find the benchmark tenant with the most items."""
+    session_factory = get_session_factory()
+    async with session_factory() as session:
+        row = (
+            await session.execute(
+                select(User.id, func.count(Item.id))
+                .join(Item, Item.user_id == User.id)
+                .where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+                .group_by(User.id)
+                .order_by(func.count(Item.id).desc())
+                .limit(1)
+            )
+        ).first()
+        if row is None:
+            raise SystemExit("No benchmark tenant found; run benchmarks.seed first")
+        user_id, item_count = row
+
+        # A second-level category and a top-level location, so filters
+        # cover a subtree rather than a single node
+        category = (
+            await session.execute(
+                select(Category)
+                .where(Category.user_id == user_id, func.nlevel(Category.path) == 2)
+                .order_by(Category.path)
+                .limit(1)
+            )
+        ).scalar_one()
+        location_id = (
+            await session.execute(
+                select(Location.id)
+                .where(Location.user_id == user_id, Location.parent_id.is_(None))
+                .order_by(Location.path)
+                .limit(1)
+            )
+        ).scalar_one()
+        item_id = (
+            await session.execute(
+                select(Item.id)
+                .where(Item.user_id == user_id, Item.quantity >= 100)
+                .order_by(Item.name)
+                .limit(1)
+            )
+        ).scalar_one()
+
+    return Tenant(
+        user_id=user_id,
+        item_count=item_count,
+        category_id=category.id,
+        category_path=str(category.path),
+        location_id=location_id,
+        item_id=item_id,
+    )
+
+
+def build_scenarios(tenant: Tenant) -> list[Scenario]:
+    items = "/api/v1/items"
+    return [
+        Scenario("list_items", "GET", items, {"limit": 50}),
+        Scenario(
+            "list_items_category",
+            "GET",
+            items,
+            {"category_id": str(tenant.category_id), "limit": 50},
+        ),
+        Scenario(
+            "list_items_filtered",
+            "GET",
+            items,
+            {
+                "location_id": str(tenant.location_id),
+                "tags": ["hardware"],
+                "attr": ["thread:M4"],
+                "limit": 50,
+            },
+        ),
+        Scenario("list_items_search", "GET", items, {"search": "bolt", "limit": 50}),
+        Scenario(
+            "list_items_search_deep",
+            "GET",
+            items,
+            {"search": "bolt", "page": 5, "limit": 50},
+        ),
+        Scenario("facets", "GET", f"{items}/facets"),
+        Scenario(
+            "facets_category",
+            "GET",
+            f"{items}/facets",
+            {"category_id": str(tenant.category_id)},
+        ),
+        Scenario("tags", "GET", f"{items}/tags"),
+        Scenario("search", "GET", f"{items}/search", {"q": "hex bolt", "limit": 20}),
+        Scenario(
+            "search_highlight",
+            "GET",
+            f"{items}/search",
+            {"q": "hex bolt", "limit": 20, "highlight": True},
+        ),
+        Scenario(
+            "find_similar",
+            "POST",
+            f"{items}/find-similar",
+            body={
+                "identified_name": "Hex Bolt M4",
+                "category_path": tenant.category_path,
+                "specifications": [{"key": "thread", "value": "M4"}],
+                "limit": 5,
+            },
+        ),
+        Scenario("category_tree", "GET", "/api/v1/categories/tree"),
+        Scenario(
+            "category_tree_uncached",
+            "GET",
+            "/api/v1/categories/tree",
+            setup=get_tree_cache().clear,
+        ),
+        Scenario(
+            "category_template",
+            "GET",
+            f"/api/v1/categories/{tenant.category_id}/template",
+        ),
+        Scenario("location_tree", "GET", "/api/v1/locations/tree"),
+        Scenario(
+            "location_tree_uncached",
+            "GET",
+            "/api/v1/locations/tree",
+            setup=get_tree_cache().clear,
+        ),
+        Scenario(
+            "check_out",
+            "POST",
+            f"{items}/{tenant.item_id}/check-out",
+            body={"quantity": 1},
+            cleanup_path=f"{items}/{tenant.item_id}/check-in",
+        ),
+        Scenario(
+            "suggest",
+            "GET",
+            "/api/v1/search/suggest",
+            {"q": "hex bo"},
+            setup=get_suggestion_cache().clear,
+            p99_target_ms=10,
+        ),
+        Scenario(
+            "suggest_cached",
+            "GET",
+            "/api/v1/search/suggest",
+            {"q": "hex bo"},
+            p99_target_ms=5,
+        ),
+        Scenario("dashboard_stats", "GET", f"{items}/stats/dashboard"),
+        Scenario("most_used", "GET", f"{items}/stats/most-used"),
+        Scenario("recently_used", "GET", f"{items}/stats/recently-used"),
+    ]
+
+
+async def _send(client: AsyncClient, scenario: Scenario) -> None:
+    response = await client.request(
+        scenario.method, scenario.path, params=scenario.params, json=scenario.body
+    )
+    if response.status_code >= 400:
+        raise SystemExit(
+            f"{scenario.name}: HTTP {response.status_code} {response.text[:200]}"
+        )
+
+
+async def run_scenario(
+    client: AsyncClient, scenario: Scenario, requests: int
+) -> Result:
+    for _ in range(min(requests, 5)):
+        if scenario.setup:
+            scenario.setup()
+        await _send(client, scenario)
+        if scenario.cleanup_path:
+            await client.post(scenario.cleanup_path, json={"quantity": 1})
+
+    if scenario.p99_target_ms:
+        requests = max(requests, P99_MIN_REQUESTS)
+    timings = []
+    queries = None
+    for _ in range(requests):
+        if scenario.setup:
+            scenario.setup()
+        start = time.perf_counter()
+        await _send(client, scenario)
+        timings.append((time.perf_counter() - start) * 1000)
+        # The app runs in this task, so the request's stats are visible here
+        stats = get_query_stats()
+        queries = stats.queries if stats else None
+        if scenario.cleanup_path:
+            await client.post(scenario.cleanup_path, json={"quantity": 1})
+
+    if len(timings) > 1:
+        percentiles = statistics.quantiles(timings, n=100)
+        p95, p99 = percentiles[94], percentiles[98]
+    else:
+        p95 = p99 = timings[0]
+    return Result(statistics.median(timings), p95, p99, queries)
+
+
+def load_baselines() -> dict[str, Any]:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def save_baselines(item_count: int, results: dict[str, Result]) -> None:
+    baselines = load_baselines()
+    scenarios = baselines.get("scenarios", {})
+    scenarios.update(
+        {
+            name: {
+                "p50_ms": round(result.p50_ms, 2),
+                "p95_ms": round(result.p95_ms, 2),
+                "p99_ms": round(result.p99_ms, 2),
+                "queries": result.queries,
+            }
+            for name, result in results.items()
+        }
+    )
+    BASELINE_PATH.parent.mkdir(exist_ok=True)
+    BASELINE_PATH.write_text(
+        json.dumps({"items": item_count, "scenarios": scenarios}, indent=2) + "\n"
+    )
+
+
+async def main(
+    requests: int, only: list[str] | None, tolerance: float, update_baseline: bool
+) -> int:
+    settings = get_settings()
+    # SQL echo (DEBUG=true) would dominate the timings
+    init_db(settings.model_copy(update={"debug": False}))
+    limiter.enabled = False
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    try:
+        tenant = await load_tenant()
+        token, _ = AuthService(settings).create_access_token(tenant.user_id)
+        scenarios = [s for s in build_scenarios(tenant) if not only or s.name in only]
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://bench",
+            headers={"Authorization": f"Bearer {token}"},
+        ) as client:
+            results = {
+                s.name: await run_scenario(client, s, requests) for s in scenarios
+            }
+    finally:
+        await close_db()
+
+    baselines = load_baselines()
+    if baselines and baselines.get("items") != tenant.item_count:
+        print(
+            f"Note: baselines were recorded with {baselines.get('items')} items, "
+            f"this tenant has {tenant.item_count}"
+        )
+
+    print(f"{tenant.item_count} items, {requests} requests per scenario")
+    print(
+        f"{'scenario':<24}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}"
+        f"{'queries':>9}"
+        f"{'baseline':>10}{'change':>9}"
+    )
+    regressions = []
+    targets = {s.name: s.p99_target_ms for s in scenarios if s.p99_target_ms}
+    for name, result in results.items():
+        baseline = baselines.get("scenarios", {}).get(name)
+        line = (
+            f"{name:<24}{result.p50_ms:>10.1f}{result.p95_ms:>10.1f}"
+            f"{result.p99_ms:>10.1f}"
+            f"{result.queries if result.queries is not None else '-':>9}"
+        )
+        if baseline:
+            change = result.p50_ms / baseline["p50_ms"] - 1
+            line += f"{baseline['p50_ms']:>10.1f}{change:>+9.0%}"
+            if (
+                change > tolerance
+                and result.p50_ms - baseline["p50_ms"] > MIN_REGRESSION_MS
+            ):
+                regressions.append(name)
+                line += "  REGRESSION"
+            elif (
+                result.queries is not None
+                and baseline.get("queries") is not None
+                and result.queries > baseline["queries"]
+            ):
+                # More statements than before usually means a new N+1
+                regressions.append(name)
+                line += f"  MORE QUERIES (was {baseline.get('queries')})"
+        target = targets.get(name)
+        if target and result.p99_ms > target:
+            regressions.append(name)
+            line += f"  P99 OVER {target:g} ms"
+        print(line)
+
+    if update_baseline:
+        save_baselines(tenant.item_count, results)
+        print(f"Baselines written to {BASELINE_PATH}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} scenario(s) regressed: {regressions}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--only", nargs="*", help="Scenario names to run")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed p50 slowdown relative to the baseline",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    sys.exit(
+        asyncio.run(
+            main(args.requests, args.only, args.tolerance, args.update_baseline)
+        )
+    )
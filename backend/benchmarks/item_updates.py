@@ -0,0 +1,143 @@
+"""
+UPDATE throughput of items under the search_vector trigger.
+
+Times item updates for the largest benchmark tenant (see benchmarks.seed)
+with the trigger from migration 026, which re-parsed the item text and
+attributes::text on every UPDATE, and with the current one from
+src.items.search_vector. The sampled items get --specs specifications
+first, so the attribute text is as large as on a well documented item.
+Updates that leave the text alone (quantity changes as in update_quantity
+and check-outs, location moves as in batch updates, an ORM save writing
+unchanged values) should no longer pay for it; a rename still does.
+Everything runs in transactions that are rolled back, so the seeded data
+is left unchanged.
+
+Usage:
+    uv run python -m benchmarks.item_updates [--rows N] [--specs N]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.endpoints import load_tenant
+from src.config import get_settings
+from src.database import close_db, get_session_factory, init_db
+from src.items.models import Item
+from src.items.search_vector import TRIGGER_DDL
+
+# The trigger as created by migration 026
+LEGACY_TRIGGER_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION items_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(array_to_string(NEW.tags, ' '), '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.attributes::text, '')), 'D');
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER items_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON items
+    FOR EACH ROW EXECUTE FUNCTION items_search_vector_update();
+    """,
+]
+
+# One statement per item, as the API issues them
+UPDATES = {
+    "quantity": "UPDATE items SET quantity = quantity + 1, updated_at = now() "
+    "WHERE id = :id",
+    "move": "UPDATE items SET location_id = :location_id, updated_at = now() "
+    "WHERE id = :id",
+    "unchanged text": "UPDATE items SET name = name, description = description, "
+    "tags = tags, attributes = attributes, updated_at = now() WHERE id = :id",
+    "rename": "UPDATE items SET name = name || ' x', updated_at = now() WHERE id = :id",
+}
+
+
+def _specifications(count: int) -> list[dict[str, str]]:
+    return [
+        {"key": f"Property {i}", "value": f"Detailed value number {i} of this item"}
+        for i in range(count)
+    ]
+
+
+async def _install(session: AsyncSession, ddl: list[str]) -> None:
+    await session.execute(text("DROP TRIGGER items_search_vector_trigger ON items"))
+    for statement in ddl:
+        await session.execute(text(statement))
+
+
+async def _measure(
+    session: AsyncSession, ddl: list[str], ids: list, location_id, specs: int
+) -> dict[str, float]:
+    """Rows per second of each update kind with the given trigger DDL."""
+    rates = {}
+    for name, statement in UPDATES.items():
+        await _install(session, ddl)
+        await session.execute(
+            text(
+                "UPDATE items SET attributes = attributes || "
+                "jsonb_build_object('specifications', CAST(:specs AS jsonb)) "
+                "WHERE id = ANY(:ids)"
+            ),
+            {"specs": json.dumps(_specifications(specs)), "ids": ids},
+        )
+        update = text(statement)
+        start = time.perf_counter()
+        for item_id in ids:
+            await session.execute(update, {"id": item_id, "location_id": location_id})
+        rates[name] = len(ids) / (time.perf_counter() - start)
+        await session.rollback()
+    return rates
+
+
+async def main(rows: int, specs: int) -> None:
+    settings = get_settings()
+    init_db(settings.model_copy(update={"debug": False}))
+    logging.getLogger("src").setLevel(logging.WARNING)
+    try:
+        tenant = await load_tenant()
+        async with get_session_factory()() as session:
+            ids = list(
+                (
+                    await session.execute(
+                        select(Item.id)
+                        .where(Item.user_id == tenant.user_id)
+                        .order_by(Item.id)
+                        .limit(rows)
+                    )
+                ).scalars()
+            )
+            await session.rollback()
+            before = await _measure(
+                session, LEGACY_TRIGGER_DDL, ids, tenant.location_id, specs
+            )
+            after = await _measure(session, TRIGGER_DDL, ids, tenant.location_id, specs)
+    finally:
+        await close_db()
+
+    print(f"{len(ids)} items with {specs} specifications, rows/s")
+    print(f"{'update':<16}{'before':>10}{'after':>10}{'change':>9}")
+    for name in UPDATES:
+        change = after[name] / before[name] - 1
+        print(f"{name:<16}{before[name]:>10.0f}{after[name]:>10.0f}{change:>+9.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=500, help="Items to update")
+    parser.add_argument(
+        "--specs", type=int, default=40, help="Specifications per updated item"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.specs))
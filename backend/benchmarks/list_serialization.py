@@ -0,0 +1,150 @@
+"""
+Serialization cost of large item list pages.
+
+Compares building and encoding a page of items the way FastAPI does for a
+declared return type (validate every item and its nested category/location,
+re-validate against the response model, convert to Python data, encode with
+the stdlib) against the json_response path used by the list endpoints.
+Reports latency and peak allocations per page.
+
+Usage:
+    uv run python -m benchmarks.list_serialization [--items N] [--rounds N]
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+
+from src.categories.models import Category
+from src.common.responses import json_response
+from src.common.schemas import PaginatedResponse
+from src.items.models import Item
+from src.items.router import _build_item_list_responses, _get_primary_image_url
+from src.items.schemas import ItemListResponse
+from src.locations.models import Location
+
+_page_adapter = TypeAdapter(PaginatedResponse[ItemListResponse])
+
+
+def _make_items(count: int) -> list[Item]:
+    """Build detached items spread over a handful of categories and locations."""
+    now = datetime.now(UTC)
+    categories = [
+        Category(
+            id=uuid.uuid4(),
+            name=f"Category {i}",
+            path=f"category_{i}",
+            attribute_template={"fields": []},
+            created_at=now,
+        )
+        for i in range(10)
+    ]
+    locations = [
+        Location(
+            id=uuid.uuid4(),
+            name=f"Location {i}",
+            path=f"location_{i}",
+            created_at=now,
+        )
+        for i in range(10)
+    ]
+    return [
+        Item(
+            id=uuid.uuid4(),
+            name=f"Item {i}",
+            description="A reasonably sized description for a benchmark item",
+            quantity=i % 7,
+            quantity_unit="pcs",
+            min_quantity=3,
+            price=Decimal("12.50"),
+            tags=["electronics", "spare", f"tag{i % 20}"],
+            attributes={"voltage": "5V", "color": "black", "size": i},
+            category=categories[i % len(categories)],
+            location=locations[i % len(locations)],
+            images=[],
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def validated_page(items: list[Item]) -> bytes:
+    """Previous path: validate, re-validate, dump to Python, encode."""
+    responses = [
+        ItemListResponse(
+            id=item.id,
+            name=item.name,
+            description=item.description,
+            quantity=item.quantity,
+            quantity_unit=item.quantity_unit,
+            price=item.price,
+            is_low_stock=item.is_low_stock,
+            tags=item.tags or [],
+            attributes=item.attributes or {},
+            category=item.category,
+            location=item.location,
+            primary_image_url=_get_primary_image_url(item),
+            created_at=item.created_at,
+            updated_at=item.updated_at,
+        )
+        for item in items
+    ]
+    page = PaginatedResponse.create(responses, len(items), 1, len(items))
+    content = _page_adapter.dump_python(
+        _page_adapter.validate_python(page), mode="json"
+    )
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def constructed_page(items: list[Item]) -> bytes:
+    """Current path: construct responses and write JSON directly."""
+    page = PaginatedResponse[ItemListResponse].create(
+        _build_item_list_responses(items), len(items), 1, len(items)
+    )
+    return json_response(_page_adapter, page).body
+
+
+def _measure(build: Callable[[list[Item]], bytes], items: list[Item], rounds: int):
+    build(items)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        build(items)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    build(items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), max(timings), peak / 1024
+
+
+def main(item_count: int, rounds: int) -> None:
+    items = _make_items(item_count)
+    assert json.loads(validated_page(items)) == json.loads(constructed_page(items))
+
+    print(f"{item_count} items per page, {rounds} rounds")
+    print(f"{'path':<12}{'median (ms)':>14}{'max (ms)':>12}{'peak (KiB)':>14}")
+    for name, build in (
+        ("validated", validated_page),
+        ("constructed", constructed_page),
+    ):
+        median, worst, peak = _measure(build, items, rounds)
+        print(f"{name:<12}{median:>14.2f}{worst:>12.2f}{peak:>14.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    main(args.items, args.rounds)
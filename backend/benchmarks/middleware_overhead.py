@@ -0,0 +1,143 @@
+"""
+Per-request overhead of the middleware stack.
+
+Times a trivial route through three apps: with no middleware, with the
+previous BaseHTTPMiddleware-based stack, and with the current pure-ASGI
+stack. Requests are sent straight to the ASGI app so
+the numbers reflect middleware cost rather than network or client overhead.
+
+Usage:
+    uv run python -m benchmarks.middleware_overhead [--requests N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Callable
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message
+
+from src.common.request_context import generate_request_id, set_request_id
+from src.common.request_id_middleware import REQUEST_ID_HEADER, RequestIDMiddleware
+from src.common.security_headers import SecurityHeadersMiddleware
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    """The request ID middleware as it was before the pure-ASGI rewrite."""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get(REQUEST_ID_HEADER) or generate_request_id()
+        set_request_id(request_id)
+        response = await call_next(request)
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The security headers middleware as it was before the pure-ASGI rewrite."""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        for name, value in SecurityHeadersMiddleware.headers.items():
+            response.headers[name] = value
+        if "server" in response.headers:
+            del response.headers["server"]
+        return response
+
+
+def _base_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def bare_app() -> ASGIApp:
+    return _base_app()
+
+
+def legacy_app() -> ASGIApp:
+    app = _base_app()
+    app.add_middleware(LegacyRequestIDMiddleware)
+    app.add_middleware(LegacySecurityHeadersMiddleware)
+    return app
+
+
+def current_app() -> ASGIApp:
+    app = _base_app()
+    app.add_middleware(RequestIDMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+    return app
+
+
+async def _request(app: ASGIApp) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("bench", 80),
+    }
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    assert messages[0]["status"] == 200
+
+
+async def _measure(app: ASGIApp, requests: int) -> list[float]:
+    for _ in range(min(requests, 200)):
+        await _request(app)
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await _request(app)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def _percentile(timings: list[float], pct: int) -> float:
+    return statistics.quantiles(timings, n=100)[pct - 1]
+
+
+async def main(requests: int) -> None:
+    stacks: dict[str, Callable[[], ASGIApp]] = {
+        "bare": bare_app,
+        "legacy": legacy_app,
+        "current": current_app,
+    }
+    results = {
+        name: await _measure(build(), requests) for name, build in stacks.items()
+    }
+    bare_p50 = _percentile(results["bare"], 50)
+
+    print(f"{'stack':<10}{'p50 (us)':>12}{'p99 (us)':>12}{'overhead p50':>16}")
+    for name, timings in results.items():
+        p50 = _percentile(timings, 50)
+        p99 = _percentile(timings, 99)
+        print(f"{name:<10}{p50:>12.1f}{p99:>12.1f}{p50 - bare_p50:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
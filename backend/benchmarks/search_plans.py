@@ -0,0 +1,123 @@
+"""
+Query plans of the ranked item search.
+
+Runs the statements behind the item search for the largest benchmark
+tenant (see benchmarks.seed) under EXPLAIN ANALYZE: the ranked list page,
+first and deep, its count, and /items/search with highlight snippets. For
+each it reports the execution time and whether the search_vector GIN
+index was read. Ranking by ts_rank_cd has to score every match, so a
+change to the query that makes the planner scan the tenant's items
+instead of the index shows up here first; the run exits non-zero when
+any plan no longer reads the index.
+
+Usage:
+    uv run python -m benchmarks.search_plans [--query TEXT ...] [--page N]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import event
+
+from benchmarks.endpoints import load_tenant
+from src.config import get_settings
+from src.database import close_db, get_session_factory, init_db
+from src.items.repository import ItemRepository
+
+SEARCH_INDEX = "ix_items_search_vector"
+
+PAGE_SIZE = 50
+
+
+def _nodes(plan: dict[str, Any]):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+async def _explain(session, run: Callable[[], Awaitable[Any]]) -> list[dict[str, Any]]:
+    """Run a repository call, then EXPLAIN ANALYZE each search statement it issued."""
+    statements: list[tuple[str, Any]] = []
+
+    def record(_conn, _cursor, statement, parameters, *_args) -> None:
+        if "search_vector" in statement:
+            statements.append((statement, parameters))
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        await run()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+
+    connection = await session.connection()
+    plans = []
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters
+        )
+        plans.append(result.scalar()[0])
+    return plans
+
+
+async def main(queries: list[str], page: int) -> int:
+    settings = get_settings()
+    init_db(settings.model_copy(update={"debug": False}))
+    logging.getLogger("src").setLevel(logging.WARNING)
+    missing = []
+    try:
+        tenant = await load_tenant()
+        print(f"{tenant.item_count} items, deep page = page {page}")
+        print(f"{'query':<20}{'statement':<16}{'ms':>9}{'rows':>7}  GIN index")
+        session_factory = get_session_factory()
+        async with session_factory() as session:
+            repo = ItemRepository(session, tenant.user_id)
+            for query in queries:
+                calls = {
+                    "list page 1": lambda q=query: repo.get_all(
+                        search=q, limit=PAGE_SIZE
+                    ),
+                    f"list page {page}": lambda q=query: repo.get_all(
+                        search=q, offset=(page - 1) * PAGE_SIZE, limit=PAGE_SIZE
+                    ),
+                    "count": lambda q=query: repo.count(search=q),
+                    "highlight": lambda q=query: repo.search(q, 20, highlight=True),
+                }
+                for label, call in calls.items():
+                    for plan in await _explain(session, call):
+                        used = any(
+                            node.get("Index Name") == SEARCH_INDEX
+                            for node in _nodes(plan["Plan"])
+                        )
+                        if not used:
+                            missing.append(f"{query!r} {label}")
+                        print(
+                            f"{query[:19]:<20}{label:<16}"
+                            f"{plan['Execution Time']:>9.2f}"
+                            f"{plan['Plan']['Actual Rows']:>7}  "
+                            f"{'yes' if used else 'NO'}"
+                        )
+    finally:
+        await close_db()
+
+    if missing:
+        print(f"{len(missing)} plan(s) do not use {SEARCH_INDEX}: {missing}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--query",
+        nargs="*",
+        default=["bolt", "hex bolt", '"hex bolt" -m4', "resistor or capacitor"],
+        help="Search inputs to plan",
+    )
+    parser.add_argument("--page", type=int, default=5, help="Deep page to plan")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.query, args.page)))
@@ -0,0 +1,117 @@
+"""
+Rendering cost of webhook body templates.
+
+Times rendering a body template the way deliveries did before templates
+were compiled (the placeholder regex and path splitting on every render),
+compiling it on every render without the cache, and the current cached
+render_template. Templates of a few and of many placeholders are rendered
+against a typical event context.
+
+Usage:
+    uv run python -m benchmarks.webhook_templates [--renders N]
+"""
+
+import argparse
+import re
+import statistics
+import time
+from collections.abc import Callable
+
+from src.webhooks.template import (
+    CompiledTemplate,
+    escape_json_string,
+    get_nested_value,
+    render_template,
+)
+
+TEMPLATES = {
+    "small": (
+        '{"text": "New feedback: {{feedback.subject}}", '
+        '"from": "{{user.email}}", "type": "{{feedback.type}}", '
+        '"id": "{{feedback.id}}"}'
+    ),
+    "large": "{"
+    + ", ".join(
+        f'"field_{i}": "{{{{feedback.subject}}}} {{{{user.name}}}} '
+        f'{{{{item.quantity}}}} {{{{item.location.name}}}}"'
+        for i in range(8)
+    )
+    + "}",
+}
+
+CONTEXT = {
+    "timestamp": "2026-01-01T12:00:00Z",
+    "feedback": {
+        "id": "4f1c6a52-8d0e-4b8e-9d43-0b7f0d6c2a11",
+        "subject": 'Scanner says "unknown item"',
+        "type": "bug",
+    },
+    "user": {"email": "someone@example.com", "name": "Some One"},
+    "item": {"quantity": 3, "location": {"name": "Garage shelf\n2"}},
+}
+
+_PATTERN = r"\{\{\s*([a-zA-Z_][a-zA-Z0-9_.]*)\s*\}\}"
+
+
+def legacy_render_template(template: str, context: dict) -> str:
+    """render_template as it was before templates were compiled."""
+
+    def replace_var(match: re.Match) -> str:
+        value = get_nested_value(context, match.group(1).strip())
+        if value is None:
+            return ""
+        if isinstance(value, str):
+            return escape_json_string(value)
+        return str(value)
+
+    return re.sub(_PATTERN, replace_var, template)
+
+
+def uncached_render_template(template: str, context: dict) -> str:
+    """Compile on every render, for the cost of parsing alone."""
+    return CompiledTemplate(template).render(context)
+
+
+def _measure(
+    render: Callable[[str, dict], str], template: str, renders: int
+) -> list[float]:
+    for _ in range(min(renders, 1000)):
+        render(template, CONTEXT)
+    timings = []
+    for _ in range(renders):
+        start = time.perf_counter()
+        render(template, CONTEXT)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def main(renders: int) -> None:
+    renderers: dict[str, Callable[[str, dict], str]] = {
+        "legacy": legacy_render_template,
+        "uncached": uncached_render_template,
+        "compiled": render_template,
+    }
+
+    print(
+        f"{'template':<10}{'renderer':<10}{'p50 (us)':>12}{'p99 (us)':>12}{'speedup':>10}"
+    )
+    for template_name, template in TEMPLATES.items():
+        expected = legacy_render_template(template, CONTEXT)
+        legacy_p50 = None
+        for name, render in renderers.items():
+            assert render(template, CONTEXT) == expected, name
+            timings = _measure(render, template, renders)
+            quantiles = statistics.quantiles(timings, n=100)
+            p50, p99 = quantiles[49], quantiles[98]
+            legacy_p50 = legacy_p50 or p50
+            print(
+                f"{template_name:<10}{name:<10}{p50:>12.2f}{p99:>12.2f}"
+                f"{legacy_p50 / p50:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--renders", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.renders)
@@ -0,0 +1,41 @@
+"""Admin analytics rollup models."""
+
+from datetime import date, datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class PlatformDailyStats(Base):
+    """Platform-wide signups and credit flows per closed UTC day.
+
+    Refreshed by src.admin.rollups, which keeps a row for every day from the
+    first signup up to yesterday. Triggers on the source tables reset
+    refreshed_at and bump changes when a day changes (a refund, a deleted
+    account), marking the day for recomputation on the next refresh.
+    """
+
+    __tablename__ = "platform_daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    signups: Mapped[int] = mapped_column(Integer, server_default="0")
+    credits_purchased: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    credits_used: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    refreshed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    changes: Mapped[int] = mapped_column(BigInteger, server_default="0")
+
+
+class PackDailySales(Base):
+    """Non-refunded credit pack purchases and revenue per pack per closed day."""
+
+    __tablename__ = "pack_daily_sales"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    credit_pack_id: Mapped[UUID] = mapped_column(
+        ForeignKey("credit_packs.id", ondelete="CASCADE"), primary_key=True
+    )
+    purchases: Mapped[int] = mapped_column(Integer, server_default="0")
+    revenue_cents: Mapped[int] = mapped_column(BigInteger, server_default="0")
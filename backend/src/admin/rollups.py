@@ -0,0 +1,469 @@
+"""
+Admin analytics rollups: signups, credit flows, pack sales and AI usage per
+closed UTC day.
+
+platform_daily_stats, pack_daily_sales and ai_usage_daily hold one summary
+per day (and pack, or user/model/operation) up to yesterday, so the admin
+statistics read a few hundred rollup rows instead of scanning users,
+credit_transactions and ai_usage_logs from the beginning. Only today's
+partial bucket is aggregated from the source tables.
+
+Closed days are rolled up by a scheduled run of this module (daily, after
+midnight UTC). Requests never refresh: the refresh scans whole days of the
+source tables. Instead they aggregate every day the rollups do not cover -
+not rolled up yet, or stale - live (rollups_live_from), so a late or missed
+run costs query time, not correctness. Writes that touch a day with a
+platform_daily_stats row - a refund, a deleted account or credit pack, a
+late insert - fire a trigger that marks the day stale and bumps its change
+counter. The refresh takes no table locks: it writes a day's rollup only if
+the counter still holds the value read before recomputing, and a day
+written to in between stays stale for the next run. Migrations 030 and 040
+install the triggers; TRIGGER_DDL is the same DDL for test databases built
+with create_all.
+
+Usage:
+    uv run python -m src.admin.rollups [--rebuild]
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, date, datetime, time, timedelta
+
+from sqlalchemy import (
+    Date,
+    cast,
+    func,
+    insert,
+    literal_column,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.sql import Subquery
+
+from src.admin.models import PackDailySales, PlatformDailyStats
+from src.ai.models import AIUsageLog
+from src.billing.models import CreditPack, CreditTransaction
+from src.common.partitions import add_months, month_start
+from src.config import get_settings
+from src.database import create_session_factory
+from src.users.models import User
+
+# Serializes each step of concurrent refresh runs
+_REFRESH_LOCK_KEY = 7_302_614_042
+
+_SOURCE_TABLES = ("users", "credit_transactions", "ai_usage_logs")
+_WRITER_POLL_SECONDS = 0.1
+
+_TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+# users.created_at never changes and ai_usage_logs is append-only, so only
+# credit_transactions (refunds, deleted packs) needs an update trigger
+_STALE_TRIGGERS = [
+    ("users", "INSERT"),
+    ("users", "DELETE"),
+    ("credit_transactions", "INSERT"),
+    ("credit_transactions", "UPDATE"),
+    ("credit_transactions", "DELETE"),
+    ("ai_usage_logs", "INSERT"),
+    ("ai_usage_logs", "DELETE"),
+]
+
+TRIGGER_DDL = [
+    # Mark every day a statement touched stale and bump its change counter;
+    # days without a row yet (today) are left alone
+    """
+    CREATE OR REPLACE FUNCTION analytics_mark_stale() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE platform_daily_stats
+            SET refreshed_at = NULL, changes = changes + 1
+            WHERE day IN (
+                SELECT (created_at AT TIME ZONE 'UTC')::date FROM old_rows
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE platform_daily_stats
+            SET refreshed_at = NULL, changes = changes + 1
+            WHERE day IN (
+                SELECT (created_at AT TIME ZONE 'UTC')::date FROM new_rows
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    *(
+        f"""
+        CREATE TRIGGER {table}_analytics_{op.lower()}_trigger
+        AFTER {op} ON {table}
+        REFERENCING {_TRANSITION_TABLES[op]}
+        FOR EACH STATEMENT EXECUTE FUNCTION analytics_mark_stale();
+        """
+        for table, op in _STALE_TRIGGERS
+    ),
+]
+
+# Each statement recomputes the days in :days, joining every day to the
+# created_at range it covers so the source tables are read by index
+_DAY_BOUNDS = """
+    CROSS JOIN LATERAL (
+        SELECT d.day::timestamp AT TIME ZONE 'UTC' AS lo,
+               (d.day + 1)::timestamp AT TIME ZONE 'UTC' AS hi
+    ) AS b
+"""
+
+# Rollups of the other tables, recomputed first; a day whose platform row is
+# not written below stays stale, so its rows here are read live instead
+_REFRESH_SQL = [
+    "DELETE FROM pack_daily_sales WHERE day = ANY(CAST(:days AS date[]))",
+    f"""
+    INSERT INTO pack_daily_sales (day, credit_pack_id, purchases, revenue_cents)
+    SELECT d.day, t.credit_pack_id, count(*), sum(p.price_cents)
+    FROM unnest(CAST(:days AS date[])) AS d(day)
+    {_DAY_BOUNDS}
+    JOIN credit_transactions t
+        ON t.created_at >= b.lo AND t.created_at < b.hi
+    JOIN credit_packs p ON p.id = t.credit_pack_id
+    WHERE t.transaction_type = 'purchase' AND NOT t.is_refunded
+    GROUP BY 1, 2
+    """,
+    # Days before :kept_from lost their logs to partition retention and keep
+    # their rollups as they are
+    """
+    DELETE FROM ai_usage_daily
+    WHERE day = ANY(CAST(:days AS date[])) AND day >= :kept_from
+    """,
+    f"""
+    INSERT INTO ai_usage_daily (
+        day, user_id, model, operation_type, calls, prompt_tokens,
+        completion_tokens, total_tokens, cost_usd
+    )
+    SELECT
+        d.day, l.user_id, l.model, l.operation_type, count(*),
+        sum(l.prompt_tokens), sum(l.completion_tokens), sum(l.total_tokens),
+        sum(l.estimated_cost_usd)
+    FROM unnest(CAST(:days AS date[])) AS d(day)
+    {_DAY_BOUNDS}
+    JOIN ai_usage_logs l ON l.created_at >= b.lo AND l.created_at < b.hi
+    WHERE d.day >= :kept_from
+    GROUP BY 1, 2, 3, 4
+    """,
+]
+
+
+# Writes a day only if its change counter still holds the value read before
+# the recompute. A write committed since has bumped it, and one still in
+# flight holds the row until it commits and bumps it, so either way the day
+# is skipped and stays stale.
+_PLATFORM_SQL = f"""
+    UPDATE platform_daily_stats AS p SET
+        signups = s.signups,
+        credits_purchased = c.purchased,
+        credits_used = c.used,
+        refreshed_at = now()
+    FROM unnest(CAST(:days AS date[]), CAST(:changes AS bigint[]))
+        AS d(day, changes)
+    {_DAY_BOUNDS}
+    CROSS JOIN LATERAL (
+        SELECT count(*) AS signups
+        FROM users
+        WHERE created_at >= b.lo AND created_at < b.hi
+    ) AS s
+    CROSS JOIN LATERAL (
+        SELECT
+            coalesce(sum(amount) FILTER (
+                WHERE transaction_type = 'purchase' AND NOT is_refunded
+            ), 0) AS purchased,
+            coalesce(-sum(amount) FILTER (
+                WHERE transaction_type = 'usage'
+            ), 0) AS used
+        FROM credit_transactions
+        WHERE created_at >= b.lo AND created_at < b.hi
+    ) AS c
+    WHERE p.day = d.day AND p.changes = d.changes
+    RETURNING p.day
+"""
+
+
+def _zero():
+    return literal_column("0")
+
+
+def day_start(day: date) -> datetime:
+    """Start of a UTC day as an aware datetime."""
+    return datetime.combine(day, time.min, tzinfo=UTC)
+
+
+def utc_day(column):
+    """SQL expression for the UTC day of a timestamptz column."""
+    return cast(func.timezone("UTC", column), Date)
+
+
+def _ai_usage_kept_from(today: date) -> date:
+    """First day whose AI usage logs are still attached (see src.common.partitions)."""
+    months = get_settings().ai_usage_log_retention_months
+    return add_months(month_start(today), -months) if months > 0 else date.min
+
+
+async def _first_day(session: AsyncSession) -> date | None:
+    """Day of the oldest row in any rolled-up source table."""
+    first = (
+        await session.execute(
+            select(
+                func.least(
+                    select(func.min(User.created_at)).scalar_subquery(),
+                    select(func.min(CreditTransaction.created_at)).scalar_subquery(),
+                    select(func.min(AIUsageLog.created_at)).scalar_subquery(),
+                )
+            )
+        )
+    ).scalar()
+    return first.astimezone(UTC).date() if first else None
+
+
+async def _new_days(session: AsyncSession, today: date) -> list[date]:
+    """Closed days without a platform_daily_stats row yet."""
+    last_day = (
+        await session.execute(select(func.max(PlatformDailyStats.day)))
+    ).scalar()
+    start = last_day + timedelta(days=1) if last_day else await _first_day(session)
+    if start is None:
+        return []
+    return [start + timedelta(days=offset) for offset in range((today - start).days)]
+
+
+async def _wait_for_writers(session: AsyncSession) -> None:
+    """Wait until the transactions writing to the source tables now have ended.
+
+    A write whose trigger ran before a day got its row did not bump the
+    day's counter; once these transactions are over, the recompute sees it.
+    """
+    writers_sql = text(
+        """
+        SELECT array_agg(DISTINCT virtualtransaction) FROM pg_locks
+        WHERE relation = ANY(CAST(:tables AS regclass[]))
+            AND mode = 'RowExclusiveLock' AND pid <> pg_backend_pid()
+        """
+    )
+    writers = (
+        await session.execute(writers_sql, {"tables": list(_SOURCE_TABLES)})
+    ).scalar()
+    while writers:
+        await asyncio.sleep(_WRITER_POLL_SECONDS)
+        writers = (
+            await session.execute(
+                text(
+                    "SELECT array_agg(DISTINCT virtualtransaction) FROM pg_locks "
+                    "WHERE virtualtransaction = ANY(:writers)"
+                ),
+                {"writers": writers},
+            )
+        ).scalar()
+    await session.commit()
+
+
+async def refresh_rollups(session: AsyncSession, rebuild: bool = False) -> int:
+    """Recompute stale closed days and roll up the days closed since the last run.
+
+    Takes no table locks. New days first get a stale row, committed, so
+    triggers bump their counters from then on; the refresh then waits out
+    the writes already in flight and recomputes every stale day. A day is
+    written only if its counter is unchanged since it was read, and is left
+    stale for the next run otherwise.
+
+    Args:
+        session: Database session; the refresh is committed on it
+        rebuild: Recompute every day from the first signup instead; AI usage
+            of days whose logs were detached by retention is kept
+
+    Returns:
+        Number of days recomputed
+    """
+    today = datetime.now(UTC).date()
+    lock = text("SELECT pg_advisory_xact_lock(:key)")
+    await session.execute(lock, {"key": _REFRESH_LOCK_KEY})
+    kept_from = _ai_usage_kept_from(today)
+    if rebuild:
+        for table in ("platform_daily_stats", "pack_daily_sales"):
+            await session.execute(text(f"DELETE FROM {table}"))
+        await session.execute(
+            text("DELETE FROM ai_usage_daily WHERE day >= :kept_from"),
+            {"kept_from": kept_from},
+        )
+    new_days = await _new_days(session, today)
+    if new_days:
+        await session.execute(
+            insert(PlatformDailyStats).values([{"day": day} for day in new_days])
+        )
+    await session.commit()
+    await _wait_for_writers(session)
+
+    await session.execute(lock, {"key": _REFRESH_LOCK_KEY})
+    stale = (
+        await session.execute(
+            select(PlatformDailyStats.day, PlatformDailyStats.changes).where(
+                PlatformDailyStats.refreshed_at.is_(None)
+            )
+        )
+    ).all()
+    if not stale:
+        await session.commit()
+        return 0
+    days = [day for day, _ in stale]
+    for statement in _REFRESH_SQL:
+        await session.execute(text(statement), {"days": days, "kept_from": kept_from})
+    refreshed = (
+        await session.execute(
+            text(_PLATFORM_SQL),
+            {"days": days, "changes": [changes for _, changes in stale]},
+        )
+    ).all()
+    await session.commit()
+    return len(refreshed)
+
+
+async def rollups_live_from(session: AsyncSession, today: date) -> date:
+    """First day the rollups do not cover, for callers to aggregate live.
+
+    The day after the last rolled-up day, or the first stale day if that is
+    earlier; today when the rollups are current. Costs one query against
+    platform_daily_stats, and one more while nothing has been rolled up.
+    """
+    last_day, first_stale = (
+        await session.execute(
+            select(
+                func.max(PlatformDailyStats.day),
+                func.min(PlatformDailyStats.day).filter(
+                    PlatformDailyStats.refreshed_at.is_(None)
+                ),
+            )
+        )
+    ).one()
+    if last_day is None:
+        return await _first_day(session) or today
+    live_from = min(last_day + timedelta(days=1), today)
+    if first_stale is not None:
+        live_from = min(live_from, first_stale)
+    return live_from
+
+
+def ai_usage_live_from(live_from: date, today: date) -> date:
+    """First day to aggregate AI usage live from ai_usage_logs.
+
+    Days before the retention boundary have no attached logs left, so their
+    ai_usage_daily rows stand even when the day is stale for other reasons.
+    """
+    return max(live_from, _ai_usage_kept_from(today))
+
+
+def platform_days(live_from: date, since: date | None = None) -> Subquery:
+    """Signups, revenue and credit flows per day since a day (default: all).
+
+    Days before live_from come from the rollups and days from live_from on
+    from the source tables.
+
+    Columns: day, signups, revenue_cents, credits_purchased, credits_used.
+    """
+    live_start = day_start(max(live_from, since) if since else live_from)
+    rolled = [
+        select(
+            PlatformDailyStats.day,
+            PlatformDailyStats.signups,
+            _zero().label("revenue_cents"),
+            PlatformDailyStats.credits_purchased,
+            PlatformDailyStats.credits_used,
+        ).where(PlatformDailyStats.day < live_from),
+        select(
+            PackDailySales.day,
+            _zero(),
+            PackDailySales.revenue_cents,
+            _zero(),
+            _zero(),
+        ).where(PackDailySales.day < live_from),
+    ]
+    if since:
+        rolled[0] = rolled[0].where(PlatformDailyStats.day >= since)
+        rolled[1] = rolled[1].where(PackDailySales.day >= since)
+
+    signup_day = utc_day(User.created_at)
+    transaction_day = utc_day(CreditTransaction.created_at)
+    purchased = (CreditTransaction.transaction_type == "purchase") & (
+        CreditTransaction.is_refunded == False  # noqa: E712
+    )
+    live = [
+        select(signup_day, func.count(), _zero(), _zero(), _zero())
+        .where(User.created_at >= live_start)
+        .group_by(signup_day),
+        select(
+            transaction_day,
+            _zero(),
+            _zero(),
+            func.coalesce(func.sum(CreditTransaction.amount).filter(purchased), 0),
+            func.coalesce(
+                -func.sum(CreditTransaction.amount).filter(
+                    CreditTransaction.transaction_type == "usage"
+                ),
+                0,
+            ),
+        )
+        .where(CreditTransaction.created_at >= live_start)
+        .group_by(transaction_day),
+        select(
+            transaction_day, _zero(), func.sum(CreditPack.price_cents), _zero(), _zero()
+        )
+        .join(CreditPack, CreditTransaction.credit_pack_id == CreditPack.id)
+        .where(CreditTransaction.created_at >= live_start, purchased)
+        .group_by(transaction_day),
+    ]
+    return union_all(*rolled, *live).subquery("platform_days")
+
+
+def pack_sales(live_from: date, since: date) -> Subquery:
+    """Non-refunded purchases and revenue per credit pack and day since a day.
+
+    Columns: credit_pack_id, purchases, revenue_cents.
+    """
+    return union_all(
+        select(
+            PackDailySales.credit_pack_id,
+            PackDailySales.purchases,
+            PackDailySales.revenue_cents,
+        ).where(PackDailySales.day >= since, PackDailySales.day < live_from),
+        select(
+            CreditTransaction.credit_pack_id,
+            func.count(),
+            func.sum(CreditPack.price_cents),
+        )
+        .join(CreditPack, CreditTransaction.credit_pack_id == CreditPack.id)
+        .where(
+            CreditTransaction.transaction_type == "purchase",
+            CreditTransaction.is_refunded == False,  # noqa: E712
+            CreditTransaction.created_at >= day_start(max(live_from, since)),
+        )
+        .group_by(CreditTransaction.credit_pack_id),
+    ).subquery("pack_sales")
+
+
+async def main(rebuild: bool) -> None:
+    engine = create_async_engine(get_settings().database_url)
+    try:
+        async with create_session_factory(engine)() as session:
+            days = await refresh_rollups(session, rebuild)
+    finally:
+        await engine.dispose()
+    print(f"Refreshed admin analytics rollups for {days} day(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Recompute every day from scratch"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.rebuild))
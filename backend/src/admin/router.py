@@ -4,9 +4,17 @@ from datetime import UTC, datetime, timedelta
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, or_, select
-
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import Row, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.admin.rollups import (
+    ai_usage_live_from,
+    pack_sales,
+    platform_days,
+    rollups_live_from,
+)
 from src.admin.schemas import (
     AdminStatsResponse,
     AIUsageByUserResponse,
@@ -51,10 +59,11 @@ from src.billing.settings_service import (
     BillingSettingsService,
     get_billing_settings_service,
 )
+from src.common.responses import json_response
 from src.config import Settings, get_settings
 from src.database import AsyncSessionDep
 from src.feedback.models import Feedback
-from src.items.models import Item
+from src.items.models import UserItemStats
 from src.users.models import User
 
 router = APIRouter()
@@ -522,28 +531,32 @@ async def get_stats(
     _admin: AdminUserDep,
     session: AsyncSessionDep,
 ) -> AdminStatsResponse:
-    """Get admin dashboard statistics."""
-    # Total users
-    users_result = await session.execute(select(func.count(User.id)))
-    total_users = users_result.scalar() or 0
+    """Get admin dashboard statistics.
 
-    # Total items
-    items_result = await session.execute(select(func.count(Item.id)))
-    total_items = items_result.scalar() or 0
-
-    # Total revenue (sum of purchase transactions * price)
-    # We need to sum the amount field for purchase transactions and correlate with pack prices
-    revenue_query = (
-        select(func.sum(CreditPack.price_cents))
-        .select_from(CreditTransaction)
-        .join(CreditPack, CreditTransaction.credit_pack_id == CreditPack.id)
-        .where(
-            CreditTransaction.transaction_type == "purchase",
-            CreditTransaction.is_refunded == False,  # noqa: E712
+    Totals come from the daily rollups plus today's rows (see
+    src.admin.rollups); signups in the last 7 days cover the last 7 UTC days.
+    """
+    today = datetime.now(UTC).date()
+    live_from = await rollups_live_from(session, today)
+    days = platform_days(live_from)
+    week_start = today - timedelta(days=6)
+    totals = (
+        await session.execute(
+            select(
+                func.sum(days.c.signups).label("users"),
+                func.sum(days.c.revenue_cents).label("revenue_cents"),
+                func.sum(days.c.credits_purchased).label("credits_purchased"),
+                func.sum(days.c.credits_used).label("credits_used"),
+                func.sum(days.c.signups)
+                .filter(days.c.day >= week_start)
+                .label("recent_signups"),
+            )
         )
-    )
-    revenue_result = await session.execute(revenue_query)
-    total_revenue_cents = revenue_result.scalar() or 0
+    ).one()
+
+    # Total items, from the per-user dashboard rollups
+    items_result = await session.execute(select(func.sum(UserItemStats.total_items)))
+    total_items = items_result.scalar() or 0
 
     # Active credit packs
     packs_result = await session.execute(
@@ -551,30 +564,6 @@ async def get_stats(
     )
     active_credit_packs = packs_result.scalar() or 0
 
-    # Total credits purchased
-    purchased_result = await session.execute(
-        select(func.sum(CreditTransaction.amount)).where(
-            CreditTransaction.transaction_type == "purchase",
-            CreditTransaction.is_refunded == False,  # noqa: E712
-        )
-    )
-    total_credits_purchased = purchased_result.scalar() or 0
-
-    # Total credits used (usage transactions have negative amounts)
-    used_result = await session.execute(
-        select(func.sum(CreditTransaction.amount)).where(
-            CreditTransaction.transaction_type == "usage"
-        )
-    )
-    total_credits_used = abs(used_result.scalar() or 0)
-
-    # Recent signups (last 7 days)
-    seven_days_ago = datetime.now(UTC) - timedelta(days=7)
-    recent_signups_result = await session.execute(
-        select(func.count(User.id)).where(User.created_at >= seven_days_ago)
-    )
-    recent_signups_7d = recent_signups_result.scalar() or 0
-
     # Pending feedback count
     pending_feedback_result = await session.execute(
         select(func.count(Feedback.id)).where(
@@ -661,13 +650,13 @@ async def get_stats(
     recent_activity = recent_activity[:15]
 
     return AdminStatsResponse(
-        total_users=total_users,
+        total_users=int(totals.users or 0),
         total_items=total_items,
-        total_revenue_cents=total_revenue_cents,
+        total_revenue_cents=int(totals.revenue_cents or 0),
         active_credit_packs=active_credit_packs,
-        total_credits_purchased=total_credits_purchased,
-        total_credits_used=total_credits_used,
-        recent_signups_7d=recent_signups_7d,
+        total_credits_purchased=int(totals.credits_purchased or 0),
+        total_credits_used=int(totals.credits_used or 0),
+        recent_signups_7d=int(totals.recent_signups or 0),
         pending_feedback_count=pending_feedback_count,
         recent_activity=recent_activity,
     )
@@ -688,6 +677,36 @@ def _generate_date_range(days: int) -> list[str]:
     return [(today - timedelta(days=i)).isoformat() for i in range(days - 1, -1, -1)]
 
 
+async def _platform_stats(session: AsyncSession, days: int) -> tuple[dict, Row]:
+    """Platform stats per day for the past N days, and all-time totals.
+
+    Returns:
+        Tuple of (rows by ISO date for days with activity, totals row); both
+        have signups, revenue_cents, credits_purchased and credits_used.
+    """
+    today = datetime.now(UTC).date()
+    live_from = await rollups_live_from(session, today)
+
+    def sums(source):
+        return [
+            func.coalesce(func.sum(source.c[column]), 0).label(column)
+            for column in (
+                "signups",
+                "revenue_cents",
+                "credits_purchased",
+                "credits_used",
+            )
+        ]
+
+    period = platform_days(live_from, since=today - timedelta(days=days - 1))
+    by_day = await session.execute(
+        select(period.c.day, *sums(period)).group_by(period.c.day)
+    )
+    all_time = platform_days(live_from)
+    totals = (await session.execute(select(*sums(all_time)))).one()
+    return {row.day.isoformat(): row for row in by_day}, totals
+
+
 @router.get("/stats/revenue")
 async def get_revenue_over_time(
     _admin: AdminUserDep,
@@ -696,56 +715,22 @@ async def get_revenue_over_time(
 ) -> RevenueTimeSeriesResponse:
     """Get revenue aggregated by day for the specified time range."""
     days, period_label = _get_time_range_days(time_range)
-    start_date = datetime.now(UTC) - timedelta(days=days)
-
-    # Get total revenue (all time)
-    total_query = (
-        select(func.sum(CreditPack.price_cents))
-        .select_from(CreditTransaction)
-        .join(CreditPack, CreditTransaction.credit_pack_id == CreditPack.id)
-        .where(
-            CreditTransaction.transaction_type == "purchase",
-            CreditTransaction.is_refunded == False,  # noqa: E712
-        )
-    )
-    total_result = await session.execute(total_query)
-    total_revenue_cents = total_result.scalar() or 0
-
-    # Get revenue by day for the period
-    date_trunc_expr = func.date_trunc("day", CreditTransaction.created_at)
-    revenue_by_day = await session.execute(
-        select(
-            date_trunc_expr.label("date"),
-            func.sum(CreditPack.price_cents).label("revenue"),
-        )
-        .select_from(CreditTransaction)
-        .join(CreditPack, CreditTransaction.credit_pack_id == CreditPack.id)
-        .where(
-            CreditTransaction.transaction_type == "purchase",
-            CreditTransaction.is_refunded == False,  # noqa: E712
-            CreditTransaction.created_at >= start_date,
-        )
-        .group_by(date_trunc_expr)
-        .order_by(date_trunc_expr)
-    )
-
-    # Convert to dict for easy lookup
-    revenue_dict = {
-        row.date.date().isoformat(): int(row.revenue) for row in revenue_by_day
-    }
+    by_day, totals = await _platform_stats(session, days)
 
     # Generate complete date range with zeros for missing days
-    date_range = _generate_date_range(days)
     data = [
-        TimeSeriesDataPoint(date=date, value=revenue_dict.get(date, 0))
-        for date in date_range
+        TimeSeriesDataPoint(
+            date=date,
+            value=int(by_day[date].revenue_cents) if date in by_day else 0,
+        )
+        for date in _generate_date_range(days)
     ]
 
     period_revenue = sum(d.value for d in data)
 
     return RevenueTimeSeriesResponse(
         data=data,
-        total_revenue_cents=total_revenue_cents,
+        total_revenue_cents=int(totals.revenue_cents),
         period_revenue_cents=int(period_revenue),
         period_label=period_label,
     )
@@ -759,39 +744,20 @@ async def get_signups_over_time(
 ) -> SignupsTimeSeriesResponse:
     """Get user signups aggregated by day for the specified time range."""
     days, period_label = _get_time_range_days(time_range)
-    start_date = datetime.now(UTC) - timedelta(days=days)
-
-    # Get total users (all time)
-    total_result = await session.execute(select(func.count(User.id)))
-    total_users = total_result.scalar() or 0
+    by_day, totals = await _platform_stats(session, days)
 
-    # Get signups by day
-    date_trunc_expr = func.date_trunc("day", User.created_at)
-    signups_by_day = await session.execute(
-        select(
-            date_trunc_expr.label("date"),
-            func.count(User.id).label("count"),
-        )
-        .where(User.created_at >= start_date)
-        .group_by(date_trunc_expr)
-        .order_by(date_trunc_expr)
-    )
-
-    # Convert to dict
-    signups_dict = {row.date.date().isoformat(): row.count for row in signups_by_day}
-
-    # Generate complete date range
-    date_range = _generate_date_range(days)
     data = [
-        TimeSeriesDataPoint(date=date, value=signups_dict.get(date, 0))
-        for date in date_range
+        TimeSeriesDataPoint(
+            date=date, value=int(by_day[date].signups) if date in by_day else 0
+        )
+        for date in _generate_date_range(days)
     ]
 
     period_signups = sum(int(d.value) for d in data)
 
     return SignupsTimeSeriesResponse(
         data=data,
-        total_users=total_users,
+        total_users=int(totals.signups),
         period_signups=period_signups,
         period_label=period_label,
     )
@@ -805,69 +771,15 @@ async def get_credit_activity(
 ) -> CreditActivityResponse:
     """Get credit purchases vs usage over time."""
     days, period_label = _get_time_range_days(time_range)
-    start_date = datetime.now(UTC) - timedelta(days=days)
+    by_day, totals = await _platform_stats(session, days)
 
-    # Get all-time totals
-    purchased_result = await session.execute(
-        select(func.sum(CreditTransaction.amount)).where(
-            CreditTransaction.transaction_type == "purchase",
-            CreditTransaction.is_refunded == False,  # noqa: E712
-        )
-    )
-    total_purchased = purchased_result.scalar() or 0
-
-    used_result = await session.execute(
-        select(func.sum(CreditTransaction.amount)).where(
-            CreditTransaction.transaction_type == "usage"
-        )
-    )
-    total_used = abs(used_result.scalar() or 0)
-
-    # Get purchases by day
-    date_trunc_expr = func.date_trunc("day", CreditTransaction.created_at)
-    purchases_by_day = await session.execute(
-        select(
-            date_trunc_expr.label("date"),
-            func.sum(CreditTransaction.amount).label("amount"),
-        )
-        .where(
-            CreditTransaction.transaction_type == "purchase",
-            CreditTransaction.is_refunded == False,  # noqa: E712
-            CreditTransaction.created_at >= start_date,
-        )
-        .group_by(date_trunc_expr)
-        .order_by(date_trunc_expr)
-    )
-    purchases_dict = {
-        row.date.date().isoformat(): int(row.amount) for row in purchases_by_day
-    }
-
-    # Get usage by day
-    usage_by_day = await session.execute(
-        select(
-            date_trunc_expr.label("date"),
-            func.sum(CreditTransaction.amount).label("amount"),
-        )
-        .where(
-            CreditTransaction.transaction_type == "usage",
-            CreditTransaction.created_at >= start_date,
-        )
-        .group_by(date_trunc_expr)
-        .order_by(date_trunc_expr)
-    )
-    usage_dict = {
-        row.date.date().isoformat(): abs(int(row.amount)) for row in usage_by_day
-    }
-
-    # Generate complete date range
-    date_range = _generate_date_range(days)
     data = [
         CreditActivityDataPoint(
             date=date,
-            purchases=purchases_dict.get(date, 0),
-            usage=usage_dict.get(date, 0),
+            purchases=int(by_day[date].credits_purchased) if date in by_day else 0,
+            usage=int(by_day[date].credits_used) if date in by_day else 0,
         )
-        for date in date_range
+        for date in _generate_date_range(days)
     ]
 
     period_purchased = sum(d.purchases for d in data)
@@ -875,8 +787,8 @@ async def get_credit_activity(
 
     return CreditActivityResponse(
         data=data,
-        total_purchased=total_purchased,
-        total_used=total_used,
+        total_purchased=int(totals.credits_purchased),
+        total_used=int(totals.credits_used),
         period_purchased=period_purchased,
         period_used=period_used,
         period_label=period_label,
@@ -889,36 +801,33 @@ async def get_pack_breakdown(
     session: AsyncSessionDep,
     time_range: str = Query("7d", pattern="^(7d|30d|90d)$"),
 ) -> PackBreakdownResponse:
-    """Get breakdown of credit pack sales."""
+    """Get breakdown of credit pack sales over the past N UTC days."""
     days, period_label = _get_time_range_days(time_range)
-    start_date = datetime.now(UTC) - timedelta(days=days)
+    today = datetime.now(UTC).date()
+    live_from = await rollups_live_from(session, today)
+    sales = pack_sales(live_from, since=today - timedelta(days=days - 1))
 
     # Get pack sales in the period
-    pack_sales = await session.execute(
+    total_revenue_expr = func.sum(sales.c.revenue_cents)
+    pack_sales_result = await session.execute(
         select(
             CreditPack.id,
             CreditPack.name,
             CreditPack.credits,
             CreditPack.price_cents,
-            func.count(CreditTransaction.id).label("purchase_count"),
-            func.sum(CreditPack.price_cents).label("total_revenue"),
-        )
-        .select_from(CreditTransaction)
-        .join(CreditPack, CreditTransaction.credit_pack_id == CreditPack.id)
-        .where(
-            CreditTransaction.transaction_type == "purchase",
-            CreditTransaction.is_refunded == False,  # noqa: E712
-            CreditTransaction.created_at >= start_date,
+            func.sum(sales.c.purchases).label("purchase_count"),
+            total_revenue_expr.label("total_revenue"),
         )
+        .join(CreditPack, sales.c.credit_pack_id == CreditPack.id)
         .group_by(
             CreditPack.id, CreditPack.name, CreditPack.credits, CreditPack.price_cents
         )
-        .order_by(func.sum(CreditPack.price_cents).desc())
+        .order_by(total_revenue_expr.desc())
     )
 
-    rows = pack_sales.all()
-    total_purchases = sum(row.purchase_count for row in rows)
-    total_revenue = sum(row.total_revenue or 0 for row in rows)
+    rows = pack_sales_result.all()
+    total_purchases = sum(int(row.purchase_count) for row in rows)
+    total_revenue = sum(int(row.total_revenue or 0) for row in rows)
 
     packs = [
         PackBreakdownItem(
@@ -926,7 +835,7 @@ async def get_pack_breakdown(
             pack_name=row.name,
             credits=row.credits,
             price_cents=row.price_cents,
-            purchase_count=row.purchase_count,
+            purchase_count=int(row.purchase_count),
             total_revenue_cents=int(row.total_revenue or 0),
             percentage=round((row.total_revenue or 0) / total_revenue * 100, 1)
             if total_revenue > 0
@@ -1071,25 +980,33 @@ async def get_activity_feed(
 # AI Usage Analytics
 # ============================================================================
 
+_usage_summary_adapter = TypeAdapter(AIUsageSummaryResponse)
+_usage_by_user_adapter = TypeAdapter(list[AIUsageByUserResponse])
+_usage_history_adapter = TypeAdapter(PaginatedAIUsageLogsResponse)
+_daily_usage_adapter = TypeAdapter(list[DailyUsageResponse])
+
 
-@router.get("/ai-usage/summary")
+@router.get("/ai-usage/summary", response_model=AIUsageSummaryResponse)
 async def get_ai_usage_summary(
     _admin: AdminUserDep,
     session: AsyncSessionDep,
     ai_usage_service: Annotated[AIUsageService, Depends(get_ai_usage_service)],
     start_date: datetime | None = Query(None, description="Start date filter"),
     end_date: datetime | None = Query(None, description="End date filter"),
-) -> AIUsageSummaryResponse:
+) -> Response:
     """Get AI token usage summary with breakdowns by operation and model."""
+    today = datetime.now(UTC).date()
+    live_from = ai_usage_live_from(await rollups_live_from(session, today), today)
     summary = await ai_usage_service.get_usage_summary(
         session=session,
         start_date=start_date,
         end_date=end_date,
+        live_from=live_from,
     )
-    return AIUsageSummaryResponse(**summary)
+    return json_response(_usage_summary_adapter, AIUsageSummaryResponse(**summary))
 
 
-@router.get("/ai-usage/by-user")
+@router.get("/ai-usage/by-user", response_model=list[AIUsageByUserResponse])
 async def get_ai_usage_by_user(
     _admin: AdminUserDep,
     session: AsyncSessionDep,
@@ -1097,18 +1014,23 @@ async def get_ai_usage_by_user(
     start_date: datetime | None = Query(None, description="Start date filter"),
     end_date: datetime | None = Query(None, description="End date filter"),
     limit: int = Query(50, ge=1, le=100, description="Max users to return"),
-) -> list[AIUsageByUserResponse]:
+) -> Response:
     """Get AI usage aggregated by user, ordered by total tokens."""
+    today = datetime.now(UTC).date()
+    live_from = ai_usage_live_from(await rollups_live_from(session, today), today)
     users = await ai_usage_service.get_usage_by_user(
         session=session,
         start_date=start_date,
         end_date=end_date,
         limit=limit,
+        live_from=live_from,
+    )
+    return json_response(
+        _usage_by_user_adapter, [AIUsageByUserResponse(**user) for user in users]
     )
-    return [AIUsageByUserResponse(**user) for user in users]
 
 
-@router.get("/ai-usage/history")
+@router.get("/ai-usage/history", response_model=PaginatedAIUsageLogsResponse)
 async def get_ai_usage_history(
     _admin: AdminUserDep,
     session: AsyncSessionDep,
@@ -1117,7 +1039,7 @@ async def get_ai_usage_history(
     limit: int = Query(50, ge=1, le=100),
     operation_type: str | None = Query(None, description="Filter by operation type"),
     user_id: UUID | None = Query(None, description="Filter by user ID"),
-) -> PaginatedAIUsageLogsResponse:
+) -> Response:
     """Get paginated AI usage logs with user information."""
     logs, total = await ai_usage_service.get_usage_history(
         session=session,
@@ -1127,19 +1049,27 @@ async def get_ai_usage_history(
         user_id=user_id,
     )
     items = [AIUsageLogResponse(**log) for log in logs]
-    return PaginatedAIUsageLogsResponse.create(items, total, page, limit)
+    return json_response(
+        _usage_history_adapter,
+        PaginatedAIUsageLogsResponse.create(items, total, page, limit),
+    )
 
 
-@router.get("/ai-usage/daily")
+@router.get("/ai-usage/daily", response_model=list[DailyUsageResponse])
 async def get_ai_usage_daily(
     _admin: AdminUserDep,
     session: AsyncSessionDep,
     ai_usage_service: Annotated[AIUsageService, Depends(get_ai_usage_service)],
     days: int = Query(30, ge=1, le=365, description="Number of days to include"),
-) -> list[DailyUsageResponse]:
+) -> Response:
     """Get daily AI usage for charts."""
+    today = datetime.now(UTC).date()
+    live_from = ai_usage_live_from(await rollups_live_from(session, today), today)
     daily = await ai_usage_service.get_daily_usage(
         session=session,
         days=days,
+        live_from=live_from,
+    )
+    return json_response(
+        _daily_usage_adapter, [DailyUsageResponse(**day) for day in daily]
     )
-    return [DailyUsageResponse(**day) for day in daily]
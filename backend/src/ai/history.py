@@ -0,0 +1,119 @@
+"""
+Token-budgeted conversation history for the AI assistant.
+
+Builds the history window sent to OpenAI on each chat turn: the most recent
+turns are kept verbatim, older turns have their tool payloads truncated, and
+turns that no longer fit the token budget are returned separately so they can
+be folded into the session's rolling summary.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+# Rough token estimate for English/JSON text. Avoids a tokenizer dependency;
+# budgets are conservative enough that the approximation is safe.
+CHARS_PER_TOKEN = 4
+
+# Per-message overhead for role and formatting tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+TRUNCATION_MARKER = "...[truncated]"
+
+
+def estimate_tokens(message: dict[str, Any]) -> int:
+    """Estimate the prompt tokens used by a single OpenAI chat message."""
+    chars = len(message.get("content") or "")
+    if message.get("tool_calls"):
+        chars += len(json.dumps(message["tool_calls"]))
+    return MESSAGE_OVERHEAD_TOKENS + chars // CHARS_PER_TOKEN
+
+
+def split_into_turns(messages: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """Group messages into turns, each starting at a user message.
+
+    Keeping turns intact guarantees every tool message stays paired with the
+    assistant message that requested it.
+    """
+    turns: list[list[dict[str, Any]]] = []
+    for message in messages:
+        if message["role"] == "user" or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def compact_message(message: dict[str, Any], max_tool_chars: int) -> dict[str, Any]:
+    """Truncate an old tool result so it no longer dominates the prompt."""
+    content = message.get("content") or ""
+    if message["role"] != "tool" or len(content) <= max_tool_chars:
+        return message
+    return {**message, "content": content[:max_tool_chars] + TRUNCATION_MARKER}
+
+
+@dataclass
+class HistoryWindow:
+    """History to send to the model plus the messages that overflowed it."""
+
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    overflow: list[dict[str, Any]] = field(default_factory=list)
+    estimated_tokens: int = 0
+
+
+def build_history_window(
+    messages: list[dict[str, Any]],
+    *,
+    token_budget: int,
+    recent_turns: int,
+    max_tool_chars: int,
+) -> HistoryWindow:
+    """Fit conversation history into a token budget.
+
+    The last ``recent_turns`` turns are always kept verbatim. Older turns are
+    added newest-first with truncated tool payloads while they fit the budget.
+    Everything older than that is returned as ``overflow`` (oldest first) for
+    summarization.
+
+    Args:
+        messages: Unsummarized session messages in OpenAI format, oldest first
+        token_budget: Approximate token budget for the history
+        recent_turns: Number of most recent turns kept verbatim
+        max_tool_chars: Maximum tool result length in older turns
+
+    Returns:
+        HistoryWindow with the messages to send and the overflow messages
+    """
+    turns = split_into_turns(messages)
+    split_at = max(len(turns) - recent_turns, 0)
+    recent = [message for turn in turns[split_at:] for message in turn]
+    used = sum(estimate_tokens(message) for message in recent)
+
+    kept: list[list[dict[str, Any]]] = []
+    first_kept = split_at
+    for index in range(split_at - 1, -1, -1):
+        compacted = [compact_message(m, max_tool_chars) for m in turns[index]]
+        cost = sum(estimate_tokens(message) for message in compacted)
+        if used + cost > token_budget:
+            break
+        kept.append(compacted)
+        used += cost
+        first_kept = index
+
+    kept.reverse()
+    return HistoryWindow(
+        messages=[message for turn in kept for message in turn] + recent,
+        overflow=[message for turn in turns[:first_kept] for message in turn],
+        estimated_tokens=used,
+    )
+
+
+def format_transcript(messages: list[dict[str, Any]], max_tool_chars: int = 500) -> str:
+    """Render messages as a plain-text transcript for the summarizer."""
+    lines = []
+    for message in messages:
+        if message["role"] == "tool":
+            content = compact_message(message, max_tool_chars)["content"]
+            lines.append(f"tool ({message.get('name')}): {content}")
+        elif message.get("content"):
+            lines.append(f"{message['role']}: {message['content']}")
+    return "\n".join(lines)
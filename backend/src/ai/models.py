@@ -1,10 +1,21 @@
 """AI usage tracking models."""
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, String, func
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -12,9 +23,13 @@ from src.database import Base
 
 
 class AIUsageLog(Base):
-    """AI usage log - tracks token usage for all AI operations."""
+    """AI usage log - tracks token usage for all AI operations.
+
+    Partitioned by month on created_at (see src.common.partitions).
+    """
 
     __tablename__ = "ai_usage_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True, server_default=func.gen_random_uuid()
@@ -41,7 +56,10 @@ class AIUsageLog(Base):
         JSONB
     )  # Operation-specific data (image count, context size, etc.)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), index=True
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        index=True,
     )
 
     # Relationships
@@ -51,6 +69,28 @@ class AIUsageLog(Base):
     )
 
 
+class AIUsageDaily(Base):
+    """AI calls, tokens and cost per closed UTC day, user, model and operation.
+
+    Refreshed from ai_usage_logs by src.admin.rollups; today's usage is read
+    from the logs directly.
+    """
+
+    __tablename__ = "ai_usage_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+    operation_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    calls: Mapped[int] = mapped_column(Integer, server_default="0")
+    prompt_tokens: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    completion_tokens: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    total_tokens: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    cost_usd: Mapped[Decimal] = mapped_column(Numeric(14, 6), server_default="0")
+
+
 class AIModelSettings(Base):
     """AI model settings - configurable parameters for each operation type."""
 
@@ -95,6 +135,12 @@ class AIConversationSession(Base):
     is_active: Mapped[bool] = mapped_column(
         Boolean, default=True, server_default="true"
     )
+    summary: Mapped[str | None] = mapped_column(
+        Text
+    )  # Rolling summary of messages no longer sent as history
+    summarized_message_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )  # Number of oldest messages folded into summary
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -107,7 +153,7 @@ class AIConversationSession(Base):
     messages: Mapped[list["AIConversationMessage"]] = relationship(
         back_populates="session",
         cascade="all, delete-orphan",
-        order_by="AIConversationMessage.created_at",
+        order_by="(AIConversationMessage.created_at, AIConversationMessage.id)",
     )
 
 
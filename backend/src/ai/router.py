@@ -2,9 +2,8 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.ai.history import build_history_window
 from src.ai.schemas import (
     AssistantQueryRequest,
     AssistantQueryResponse,
@@ -21,13 +20,15 @@ from src.ai.schemas import (
 )
 from src.ai.service import AIClassificationService, get_ai_service
 from src.ai.session_repository import AISessionRepository
+from src.ai.tool_cache import get_tool_result_cache
 from src.ai.tool_executor import ToolExecutor
 from src.ai.usage_service import AIUsageService, get_ai_usage_service
 from src.auth.dependencies import CurrentUserIdDep
 from src.billing.pricing_service import CreditPricingService, get_pricing_service
 from src.billing.router import CreditServiceDep
 from src.common.rate_limiter import RATE_LIMIT_AI, limiter
-from src.database import AsyncSessionDep
+from src.config import Settings, get_settings
+from src.database import AsyncSessionDep, get_session_factory, set_tenant_context
 from src.items.repository import ItemRepository
 
 router = APIRouter()
@@ -36,20 +37,6 @@ router = APIRouter()
 MAX_ITEMS_IN_CONTEXT = 100
 
 
-async def _set_rls_context(session: AsyncSession, user_id: UUID) -> None:
-    """Set the PostgreSQL session variable for Row Level Security.
-
-    This enables RLS policies on ai_conversation_sessions and ai_conversation_messages
-    tables to filter data by user_id.
-
-    Note: We use string formatting here because PostgreSQL's SET command doesn't
-    support parameterized queries with asyncpg. This is safe because user_id is
-    a validated UUID type.
-    """
-    # Use literal string since SET doesn't support parameterized queries in asyncpg
-    await session.execute(text(f"SET LOCAL app.current_user_id = '{user_id}'"))
-
-
 async def _build_inventory_context(
     session: AsyncSessionDep,
     user_id: CurrentUserIdDep,
@@ -210,7 +197,7 @@ async def create_session(
 
     Sessions store conversation history for persistent chat with the AI assistant.
     """
-    await _set_rls_context(session, user_id)
+    await set_tenant_context(session, user_id)
     repo = AISessionRepository(session, user_id)
     title = data.title or "New Conversation"
     session_obj = await repo.create_session(title)
@@ -237,7 +224,7 @@ async def list_sessions(
 
     Returns sessions ordered by most recently updated first.
     """
-    await _set_rls_context(session, user_id)
+    await set_tenant_context(session, user_id)
     repo = AISessionRepository(session, user_id)
     offset = (page - 1) * limit
 
@@ -276,7 +263,7 @@ async def get_session(
     user_id: CurrentUserIdDep,
 ) -> SessionDetailResponse:
     """Get a session with its full message history."""
-    await _set_rls_context(session, user_id)
+    await set_tenant_context(session, user_id)
     repo = AISessionRepository(session, user_id)
     session_obj = await repo.get_session(session_id)
 
@@ -318,7 +305,7 @@ async def update_session(
     user_id: CurrentUserIdDep,
 ) -> SessionResponse:
     """Update a session's title."""
-    await _set_rls_context(session, user_id)
+    await set_tenant_context(session, user_id)
     repo = AISessionRepository(session, user_id)
     session_obj = await repo.update_session_title(session_id, data.title)
 
@@ -351,7 +338,7 @@ async def delete_session(
 
     By default, sessions are archived (soft delete). Set permanent=true to permanently delete.
     """
-    await _set_rls_context(session, user_id)
+    await set_tenant_context(session, user_id)
     repo = AISessionRepository(session, user_id)
 
     if permanent:
@@ -365,6 +352,8 @@ async def delete_session(
             detail="Session not found",
         )
 
+    get_tool_result_cache().invalidate_conversation(session_id)
+
 
 # ============================================================================
 # Tool-Enabled Chat Endpoint
@@ -382,6 +371,7 @@ async def chat_with_tools(
     ai_usage_service: Annotated[AIUsageService, Depends(get_ai_usage_service)],
     credit_service: CreditServiceDep,
     pricing_service: Annotated[CreditPricingService, Depends(get_pricing_service)],
+    settings: Annotated[Settings, Depends(get_settings)],
 ) -> SessionQueryResponse:
     """Chat with the AI assistant using tool-calling.
 
@@ -409,9 +399,8 @@ async def chat_with_tools(
         )
 
     # Set RLS context for session and message access
-    await _set_rls_context(session, user_id)
+    await set_tenant_context(session, user_id)
     session_repo = AISessionRepository(session, user_id)
-    tool_executor = ToolExecutor(session, user_id)
 
     # Get or create session
     session_id = data.session_id
@@ -431,9 +420,39 @@ async def chat_with_tools(
         )
         session_id = session_obj.id
 
+    tool_executor = ToolExecutor(
+        session,
+        user_id,
+        session_factory=get_session_factory(),
+        compact_output=True,
+        result_cache=get_tool_result_cache(),
+        conversation_id=session_id,
+    )
+
     try:
-        # Get conversation history for context
-        history = await session_repo.get_messages_for_openai(session_id)
+        # Get unsummarized conversation history and fit it to the token budget
+        history = await session_repo.get_messages_for_openai(
+            session_id, skip=session_obj.summarized_message_count or 0
+        )
+        window = build_history_window(
+            history,
+            token_budget=settings.assistant_history_token_budget,
+            recent_turns=settings.assistant_history_recent_turns,
+            max_tool_chars=settings.assistant_history_tool_result_chars,
+        )
+
+        # Fold turns that no longer fit into the rolling session summary
+        summary_usage = None
+        if window.overflow:
+            summary, summary_usage = await ai_service.summarize_conversation(
+                session_obj.summary, window.overflow
+            )
+            await session_repo.update_summary(
+                session_obj,
+                summary,
+                (session_obj.summarized_message_count or 0) + len(window.overflow),
+                commit=False,
+            )
 
         # Query AI with tools
         (
@@ -442,10 +461,17 @@ async def chat_with_tools(
             token_usage,
         ) = await ai_service.query_assistant_with_tools(
             user_prompt=data.prompt,
-            conversation_history=history,
+            conversation_history=window.messages,
             tool_executor=tool_executor,
+            conversation_summary=session_obj.summary,
         )
 
+        if summary_usage is not None:
+            token_usage.prompt_tokens += summary_usage.prompt_tokens
+            token_usage.completion_tokens += summary_usage.completion_tokens
+            token_usage.total_tokens += summary_usage.total_tokens
+            token_usage.estimated_cost_usd += summary_usage.estimated_cost_usd
+
         # Persist new messages to session (commit=False for atomicity)
         saved_messages = []
         if new_messages:
@@ -495,6 +521,9 @@ async def chat_with_tools(
                 "tools_used": tools_used,
                 "message_count": len(new_messages),
                 "credits_charged": operation_cost,
+                "tool_calls": tool_executor.stats.calls,
+                "tool_cache_hits": tool_executor.stats.cache_hits,
+                "tool_tokens_saved": tool_executor.stats.tokens_saved,
             },
         )
 
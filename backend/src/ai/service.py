@@ -2,11 +2,12 @@ import base64
 import json
 import logging
 import re
+import time
 from decimal import Decimal
 from typing import Annotated, Any
 
 from fastapi import Depends
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, RateLimitError
 from openai.types.chat import ChatCompletion
 
 from src.ai.prompt_templates import PromptTemplateManager, get_prompt_template_manager
@@ -15,6 +16,11 @@ from src.ai.settings_service import (
     AIModelSettingsService,
     get_ai_model_settings_service,
 )
+from src.common.metrics import (
+    OPENAI_RATE_LIMITED,
+    OPENAI_REQUEST_DURATION,
+    OPENAI_TOKENS,
+)
 from src.config import Settings, get_settings
 from src.images.schemas import ClassificationResult, Specification
 from src.locations.schemas import (
@@ -59,6 +65,35 @@ def calculate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> De
     return (input_cost + output_cost).quantize(Decimal("0.000001"))
 
 
+async def create_chat_completion(
+    client: AsyncOpenAI, operation_type: str, **kwargs: Any
+) -> ChatCompletion:
+    """Call the chat completions API, recording latency, tokens and 429s.
+
+    Args:
+        client: OpenAI client
+        operation_type: Operation the call is made for (metrics label)
+        **kwargs: Arguments for chat.completions.create
+    """
+    start = time.perf_counter()
+    try:
+        response = await client.chat.completions.create(**kwargs)
+    except RateLimitError:
+        OPENAI_RATE_LIMITED.labels(operation_type).inc()
+        raise
+    finally:
+        OPENAI_REQUEST_DURATION.labels(operation_type).observe(
+            time.perf_counter() - start
+        )
+
+    if response.usage is not None:
+        OPENAI_TOKENS.labels(operation_type, "prompt").inc(response.usage.prompt_tokens)
+        OPENAI_TOKENS.labels(operation_type, "completion").inc(
+            response.usage.completion_tokens
+        )
+    return response
+
+
 def extract_token_usage(response: ChatCompletion) -> TokenUsage:
     """Extract token usage information from OpenAI API response."""
     usage = response.usage
@@ -210,6 +245,21 @@ TEMPLATE_ITEM_CLASSIFICATION = "item_classification"
 TEMPLATE_LOCATION_ANALYSIS = "location_analysis"
 TEMPLATE_LOCATION_SUGGESTION = "location_suggestion"
 TEMPLATE_ASSISTANT = "assistant"
+TEMPLATE_CONVERSATION_SUMMARY = "conversation_summary"
+
+# Appended to the assistant system prompt when tools are available. Kept
+# static so the system prompt forms a stable prefix for provider prompt caching.
+ASSISTANT_TOOL_INSTRUCTIONS = """
+
+## Tool Usage
+You have access to tools to query the user's inventory. Use them when you need specific information about items, categories, locations, or stock levels.
+
+**CRITICAL: When referencing items, use the markdown_link field from tool results EXACTLY as provided.** Each item includes a ready-to-use markdown_link like `[Item Name](/items/ITEM_ID)` - copy this verbatim into your response to create clickable links.
+
+Item lists in tool results use a columnar format: `columns` names the fields and each entry in `rows` is one item, with values in the same order. Use the `fields` argument to request description, tags or specifications only when you need them.
+
+If a tool returns no results, tell the user and suggest alternatives.
+"""
 
 
 class AIClassificationService:
@@ -323,7 +373,9 @@ class AIClassificationService:
         )
 
         # Call OpenAI API
-        response = await self.client.chat.completions.create(
+        response = await create_chat_completion(
+            self.client,
+            "image_classification",
             model=operation_settings["model_name"],
             temperature=operation_settings["temperature"],
             messages=[
@@ -528,7 +580,9 @@ class AIClassificationService:
         )
 
         # Call OpenAI API
-        response = await self.client.chat.completions.create(
+        response = await create_chat_completion(
+            self.client,
+            "location_analysis",
             model=operation_settings["model_name"],
             temperature=operation_settings["temperature"],
             messages=[
@@ -695,7 +749,9 @@ class AIClassificationService:
         )
 
         # Call OpenAI API
-        response = await self.client.chat.completions.create(
+        response = await create_chat_completion(
+            self.client,
+            "location_suggestion",
             model=operation_settings["model_name"],
             temperature=operation_settings["temperature"],
             messages=[
@@ -839,7 +895,9 @@ class AIClassificationService:
         )
 
         # Call OpenAI API
-        response = await self.client.chat.completions.create(
+        response = await create_chat_completion(
+            self.client,
+            "assistant_query",
             model=operation_settings["model_name"],
             temperature=operation_settings["temperature"],
             messages=[
@@ -880,12 +938,65 @@ class AIClassificationService:
         )
         return result
 
+    async def summarize_conversation(
+        self,
+        previous_summary: str | None,
+        messages: list[dict[str, Any]],
+    ) -> tuple[str, TokenUsage]:
+        """
+        Fold older conversation messages into the rolling session summary.
+
+        Args:
+            previous_summary: Existing summary of earlier turns, if any
+            messages: Messages (OpenAI format) that no longer fit the history
+
+        Returns:
+            Tuple of (updated_summary, TokenUsage)
+        """
+        from src.ai.history import format_transcript
+
+        logger.info(
+            f"Summarizing conversation: messages={len(messages)}, "
+            f"has_previous_summary={previous_summary is not None}"
+        )
+
+        system_prompt = self._template_manager.get_system_prompt(
+            TEMPLATE_CONVERSATION_SUMMARY
+        )
+        user_message = self._template_manager.get_user_prompt(
+            TEMPLATE_CONVERSATION_SUMMARY,
+            previous_summary=previous_summary or "",
+            transcript=format_transcript(messages),
+        )
+
+        # Summaries run as part of an assistant chat turn
+        operation_settings = await self.model_settings_service.get_operation_settings(
+            "assistant_query"
+        )
+
+        response = await create_chat_completion(
+            self.client,
+            "assistant_query",
+            model=operation_settings["model_name"],
+            temperature=operation_settings["temperature"],
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message},
+            ],
+            max_tokens=operation_settings["max_tokens"],
+        )
+
+        token_usage = extract_token_usage(response)
+        summary = response.choices[0].message.content or previous_summary or ""
+        return summary, token_usage
+
     async def query_assistant_with_tools(
         self,
         user_prompt: str,
         conversation_history: list[dict[str, Any]],
         tool_executor: Any,  # Type hint avoids circular import
         max_tool_calls: int = 5,
+        conversation_summary: str | None = None,
     ) -> tuple[str, list[dict[str, Any]], TokenUsage]:
         """
         Query the AI assistant with tool-calling capability.
@@ -898,9 +1009,11 @@ class AIClassificationService:
             conversation_history: Previous messages in OpenAI format
             tool_executor: ToolExecutor instance for running tools
             max_tool_calls: Maximum tool call iterations to prevent infinite loops
+            conversation_summary: Rolling summary of turns no longer in history
 
         Returns:
-            Tuple of (final_response_text, all_new_messages, total_token_usage)
+            Tuple of (final_response_text, all_new_messages, total_token_usage).
+            all_new_messages starts with the user message.
         """
         from src.ai.tools import INVENTORY_TOOLS
 
@@ -909,26 +1022,27 @@ class AIClassificationService:
             f"history_length={len(conversation_history)}"
         )
 
-        # Get system prompt and enhance with tool usage instructions
-        system_prompt = self._template_manager.get_system_prompt(TEMPLATE_ASSISTANT)
-        system_prompt += """
-
-## Tool Usage
-You have access to tools to query the user's inventory. Use them when you need specific information about items, categories, locations, or stock levels.
-
-**CRITICAL: When referencing items, use the markdown_link field from tool results EXACTLY as provided.** Each item includes a ready-to-use markdown_link like `[Item Name](/items/ITEM_ID)` - copy this verbatim into your response to create clickable links.
-
-If a tool returns no results, tell the user and suggest alternatives.
-"""
+        # Static system prompt first so it is a cacheable prompt prefix;
+        # per-session content (summary, history) follows it
+        system_prompt = (
+            self._template_manager.get_system_prompt(TEMPLATE_ASSISTANT)
+            + ASSISTANT_TOOL_INSTRUCTIONS
+        )
 
-        # Build messages array
-        messages: list[dict[str, Any]] = [
-            {"role": "system", "content": system_prompt},
-            *conversation_history,
-            {"role": "user", "content": user_prompt},
-        ]
+        messages: list[dict[str, Any]] = [{"role": "system", "content": system_prompt}]
+        if conversation_summary:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": "## Summary of Earlier Conversation\n"
+                    + conversation_summary,
+                }
+            )
+        user_message = {"role": "user", "content": user_prompt}
+        messages.extend([*conversation_history, user_message])
 
-        all_new_messages: list[dict[str, Any]] = []
+        # The user message is persisted with the rest of the turn
+        all_new_messages: list[dict[str, Any]] = [user_message]
         total_usage = TokenUsage(
             prompt_tokens=0,
             completion_tokens=0,
@@ -945,7 +1059,9 @@ If a tool returns no results, tell the user and suggest alternatives.
         for iteration in range(max_tool_calls):
             logger.debug(f"Tool call iteration {iteration + 1}/{max_tool_calls}")
 
-            response = await self.client.chat.completions.create(
+            response = await create_chat_completion(
+                self.client,
+                "assistant_query",
                 model=operation_settings["model_name"],
                 temperature=operation_settings["temperature"],
                 messages=messages,
@@ -992,21 +1108,26 @@ If a tool returns no results, tell the user and suggest alternatives.
                 )
                 return assistant_message.content or "", all_new_messages, total_usage
 
-            # Execute each tool call
+            # Execute this turn's tool calls (concurrently where possible)
+            calls: list[tuple[str, dict[str, Any]]] = []
             for tool_call in assistant_message.tool_calls:
-                function_name = tool_call.function.name
                 try:
                     arguments = json.loads(tool_call.function.arguments)
                 except json.JSONDecodeError:
                     arguments = {}
+                calls.append((tool_call.function.name, arguments))
 
-                logger.info(f"Executing tool: {function_name}")
-                result = await tool_executor.execute(function_name, arguments)
+            logger.info(f"Executing tools: {[name for name, _ in calls]}")
+            results = await tool_executor.execute_batch(calls)
 
+            # Tool messages follow the model's tool_call order
+            for tool_call, result in zip(
+                assistant_message.tool_calls, results, strict=True
+            ):
                 tool_message = {
                     "role": "tool",
                     "tool_call_id": tool_call.id,
-                    "name": function_name,
+                    "name": tool_call.function.name,
                     "content": result,
                 }
                 messages.append(tool_message)
@@ -1018,7 +1139,9 @@ If a tool returns no results, tell the user and suggest alternatives.
             "getting final response"
         )
 
-        response = await self.client.chat.completions.create(
+        response = await create_chat_completion(
+            self.client,
+            "assistant_query",
             model=operation_settings["model_name"],
             temperature=operation_settings["temperature"],
             messages=messages,
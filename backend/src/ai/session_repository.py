@@ -1,6 +1,6 @@
 """Repository for AI conversation session persistence."""
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 from uuid import UUID
 
@@ -281,7 +281,10 @@ class AISessionRepository:
             List of created messages
         """
         created_messages = []
-        for msg in messages:
+        # Explicit, strictly increasing timestamps keep the batch in order:
+        # server-side now() is identical for every row in a transaction
+        base_time = datetime.now(UTC)
+        for index, msg in enumerate(messages):
             message = AIConversationMessage(
                 session_id=session_id,
                 role=msg["role"],
@@ -289,6 +292,7 @@ class AISessionRepository:
                 tool_calls=msg.get("tool_calls"),
                 tool_call_id=msg.get("tool_call_id"),
                 tool_name=msg.get("name"),  # OpenAI uses 'name' for tool name
+                created_at=base_time + timedelta(microseconds=index),
             )
             self.session.add(message)
             created_messages.append(message)
@@ -310,11 +314,14 @@ class AISessionRepository:
 
         return created_messages
 
-    async def get_messages_for_openai(self, session_id: UUID) -> list[dict[str, Any]]:
+    async def get_messages_for_openai(
+        self, session_id: UUID, skip: int = 0
+    ) -> list[dict[str, Any]]:
         """Get messages in OpenAI API format for context.
 
         Args:
             session_id: UUID of the session
+            skip: Number of oldest messages to skip (e.g. already summarized)
 
         Returns:
             List of messages in OpenAI chat format
@@ -322,7 +329,10 @@ class AISessionRepository:
         result = await self.session.execute(
             select(AIConversationMessage)
             .where(AIConversationMessage.session_id == session_id)
-            .order_by(AIConversationMessage.created_at)
+            # id breaks ties of older batches written with one server now(),
+            # so the summarized messages are the same ones on every call
+            .order_by(AIConversationMessage.created_at, AIConversationMessage.id)
+            .offset(skip)
         )
         messages = result.scalars().all()
 
@@ -353,6 +363,33 @@ class AISessionRepository:
 
         return openai_messages
 
+    async def update_summary(
+        self,
+        session_obj: AIConversationSession,
+        summary: str,
+        summarized_message_count: int,
+        *,
+        commit: bool = True,
+    ) -> AIConversationSession:
+        """Store the rolling summary of a session's oldest messages.
+
+        Args:
+            session_obj: The conversation session
+            summary: Updated summary text
+            summarized_message_count: Total number of messages now summarized
+            commit: Whether to commit the transaction (default True)
+
+        Returns:
+            The updated session
+        """
+        session_obj.summary = summary
+        session_obj.summarized_message_count = summarized_message_count
+        if commit:
+            await self.session.commit()
+        else:
+            await self.session.flush()
+        return session_obj
+
     async def get_message_count(self, session_id: UUID) -> int:
         """Get the number of messages in a session.
 
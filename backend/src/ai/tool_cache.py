@@ -0,0 +1,120 @@
+"""
+Per-conversation cache for AI tool results.
+
+The assistant often repeats identical search_items/filter_items calls across
+tool iterations and chat turns. Results are cached per conversation and keyed
+by the tool name, the normalized arguments and the user's inventory version,
+so any inventory change makes earlier entries unreachable.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+# Cached results are short-lived; they only need to span one conversation
+DEFAULT_TTL_SECONDS = 900
+
+# Bound memory use across all conversations in this process
+DEFAULT_MAX_ENTRIES = 2000
+
+
+def normalize_arguments(arguments: dict[str, Any]) -> str:
+    """Normalize tool arguments into a stable cache key component.
+
+    Drops empty values, trims and lowercases strings, and sorts keys so that
+    equivalent calls from the model map to the same entry.
+    """
+
+    def normalize(value: Any) -> Any:
+        if isinstance(value, str):
+            return value.strip().lower()
+        if isinstance(value, list):
+            return sorted((normalize(v) for v in value), key=str)
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items()}
+        return value
+
+    cleaned = {
+        key: normalize(value)
+        for key, value in arguments.items()
+        if value not in (None, "", [], {})
+    }
+    return json.dumps(cleaned, sort_keys=True, default=str)
+
+
+@dataclass
+class ToolExecutionStats:
+    """Per-request tool execution measurements."""
+
+    calls: int = 0
+    cache_hits: int = 0
+    tokens_saved: int = 0  # Estimated prompt tokens saved by compact output
+
+
+class ToolResultCache:
+    """In-memory LRU cache of tool results, scoped per conversation."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+
+    @staticmethod
+    def make_key(
+        conversation_id: UUID,
+        tool_name: str,
+        arguments: dict[str, Any],
+        inventory_version: str,
+    ) -> tuple:
+        """Build the cache key for a tool call."""
+        return (
+            conversation_id,
+            tool_name,
+            normalize_arguments(arguments),
+            inventory_version,
+        )
+
+    def get(self, key: tuple) -> str | None:
+        """Return a cached result, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def set(self, key: tuple, result: str) -> None:
+        """Store a tool result, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_conversation(self, conversation_id: UUID) -> None:
+        """Drop all cached results for a conversation."""
+        for key in [k for k in self._entries if k[0] == conversation_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache
+def get_tool_result_cache() -> ToolResultCache:
+    """Get the process-wide tool result cache."""
+    return ToolResultCache()
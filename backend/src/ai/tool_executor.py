@@ -4,22 +4,42 @@ Tool execution service for AI assistant.
 Handles execution of OpenAI tool calls against the inventory.
 """
 
+import asyncio
 import json
 import logging
 from typing import Any
 from uuid import UUID
 
 from sqlalchemy import Text, or_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.sql.expression import cast
 
-from src.ai.tools import format_item_for_tool
+from src.ai.history import CHARS_PER_TOKEN
+from src.ai.tool_cache import ToolExecutionStats, ToolResultCache
+from src.ai.tools import compact_tool_result, format_item_for_tool
 from src.categories.models import Category
+from src.database import set_session_user, set_tenant_context, use_replica
 from src.items.repository import ItemRepository
 from src.locations.models import Location
 
 logger = logging.getLogger(__name__)
 
+# Tools that only read inventory data and can safely run concurrently,
+# each on its own database session
+READ_ONLY_TOOLS = frozenset(
+    {
+        "search_items",
+        "get_item_details",
+        "filter_items",
+        "find_similar_items",
+        "get_low_stock_items",
+        "get_inventory_summary",
+    }
+)
+
+# Maximum number of tool calls executed concurrently within one model turn
+MAX_CONCURRENT_TOOL_CALLS = 4
+
 
 def _escape_like_pattern(value: str) -> str:
     r"""Escape special characters in a LIKE pattern to prevent SQL injection.
@@ -37,14 +57,137 @@ def _escape_like_pattern(value: str) -> str:
 class ToolExecutor:
     """Executes AI tool calls against the user's inventory."""
 
-    def __init__(self, session: AsyncSession, user_id: UUID):
+    def __init__(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        max_concurrency: int = MAX_CONCURRENT_TOOL_CALLS,
+        *,
+        compact_output: bool = False,
+        result_cache: ToolResultCache | None = None,
+        conversation_id: UUID | None = None,
+        stats: ToolExecutionStats | None = None,
+    ):
+        """Create a tool executor.
+
+        Args:
+            session: Request session used for sequential tool execution
+            user_id: Owner of the inventory being queried
+            session_factory: Optional factory for opening one tenant-scoped
+                session per concurrent tool call. When omitted, all tool
+                calls run sequentially on ``session``.
+            max_concurrency: Maximum concurrent tool calls per batch
+            compact_output: Return item lists in columnar format with only
+                the fields selected by the model
+            result_cache: Optional cache for read-only tool results
+            conversation_id: Conversation the cached results are scoped to
+            stats: Shared execution measurements (created if omitted)
+        """
         self.session = session
         self.user_id = user_id
+        self.session_factory = session_factory
+        self.max_concurrency = max(1, max_concurrency)
+        self.compact_output = compact_output
+        self.result_cache = result_cache
+        self.conversation_id = conversation_id
+        self.stats = stats or ToolExecutionStats()
         self.item_repo = ItemRepository(session, user_id)
+        self._inventory_version: str | None = None
+
+    @property
+    def _cache_enabled(self) -> bool:
+        return self.result_cache is not None and self.conversation_id is not None
+
+    async def _get_inventory_version(self) -> str:
+        """Get the inventory version, computed once per executor."""
+        if self._inventory_version is None:
+            self._inventory_version = await self.item_repo.get_inventory_version()
+        return self._inventory_version
+
+    def _child(self, session: AsyncSession) -> "ToolExecutor":
+        """Create an executor sharing this one's settings on another session."""
+        child = ToolExecutor(
+            session,
+            self.user_id,
+            compact_output=self.compact_output,
+            result_cache=self.result_cache,
+            conversation_id=self.conversation_id,
+            stats=self.stats,
+        )
+        child._inventory_version = self._inventory_version
+        return child
+
+    async def execute_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        """Execute the tool calls from a single model turn.
+
+        Read-only tools run concurrently (bounded by ``max_concurrency``), each
+        on its own session from ``session_factory``, since an AsyncSession
+        cannot be shared between concurrent tasks. Any other tools run
+        sequentially on the request session once the concurrent calls finish.
+
+        Args:
+            calls: List of (tool_name, arguments) pairs in model order
+
+        Returns:
+            JSON result strings in the same order as ``calls``
+        """
+        session_factory = self.session_factory
+        if session_factory is None or len(calls) < 2:
+            return [await self.execute(name, args) for name, args in calls]
+
+        if self._cache_enabled:
+            # Resolve once so concurrent calls share the same cache version
+            await self._get_inventory_version()
+
+        results: list[str | None] = [None] * len(calls)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_isolated(index: int, tool_name: str, args: dict[str, Any]):
+            async with semaphore:
+                results[index] = await self._execute_isolated(
+                    session_factory, tool_name, args
+                )
+
+        await asyncio.gather(
+            *(
+                run_isolated(index, name, args)
+                for index, (name, args) in enumerate(calls)
+                if name in READ_ONLY_TOOLS
+            )
+        )
+
+        for index, (name, args) in enumerate(calls):
+            if results[index] is None:
+                results[index] = await self.execute(name, args)
+
+        return [result for result in results if result is not None]
+
+    async def _execute_isolated(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        tool_name: str,
+        arguments: dict[str, Any],
+    ) -> str:
+        """Execute a tool on a dedicated tenant-scoped session."""
+        try:
+            async with session_factory() as session:
+                # Read-only tools may read from the replica, unless the user
+                # just wrote
+                use_replica(session)
+                set_session_user(session, self.user_id)
+                await set_tenant_context(session, self.user_id)
+                return await self._child(session).execute(tool_name, arguments)
+        except Exception as e:
+            logger.exception(f"Tool session error: {tool_name} - {e}")
+            return json.dumps({"error": str(e)})
 
     async def execute(self, tool_name: str, arguments: dict[str, Any]) -> str:
         """Execute a tool and return the result as a JSON string.
 
+        Read-only results are served from the conversation's result cache when
+        the inventory has not changed since they were produced.
+
         Args:
             tool_name: Name of the tool to execute
             arguments: Tool arguments as parsed from OpenAI function call
@@ -53,28 +196,67 @@ class ToolExecutor:
             JSON string containing the tool result
         """
         logger.info(f"Executing tool: {tool_name} with args: {arguments}")
+        self.stats.calls += 1
 
         try:
-            if tool_name == "search_items":
-                result = await self._search_items(arguments)
-            elif tool_name == "get_item_details":
-                result = await self._get_item_details(arguments)
-            elif tool_name == "filter_items":
-                result = await self._filter_items(arguments)
-            elif tool_name == "find_similar_items":
-                result = await self._find_similar_items(arguments)
-            elif tool_name == "get_low_stock_items":
-                result = await self._get_low_stock_items(arguments)
-            elif tool_name == "get_inventory_summary":
-                result = await self._get_inventory_summary(arguments)
-            else:
-                result = {"error": f"Unknown tool: {tool_name}"}
-
-            return json.dumps(result, default=str)
+            cache_key = None
+            if self._cache_enabled and tool_name in READ_ONLY_TOOLS:
+                cache_key = ToolResultCache.make_key(
+                    self.conversation_id,
+                    tool_name,
+                    arguments,
+                    await self._get_inventory_version(),
+                )
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    self.stats.cache_hits += 1
+                    logger.debug(f"Tool cache hit: {tool_name}")
+                    return cached
+
+            result = await self._run_tool(tool_name, arguments)
+            output = self._serialize(result, arguments.get("fields"))
+
+            if cache_key is not None and "error" not in result:
+                self.result_cache.set(cache_key, output)
+            return output
         except Exception as e:
             logger.exception(f"Tool execution error: {tool_name} - {e}")
             return json.dumps({"error": str(e)})
 
+    async def _run_tool(
+        self, tool_name: str, arguments: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Dispatch a tool call to its handler."""
+        if tool_name == "search_items":
+            return await self._search_items(arguments)
+        if tool_name == "get_item_details":
+            return await self._get_item_details(arguments)
+        if tool_name == "filter_items":
+            return await self._filter_items(arguments)
+        if tool_name == "find_similar_items":
+            return await self._find_similar_items(arguments)
+        if tool_name == "get_low_stock_items":
+            return await self._get_low_stock_items(arguments)
+        if tool_name == "get_inventory_summary":
+            return await self._get_inventory_summary(arguments)
+        return {"error": f"Unknown tool: {tool_name}"}
+
+    def _serialize(self, result: dict[str, Any], fields: list[str] | None) -> str:
+        """Serialize a tool result, compacting item lists if enabled."""
+        verbose = json.dumps(result, default=str)
+        if not self.compact_output:
+            return verbose
+
+        compact = json.dumps(
+            compact_tool_result(result, fields),
+            default=str,
+            separators=(",", ":"),
+        )
+        self.stats.tokens_saved += max(len(verbose) - len(compact), 0) // (
+            CHARS_PER_TOKEN
+        )
+        return compact
+
     async def _search_items(self, args: dict[str, Any]) -> dict[str, Any]:
         """Search items by text query."""
         query = args.get("query", "")
@@ -159,7 +341,9 @@ class ToolExecutor:
             limit=limit,
         )
 
-        filters_applied = {k: v for k, v in args.items() if v and k != "limit"}
+        filters_applied = {
+            k: v for k, v in args.items() if v and k not in ("limit", "fields")
+        }
 
         return {
             "items": [format_item_for_tool(item, include_specs=True) for item in items],
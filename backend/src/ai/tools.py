@@ -7,6 +7,46 @@ Defines available tools and their execution logic.
 import re
 from typing import Any
 
+# Item fields available for compact (columnar) tool output
+COMPACT_ITEM_FIELDS = [
+    "id",
+    "name",
+    "markdown_link",
+    "quantity",
+    "quantity_unit",
+    "description",
+    "category",
+    "location",
+    "tags",
+    "is_low_stock",
+    "min_quantity",
+    "specifications",
+]
+
+# Fields returned in compact output when the model does not select any.
+# markdown_link is always included since responses must link items.
+DEFAULT_COMPACT_FIELDS = [
+    "markdown_link",
+    "quantity",
+    "quantity_unit",
+    "category",
+    "location",
+    "is_low_stock",
+]
+
+# Tool result keys holding lists of formatted items
+ITEM_LIST_KEYS = ("items", "similar_items", "low_stock_items")
+
+_FIELDS_PARAMETER: dict[str, Any] = {
+    "type": "array",
+    "items": {"type": "string", "enum": COMPACT_ITEM_FIELDS},
+    "description": (
+        "Item fields to return (default: markdown_link, quantity, quantity_unit, "
+        "category, location, is_low_stock). Request description, tags or "
+        "specifications only when needed."
+    ),
+}
+
 
 def _escape_markdown_link_text(text: str) -> str:
     """Escape markdown special characters in link text.
@@ -48,6 +88,7 @@ INVENTORY_TOOLS: list[dict[str, Any]] = [
                         "description": "Maximum number of results (default: 10, max: 50)",
                         "default": 10,
                     },
+                    "fields": _FIELDS_PARAMETER,
                 },
                 "required": ["query"],
             },
@@ -109,6 +150,7 @@ INVENTORY_TOOLS: list[dict[str, Any]] = [
                         "description": "Maximum results (default: 20, max: 100)",
                         "default": 20,
                     },
+                    "fields": _FIELDS_PARAMETER,
                 },
             },
         },
@@ -139,6 +181,7 @@ INVENTORY_TOOLS: list[dict[str, Any]] = [
                         "description": "Maximum results (default: 5)",
                         "default": 5,
                     },
+                    "fields": _FIELDS_PARAMETER,
                 },
                 "required": ["item_name"],
             },
@@ -236,3 +279,44 @@ def format_item_for_tool(item: Any, include_specs: bool = False) -> dict[str, An
             result["specifications"] = specs
 
     return result
+
+
+def compact_tool_result(
+    result: dict[str, Any], fields: list[str] | None = None
+) -> dict[str, Any]:
+    """Convert item lists in a tool result to a columnar format.
+
+    Each list of item dicts becomes ``{"columns": [...], "rows": [[...]]}``,
+    so field names are sent once instead of once per item. Only the selected
+    item fields are kept, plus any tool-specific extras (e.g. similarity_score).
+
+    Args:
+        result: Tool result as produced by the ToolExecutor handlers
+        fields: Item fields to keep (defaults to DEFAULT_COMPACT_FIELDS)
+
+    Returns:
+        The tool result with item lists in columnar format
+    """
+    selected = [f for f in fields or [] if f in COMPACT_ITEM_FIELDS]
+    if not selected:
+        selected = list(DEFAULT_COMPACT_FIELDS)
+    elif "markdown_link" not in selected:
+        selected.insert(0, "markdown_link")
+
+    compacted = dict(result)
+    for key in ITEM_LIST_KEYS:
+        rows = result.get(key)
+        if not isinstance(rows, list):
+            continue
+        # Tool-specific extras (not item fields) are always kept
+        extras = [
+            column
+            for column in dict.fromkeys(k for row in rows for k in row)
+            if column not in COMPACT_ITEM_FIELDS
+        ]
+        columns = selected + extras
+        compacted[key] = {
+            "columns": columns,
+            "rows": [[row.get(column) for column in columns] for row in rows],
+        }
+    return compacted
@@ -1,18 +1,30 @@
 """AI usage tracking service for logging and analyzing token usage."""
 
-from datetime import datetime
+from datetime import UTC, date, datetime, time, timedelta
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Date, cast, func, or_, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Subquery
 
-from src.ai.models import AIUsageLog
+from src.ai.models import AIUsageDaily, AIUsageLog
 from src.ai.schemas import TokenUsage
 from src.users.models import User
 
 
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC and convert aware ones to UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=UTC)
+
+
 class AIUsageService:
     """Service for logging and analyzing AI token usage."""
 
@@ -55,11 +67,84 @@ class AIUsageService:
         await session.flush()
         return usage_log
 
+    @staticmethod
+    def _usage_rows(
+        start_date: datetime | None,
+        end_date: datetime | None,
+        live_from: date | None,
+    ) -> Subquery:
+        """Usage per UTC day, user, model and operation within a date range.
+
+        Without live_from every row is aggregated from ai_usage_logs. With it,
+        whole days before live_from come from the ai_usage_daily rollup, and
+        only the partial days at either end of the range and the days from
+        live_from on are read from the logs.
+
+        Columns: day, user_id, model, operation_type, calls, prompt_tokens,
+        completion_tokens, total_tokens, cost_usd.
+        """
+        log_day = cast(func.timezone("UTC", AIUsageLog.created_at), Date)
+        live = select(
+            log_day.label("day"),
+            AIUsageLog.user_id,
+            AIUsageLog.model,
+            AIUsageLog.operation_type,
+            func.count().label("calls"),
+            func.sum(AIUsageLog.prompt_tokens).label("prompt_tokens"),
+            func.sum(AIUsageLog.completion_tokens).label("completion_tokens"),
+            func.sum(AIUsageLog.total_tokens).label("total_tokens"),
+            func.sum(AIUsageLog.estimated_cost_usd).label("cost_usd"),
+        ).group_by(
+            log_day, AIUsageLog.user_id, AIUsageLog.model, AIUsageLog.operation_type
+        )
+        if start_date:
+            start_date = _as_utc(start_date)
+            live = live.where(AIUsageLog.created_at >= start_date)
+        if end_date:
+            end_date = _as_utc(end_date)
+            live = live.where(AIUsageLog.created_at <= end_date)
+        if live_from is None:
+            return live.subquery("usage_rows")
+
+        # Whole days inside the range that the rollup covers
+        first_day = None
+        if start_date:
+            first_day = start_date.date()
+            if start_date > _day_start(first_day):
+                first_day += timedelta(days=1)
+        last_day = live_from - timedelta(days=1)
+        if end_date:
+            last_day = min(last_day, end_date.date() - timedelta(days=1))
+        if first_day and first_day > last_day:
+            return live.subquery("usage_rows")
+
+        rolled = select(
+            AIUsageDaily.day,
+            AIUsageDaily.user_id,
+            AIUsageDaily.model,
+            AIUsageDaily.operation_type,
+            AIUsageDaily.calls,
+            AIUsageDaily.prompt_tokens,
+            AIUsageDaily.completion_tokens,
+            AIUsageDaily.total_tokens,
+            AIUsageDaily.cost_usd,
+        ).where(AIUsageDaily.day <= last_day)
+        outside_rollup = AIUsageLog.created_at >= _day_start(
+            last_day + timedelta(days=1)
+        )
+        if first_day:
+            rolled = rolled.where(AIUsageDaily.day >= first_day)
+            outside_rollup = or_(
+                outside_rollup, AIUsageLog.created_at < _day_start(first_day)
+            )
+        return union_all(rolled, live.where(outside_rollup)).subquery("usage_rows")
+
     async def get_usage_summary(
         self,
         session: AsyncSession,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        live_from: date | None = None,
     ) -> dict:
         """
         Get aggregated usage summary for all users (admin view).
@@ -68,86 +153,70 @@ class AIUsageService:
             session: Database session
             start_date: Optional start date filter
             end_date: Optional end date filter
+            live_from: First day not covered by the current ai_usage_daily
+                rollup (see src.admin.rollups); if omitted, the logs are
+                aggregated directly
 
         Returns:
             Dictionary with usage summary including totals and breakdowns
         """
-        # Build base query
-        query = select(
-            func.count(AIUsageLog.id).label("total_calls"),
-            func.sum(AIUsageLog.prompt_tokens).label("total_prompt_tokens"),
-            func.sum(AIUsageLog.completion_tokens).label("total_completion_tokens"),
-            func.sum(AIUsageLog.total_tokens).label("total_tokens"),
-            func.sum(AIUsageLog.estimated_cost_usd).label("total_cost_usd"),
+        rows = self._usage_rows(start_date, end_date, live_from)
+        result = await session.execute(
+            select(
+                rows.c.operation_type,
+                rows.c.model,
+                func.sum(rows.c.calls).label("calls"),
+                func.sum(rows.c.prompt_tokens).label("prompt_tokens"),
+                func.sum(rows.c.completion_tokens).label("completion_tokens"),
+                func.sum(rows.c.total_tokens).label("tokens"),
+                func.sum(rows.c.cost_usd).label("cost_usd"),
+            ).group_by(rows.c.operation_type, rows.c.model)
         )
 
-        if start_date:
-            query = query.where(AIUsageLog.created_at >= start_date)
-        if end_date:
-            query = query.where(AIUsageLog.created_at <= end_date)
-
-        result = await session.execute(query)
-        row = result.one()
-
-        # Get breakdown by operation type
-        operation_query = select(
-            AIUsageLog.operation_type,
-            func.count(AIUsageLog.id).label("calls"),
-            func.sum(AIUsageLog.total_tokens).label("tokens"),
-            func.sum(AIUsageLog.estimated_cost_usd).label("cost_usd"),
-        ).group_by(AIUsageLog.operation_type)
-
-        if start_date:
-            operation_query = operation_query.where(AIUsageLog.created_at >= start_date)
-        if end_date:
-            operation_query = operation_query.where(AIUsageLog.created_at <= end_date)
-
-        op_result = await session.execute(operation_query)
-        operations = [
-            {
-                "operation_type": r.operation_type,
-                "total_calls": r.calls,
-                "total_tokens": r.tokens or 0,
-                "total_cost_usd": float(r.cost_usd or 0),
-            }
-            for r in op_result.all()
-        ]
-
-        # Get breakdown by model
-        model_query = select(
-            AIUsageLog.model,
-            func.count(AIUsageLog.id).label("calls"),
-            func.sum(AIUsageLog.total_tokens).label("tokens"),
-            func.sum(AIUsageLog.estimated_cost_usd).label("cost_usd"),
-        ).group_by(AIUsageLog.model)
-
-        if start_date:
-            model_query = model_query.where(AIUsageLog.created_at >= start_date)
-        if end_date:
-            model_query = model_query.where(AIUsageLog.created_at <= end_date)
-
-        model_result = await session.execute(model_query)
-        models = [
-            {
-                "model": r.model,
-                "total_calls": r.calls,
-                "total_tokens": r.tokens or 0,
-                "total_cost_usd": float(r.cost_usd or 0),
-            }
-            for r in model_result.all()
-        ]
-
-        total_tokens = row.total_tokens or 0
-        total_cost = float(row.total_cost_usd or Decimal("0"))
+        # Totals and both breakdowns come from the same (operation, model) groups
+        totals = dict.fromkeys(
+            ["calls", "prompt_tokens", "completion_tokens", "tokens"], 0
+        )
+        total_cost = Decimal("0")
+        operations: dict[str, dict] = {}
+        models: dict[str, dict] = {}
+        for r in result.all():
+            for key in totals:
+                totals[key] += int(getattr(r, key) or 0)
+            total_cost += r.cost_usd or Decimal("0")
+            for breakdown, key, value in [
+                (operations, "operation_type", r.operation_type),
+                (models, "model", r.model),
+            ]:
+                entry = breakdown.setdefault(
+                    value,
+                    {
+                        key: value,
+                        "total_calls": 0,
+                        "total_tokens": 0,
+                        "total_cost_usd": Decimal("0"),
+                    },
+                )
+                entry["total_calls"] += int(r.calls)
+                entry["total_tokens"] += int(r.tokens or 0)
+                entry["total_cost_usd"] += r.cost_usd or Decimal("0")
+
+        def finish(entries: dict[str, dict]) -> list[dict]:
+            return [
+                {**entry, "total_cost_usd": float(entry["total_cost_usd"])}
+                for entry in sorted(
+                    entries.values(), key=lambda e: e["total_tokens"], reverse=True
+                )
+            ]
 
         return {
-            "total_calls": row.total_calls or 0,
-            "total_prompt_tokens": row.total_prompt_tokens or 0,
-            "total_completion_tokens": row.total_completion_tokens or 0,
-            "total_tokens": total_tokens,
-            "total_cost_usd": total_cost,
-            "by_operation": operations,
-            "by_model": models,
+            "total_calls": totals["calls"],
+            "total_prompt_tokens": totals["prompt_tokens"],
+            "total_completion_tokens": totals["completion_tokens"],
+            "total_tokens": totals["tokens"],
+            "total_cost_usd": float(total_cost),
+            "by_operation": finish(operations),
+            "by_model": finish(models),
         }
 
     async def get_usage_by_user(
@@ -156,6 +225,7 @@ class AIUsageService:
         start_date: datetime | None = None,
         end_date: datetime | None = None,
         limit: int = 50,
+        live_from: date | None = None,
     ) -> list[dict]:
         """
         Get usage aggregated by user (admin view).
@@ -165,38 +235,37 @@ class AIUsageService:
             start_date: Optional start date filter
             end_date: Optional end date filter
             limit: Maximum number of users to return
+            live_from: First day not covered by the current ai_usage_daily
+                rollup; if omitted, the logs are aggregated directly
 
         Returns:
             List of user usage summaries ordered by total tokens descending
         """
+        rows = self._usage_rows(start_date, end_date, live_from)
+        total_tokens = func.sum(rows.c.total_tokens)
         query = (
             select(
-                AIUsageLog.user_id,
+                rows.c.user_id,
                 User.email.label("user_email"),
                 User.name.label("user_name"),
-                func.count(AIUsageLog.id).label("total_calls"),
-                func.sum(AIUsageLog.total_tokens).label("total_tokens"),
-                func.sum(AIUsageLog.estimated_cost_usd).label("total_cost_usd"),
+                func.sum(rows.c.calls).label("total_calls"),
+                total_tokens.label("total_tokens"),
+                func.sum(rows.c.cost_usd).label("total_cost_usd"),
             )
-            .join(User, AIUsageLog.user_id == User.id)
-            .group_by(AIUsageLog.user_id, User.email, User.name)
-            .order_by(func.sum(AIUsageLog.total_tokens).desc())
+            .join(User, rows.c.user_id == User.id)
+            .group_by(rows.c.user_id, User.email, User.name)
+            .order_by(total_tokens.desc())
             .limit(limit)
         )
 
-        if start_date:
-            query = query.where(AIUsageLog.created_at >= start_date)
-        if end_date:
-            query = query.where(AIUsageLog.created_at <= end_date)
-
         result = await session.execute(query)
         return [
             {
                 "user_id": str(r.user_id),
                 "user_email": r.user_email,
                 "user_name": r.user_name,
-                "total_calls": r.total_calls,
-                "total_tokens": r.total_tokens or 0,
+                "total_calls": int(r.total_calls),
+                "total_tokens": int(r.total_tokens or 0),
                 "total_cost_usd": float(r.total_cost_usd or Decimal("0")),
             }
             for r in result.all()
@@ -274,6 +343,7 @@ class AIUsageService:
         self,
         session: AsyncSession,
         days: int = 30,
+        live_from: date | None = None,
     ) -> list[dict]:
         """
         Get daily usage aggregation for charts.
@@ -281,19 +351,22 @@ class AIUsageService:
         Args:
             session: Database session
             days: Number of days to include
+            live_from: First day not covered by the current ai_usage_daily
+                rollup; if omitted, the logs are aggregated directly
 
         Returns:
             List of daily usage summaries
         """
+        rows = self._usage_rows(None, None, live_from)
         query = (
             select(
-                func.date(AIUsageLog.created_at).label("date"),
-                func.count(AIUsageLog.id).label("calls"),
-                func.sum(AIUsageLog.total_tokens).label("tokens"),
-                func.sum(AIUsageLog.estimated_cost_usd).label("cost_usd"),
+                rows.c.day.label("date"),
+                func.sum(rows.c.calls).label("calls"),
+                func.sum(rows.c.total_tokens).label("tokens"),
+                func.sum(rows.c.cost_usd).label("cost_usd"),
             )
-            .group_by(func.date(AIUsageLog.created_at))
-            .order_by(func.date(AIUsageLog.created_at).desc())
+            .group_by(rows.c.day)
+            .order_by(rows.c.day.desc())
             .limit(days)
         )
 
@@ -301,8 +374,8 @@ class AIUsageService:
         return [
             {
                 "date": str(r.date),
-                "total_calls": r.calls,
-                "total_tokens": r.tokens or 0,
+                "total_calls": int(r.calls),
+                "total_tokens": int(r.tokens or 0),
                 "total_cost_usd": float(r.cost_usd or Decimal("0")),
             }
             for r in result.all()
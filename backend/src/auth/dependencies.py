@@ -8,7 +8,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from src.apikeys.models import ApiKey
 from src.apikeys.service import ApiKeyService
 from src.auth.service import AuthService, get_auth_service
-from src.database import AsyncSessionDep
+from src.database import AsyncSessionDep, set_session_user
 from src.users.models import User
 from src.users.repository import UserRepository
 
@@ -28,13 +28,15 @@ async def get_current_user_id(
     Get the current user ID from the JWT token or API key.
 
     Supports both Bearer token and X-API-Key header authentication.
-    Raises HTTPException if neither is valid.
+    Raises HTTPException if neither is valid. The request session is
+    recorded as working for the user (see set_session_user).
     """
     # Try Bearer token first
     if credentials is not None:
         user_id = auth_service.verify_token(credentials.credentials)
         if user_id is not None:
             logger.debug(f"Authenticated via Bearer token: user_id={user_id}")
+            set_session_user(session, user_id)
             return user_id
         logger.info("Bearer token provided but invalid or expired")
 
@@ -44,6 +46,7 @@ async def get_current_user_id(
         api_key = await api_key_service.validate_key(x_api_key)
         if api_key is not None:
             logger.debug(f"Authenticated via API key: user_id={api_key.user_id}")
+            set_session_user(session, api_key.user_id)
             return api_key.user_id
         logger.info("API key provided but invalid")
 
@@ -110,7 +110,7 @@ class CreditTransaction(Base):
         Boolean, default=False, server_default="false"
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now()
+        DateTime(timezone=True), server_default=func.now(), index=True
     )
 
     # Relationships
@@ -1,6 +1,7 @@
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from pydantic import TypeAdapter
 
 from src.auth.dependencies import (
     CurrentUserIdDep,
@@ -17,10 +18,13 @@ from src.categories.schemas import (
     MergedAttributeTemplate,
 )
 from src.categories.service import CategoryService
+from src.common.tree_cache import cached_tree_response
 from src.database import AsyncSessionDep
 
 router = APIRouter()
 
+_tree_adapter = TypeAdapter(list[CategoryTreeNode])
+
 
 @router.get("")
 async def list_categories(
@@ -33,14 +37,25 @@ async def list_categories(
     return [CategoryResponse.model_validate(c) for c in categories]
 
 
-@router.get("/tree")
+@router.get("/tree", response_model=list[CategoryTreeNode])
 async def get_category_tree(
+    request: Request,
     session: AsyncSessionDep,
     inventory_owner_id: InventoryContextDep,
-) -> list[CategoryTreeNode]:
-    """Get categories as a nested tree structure with item counts."""
+) -> Response:
+    """Get categories as a nested tree structure with item counts.
+
+    Served from a cache until a category or item changes, with an ETag;
+    send it back in If-None-Match to get 304 while the tree is unchanged.
+    """
     service = CategoryService(session, inventory_owner_id)
-    return await service.get_tree()
+
+    async def build() -> bytes:
+        return _tree_adapter.dump_json(await service.get_tree())
+
+    return await cached_tree_response(
+        request, session, inventory_owner_id, "category_tree", build
+    )
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -128,13 +143,13 @@ async def get_category_template(
     overriding parent fields of the same name.
     """
     service = CategoryService(session, inventory_owner_id)
-    category = await service.get_by_id(category_id)
-    if not category:
+    template = (await service.get_merged_templates()).get(category_id)
+    if template is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found",
         )
-    return await service.get_merged_template(category_id)
+    return template
 
 
 @router.get("/{category_id}/descendants")
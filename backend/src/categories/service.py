@@ -14,6 +14,7 @@ from src.categories.schemas import (
     CategoryUpdate,
     MergedAttributeTemplate,
 )
+from src.common.tree_cache import get_tree_cache, get_tree_versions
 
 
 def generate_path_segment(name: str) -> str:
@@ -278,7 +279,8 @@ class CategoryService:
         )
         rows = result.all()
 
-        # Build lookup maps
+        # Build lookup maps. Values are already converted to their response
+        # types, so nodes are constructed without re-validation.
         nodes: dict[UUID, CategoryTreeNode] = {}
         for category, item_count, total_value in rows:
             # Convert Decimal to float for JSON serialization
@@ -287,7 +289,7 @@ class CategoryService:
                 if isinstance(total_value, Decimal)
                 else float(total_value or 0)
             )
-            nodes[category.id] = CategoryTreeNode(
+            nodes[category.id] = CategoryTreeNode.model_construct(
                 id=category.id,
                 name=category.name,
                 icon=category.icon,
@@ -324,65 +326,110 @@ class CategoryService:
         if not segments:
             raise ValueError("Path cannot be empty")
 
-        parent_id: UUID | None = None
+        # Look up every segment at once rather than one query per segment
+        result = await self.session.execute(
+            select(Category).where(
+                Category.name.in_(segments),
+                Category.user_id == self.user_id,
+            )
+        )
+        existing_by_name = {category.name: category for category in result.scalars()}
+
         current_category: Category | None = None
 
         for segment in segments:
-            # Check if category with this name already exists
-            existing = await self.get_by_name(segment)
+            existing = existing_by_name.get(segment)
             if existing:
                 current_category = existing
-                parent_id = existing.id
             else:
-                # Create the category with current parent
-                category_path = await self._build_path(segment, parent_id)
-                category_path = await self._ensure_unique_path(category_path)
+                # Create the category under the previous segment
+                base_path = generate_path_segment(segment)
+                if current_category and current_category.path:
+                    base_path = f"{current_category.path}.{base_path}"
+                category_path = await self._ensure_unique_path(base_path)
 
                 current_category = Category(
                     user_id=self.user_id,
                     name=segment,
-                    parent_id=parent_id,
+                    parent_id=current_category.id if current_category else None,
                     path=Ltree(category_path),
                     attribute_template={},
                 )
                 self.session.add(current_category)
                 await self.session.flush()
-                parent_id = current_category.id
+                existing_by_name[segment] = current_category
 
         await self.session.commit()
         if current_category:
             await self.session.refresh(current_category)
         return current_category  # type: ignore
 
-    async def get_merged_template(self, category_id: UUID) -> MergedAttributeTemplate:
+    async def get_merged_templates(self) -> dict[UUID, MergedAttributeTemplate]:
         """
-        Get merged attribute template from category and all ancestors.
+        Get the merged attribute template of every category, by category ID.
 
-        Fields from child categories override fields with the same name from parents.
+        Each template holds the fields of the category and all ancestors, with
+        fields from child categories overriding fields with the same name from
+        parents. All templates are built from one query and cached until a
+        category changes (see src.common.tree_cache).
         """
-        category = await self.get_by_id(category_id)
-        if not category:
-            return MergedAttributeTemplate()
-
-        # Get ancestors (ordered from root to parent)
-        ancestors = await self.get_ancestors(category)
+        versions = await get_tree_versions(self.session, self.user_id)
+        cache = get_tree_cache()
+        key = cache.make_key(self.user_id, "category_templates", versions)
+        templates = cache.get(key)
+        if templates is not None:
+            return templates
 
-        # Merge templates: ancestors first, then current category
-        all_categories = ancestors + [category]
-        merged_fields: dict[str, AttributeField] = {}
-        inherited_from: list[UUID] = []
-
-        for cat in all_categories:
-            template = cat.attribute_template or {}
-            fields = template.get("fields", [])
+        result = await self.session.execute(
+            select(
+                Category.id,
+                Category.parent_id,
+                Category.path,
+                Category.attribute_template,
+            )
+            .where(Category.user_id == self.user_id)
+            .order_by(Category.path)
+        )
 
+        # Ancestors sort before their descendants, so the nearest existing
+        # ancestor path is always merged already
+        merged_by_path: dict[str, tuple[dict[str, AttributeField], list[UUID]]] = {}
+        templates = {}
+        for category_id, parent_id, path, template in result:
+            path = str(path) if path else ""
+            merged_fields: dict[str, AttributeField] = {}
+            inherited_from: list[UUID] = []
+            if path and parent_id:
+                ancestor = path
+                while "." in ancestor:
+                    ancestor = ancestor.rsplit(".", 1)[0]
+                    if ancestor in merged_by_path:
+                        ancestor_fields, ancestor_ids = merged_by_path[ancestor]
+                        merged_fields = dict(ancestor_fields)
+                        inherited_from = list(ancestor_ids)
+                        break
+
+            fields = (template or {}).get("fields", [])
             if fields:
-                inherited_from.append(cat.id)
+                inherited_from.append(category_id)
                 for field_data in fields:
                     field = AttributeField(**field_data)
                     merged_fields[field.name] = field  # Later fields override earlier
 
-        return MergedAttributeTemplate(
-            fields=list(merged_fields.values()),
-            inherited_from=inherited_from,
-        )
+            merged_by_path[path] = (merged_fields, inherited_from)
+            templates[category_id] = MergedAttributeTemplate(
+                fields=list(merged_fields.values()),
+                inherited_from=inherited_from,
+            )
+
+        cache.set(key, templates)
+        return templates
+
+    async def get_merged_template(self, category_id: UUID) -> MergedAttributeTemplate:
+        """
+        Get merged attribute template from category and all ancestors.
+
+        Fields from child categories override fields with the same name from parents.
+        """
+        templates = await self.get_merged_templates()
+        return templates.get(category_id) or MergedAttributeTemplate()
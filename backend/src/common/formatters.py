@@ -4,15 +4,27 @@ import logging
 
 from uvicorn.logging import AccessFormatter, DefaultFormatter
 
-from src.common.request_context import get_request_id
+from src.common.request_context import get_query_stats, get_request_id
+
+
+def _add_request_context(record: logging.LogRecord) -> None:
+    """Add request ID and database stats for the current request."""
+    record.request_id = get_request_id() or "-"
+    stats = get_query_stats()
+    if stats is None:
+        record.db_queries = "-"
+        record.db_time_ms = "-"
+    else:
+        record.db_queries = stats.queries
+        record.db_time_ms = f"{stats.seconds * 1000:.1f}"
 
 
 class RequestIDFormatter(DefaultFormatter):
     """Formatter that includes request ID for distributed tracing."""
 
     def format(self, record: logging.LogRecord) -> str:
-        """Add request_id to the log record before formatting."""
-        record.request_id = get_request_id() or "-"
+        """Add request_id and DB stats to the log record before formatting."""
+        _add_request_context(record)
         return super().format(record)
 
 
@@ -20,6 +32,6 @@ class RequestIDAccessFormatter(AccessFormatter):
     """Access log formatter that includes request ID for distributed tracing."""
 
     def format(self, record: logging.LogRecord) -> str:
-        """Add request_id to the log record before formatting."""
-        record.request_id = get_request_id() or "-"
+        """Add request_id and DB stats to the log record before formatting."""
+        _add_request_context(record)
         return super().format(record)
@@ -0,0 +1,209 @@
+"""Prometheus metrics and per-request database accounting.
+
+Metrics are process-wide and served in the Prometheus text format on a
+separate internal port (METRICS_PORT), never by the public API app: they
+reveal routes, pool state and AI usage. Each worker process keeps its own
+registry, so scrape every worker (or run one worker per container).
+"""
+
+import logging
+import time
+from wsgiref.simple_server import WSGIServer
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.common.request_context import get_query_stats
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "homerp_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "homerp_http_requests_in_flight",
+    "HTTP requests currently being handled",
+)
+
+DB_POOL_SIZE = Gauge(
+    "homerp_db_pool_size",
+    "Connections held open by the database pool",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "homerp_db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "homerp_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+DB_QUERIES = Counter(
+    "homerp_db_queries_total",
+    "Database statements executed",
+)
+DB_SLOW_QUERIES = Counter(
+    "homerp_db_slow_queries_total",
+    "Database statements slower than SLOW_QUERY_THRESHOLD_MS",
+)
+
+OPENAI_REQUEST_DURATION = Histogram(
+    "homerp_openai_request_duration_seconds",
+    "OpenAI API call latency by operation type",
+    ["operation"],
+    buckets=(0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+OPENAI_TOKENS = Counter(
+    "homerp_openai_tokens_total",
+    "OpenAI tokens used by operation type",
+    ["operation", "kind"],
+)
+OPENAI_RATE_LIMITED = Counter(
+    "homerp_openai_rate_limited_total",
+    "OpenAI calls rejected with 429 by operation type",
+    ["operation"],
+)
+
+WEBHOOK_QUEUE_DEPTH = Gauge(
+    "homerp_webhook_queue_depth",
+    "Webhook deliveries queued or in progress",
+)
+EMAIL_QUEUE_DEPTH = Gauge(
+    "homerp_email_queue_depth",
+    "Emails waiting for or being sent over SMTP",
+)
+
+IMAGE_PROCESSING_DURATION = Histogram(
+    "homerp_image_processing_seconds",
+    "Image processing time by operation",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+
+# Internal metrics server of this process, if started
+_metrics_server: WSGIServer | None = None
+
+
+def start_metrics_server(port: int, host: str) -> WSGIServer | None:
+    """Serve /metrics on an internal port from a background thread.
+
+    Args:
+        port: Port to listen on (0 picks a free one)
+        host: Address to bind
+
+    Returns:
+        The server, or None if the port could not be bound (e.g. taken by
+        another worker process)
+    """
+    global _metrics_server
+    try:
+        _metrics_server, _thread = start_http_server(port, addr=host)
+    except OSError as e:
+        logger.error(f"Metrics server not started on {host}:{port}: {e}")
+        return None
+    logger.info(f"Metrics server listening on {host}:{port}")
+    return _metrics_server
+
+
+def stop_metrics_server() -> None:
+    """Stop the internal metrics server, if running."""
+    global _metrics_server
+    if _metrics_server is not None:
+        _metrics_server.shutdown()
+        _metrics_server.server_close()
+        _metrics_server = None
+
+
+class MetricsMiddleware:
+    """Records latency and in-flight requests for each HTTP request.
+
+    Requests are labelled with the matched route template (e.g.
+    /api/v1/items/{item_id}) rather than the raw path, so label cardinality
+    stays bounded. Requests that match no route are labelled "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            ).observe(time.perf_counter() - start)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool recording how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def instrument_engine(
+    engine: AsyncEngine, slow_query_threshold_ms: int, pool_gauges: bool = True
+) -> None:
+    """Count queries and database time per request, and log slow queries.
+
+    Totals are added to the current request's query stats (see
+    request_context.start_query_stats) and the pool gauges report this
+    engine's pool.
+
+    Args:
+        engine: Engine to instrument
+        slow_query_threshold_ms: Log statements slower than this; 0 disables
+        pool_gauges: Report this engine's pool in the pool gauges (the
+            primary's; the read replica's pool is not reported)
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, *_args):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, _cursor, statement, *_args):
+        elapsed = time.perf_counter() - conn.info["query_start"]
+        DB_QUERIES.inc()
+        stats = get_query_stats()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+        if slow_query_threshold_ms and elapsed * 1000 >= slow_query_threshold_ms:
+            DB_SLOW_QUERIES.inc()
+            logger.warning(f"Slow query ({elapsed * 1000:.0f}ms): {statement}")
+
+    pool = sync_engine.pool
+    if pool_gauges and hasattr(pool, "checkedout"):
+        DB_POOL_SIZE.set_function(lambda: pool.checkedin() + pool.checkedout())
+        DB_POOL_CHECKED_OUT.set_function(pool.checkedout)
@@ -0,0 +1,29 @@
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class TreeVersion(Base):
+    """Version tokens of a user's category and location trees and items.
+
+    Each token is replaced with a new random UUID by triggers whenever the
+    data it covers changes (see src.common.tree_cache), so cached trees
+    and templates are keyed by the tokens rather than invalidated.
+    """
+
+    __tablename__ = "tree_versions"
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Categories: any insert, update or delete
+    categories: Mapped[UUID] = mapped_column(server_default=func.gen_random_uuid())
+    # Locations: any insert, update or delete
+    locations: Mapped[UUID] = mapped_column(server_default=func.gen_random_uuid())
+    # Items: changes to what the trees count and sum (placement, price, quantity)
+    items: Mapped[UUID] = mapped_column(server_default=func.gen_random_uuid())
+    # Inventory: any item insert, update or delete
+    inventory: Mapped[UUID] = mapped_column(server_default=func.gen_random_uuid())
@@ -0,0 +1,271 @@
+"""
+Monthly range partitions for the append-only log tables.
+
+ai_usage_logs, item_check_in_outs, webhook_executions and alert_history are
+partitioned by month on the timestamp set when a row is written, so recent
+time-range queries touch only the newest partitions and old months are
+detached whole instead of deleted row by row. Besides the monthly
+partitions each table has:
+- <table>_default, catching rows outside every monthly partition (e.g. when
+  this job has not run in time); its rows are moved into the month's
+  partition when that is created
+- <table>_legacy, holding the rows from before migration 031 converted the
+  table, attached as one partition rather than copied
+
+Run this module daily (e.g. from cron) to create the partitions for the
+coming months and detach those past their retention:
+
+Usage:
+    uv run python -m src.common.partitions [--dry-run]
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from src.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+# Partitioned table -> partition key, a timestamp that never changes
+PARTITIONED_TABLES = {
+    "ai_usage_logs": "created_at",
+    "item_check_in_outs": "created_at",
+    "webhook_executions": "executed_at",
+    "alert_history": "sent_at",
+}
+
+_BOUNDS = re.compile(r"FROM \((MINVALUE|'[^']+')\) TO \('([^']+)'\)")
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing a day."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month a number of months after (or before) a month."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of a table's partition for a month, e.g. alert_history_2026_10."""
+    return f"{table}_{month:%Y_%m}"
+
+
+def _as_datetime(month: date) -> datetime:
+    return datetime.combine(month, datetime.min.time(), tzinfo=UTC)
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+async def _partitions(
+    conn: AsyncConnection | AsyncSession, table: str
+) -> dict[str, tuple[datetime | None, datetime] | None]:
+    """Attached partitions of a table and their bounds.
+
+    Returns:
+        Partition name -> (lower bound or None for MINVALUE, upper bound),
+        or None for the default partition
+    """
+    result = await conn.execute(
+        text(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:table AS regclass)
+            """
+        ),
+        {"table": table},
+    )
+    partitions = {}
+    for name, bound in result.tuples():
+        match = _BOUNDS.search(bound)
+        if match is None:
+            partitions[name] = None
+            continue
+        lower = None if match[1] == "MINVALUE" else match[1].strip("'")
+        partitions[name] = (
+            datetime.fromisoformat(lower) if lower else None,
+            datetime.fromisoformat(match[2]),
+        )
+    return partitions
+
+
+def _covered(
+    partitions: dict[str, tuple[datetime | None, datetime] | None], at: datetime
+) -> bool:
+    """Whether a non-default partition already holds rows at a point in time."""
+    return any(
+        (lower is None or lower <= at) and at < upper
+        for lower, upper in filter(None, partitions.values())
+    )
+
+
+async def create_partitions(
+    conn: AsyncConnection | AsyncSession,
+    months_ahead: int,
+    today: date | None = None,
+) -> list[str]:
+    """Create the default partitions and monthly ones up to N months ahead.
+
+    Months already covered by another partition (the legacy partition
+    reaches into the month migration 031 ran in) are skipped. Rows that
+    already landed in a default partition for a month being created are
+    moved into the new partition.
+
+    Args:
+        conn: Connection or session; the caller commits
+        months_ahead: Months after the current one to create partitions for
+        today: Day to count from (default: today in UTC)
+
+    Returns:
+        Names of the partitions created
+    """
+    this_month = month_start(today or datetime.now(UTC).date())
+    created = []
+    for table, column in PARTITIONED_TABLES.items():
+        default = f"{table}_default"
+        existing = await _partitions(conn, table)
+        if default not in existing:
+            await conn.execute(
+                text(f"CREATE TABLE {default} PARTITION OF {table} DEFAULT")
+            )
+            created.append(default)
+
+        for offset in range(months_ahead + 1):
+            month = add_months(this_month, offset)
+            name = partition_name(table, month)
+            if name in existing or _covered(existing, _as_datetime(month)):
+                continue
+            lower, upper = _bound(month), _bound(add_months(month, 1))
+            in_range = f"{column} >= {lower} AND {column} < {upper}"
+            stray_rows = (
+                await conn.execute(
+                    text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})")
+                )
+            ).scalar()
+            if stray_rows:
+                # A partition cannot be added while the default partition
+                # holds rows in its range: move them over, then attach
+                await conn.execute(
+                    text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)")
+                )
+                await conn.execute(
+                    text(
+                        f"""
+                        WITH moved AS (
+                            DELETE FROM {default} WHERE {in_range} RETURNING *
+                        )
+                        INSERT INTO {name} SELECT * FROM moved
+                        """
+                    )
+                )
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                        f"FOR VALUES FROM ({lower}) TO ({upper})"
+                    )
+                )
+            else:
+                await conn.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ({lower}) TO ({upper})"
+                    )
+                )
+            created.append(name)
+    return created
+
+
+def retention_months(settings: Settings) -> dict[str, int]:
+    """Months of history kept per partitioned table (0 keeps everything).
+
+    item_check_in_outs has no retention: checked-out quantities are summed
+    over the whole history.
+    """
+    return {
+        "ai_usage_logs": settings.ai_usage_log_retention_months,
+        "webhook_executions": settings.webhook_execution_retention_months,
+        "alert_history": settings.alert_history_retention_months,
+    }
+
+
+async def detach_expired_partitions(
+    conn: AsyncConnection | AsyncSession,
+    retention: dict[str, int],
+    drop: bool = False,
+    today: date | None = None,
+) -> list[str]:
+    """Detach the partitions holding only rows older than a table's retention.
+
+    With a retention of N months, a partition is expired once it ends before
+    the first day of the month N months ago, so at least N whole months
+    are always kept.
+
+    Args:
+        conn: Connection or session; the caller commits
+        retention: Months to keep per table; tables missing or at 0 are kept
+        drop: Drop detached partitions instead of leaving them for archiving
+        today: Day to count from (default: today in UTC)
+
+    Returns:
+        Names of the partitions detached
+    """
+    this_month = month_start(today or datetime.now(UTC).date())
+    detached = []
+    for table, months in retention.items():
+        if months <= 0:
+            continue
+        cutoff = _as_datetime(add_months(this_month, -months))
+        for name, bounds in sorted((await _partitions(conn, table)).items()):
+            if bounds is None or bounds[1] > cutoff:
+                continue
+            await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            if drop:
+                await conn.execute(text(f"DROP TABLE {name}"))
+            logger.info(
+                f"{'Dropped' if drop else 'Detached'} partition {name} "
+                f"(older than {months} months)"
+            )
+            detached.append(name)
+    return detached
+
+
+async def main(dry_run: bool) -> None:
+    settings = get_settings()
+    engine = create_async_engine(settings.database_url)
+    try:
+        async with engine.connect() as conn:
+            created = await create_partitions(conn, settings.partition_months_ahead)
+            detached = await detach_expired_partitions(
+                conn, retention_months(settings), settings.partition_drop_detached
+            )
+            if dry_run:
+                await conn.rollback()
+            else:
+                await conn.commit()
+    finally:
+        await engine.dispose()
+    prefix = "Would have" if dry_run else "Have"
+    print(f"{prefix} created {len(created)} partition(s): {', '.join(created)}")
+    action = "dropped" if settings.partition_drop_detached else "detached"
+    print(f"{prefix} {action} {len(detached)} partition(s): {', '.join(detached)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report changes without applying"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
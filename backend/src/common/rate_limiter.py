@@ -1,10 +1,25 @@
-"""Rate limiting configuration and utilities."""
+"""Rate limiting configuration and utilities.
 
+Routes opt in with the @limiter.limit decorator. Limits use fixed windows and
+are counted in Redis when REDIS_URL is set (shared across instances), or in
+process memory otherwise. All limits for a request are checked in one Redis
+round-trip, and keys already known to be over their limit are rejected
+locally without contacting Redis at all. If Redis is unreachable, limits are
+counted in memory until it comes back.
+"""
+
+import functools
+import inspect
 import logging
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Protocol
 
 from fastapi import Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi.responses import JSONResponse
+from redis.asyncio import Redis
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +39,7 @@ def get_client_identifier(request: Request) -> str:
     # Fall back to IP address
     # Log when using IP-based limiting on authenticated endpoints for monitoring
     # This can indicate auth middleware issues or proxy/NAT collisions
-    ip_address = get_remote_address(request)
+    ip_address = request.client.host if request.client else "127.0.0.1"
     path = str(request.url.path)
     if path.startswith("/api/v1/") and not path.startswith("/api/v1/auth"):
         logger.debug(f"Rate limiting by IP on API endpoint: {path} from {ip_address}")
@@ -32,12 +47,241 @@ def get_client_identifier(request: Request) -> str:
     return ip_address
 
 
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_LIMIT_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A number of requests allowed per fixed window."""
+
+    amount: int
+    period_seconds: int
+    text: str
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def parse_rate_limits(value: str) -> list[RateLimit]:
+    """Parse limits like "10/minute" or "10/minute;200/hour".
+
+    Raises:
+        ValueError: If a limit cannot be parsed
+    """
+    limits = []
+    for part in value.split(";"):
+        match = _LIMIT_PATTERN.match(part)
+        if not match:
+            raise ValueError(f"Invalid rate limit: {part!r}")
+        amount, multiplier, unit = match.groups()
+        limits.append(
+            RateLimit(
+                amount=int(amount),
+                period_seconds=int(multiplier or 1) * _PERIODS[unit],
+                text=part.strip(),
+            )
+        )
+    return limits
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request exceeds one of its route's rate limits."""
+
+    def __init__(self, limit: RateLimit, retry_after: int):
+        super().__init__(f"Rate limit exceeded: {limit}")
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+async def rate_limit_exceeded_handler(
+    _request: Request, exc: RateLimitExceeded
+) -> JSONResponse:
+    """Return 429 with a Retry-After header for the exceeded window."""
+    return JSONResponse(
+        status_code=429,
+        content={"error": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+class RateLimitStorage(Protocol):
+    """Backend counting hits per fixed window."""
+
+    async def hit(self, windows: list[tuple[str, int]]) -> list[tuple[int, int]]:
+        """Count a hit in each (key, period_seconds) window.
+
+        Returns:
+            (count including this hit, seconds until the window resets) for
+            each window, in order
+        """
+        ...
+
+    async def close(self) -> None:
+        """Release the backend's resources."""
+        ...
+
+
+class MemoryRateLimitStorage:
+    """In-process counters, for single-instance deployments and tests."""
+
+    def __init__(self) -> None:
+        self._counters: dict[str, tuple[int, float]] = {}
+
+    async def hit(self, windows: list[tuple[str, int]]) -> list[tuple[int, int]]:
+        now = time.monotonic()
+        results = []
+        for key, period in windows:
+            count, expires_at = self._counters.get(key, (0, 0.0))
+            if expires_at <= now:
+                count, expires_at = 0, now + period
+                # Drop expired counters occasionally so memory stays bounded
+                if len(self._counters) > 10_000:
+                    self._counters = {
+                        k: v for k, v in self._counters.items() if v[1] > now
+                    }
+            count += 1
+            self._counters[key] = (count, expires_at)
+            results.append((count, max(1, int(expires_at - now))))
+        return results
+
+    async def close(self) -> None:
+        self._counters.clear()
+
+
+# Redis calls taking longer than this fall back to in-memory counting rather
+# than stalling the request
+REDIS_TIMEOUT_SECONDS = 0.5
+
+# Increments every window in one round-trip, setting the expiry when a
+# window is first hit. Returns count and remaining TTL for each key.
+_HIT_SCRIPT = """
+local results = {}
+for i, key in ipairs(KEYS) do
+    local count = redis.call('INCR', key)
+    if count == 1 then
+        redis.call('EXPIRE', key, ARGV[i])
+    end
+    results[#results + 1] = count
+    results[#results + 1] = redis.call('TTL', key)
+end
+return results
+"""
+
+
+class RedisRateLimitStorage:
+    """Redis counters shared by all instances, using a pooled async client."""
+
+    def __init__(self, url: str, max_connections: int = 10) -> None:
+        self._redis = Redis.from_url(
+            url,
+            max_connections=max_connections,
+            socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+            socket_timeout=REDIS_TIMEOUT_SECONDS,
+        )
+        self._hit_script = self._redis.register_script(_HIT_SCRIPT)
+
+    async def hit(self, windows: list[tuple[str, int]]) -> list[tuple[int, int]]:
+        values = await self._hit_script(
+            keys=[key for key, _ in windows],
+            args=[period for _, period in windows],
+        )
+        return [
+            (int(values[i]), max(1, int(values[i + 1])))
+            for i in range(0, len(values), 2)
+        ]
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class RateLimiter:
+    """Per-route fixed-window rate limiter."""
+
+    def __init__(
+        self,
+        key_func: Callable[[Request], str],
+        storage: RateLimitStorage | None = None,
+    ) -> None:
+        self.key_func = key_func
+        self.storage: RateLimitStorage = storage or MemoryRateLimitStorage()
+        self.enabled = True
+        # Used while the configured storage is failing
+        self._fallback_storage = MemoryRateLimitStorage()
+        # Keys known to be over their limit, with when their window resets.
+        # Checked before the storage so rejected clients cost no round-trip.
+        self._blocked: dict[str, float] = {}
+
+    def reset(self) -> None:
+        """Forget locally blocked keys (e.g. after swapping the storage)."""
+        self._blocked.clear()
+
+    async def check(
+        self, request: Request, scope: str, limits: list[RateLimit]
+    ) -> None:
+        """Count a request against limits, raising if any is exceeded.
+
+        Raises:
+            RateLimitExceeded: If the request is over one of the limits
+        """
+        identifier = self.key_func(request)
+        windows = [
+            (f"ratelimit:{scope}:{identifier}:{limit.period_seconds}", limit)
+            for limit in limits
+        ]
+
+        now = time.monotonic()
+        for key, limit in windows:
+            reset_at = self._blocked.get(key)
+            if reset_at is not None:
+                if reset_at > now:
+                    raise RateLimitExceeded(limit, max(1, int(reset_at - now)))
+                del self._blocked[key]
+
+        hits = [(key, limit.period_seconds) for key, limit in windows]
+        try:
+            counts = await self.storage.hit(hits)
+        except Exception as e:
+            # Keep limiting per instance rather than failing requests
+            logger.error(f"Rate limit storage error, counting in memory: {e}")
+            counts = await self._fallback_storage.hit(hits)
+
+        for (key, limit), (count, reset_in) in zip(windows, counts, strict=True):
+            if count > limit.amount:
+                if len(self._blocked) > 10_000:
+                    self._blocked = {k: v for k, v in self._blocked.items() if v > now}
+                self._blocked[key] = now + reset_in
+                raise RateLimitExceeded(limit, reset_in)
+
+    def limit(self, limit_value: str) -> Callable:
+        """Decorate a route to enforce rate limits.
+
+        The route must take a ``request: Request`` parameter.
+        """
+        limits = parse_rate_limits(limit_value)
+
+        def decorator(func: Callable) -> Callable:
+            if "request" not in inspect.signature(func).parameters:
+                raise TypeError(
+                    f"{func.__name__} must take a 'request' parameter to be rate limited"
+                )
+            scope = f"{func.__module__}.{func.__name__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if self.enabled:
+                    await self.check(kwargs["request"], scope, limits)
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
 # Module-level limiter - starts with in-memory storage
-# Storage is reconfigured in configure_rate_limiting() if Redis is available
-limiter = Limiter(
-    key_func=get_client_identifier,
-    default_limits=["1000/hour"],
-)
+# Storage is reconfigured in configure_rate_limiting() if Redis is available.
+# Only routes decorated with @limiter.limit are rate limited.
+limiter = RateLimiter(key_func=get_client_identifier)
 
 
 # Rate limit configurations for different endpoint types
@@ -50,6 +294,16 @@ RATE_LIMIT_STANDARD = "100/minute"  # Standard API operations
 RATE_LIMIT_READONLY = "200/minute"  # Read-only operations - higher limits
 
 
+async def close_rate_limiter() -> None:
+    """Close the limiter's storage connections (on application shutdown)."""
+    await limiter.storage.close()
+
+
+def create_redis_storage(url: str, max_connections: int) -> RedisRateLimitStorage:
+    """Create the Redis rate limit storage."""
+    return RedisRateLimitStorage(url, max_connections=max_connections)
+
+
 def configure_rate_limiting(app) -> None:
     """
     Configure rate limiting for the FastAPI application.
@@ -57,12 +311,6 @@ def configure_rate_limiting(app) -> None:
     If REDIS_URL is set, reconfigures the limiter to use Redis storage
     for distributed rate limiting across multiple instances.
     """
-    global limiter
-
-    from limits.storage import MemoryStorage, storage_from_string
-    from slowapi import _rate_limit_exceeded_handler
-    from slowapi.errors import RateLimitExceeded
-
     from src.config import get_settings
 
     settings = get_settings()
@@ -73,8 +321,9 @@ def configure_rate_limiting(app) -> None:
     if settings.redis_url:
         try:
             # Create Redis storage
-            storage = storage_from_string(settings.redis_url)
-            limiter._storage = storage
+            limiter.storage = create_redis_storage(
+                settings.redis_url, settings.rate_limit_redis_max_connections
+            )
             # Mask password in logs
             safe_url = (
                 settings.redis_url.split("@")[-1]
@@ -93,7 +342,7 @@ def configure_rate_limiting(app) -> None:
             logger.warning(
                 "Falling back to in-memory storage (not suitable for multi-instance)"
             )
-            limiter._storage = MemoryStorage()
+            limiter.storage = MemoryRateLimitStorage()
     elif is_production:
         # Production without Redis - fail fast
         raise RuntimeError(
@@ -104,7 +353,8 @@ def configure_rate_limiting(app) -> None:
         logger.info(
             "Rate limiting configured with in-memory storage (single instance only)"
         )
-        limiter._storage = MemoryStorage()
+        limiter.storage = MemoryRateLimitStorage()
 
+    limiter.reset()
     app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
@@ -6,12 +6,28 @@ through async call chains without thread-local storage issues.
 
 import uuid
 from contextvars import ContextVar
+from dataclasses import dataclass
 
 # Context variable to store the current request ID
 # This is async-safe and isolated per request
 _request_id_context: ContextVar[str | None] = ContextVar("request_id", default=None)
 
 
+@dataclass
+class QueryStats:
+    """Database statements executed while handling a request."""
+
+    queries: int = 0
+    seconds: float = 0.0
+
+
+# Mutable stats object for the current request, updated by the engine's
+# cursor hooks (see metrics.instrument_engine)
+_query_stats_context: ContextVar[QueryStats | None] = ContextVar(
+    "query_stats", default=None
+)
+
+
 def get_request_id() -> str | None:
     """
     Get the current request ID from context.
@@ -42,3 +58,25 @@ def generate_request_id() -> str:
         A new UUID4 string
     """
     return str(uuid.uuid4())
+
+
+def start_query_stats() -> QueryStats:
+    """
+    Start counting database statements for the current request.
+
+    Returns:
+        The stats object that queries in this context will update
+    """
+    stats = QueryStats()
+    _query_stats_context.set(stats)
+    return stats
+
+
+def get_query_stats() -> QueryStats | None:
+    """
+    Get the current request's database statement stats.
+
+    Returns:
+        The stats, or None outside a request
+    """
+    return _query_stats_context.get()
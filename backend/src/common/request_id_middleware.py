@@ -3,17 +3,20 @@
 Adds unique request IDs to all requests for improved observability.
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from src.common.request_context import generate_request_id, set_request_id
+from src.common.request_context import (
+    generate_request_id,
+    set_request_id,
+    start_query_stats,
+)
 
 # Standard header name for request IDs (used by nginx, AWS ALB, etc.)
 REQUEST_ID_HEADER = "X-Request-ID"
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """
     Middleware that manages request IDs for tracing and correlation.
 
@@ -21,7 +24,8 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
     1. Extracts X-Request-ID header if present (for distributed tracing)
     2. Generates a new UUID4 if no incoming request ID
     3. Stores the request ID in async-safe context storage
-    4. Adds X-Request-ID to the response headers
+    4. Starts counting the request's database queries for its log lines
+    5. Adds X-Request-ID to the response headers
 
     This enables:
     - Correlating all logs from a single request
@@ -30,17 +34,27 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
     - Support workflows where users can provide request IDs
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Extract request ID from incoming header, or generate a new one
-        request_id = request.headers.get(REQUEST_ID_HEADER) or generate_request_id()
+        request_id = (
+            Headers(scope=scope).get(REQUEST_ID_HEADER) or generate_request_id()
+        )
 
         # Store in context for this request's async execution
         set_request_id(request_id)
+        start_query_stats()
 
-        # Process the request
-        response = await call_next(request)
-
-        # Add request ID to response headers for client visibility
-        response.headers[REQUEST_ID_HEADER] = request_id
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add request ID to response headers for client visibility
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_request_id)
@@ -0,0 +1,29 @@
+"""JSON response helpers for large responses."""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def json_response(
+    adapter: TypeAdapter[Any], content: Any, status_code: int = 200
+) -> Response:
+    """Serialize already-built response models straight to JSON bytes.
+
+    FastAPI validates a route's return value against its response model,
+    converts it to plain Python data and only then encodes it. For content
+    built from database rows that work is redundant; pydantic-core can write
+    the JSON directly. Declare the schema with response_model on the route
+    so the OpenAPI docs are unchanged.
+
+    Args:
+        adapter: TypeAdapter for the response schema, created once per module
+        content: Response models (or lists of them) matching the adapter
+        status_code: HTTP status code
+    """
+    return Response(
+        content=adapter.dump_json(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -1,11 +1,10 @@
 """Security headers middleware for HTTP responses."""
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Middleware that adds security headers to all HTTP responses.
 
@@ -14,30 +13,28 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Clickjacking
     - MIME type sniffing
     - Information leakage
-    """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
+    Implemented as a plain ASGI middleware: headers are added to the
+    http.response.start message, so response bodies (including streamed
+    files) pass through untouched.
+    """
 
+    headers: dict[str, str] = {
         # Prevent MIME type sniffing
         # Stops browsers from trying to guess the content type
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
+        "X-Content-Type-Options": "nosniff",
         # Prevent clickjacking by disallowing embedding in frames
         # SAMEORIGIN allows embedding by same origin (needed for some UIs)
-        response.headers["X-Frame-Options"] = "SAMEORIGIN"
-
+        "X-Frame-Options": "SAMEORIGIN",
         # Enable browser XSS filter (legacy, but still useful for older browsers)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
+        "X-XSS-Protection": "1; mode=block",
         # Control what information is sent in Referer header
         # strict-origin-when-cross-origin: send full URL for same-origin,
         # only origin for cross-origin, nothing for downgrades
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
+        "Referrer-Policy": "strict-origin-when-cross-origin",
         # Restrict browser features/APIs that can be used
         # Disable potentially dangerous features by default
-        response.headers["Permissions-Policy"] = (
+        "Permissions-Policy": (
             "accelerometer=(), "
             "camera=(), "
             "geolocation=(), "
@@ -46,12 +43,11 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "microphone=(), "
             "payment=(), "
             "usb=()"
-        )
-
+        ),
         # Content Security Policy - restrict resource loading
         # This is a baseline policy; adjust based on frontend needs
         # Note: 'unsafe-inline' for styles needed for many UI frameworks
-        response.headers["Content-Security-Policy"] = (
+        "Content-Security-Policy": (
             "default-src 'self'; "
             "script-src 'self'; "
             "style-src 'self' 'unsafe-inline'; "
@@ -61,14 +57,30 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "frame-ancestors 'self'; "
             "form-action 'self'; "
             "base-uri 'self'"
-        )
+        ),
+    }
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Remove server identification header if present
-        # Prevents information disclosure about backend technology
-        if "server" in response.headers:
-            del response.headers["server"]
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self.headers.items():
+                    headers[name] = value
 
-        return response
+                # Remove server identification header if present
+                # Prevents information disclosure about backend technology
+                if "server" in headers:
+                    del headers["server"]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 class StrictSecurityHeadersMiddleware(SecurityHeadersMiddleware):
@@ -79,14 +91,10 @@ class StrictSecurityHeadersMiddleware(SecurityHeadersMiddleware):
     HSTS tells browsers to always use HTTPS for this domain.
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await super().dispatch(request, call_next)
-
+    headers = {
+        **SecurityHeadersMiddleware.headers,
         # HTTP Strict Transport Security
         # max-age: 1 year, includeSubDomains for all subdomains
         # Only enable in production with proper HTTPS setup
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains"
-        )
-
-        return response
+        "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    }
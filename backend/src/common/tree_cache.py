@@ -0,0 +1,267 @@
+"""
+Versioned cache of category and location trees.
+
+The tree endpoints aggregate every item of the inventory, and the item form
+asks for a category's merged attribute template on each render. Triggers
+give every user a version token per tree input (tree_versions: categories,
+locations, items), replaced by a new random UUID on every write that
+changes it: category and location inserts, updates, moves and deletes, and
+item inserts, deletes, moves and price or quantity changes. A fourth token,
+inventory, changes on every item write; the AI assistant keys its cached
+tool results by it (ItemRepository.get_inventory_version). Cached trees
+and templates are keyed by the tokens, so a write makes them unreachable
+in every worker, and stale entries age out of the LRU. Tokens are random
+rather than counters so a database restored from a backup never matches
+entries cached before.
+
+The same tokens make the tree ETags: a client sending If-None-Match gets
+304 Not Modified after a single primary key lookup.
+
+Migrations 036 and 037 install the triggers; TRIGGER_DDL is the same DDL
+for test databases built with create_all. tree_versions has the tenant RLS
+policy and the trigger functions are SECURITY DEFINER (migration 039), as
+for the dashboard rollups.
+"""
+
+import hashlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Literal
+from uuid import UUID
+
+from fastapi import Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.common.models import TreeVersion
+
+TRIGGER_DDL = [
+    # Replace the given tokens of each user. Users are joined before
+    # inserting so a cascading user delete adds nothing.
+    """
+    CREATE OR REPLACE FUNCTION tree_versions_bump(
+        p_user_ids uuid[], p_categories boolean, p_locations boolean,
+        p_items boolean, p_inventory boolean
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO tree_versions (user_id)
+        SELECT u.id FROM users u WHERE u.id = ANY(p_user_ids)
+        ON CONFLICT (user_id) DO UPDATE SET
+            categories = CASE WHEN p_categories
+                THEN gen_random_uuid() ELSE tree_versions.categories END,
+            locations = CASE WHEN p_locations
+                THEN gen_random_uuid() ELSE tree_versions.locations END,
+            items = CASE WHEN p_items
+                THEN gen_random_uuid() ELSE tree_versions.items END,
+            inventory = CASE WHEN p_inventory
+                THEN gen_random_uuid() ELSE tree_versions.inventory END;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    # Categories and locations are written a row at a time
+    """
+    CREATE OR REPLACE FUNCTION tree_versions_row_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM tree_versions_bump(
+            ARRAY[coalesce(NEW.user_id, OLD.user_id)],
+            TG_TABLE_NAME = 'categories',
+            TG_TABLE_NAME = 'locations',
+            false,
+            false
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+    """,
+    """
+    CREATE TRIGGER categories_tree_version_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON categories
+    FOR EACH ROW EXECUTE FUNCTION tree_versions_row_trigger();
+    """,
+    """
+    CREATE TRIGGER locations_tree_version_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON locations
+    FOR EACH ROW EXECUTE FUNCTION tree_versions_row_trigger();
+    """,
+    # Items once per statement. Every write replaces the inventory token;
+    # updates only replace the items token when they change what the trees
+    # count and sum.
+    """
+    CREATE OR REPLACE FUNCTION items_tree_version_trigger() RETURNS trigger AS $$
+    DECLARE
+        user_ids uuid[];
+        tree_user_ids uuid[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT array_agg(DISTINCT user_id) INTO user_ids FROM new_items;
+            tree_user_ids := user_ids;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT array_agg(DISTINCT user_id) INTO user_ids FROM old_items;
+            tree_user_ids := user_ids;
+        ELSE
+            SELECT array_agg(DISTINCT user_id) INTO user_ids FROM new_items;
+            SELECT array_agg(DISTINCT n.user_id) INTO tree_user_ids
+            FROM old_items o
+            JOIN new_items n ON n.id = o.id
+            WHERE (o.user_id, o.category_id, o.location_id, o.price, o.quantity)
+                IS DISTINCT FROM
+                (n.user_id, n.category_id, n.location_id, n.price, n.quantity);
+        END IF;
+
+        IF tree_user_ids IS NOT NULL THEN
+            PERFORM tree_versions_bump(tree_user_ids, false, false, true, true);
+        END IF;
+        IF user_ids IS DISTINCT FROM tree_user_ids THEN
+            PERFORM tree_versions_bump(user_ids, false, false, false, true);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+    """,
+    """
+    CREATE TRIGGER items_tree_version_insert_trigger
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_tree_version_trigger();
+    """,
+    """
+    CREATE TRIGGER items_tree_version_update_trigger
+    AFTER UPDATE ON items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_tree_version_trigger();
+    """,
+    """
+    CREATE TRIGGER items_tree_version_delete_trigger
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_tree_version_trigger();
+    """,
+]
+
+# Bound memory use across all users in this process
+DEFAULT_MAX_ENTRIES = 2000
+
+# Tokens of a user who has never written a category, location or item
+_INITIAL_TOKEN = UUID(int=0)
+
+TreeKind = Literal["category_tree", "location_tree", "category_templates"]
+
+
+@dataclass(frozen=True)
+class TreeVersions:
+    """A user's current version tokens."""
+
+    categories: UUID = _INITIAL_TOKEN
+    locations: UUID = _INITIAL_TOKEN
+    items: UUID = _INITIAL_TOKEN
+
+    def tokens(self, kind: TreeKind) -> tuple[UUID, ...]:
+        """The tokens covering everything the given kind is built from."""
+        if kind == "category_tree":
+            return (self.categories, self.items)
+        if kind == "location_tree":
+            return (self.locations, self.items)
+        return (self.categories,)
+
+    def etag(self, kind: TreeKind) -> str:
+        """Strong ETag of the given kind at these versions."""
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(kind.encode())
+        for token in self.tokens(kind):
+            digest.update(token.bytes)
+        return f'"{digest.hexdigest()}"'
+
+
+async def get_tree_versions(session: AsyncSession, user_id: UUID) -> TreeVersions:
+    """Read a user's version tokens.
+
+    Read them before the data they cover: a write committing in between then
+    leaves newer data under the older tokens, which are already outdated,
+    instead of older data under the current ones.
+    """
+    row = (
+        await session.execute(
+            select(
+                TreeVersion.categories, TreeVersion.locations, TreeVersion.items
+            ).where(TreeVersion.user_id == user_id)
+        )
+    ).first()
+    if row is None:
+        return TreeVersions()
+    return TreeVersions(*row)
+
+
+class TreeCache:
+    """In-memory LRU cache of trees and templates keyed by version tokens."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+
+    @staticmethod
+    def make_key(user_id: UUID, kind: TreeKind, versions: TreeVersions) -> tuple:
+        """Build the cache key for a user's tree or templates."""
+        return (user_id, kind, *versions.tokens(kind))
+
+    def get(self, key: tuple) -> Any | None:
+        """Return a cached value, or None if missing."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: tuple, value: Any) -> None:
+        """Store a value, evicting the least recently used entries."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached values."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache
+def get_tree_cache() -> TreeCache:
+    """Get the process-wide tree cache."""
+    return TreeCache()
+
+
+async def cached_tree_response(
+    request: Request,
+    session: AsyncSession,
+    user_id: UUID,
+    kind: TreeKind,
+    build: Callable[[], Awaitable[bytes]],
+) -> Response:
+    """Serve a tree as JSON with an ETag, from the cache when possible.
+
+    Args:
+        request: Incoming request, for If-None-Match
+        session: Database session
+        user_id: Owner of the inventory
+        kind: Which tree
+        build: Builds the serialized tree on a cache miss
+
+    Returns:
+        304 Not Modified if the client's copy is current, else the tree
+    """
+    versions = await get_tree_versions(session, user_id)
+    headers = {"ETag": versions.etag(kind), "Cache-Control": "private, no-cache"}
+    client_etags = request.headers.get("if-none-match", "").split(",")
+    if headers["ETag"] in (etag.strip().removeprefix("W/") for etag in client_etags):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cache = get_tree_cache()
+    key = cache.make_key(user_id, kind, versions)
+    content = cache.get(key)
+    if content is None:
+        content = await build()
+        cache.set(key, content)
+    return Response(content=content, media_type="application/json", headers=headers)
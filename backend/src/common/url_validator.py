@@ -1,12 +1,18 @@
 """URL validation utilities for SSRF protection."""
 
+import asyncio
 import ipaddress
 import logging
 import os
 import socket
+import time
+from dataclasses import dataclass
 from functools import lru_cache
+from typing import Any
 from urllib.parse import urlparse
 
+import httpx
+
 logger = logging.getLogger(__name__)
 
 
@@ -96,6 +102,14 @@ BLOCKED_HOSTNAMES = {
 # Allowed URL schemes
 ALLOWED_SCHEMES = {"http", "https"}
 
+# getaddrinfo does not expose record TTLs, so resolved addresses are cached
+# for a short fixed time. Webhook retries and repeated deliveries to the same
+# host reuse the lookup while DNS changes are still picked up quickly.
+DNS_CACHE_TTL_SECONDS = 30
+DNS_CACHE_MAX_ENTRIES = 1024
+
+_dns_cache: dict[str, tuple[float, list[str]]] = {}
+
 
 class SSRFValidationError(ValueError):
     """Raised when URL validation fails due to SSRF risk."""
@@ -135,36 +149,85 @@ def is_ip_blocked(ip_str: str) -> bool:
         return True
 
 
+def _get_cached_addresses(hostname: str) -> list[str] | None:
+    """Return cached addresses for a hostname, or None if missing or expired."""
+    entry = _dns_cache.get(hostname)
+    if entry is None:
+        return None
+    expires_at, addresses = entry
+    if time.monotonic() > expires_at:
+        del _dns_cache[hostname]
+        return None
+    return addresses
+
+
+def _cache_addresses(hostname: str, addresses: list[str]) -> None:
+    """Cache resolved addresses for DNS_CACHE_TTL_SECONDS."""
+    if len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+        _dns_cache.clear()
+    _dns_cache[hostname] = (time.monotonic() + DNS_CACHE_TTL_SECONDS, addresses)
+
+
+def clear_dns_cache() -> None:
+    """Drop all cached DNS results."""
+    _dns_cache.clear()
+
+
+def _unique_addresses(results: list) -> list[str]:
+    """Extract unique IP addresses from getaddrinfo results, keeping order."""
+    return list(dict.fromkeys(str(result[4][0]) for result in results))
+
+
 def resolve_hostname(hostname: str) -> list[str]:
     """Resolve hostname to IP addresses."""
+    cached = _get_cached_addresses(hostname)
+    if cached is not None:
+        return cached
     try:
         # Get all IP addresses for the hostname
         results = socket.getaddrinfo(
             hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM
         )
-        return list({result[4][0] for result in results})
     except socket.gaierror as e:
         raise SSRFValidationError(f"Failed to resolve hostname: {e}") from e
+    addresses = _unique_addresses(results)
+    _cache_addresses(hostname, addresses)
+    return addresses
 
 
-def validate_webhook_url(url: str) -> str:
+async def resolve_hostname_async(hostname: str) -> list[str]:
+    """Resolve hostname to IP addresses without blocking the event loop.
+
+    Uses the loop's resolver (run in its default executor) and shares the
+    short-lived cache with resolve_hostname.
     """
-    Validate a webhook URL for SSRF vulnerabilities.
+    cached = _get_cached_addresses(hostname)
+    if cached is not None:
+        return cached
+    loop = asyncio.get_running_loop()
+    try:
+        results = await loop.getaddrinfo(
+            hostname, None, family=socket.AF_UNSPEC, type=socket.SOCK_STREAM
+        )
+    except socket.gaierror as e:
+        raise SSRFValidationError(f"Failed to resolve hostname: {e}") from e
+    addresses = _unique_addresses(results)
+    _cache_addresses(hostname, addresses)
+    return addresses
 
-    This function performs comprehensive validation:
-    1. Checks URL scheme (only http/https allowed)
-    2. Checks for blocked hostnames
-    3. Resolves hostname and checks all resulting IPs against blocked networks
 
-    Args:
-        url: The URL to validate
+@dataclass(frozen=True)
+class ValidatedURL:
+    """A webhook URL that passed SSRF validation."""
 
-    Returns:
-        The validated URL string
+    url: str
+    hostname: str
+    # Validated address to connect to; None if DNS resolution was skipped
+    ip: str | None
 
-    Raises:
-        SSRFValidationError: If the URL poses an SSRF risk
-    """
+
+def _check_url(url: str) -> str:
+    """Check scheme and hostname of a URL, returning the hostname."""
     try:
         parsed = urlparse(url)
     except Exception as e:
@@ -181,41 +244,44 @@ def validate_webhook_url(url: str) -> str:
         raise SSRFValidationError("URL must contain a hostname")
 
     # Check for blocked hostnames
-    hostname_lower = hostname.lower()
-    if hostname_lower in BLOCKED_HOSTNAMES:
+    if hostname.lower() in BLOCKED_HOSTNAMES:
         raise SSRFValidationError(f"Hostname '{hostname}' is not allowed")
 
-    # Check if hostname is already an IP address
+    return hostname
+
+
+def _check_ip_literal(hostname: str) -> str | None:
+    """Check a hostname that is an IP address, returning the IP if it is one."""
     try:
         ip = ipaddress.ip_address(hostname)
-        if is_ip_blocked(str(ip)):
-            raise SSRFValidationError(
-                f"IP address '{hostname}' is in a blocked network range"
-            )
-        return url
     except ValueError:
-        # Not an IP address, continue to resolve hostname
-        pass
+        # Not an IP address, needs to be resolved
+        return None
+    if is_ip_blocked(str(ip)):
+        raise SSRFValidationError(
+            f"IP address '{hostname}' is in a blocked network range"
+        )
+    return str(ip)
+
 
+def _is_safe_test_domain(hostname: str) -> bool:
+    """Check whether DNS resolution can be skipped for a test domain."""
     # In test mode, allow safe domains without DNS resolution
     # This is used for testing webhooks without requiring real DNS
-    if _is_dns_skip_enabled():
-        # Check if base domain (without subdomain) is in safe test domains
-        domain_parts = hostname_lower.split(".")
-        if len(domain_parts) >= 2:
-            base_domain = ".".join(domain_parts[-2:])
-            if base_domain in SAFE_TEST_DOMAINS:
-                logger.debug(f"Skipping DNS resolution for test domain: {hostname}")
-                return url
-
-    # Resolve hostname and check all resulting IPs
-    try:
-        ip_addresses = resolve_hostname(hostname)
-    except SSRFValidationError:
-        raise
-    except Exception as e:
-        raise SSRFValidationError(f"Failed to validate hostname: {e}") from e
-
+    if not _is_dns_skip_enabled():
+        return False
+    # Check if base domain (without subdomain) is in safe test domains
+    domain_parts = hostname.lower().split(".")
+    if len(domain_parts) >= 2:
+        base_domain = ".".join(domain_parts[-2:])
+        if base_domain in SAFE_TEST_DOMAINS:
+            logger.debug(f"Skipping DNS resolution for test domain: {hostname}")
+            return True
+    return False
+
+
+def _check_resolved_addresses(hostname: str, ip_addresses: list[str]) -> None:
+    """Check that every address a hostname resolves to is allowed."""
     if not ip_addresses:
         raise SSRFValidationError(f"Hostname '{hostname}' did not resolve to any IP")
 
@@ -228,9 +294,105 @@ def validate_webhook_url(url: str) -> str:
                 f"Hostname '{hostname}' resolves to a blocked network range"
             )
 
+
+def validate_webhook_url(url: str) -> str:
+    """
+    Validate a webhook URL for SSRF vulnerabilities.
+
+    This function performs comprehensive validation:
+    1. Checks URL scheme (only http/https allowed)
+    2. Checks for blocked hostnames
+    3. Resolves hostname and checks all resulting IPs against blocked networks
+
+    Args:
+        url: The URL to validate
+
+    Returns:
+        The validated URL string
+
+    Raises:
+        SSRFValidationError: If the URL poses an SSRF risk
+    """
+    hostname = _check_url(url)
+    if _check_ip_literal(hostname) or _is_safe_test_domain(hostname):
+        return url
+
+    # Resolve hostname and check all resulting IPs
+    try:
+        ip_addresses = resolve_hostname(hostname)
+    except SSRFValidationError:
+        raise
+    except Exception as e:
+        raise SSRFValidationError(f"Failed to validate hostname: {e}") from e
+
+    _check_resolved_addresses(hostname, ip_addresses)
     return url
 
 
+async def validate_webhook_url_async(url: str) -> ValidatedURL:
+    """
+    Validate a webhook URL for SSRF vulnerabilities from async code.
+
+    Performs the same checks as validate_webhook_url, resolving the hostname
+    without blocking the event loop. The returned IP should be used for the
+    connection (see PinnedIPTransport) so a DNS change between validation and
+    connect cannot redirect the request to a blocked address.
+
+    Args:
+        url: The URL to validate
+
+    Returns:
+        ValidatedURL with the address to connect to
+
+    Raises:
+        SSRFValidationError: If the URL poses an SSRF risk
+    """
+    hostname = _check_url(url)
+    ip = _check_ip_literal(hostname)
+    if ip:
+        return ValidatedURL(url=url, hostname=hostname, ip=ip)
+    if _is_safe_test_domain(hostname):
+        return ValidatedURL(url=url, hostname=hostname, ip=None)
+
+    try:
+        ip_addresses = await resolve_hostname_async(hostname)
+    except SSRFValidationError:
+        raise
+    except Exception as e:
+        raise SSRFValidationError(f"Failed to validate hostname: {e}") from e
+
+    _check_resolved_addresses(hostname, ip_addresses)
+    return ValidatedURL(url=url, hostname=hostname, ip=ip_addresses[0])
+
+
+class PinnedIPTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport that connects to an already-validated IP address.
+
+    Requests keep their original URL for the Host header and TLS SNI and
+    certificate checks, but the TCP connection goes to the pinned IP, so
+    the request cannot be rebound to a different address after validation.
+    """
+
+    def __init__(self, target: ValidatedURL, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.target = target
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.target.ip is not None:
+            if request.url.host != self.target.hostname.lower():
+                raise SSRFValidationError(
+                    f"Request to '{request.url.host}' does not match the "
+                    f"validated host '{self.target.hostname}'"
+                )
+            if request.url.scheme == "https":
+                request.extensions = {
+                    **request.extensions,
+                    "sni_hostname": request.url.host,
+                }
+            request.url = request.url.copy_with(host=self.target.ip)
+        return await super().handle_async_request(request)
+
+
 def validate_webhook_url_sync(url: str) -> str:
     """
     Synchronous wrapper for webhook URL validation.
@@ -1,14 +1,32 @@
+"""
+Database engines and sessions.
+
+With DATABASE_REPLICA_URL set, sessions of GET and HEAD requests send their
+plain SELECTs to a streaming read replica (RoutingSession). Replicas lag
+behind the primary, so reads keep to the primary where a stale answer would
+show: after the session's own first write, and for ReplicaPins' window after
+a user commits a write, so the next page they load shows what they saved.
+Pins live in the memory of the worker that committed the write: with the
+replica configured, run a single worker (or sticky sessions), or a user's
+next request may land on a worker that does not know they wrote.
+The RLS tenant (set_tenant_context) is re-applied to every transaction
+either database begins.
+"""
+
 import logging
+import time
+from collections import OrderedDict
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import Depends
-from sqlalchemy import text
+from fastapi import Depends, Request
+from sqlalchemy import CompoundSelect, Select, event, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 
+from src.common.metrics import TimedAsyncQueuePool, instrument_engine
 from src.config import Settings
 
 logger = logging.getLogger(__name__)
@@ -20,20 +38,78 @@ class Base(DeclarativeBase):
     pass
 
 
-def create_engine(settings: Settings):
-    """Create async database engine."""
+# Request methods whose sessions may read from the replica
+_READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def create_engine(settings: Settings, url: str | None = None):
+    """Create async database engine (for settings.database_url by default)."""
     return create_async_engine(
-        settings.database_url,
+        url or settings.database_url,
         echo=settings.debug,
         pool_pre_ping=True,
+        poolclass=TimedAsyncQueuePool,
+    )
+
+
+def _is_plain_select(clause) -> bool:
+    """Whether a statement only reads: a SELECT without FOR UPDATE/SHARE."""
+    return (
+        isinstance(clause, Select | CompoundSelect) and clause._for_update_arg is None
     )
 
 
+class RoutingSession(Session):
+    """Session that sends plain SELECTs to the read replica, if given one.
+
+    use_replica() gives a session the replica. Its first statement that may
+    write (a flush, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE or raw SQL)
+    moves it to the primary for good, so it reads its own writes. Sessions
+    without a replica behave like a plain Session.
+    """
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        plain_select = not self._flushing and _is_plain_select(clause)
+        if not plain_select:
+            self.info["wrote"] = True
+            self.info["on_primary"] = True
+        replica = self.info.get("replica")
+        if replica is not None and not self.info.get("on_primary"):
+            return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+class ReplicaPins:
+    """Users whose reads stay on the primary for a while after they write.
+
+    Held in process memory, so only the worker that committed the write
+    knows about it; see the module docstring.
+    """
+
+    def __init__(self, seconds: float):
+        self._seconds = seconds
+        self._until: OrderedDict[UUID, float] = OrderedDict()
+
+    def pin(self, user_id: UUID) -> None:
+        """Keep the user's reads on the primary for the pin window."""
+        now = time.monotonic()
+        self._until[user_id] = now + self._seconds
+        self._until.move_to_end(user_id)
+        # The window is the same for everyone, so the oldest pins end first
+        while self._until and next(iter(self._until.values())) <= now:
+            self._until.popitem(last=False)
+
+    def is_pinned(self, user_id: UUID) -> bool:
+        """Whether the user wrote within the pin window."""
+        return self._until.get(user_id, 0.0) > time.monotonic()
+
+
 def create_session_factory(engine) -> async_sessionmaker[AsyncSession]:
     """Create async session factory."""
     return async_sessionmaker(
         engine,
         class_=AsyncSession,
+        sync_session_class=RoutingSession,
         expire_on_commit=False,
         autocommit=False,
         autoflush=False,
@@ -42,6 +118,8 @@ def create_session_factory(engine) -> async_sessionmaker[AsyncSession]:
 
 # Global engine and session factory (initialized on startup)
 _engine = None
+_replica_engine = None
+_replica_pins: ReplicaPins | None = None
 _session_factory = None
 _db_host = "unknown"  # Stored for logging (without credentials)
 
@@ -58,19 +136,108 @@ def _extract_db_host(database_url: str) -> str:
 
 
 def init_db(settings: Settings):
-    """Initialize database engine and session factory."""
-    global _engine, _session_factory, _db_host
+    """Initialize database engines and session factory."""
+    global _engine, _replica_engine, _replica_pins, _session_factory, _db_host
     _engine = create_engine(settings)
+    instrument_engine(_engine, settings.slow_query_threshold_ms)
     _session_factory = create_session_factory(_engine)
     _db_host = _extract_db_host(settings.database_url)
     logger.info(f"Database engine initialized: host={_db_host}")
 
+    if settings.database_replica_url:
+        _replica_engine = create_engine(settings, settings.database_replica_url)
+        instrument_engine(
+            _replica_engine, settings.slow_query_threshold_ms, pool_gauges=False
+        )
+        _replica_pins = ReplicaPins(settings.replica_pin_seconds)
+        replica_host = _extract_db_host(settings.database_replica_url)
+        logger.info(f"Read replica engine initialized: host={replica_host}")
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession] | None:
+    """Return the global session factory, or None if the database is not initialized.
+
+    Used by services that need to open additional short-lived sessions
+    alongside the request session (e.g. concurrent AI tool execution).
+    """
+    return _session_factory
+
 
 async def close_db():
     """Close database connections."""
-    global _engine
+    global _engine, _replica_engine
     if _engine:
         await _engine.dispose()
+    if _replica_engine:
+        await _replica_engine.dispose()
+        _replica_engine = None
+
+
+def use_replica(session: AsyncSession) -> None:
+    """Send the session's plain SELECTs to the read replica, if configured.
+
+    Only for sessions whose work is reading: see RoutingSession for how
+    writes and the session's user keep it on the primary.
+    """
+    if _replica_engine is not None:
+        session.info["replica"] = _replica_engine.sync_engine
+
+
+def set_session_user(session: AsyncSession, user_id: UUID) -> None:
+    """Record the user a session works for.
+
+    The session stays on the primary if the user is pinned, and its
+    committed writes pin the user.
+    """
+    session.info["user_id"] = user_id
+    if _replica_pins is not None and _replica_pins.is_pinned(user_id):
+        session.info["on_primary"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_writer(session: Session) -> None:
+    if not session.info.pop("wrote", False):
+        return
+    user_id = session.info.get("user_id")
+    if user_id is None:
+        # Bookkeeping before the user is known (an API key's last use):
+        # nothing the request reads back, so it can return to the replica
+        session.info.pop("on_primary", None)
+    elif _replica_pins is not None:
+        _replica_pins.pin(user_id)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_writes(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+def _tenant_statement(user_id: str) -> Select:
+    # set_config(..., true) is SET LOCAL that takes parameters, and a SELECT,
+    # so it can run on the replica
+    return select(func.set_config("app.current_user_id", user_id, True))
+
+
+async def set_tenant_context(session: AsyncSession, user_id: UUID) -> None:
+    """Set the RLS tenant (app.current_user_id) for the rest of the session.
+
+    The setting is transaction-local; sessions re-apply it to every
+    transaction they begin afterwards, on the primary and the replica alike.
+
+    Args:
+        session: Database session
+        user_id: Tenant whose rows RLS policies let through
+    """
+    session.info["tenant_user_id"] = str(user_id)
+    if session.in_transaction():
+        await session.execute(_tenant_statement(str(user_id)))
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_tenant_context(session: Session, _transaction, connection) -> None:
+    user_id = session.info.get("tenant_user_id")
+    if user_id is not None:
+        connection.execute(_tenant_statement(user_id))
 
 
 @asynccontextmanager
@@ -78,30 +245,40 @@ async def get_tenant_session(user_id: UUID) -> AsyncGenerator[AsyncSession, None
     """
     Get a database session with RLS tenant context set.
 
-    This sets the PostgreSQL session variable that RLS policies use
-    to filter data by user_id.
+    This sets the PostgreSQL setting that RLS policies use to filter data
+    by user_id.
     """
     if _session_factory is None:
         raise RuntimeError("Database not initialized. Call init_db() first.")
 
     async with _session_factory() as session:
-        # Set the tenant context for RLS
-        await session.execute(
-            text("SET app.current_user_id = :user_id"),
-            {"user_id": str(user_id)},
-        )
-        try:
-            yield session
-        finally:
-            # Reset the tenant context
-            await session.execute(text("RESET app.current_user_id"))
+        await set_tenant_context(session, user_id)
+        yield session
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Get a database session without tenant context.
 
     Use this for operations that don't need RLS (e.g., user creation during OAuth).
+    Sessions of GET and HEAD requests read from the replica, if configured.
+    """
+    if _session_factory is None:
+        raise RuntimeError("Database not initialized. Call init_db() first.")
+
+    async with _session_factory() as session:
+        if request.method in _READ_METHODS:
+            use_replica(session)
+        yield session
+
+
+@asynccontextmanager
+async def background_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Open a database session for work outside a request (background tasks).
+
+    Always uses the primary: background work usually follows a write that
+    the replica may not have yet.
     """
     if _session_factory is None:
         raise RuntimeError("Database not initialized. Call init_db() first.")
@@ -53,6 +53,21 @@ class ImageRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, image_ids: list[UUID]) -> dict[UUID, Image]:
+        """Get several images by ID in one query, keyed by ID.
+
+        IDs that don't exist or belong to another user are left out.
+        """
+        if not image_ids:
+            return {}
+        result = await self.session.execute(
+            select(Image).where(
+                Image.id.in_(image_ids),
+                Image.user_id == self.user_id,
+            )
+        )
+        return {image.id: image for image in result.scalars().all()}
+
     async def get_by_item(self, item_id: UUID) -> list[Image]:
         """Get all images for an item."""
         result = await self.session.execute(
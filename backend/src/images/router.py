@@ -271,9 +271,10 @@ async def classify_images(
 
     # Get all image records
     repo = ImageRepository(session, user_id)
+    images_by_id = await repo.get_by_ids(data.image_ids)
     images = []
     for image_id in data.image_ids:
-        image = await repo.get_by_id(image_id)
+        image = images_by_id.get(image_id)
         if not image:
             logger.warning(
                 f"Classification failed - image not found: user_id={user_id}, "
@@ -6,6 +6,7 @@ from pathlib import Path
 import aiofiles
 from PIL import Image
 
+from src.common.metrics import IMAGE_PROCESSING_DURATION
 from src.config import Settings, get_settings
 
 # Default thumbnail size (width x height)
@@ -97,20 +98,21 @@ class LocalStorage:
             The storage path for the thumbnail, or None if generation fails.
         """
         try:
-            # Open image from bytes
-            img = Image.open(io.BytesIO(content))
+            with IMAGE_PROCESSING_DURATION.labels("thumbnail").time():
+                # Open image from bytes
+                img = Image.open(io.BytesIO(content))
 
-            # Convert to RGB if necessary (for PNG with transparency, etc.)
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
+                # Convert to RGB if necessary (for PNG with transparency, etc.)
+                if img.mode in ("RGBA", "P"):
+                    img = img.convert("RGB")
 
-            # Create thumbnail (maintains aspect ratio)
-            img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+                # Create thumbnail (maintains aspect ratio)
+                img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
 
-            # Save to bytes
-            thumb_buffer = io.BytesIO()
-            img.save(thumb_buffer, format="JPEG", quality=85, optimize=True)
-            thumb_content = thumb_buffer.getvalue()
+                # Save to bytes
+                thumb_buffer = io.BytesIO()
+                img.save(thumb_buffer, format="JPEG", quality=85, optimize=True)
+                thumb_content = thumb_buffer.getvalue()
 
             # Generate thumbnail filename
             thumb_filename = self._generate_filename(original_filename)
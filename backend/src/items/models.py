@@ -1,8 +1,20 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String, func
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +25,19 @@ class Item(Base):
     """Item model - core inventory entity."""
 
     __tablename__ = "items"
+    __table_args__ = (
+        # Created by migration 026 with the search_vector trigger
+        Index("ix_items_search_vector", "search_vector", postgresql_using="gin"),
+        # Created by migration 003; serves tag filters (tags @> ARRAY[...])
+        Index("ix_items_tags_gin", "tags", postgresql_using="gin"),
+        # Created by migration 035; serves attribute filters (attributes @> {...})
+        Index(
+            "ix_items_attributes_path_ops",
+            "attributes",
+            postgresql_using="gin",
+            postgresql_ops={"attributes": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True, server_default=func.gen_random_uuid()
@@ -35,8 +60,9 @@ class Item(Base):
     attributes: Mapped[dict] = mapped_column(JSONB, default=dict)
     tags: Mapped[list[str]] = mapped_column(ARRAY(String(100)), default=list)
     ai_classification: Mapped[dict] = mapped_column(JSONB, default=dict)
-    # Full-text search vector (updated by trigger in database)
-    # Weights: A=name (highest), B=description, C=tags, D=attributes
+    # Full-text search vector (updated by trigger in database, see
+    # src.items.search_vector)
+    # Weights: A=name (highest), B=description, C=tags, D=attribute values
     search_vector = mapped_column(TSVECTOR, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -74,9 +100,13 @@ class Item(Base):
 
 
 class ItemCheckInOut(Base):
-    """Track item check-in/out events for usage history."""
+    """Track item check-in/out events for usage history.
+
+    Partitioned by month on created_at (see src.common.partitions).
+    """
 
     __tablename__ = "item_check_in_outs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True, server_default=func.gen_random_uuid()
@@ -94,7 +124,7 @@ class ItemCheckInOut(Base):
         DateTime(timezone=True), server_default=func.now(), index=True
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now()
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
     )
 
     # Relationships
@@ -102,6 +132,118 @@ class ItemCheckInOut(Base):
     item: Mapped["Item"] = relationship(back_populates="check_in_outs")
 
 
+class UserItemStats(Base):
+    """Per-user inventory totals for the dashboard.
+
+    Maintained by statement-level triggers on items (see src.items.rollups).
+    category_counts and location_counts map a category/location id to its
+    item count, with "" for items that have none; ids with no items are
+    dropped, so the number of other keys is the number of groups in use.
+    """
+
+    __tablename__ = "user_item_stats"
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_items: Mapped[int] = mapped_column(Integer, server_default="0")
+    total_quantity: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    category_counts: Mapped[dict] = mapped_column(
+        JSONB, server_default=text("'{}'::jsonb")
+    )
+    location_counts: Mapped[dict] = mapped_column(
+        JSONB, server_default=text("'{}'::jsonb")
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class ItemDailyActivity(Base):
+    """Items created per user per UTC day, maintained by triggers on items."""
+
+    __tablename__ = "item_daily_activity"
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    items_created: Mapped[int] = mapped_column(Integer, server_default="0")
+
+
+class ItemUsageStats(Base):
+    """Check-out count and latest activity per item.
+
+    Maintained by a trigger on item_check_in_outs, which is append-only.
+    """
+
+    __tablename__ = "item_usage_stats"
+    __table_args__ = (
+        Index(
+            "ix_item_usage_stats_user_check_outs",
+            "user_id",
+            text("check_out_count DESC"),
+        ),
+        Index(
+            "ix_item_usage_stats_user_last_used",
+            "user_id",
+            text("last_used_at DESC"),
+        ),
+    )
+
+    item_id: Mapped[UUID] = mapped_column(
+        ForeignKey("items.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    check_out_count: Mapped[int] = mapped_column(Integer, server_default="0")
+    last_used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_action_type: Mapped[str | None] = mapped_column(String(20))
+
+
+class ItemTag(Base):
+    """Number of a user's items carrying each tag, for the tag picker.
+
+    Maintained by statement-level triggers on items (see src.items.rollups);
+    tags no item carries any more are removed.
+    """
+
+    __tablename__ = "item_tags"
+    __table_args__ = (
+        Index("ix_item_tags_user_count", "user_id", text("item_count DESC")),
+    )
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    tag: Mapped[str] = mapped_column(String(100), primary_key=True)
+    item_count: Mapped[int] = mapped_column(Integer, server_default="0")
+
+
+class ItemSpecificationKey(Base):
+    """Number of a user's items having each specification key.
+
+    Read as hints for AI classification; maintained by statement-level
+    triggers on items (see src.items.rollups) like ItemTag.
+    """
+
+    __tablename__ = "item_specification_keys"
+    __table_args__ = (
+        Index(
+            "ix_item_specification_keys_user_count",
+            "user_id",
+            text("item_count DESC"),
+        ),
+    )
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    item_count: Mapped[int] = mapped_column(Integer, server_default="0")
+
+
 # Import at bottom to avoid circular imports
 from src.categories.models import Category  # noqa: E402, F811
 from src.gridfinity.models import GridfinityPlacement  # noqa: E402, F811
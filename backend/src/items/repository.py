@@ -1,15 +1,24 @@
-import json
 from difflib import SequenceMatcher
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, or_, select, text
+from sqlalchemy import func, insert, or_, select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy_utils import Ltree
 
 from src.categories.models import Category
+from src.common.models import TreeVersion
 from src.images.schemas import Specification
-from src.items.models import Item, ItemCheckInOut
+from src.items.models import (
+    Item,
+    ItemCheckInOut,
+    ItemDailyActivity,
+    ItemSpecificationKey,
+    ItemTag,
+    ItemUsageStats,
+    UserItemStats,
+)
 from src.items.schemas import (
     BatchItemCreate,
     BatchItemResult,
@@ -24,6 +33,34 @@ from src.items.schemas import (
 )
 from src.locations.models import Location
 
+# ts_headline options for search snippets: up to two fragments around the
+# matches, with the matched words wrapped in <mark>
+_HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=8, "
+    'FragmentDelimiter=" … "'
+)
+
+
+def _tsquery(search: str):
+    """Full-text query for user input in web search syntax.
+
+    Words are ANDed; "quoted phrases", OR and -negation are supported, and
+    malformed input never raises.
+    """
+    return func.websearch_to_tsquery("english", search)
+
+
+def _search_rank(tsquery):
+    """Relevance of an item to a query, using the A-D weights of search_vector."""
+    return func.ts_rank_cd(Item.search_vector, tsquery)
+
+
+def _escaped(column):
+    """HTML-escape a text column, so headlines only contain our <mark> tags."""
+    return func.replace(
+        func.replace(func.replace(column, "&", "&amp;"), "<", "&lt;"), ">", "&gt;"
+    )
+
 
 class ItemRepository:
     """Repository for item database operations."""
@@ -66,6 +103,17 @@ class ItemRepository:
         if result.scalar_one_or_none() is None:
             raise ValueError(f"Location {location_id} not found or access denied")
 
+    async def _owned_ids(
+        self, model: type[Category] | type[Location], ids: set[UUID]
+    ) -> set[UUID]:
+        """Return which of the given category or location ids the user owns."""
+        if not ids:
+            return set()
+        result = await self.session.execute(
+            select(model.id).where(model.id.in_(ids), model.user_id == self.user_id)
+        )
+        return set(result.scalars().all())
+
     def _base_query(self):
         """Base query with eager loading."""
         return (
@@ -205,26 +253,20 @@ class ItemRepository:
                 query = query.where(Item.location_id == location_id)
 
         if search:
-            # Use PostgreSQL full-text search for word-based matching
-            # plainto_tsquery handles multi-word queries and common words
-            query = query.where(
-                Item.search_vector.op("@@")(func.plainto_tsquery("english", search))
-            )
+            # Full-text search over the weighted search_vector (GIN indexed)
+            tsquery = _tsquery(search)
+            query = query.where(Item.search_vector.op("@@")(tsquery))
 
-        # Filter by tags (items must have ALL specified tags)
+        # Filter by tags (items must have ALL specified tags); @> can use
+        # the GIN index on tags
         if tags:
-            for tag in tags:
-                query = query.where(Item.tags.any(tag))
+            query = query.where(Item.tags.contains(tags))
 
         # Filter by JSONB attributes
         if attribute_filters:
             for key, value in attribute_filters.items():
                 # Use JSONB containment operator for filtering
-                query = query.where(
-                    text("attributes @> :attr").bindparams(
-                        attr=json.dumps({key: value})
-                    )
-                )
+                query = query.where(Item.attributes.contains({key: value}))
 
         if low_stock_only:
             query = query.where(
@@ -247,7 +289,11 @@ class ItemRepository:
                 )
             )
 
-        query = query.order_by(Item.updated_at.desc()).offset(offset).limit(limit)
+        # Search results are ordered by relevance, everything else by recency
+        if search:
+            query = query.order_by(_search_rank(tsquery).desc())
+        query = query.order_by(Item.updated_at.desc(), Item.id)
+        query = query.offset(offset).limit(limit)
 
         result = await self.session.execute(query)
         return list(result.scalars().all())
@@ -291,22 +337,14 @@ class ItemRepository:
                 query = query.where(Item.location_id == location_id)
 
         if search:
-            # Use PostgreSQL full-text search for word-based matching
-            query = query.where(
-                Item.search_vector.op("@@")(func.plainto_tsquery("english", search))
-            )
+            query = query.where(Item.search_vector.op("@@")(_tsquery(search)))
 
         if tags:
-            for tag in tags:
-                query = query.where(Item.tags.any(tag))
+            query = query.where(Item.tags.contains(tags))
 
         if attribute_filters:
             for key, value in attribute_filters.items():
-                query = query.where(
-                    text("attributes @> :attr").bindparams(
-                        attr=json.dumps({key: value})
-                    )
-                )
+                query = query.where(Item.attributes.contains({key: value}))
 
         if low_stock_only:
             query = query.where(
@@ -332,6 +370,25 @@ class ItemRepository:
         result = await self.session.execute(query)
         return result.scalar_one()
 
+    async def get_inventory_version(self) -> str:
+        """Get a cheap fingerprint of the user's inventory.
+
+        Changes whenever items are created, updated or deleted, or categories
+        and locations are added, changed or removed. Read from the tokens
+        triggers keep in tree_versions, so it costs a primary key lookup.
+        Used to key cached AI tool results.
+        """
+        result = await self.session.execute(
+            select(
+                TreeVersion.categories, TreeVersion.locations, TreeVersion.inventory
+            ).where(TreeVersion.user_id == self.user_id)
+        )
+        row = result.first()
+        if row is None:
+            # No row until the user's first write
+            return "-"
+        return ":".join(str(token) for token in row)
+
     async def get_by_id(self, item_id: UUID) -> Item | None:
         """Get an item by ID."""
         query = self._base_query().where(Item.id == item_id)
@@ -425,51 +482,83 @@ class ItemRepository:
         Returns:
             List of BatchItemResult with success/failure status for each item
         """
-        results: list[BatchItemResult] = []
+        # Check ownership of every referenced category and location up front,
+        # one query each, instead of two queries per item
+        owned_category_ids = await self._owned_ids(
+            Category, {d.category_id for d in items_data if d.category_id}
+        )
+        owned_location_ids = await self._owned_ids(
+            Location, {d.location_id for d in items_data if d.location_id}
+        )
 
+        results: list[BatchItemResult] = []
+        rows: list[dict] = []
         for data in items_data:
-            try:
-                # Validate foreign key ownership
-                await self._validate_category_ownership(data.category_id)
-                await self._validate_location_ownership(data.location_id)
-
-                item = Item(
-                    user_id=self.user_id,
-                    name=data.name,
-                    description=data.description,
-                    category_id=data.category_id,
-                    location_id=data.location_id,
-                    quantity=data.quantity,
-                    quantity_unit=data.quantity_unit,
-                    min_quantity=data.min_quantity,
-                    price=data.price,
-                    attributes=data.attributes,
-                    tags=data.tags,
+            if data.category_id and data.category_id not in owned_category_ids:
+                error = f"Category {data.category_id} not found or access denied"
+            elif data.location_id and data.location_id not in owned_location_ids:
+                error = f"Location {data.location_id} not found or access denied"
+            else:
+                # Ids are generated here so the rows can go out as one
+                # multi-row INSERT without reading anything back
+                item_id = uuid4()
+                rows.append(
+                    {
+                        "id": item_id,
+                        "user_id": self.user_id,
+                        "name": data.name,
+                        "description": data.description,
+                        "category_id": data.category_id,
+                        "location_id": data.location_id,
+                        "quantity": data.quantity,
+                        "quantity_unit": data.quantity_unit,
+                        "min_quantity": data.min_quantity,
+                        "price": data.price,
+                        "attributes": data.attributes,
+                        "tags": data.tags,
+                    }
                 )
-                self.session.add(item)
-                await self.session.flush()
-
                 results.append(
                     BatchItemResult(
-                        success=True,
-                        item_id=item.id,
-                        name=data.name,
-                        error=None,
+                        success=True, item_id=item_id, name=data.name, error=None
                     )
                 )
-            except Exception as e:
-                results.append(
-                    BatchItemResult(
-                        success=False,
-                        item_id=None,
-                        name=data.name,
-                        error=str(e),
-                    )
+                continue
+            results.append(
+                BatchItemResult(
+                    success=False, item_id=None, name=data.name, error=error
                 )
+            )
 
+        if rows:
+            try:
+                async with self.session.begin_nested():
+                    await self.session.execute(insert(Item), rows)
+            except DBAPIError:
+                # One bad row fails the whole statement; insert them one by
+                # one to tell which, keeping the others
+                await self._insert_rows_separately(rows, results)
         await self.session.commit()
         return results
 
+    async def _insert_rows_separately(
+        self, rows: list[dict], results: list[BatchItemResult]
+    ) -> None:
+        """Insert rows each in its own savepoint, marking failures in results."""
+        result_index = {r.item_id: i for i, r in enumerate(results) if r.success}
+        for row in rows:
+            try:
+                async with self.session.begin_nested():
+                    await self.session.execute(insert(Item), [row])
+            except DBAPIError as e:
+                index = result_index[row["id"]]
+                results[index] = BatchItemResult(
+                    success=False,
+                    item_id=None,
+                    name=results[index].name,
+                    error=str(e.orig),
+                )
+
     async def batch_update(
         self,
         item_ids: list[UUID],
@@ -526,19 +615,61 @@ class ItemRepository:
         await self.session.commit()
         return updated_ids
 
-    async def search(self, query: str, limit: int = 20) -> list[Item]:
+    async def search(
+        self, query: str, limit: int = 20, *, highlight: bool = False
+    ) -> list[tuple[Item, str | None]]:
         """Search items by name, description, tags, or specifications.
 
-        Uses PostgreSQL full-text search for word-based matching.
-        Supports multi-word queries where words can appear in any order.
+        Uses PostgreSQL full-text search in web search syntax: words may
+        appear in any order, and "quoted phrases", OR and -negation are
+        supported. Results are ranked by relevance, name matches first.
+
+        Args:
+            query: Search input
+            limit: Maximum number of results
+            highlight: Also return a snippet of each item's name, description
+                and tags with the matched words in <mark> tags (HTML-escaped
+                otherwise)
+
+        Returns:
+            (item, snippet) pairs, best match first; snippets are None unless
+            highlight is set
         """
-        result = await self.session.execute(
-            self._base_query()
-            .where(Item.search_vector.op("@@")(func.plainto_tsquery("english", query)))
-            .order_by(Item.name)
+        tsquery = _tsquery(query)
+        rank = _search_rank(tsquery)
+        # Rank and cut down to the page first, so snippets (which re-parse
+        # the item text) are only built for the items returned
+        ranked = (
+            select(Item.id, rank.label("rank"))
+            .where(
+                Item.user_id == self.user_id,
+                Item.search_vector.op("@@")(tsquery),
+            )
+            .order_by(rank.desc(), Item.name, Item.id)
             .limit(limit)
+            .subquery()
         )
-        return list(result.scalars().all())
+        statement = (
+            self._base_query()
+            .join(ranked, ranked.c.id == Item.id)
+            .order_by(ranked.c.rank.desc(), Item.name, Item.id)
+        )
+        if highlight:
+            document = func.concat_ws(
+                " ",
+                Item.name,
+                Item.description,
+                func.array_to_string(Item.tags, " "),
+            )
+            statement = statement.add_columns(
+                func.ts_headline(
+                    "english", _escaped(document), tsquery, _HEADLINE_OPTIONS
+                )
+            )
+            result = await self.session.execute(statement)
+            return [(item, snippet) for item, snippet in result.tuples()]
+        result = await self.session.execute(statement)
+        return [(item, None) for item in result.scalars()]
 
     async def get_facets(
         self,
@@ -616,7 +747,10 @@ class ItemRepository:
                     Item.attributes[key].isnot(None),
                     Item.attributes[key].astext != "",
                 )
-                .group_by(Item.attributes[key].astext)
+                # Group by the output column: a repeated attributes[key]
+                # expression gets its own bind parameter, which Postgres
+                # doesn't treat as the same grouping expression
+                .group_by(text("value"))
                 .order_by(func.count(Item.id).desc())
                 .limit(50)  # Limit facet values
             )
@@ -635,135 +769,101 @@ class ItemRepository:
         return facets, total_items
 
     async def get_all_tags(self, limit: int = 100) -> list[tuple[str, int]]:
-        """Get all unique tags with their counts."""
-        # Use unnest to expand the array and count occurrences
+        """Get all unique tags with their item counts, most used first.
+
+        Reads the item_tags counts maintained by triggers (see
+        src.items.rollups) instead of unnesting every item's tags.
+        """
         result = await self.session.execute(
-            select(
-                func.unnest(Item.tags).label("tag"),
-                func.count().label("count"),
-            )
-            .where(Item.user_id == self.user_id)
-            .group_by(text("tag"))
-            .order_by(text("count DESC"))
+            select(ItemTag.tag, ItemTag.item_count)
+            .where(ItemTag.user_id == self.user_id)
+            .order_by(ItemTag.item_count.desc(), ItemTag.tag)
             .limit(limit)
         )
-        return [(row.tag, row.count) for row in result.fetchall()]
+        return [(tag, count) for tag, count in result.tuples()]
 
     async def get_dashboard_stats(self, days: int = 30) -> dict:
-        """Get dashboard statistics including time series data."""
-        from datetime import UTC, datetime, timedelta
+        """Get dashboard statistics including time series data.
 
-        # Items created over time (last N days)
-        start_date = datetime.now(UTC) - timedelta(days=days)
+        Reads the rollups maintained by triggers (see src.items.rollups)
+        instead of aggregating the user's items.
+        """
+        from datetime import UTC, datetime, timedelta
 
-        date_trunc_expr = func.date_trunc("day", Item.created_at)
-        items_over_time_result = await self.session.execute(
-            select(
-                date_trunc_expr.label("date"),
-                func.count(Item.id).label("count"),
-            )
-            .where(
-                Item.user_id == self.user_id,
-                Item.created_at >= start_date,
+        stats = (
+            await self.session.execute(
+                select(
+                    UserItemStats.total_items,
+                    UserItemStats.total_quantity,
+                    UserItemStats.category_counts,
+                    UserItemStats.location_counts,
+                ).where(UserItemStats.user_id == self.user_id)
             )
-            .group_by(date_trunc_expr)
-            .order_by(date_trunc_expr)
+        ).first()
+        # Users without items have no stats row yet
+        total_items, total_quantity, category_counts, location_counts = (
+            stats if stats else (0, 0, {}, {})
         )
-        items_over_time = [
-            {"date": row.date.strftime("%Y-%m-%d"), "count": row.count}
-            for row in items_over_time_result.fetchall()
-        ]
 
-        # Fill in missing dates with 0 counts
-        date_counts = {item["date"]: item["count"] for item in items_over_time}
+        # Items created over time (last N days), with missing dates as 0
+        start_date = (datetime.now(UTC) - timedelta(days=days)).date()
+        activity_result = await self.session.execute(
+            select(ItemDailyActivity.day, ItemDailyActivity.items_created).where(
+                ItemDailyActivity.user_id == self.user_id,
+                ItemDailyActivity.day >= start_date,
+            )
+        )
+        date_counts = dict(activity_result.tuples().all())
         filled_data = []
-        current_date = start_date.date()
+        current_date = start_date
         end_date = datetime.now(UTC).date()
         while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
             filled_data.append(
-                {"date": date_str, "count": date_counts.get(date_str, 0)}
+                {
+                    "date": current_date.strftime("%Y-%m-%d"),
+                    "count": date_counts.get(current_date, 0),
+                }
             )
             current_date += timedelta(days=1)
 
-        # Items by category
-        items_by_category_result = await self.session.execute(
-            select(
-                func.coalesce(Category.name, "Uncategorized").label("name"),
-                func.count(Item.id).label("count"),
-            )
-            .select_from(Item)
-            .outerjoin(Category, Item.category_id == Category.id)
-            .where(Item.user_id == self.user_id)
-            .group_by(Category.name)
-            .order_by(func.count(Item.id).desc())
-            .limit(10)
-        )
-        items_by_category = [
-            {"name": row.name, "count": row.count}
-            for row in items_by_category_result.fetchall()
-        ]
-
-        # Items by location
-        items_by_location_result = await self.session.execute(
-            select(
-                func.coalesce(Location.name, "No Location").label("name"),
-                func.count(Item.id).label("count"),
-            )
-            .select_from(Item)
-            .outerjoin(Location, Item.location_id == Location.id)
-            .where(Item.user_id == self.user_id)
-            .group_by(Location.name)
-            .order_by(func.count(Item.id).desc())
-            .limit(10)
-        )
-        items_by_location = [
-            {"name": row.name, "count": row.count}
-            for row in items_by_location_result.fetchall()
-        ]
-
-        # Total items
-        total_items_result = await self.session.execute(
-            select(func.count(Item.id)).where(Item.user_id == self.user_id)
-        )
-        total_items = total_items_result.scalar_one()
-
-        # Total quantity
-        total_quantity_result = await self.session.execute(
-            select(func.coalesce(func.sum(Item.quantity), 0)).where(
-                Item.user_id == self.user_id
-            )
-        )
-        total_quantity = total_quantity_result.scalar_one()
-
-        # Categories used
-        categories_used_result = await self.session.execute(
-            select(func.count(func.distinct(Item.category_id))).where(
-                Item.user_id == self.user_id,
-                Item.category_id.isnot(None),
-            )
-        )
-        categories_used = categories_used_result.scalar_one()
-
-        # Locations used
-        locations_used_result = await self.session.execute(
-            select(func.count(func.distinct(Item.location_id))).where(
-                Item.user_id == self.user_id,
-                Item.location_id.isnot(None),
-            )
-        )
-        locations_used = locations_used_result.scalar_one()
-
         return {
             "items_over_time": filled_data,
-            "items_by_category": items_by_category,
-            "items_by_location": items_by_location,
+            "items_by_category": await self._top_groups(
+                Category, category_counts, "Uncategorized"
+            ),
+            "items_by_location": await self._top_groups(
+                Location, location_counts, "No Location"
+            ),
             "total_items": total_items,
             "total_quantity": total_quantity,
-            "categories_used": categories_used,
-            "locations_used": locations_used,
+            # Rollups only keep groups that still have items; "" is "none"
+            "categories_used": sum(1 for key in category_counts if key),
+            "locations_used": sum(1 for key in location_counts if key),
         }
 
+    async def _top_groups(
+        self,
+        model: type[Category] | type[Location],
+        counts: dict[str, int],
+        fallback_name: str,
+        limit: int = 10,
+    ) -> list[dict]:
+        """Name the largest groups of a category/location count rollup."""
+        top = sorted(counts.items(), key=lambda entry: -entry[1])[:limit]
+        names: dict[str, str] = {}
+        ids = [UUID(key) for key, _ in top if key]
+        if ids:
+            result = await self.session.execute(
+                select(model.id, model.name).where(
+                    model.id.in_(ids), model.user_id == self.user_id
+                )
+            )
+            names = {str(group_id): name for group_id, name in result.tuples()}
+        return [
+            {"name": names.get(key, fallback_name), "count": count}
+            for key, count in top
+        ]
+
     # Check-in/out methods
 
     async def create_check_in_out(
@@ -861,101 +961,53 @@ class ItemRepository:
     async def get_most_used_items(self, limit: int = 5) -> list[MostUsedItemResponse]:
         """Get items sorted by total check-outs for dashboard."""
         result = await self.session.execute(
-            select(
-                Item.id,
-                Item.name,
-                func.count(ItemCheckInOut.id).label("total_check_outs"),
-            )
-            .select_from(Item)
-            .join(ItemCheckInOut, ItemCheckInOut.item_id == Item.id)
+            select(Item, ItemUsageStats.check_out_count)
+            .join(ItemUsageStats, ItemUsageStats.item_id == Item.id)
             .where(
+                ItemUsageStats.user_id == self.user_id,
+                ItemUsageStats.check_out_count > 0,
                 Item.user_id == self.user_id,
-                ItemCheckInOut.action_type == "check_out",
             )
-            .group_by(Item.id, Item.name)
-            .order_by(func.count(ItemCheckInOut.id).desc())
+            .options(selectinload(Item.images))
+            .order_by(ItemUsageStats.check_out_count.desc())
             .limit(limit)
         )
-        rows = result.fetchall()
-
-        # Get primary images for these items
-        if rows:
-            item_ids = [row.id for row in rows]
-            items_with_images = await self.session.execute(
-                self._base_query().where(Item.id.in_(item_ids))
+        return [
+            MostUsedItemResponse(
+                id=item.id,
+                name=item.name,
+                total_check_outs=check_out_count,
+                primary_image_url=self._get_primary_image_url(item),
             )
-            items_map = {item.id: item for item in items_with_images.scalars().all()}
-
-            return [
-                MostUsedItemResponse(
-                    id=row.id,
-                    name=row.name,
-                    total_check_outs=row.total_check_outs,
-                    primary_image_url=self._get_primary_image_url(
-                        items_map.get(row.id)
-                    ),
-                )
-                for row in rows
-            ]
-        return []
+            for item, check_out_count in result.tuples()
+        ]
 
     async def get_recently_used_items(
         self, limit: int = 5
     ) -> list[RecentlyUsedItemResponse]:
         """Get items sorted by most recent activity."""
-        # Subquery to get latest activity per item
-        subquery = (
-            select(
-                ItemCheckInOut.item_id,
-                func.max(ItemCheckInOut.occurred_at).label("last_used"),
-            )
-            .where(ItemCheckInOut.user_id == self.user_id)
-            .group_by(ItemCheckInOut.item_id)
-            .subquery()
-        )
-
-        # Get items with their latest activity
         result = await self.session.execute(
-            select(
-                Item.id,
-                Item.name,
-                subquery.c.last_used,
-                ItemCheckInOut.action_type,
-            )
-            .select_from(Item)
-            .join(subquery, subquery.c.item_id == Item.id)
-            .join(
-                ItemCheckInOut,
-                (ItemCheckInOut.item_id == Item.id)
-                & (ItemCheckInOut.occurred_at == subquery.c.last_used),
+            select(Item, ItemUsageStats.last_used_at, ItemUsageStats.last_action_type)
+            .join(ItemUsageStats, ItemUsageStats.item_id == Item.id)
+            .where(
+                ItemUsageStats.user_id == self.user_id,
+                ItemUsageStats.last_used_at.isnot(None),
+                Item.user_id == self.user_id,
             )
-            .where(Item.user_id == self.user_id)
-            .order_by(subquery.c.last_used.desc())
+            .options(selectinload(Item.images))
+            .order_by(ItemUsageStats.last_used_at.desc())
             .limit(limit)
         )
-        rows = result.fetchall()
-
-        # Get primary images for these items
-        if rows:
-            item_ids = [row.id for row in rows]
-            items_with_images = await self.session.execute(
-                self._base_query().where(Item.id.in_(item_ids))
+        return [
+            RecentlyUsedItemResponse(
+                id=item.id,
+                name=item.name,
+                last_used=last_used,
+                action_type=action_type,
+                primary_image_url=self._get_primary_image_url(item),
             )
-            items_map = {item.id: item for item in items_with_images.scalars().all()}
-
-            return [
-                RecentlyUsedItemResponse(
-                    id=row.id,
-                    name=row.name,
-                    last_used=row.last_used,
-                    action_type=row.action_type,
-                    primary_image_url=self._get_primary_image_url(
-                        items_map.get(row.id)
-                    ),
-                )
-                for row in rows
-            ]
-        return []
+            for item, last_used, action_type in result.tuples()
+        ]
 
     def _get_primary_image_url(self, item: Item | None) -> str | None:
         """Get the primary image URL for an item."""
@@ -1221,37 +1273,15 @@ class ItemRepository:
         Returns:
             List of specification keys sorted by frequency
         """
-        # Query all items with specifications
-        query = select(Item.attributes).where(
-            Item.user_id == self.user_id,
-            Item.attributes.op("?")(
-                "specifications"
-            ),  # Check if 'specifications' key exists
+        # item_specification_keys is kept current by triggers on items
+        # (see src.items.rollups), so no item attributes are read here
+        result = await self.session.execute(
+            select(ItemSpecificationKey.key)
+            .where(
+                ItemSpecificationKey.user_id == self.user_id,
+                ItemSpecificationKey.item_count >= min_frequency,
+            )
+            .order_by(ItemSpecificationKey.item_count.desc(), ItemSpecificationKey.key)
+            .limit(limit)
         )
-
-        result = await self.session.execute(query)
-        all_attributes = [row[0] for row in result.fetchall()]
-
-        # Count frequency of each specification key
-        spec_key_counts: dict[str, int] = {}
-        for attrs in all_attributes:
-            if attrs and "specifications" in attrs:
-                specs = attrs.get("specifications")
-                # Handle new array format
-                if isinstance(specs, list):
-                    for spec in specs:
-                        if isinstance(spec, dict) and "key" in spec:
-                            key = spec["key"]
-                            spec_key_counts[key] = spec_key_counts.get(key, 0) + 1
-                # Handle legacy dict format
-                elif isinstance(specs, dict):
-                    for key in specs:
-                        spec_key_counts[key] = spec_key_counts.get(key, 0) + 1
-
-        # Filter by minimum frequency and sort by frequency
-        common_keys = [
-            key for key, count in spec_key_counts.items() if count >= min_frequency
-        ]
-        common_keys.sort(key=lambda k: spec_key_counts[k], reverse=True)
-
-        return common_keys[:limit]
+        return list(result.scalars())
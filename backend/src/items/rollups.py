@@ -0,0 +1,541 @@
+"""
+Dashboard rollups: per-user item totals, tag and specification key counts,
+daily item activity and per-item usage, kept current by statement-level
+triggers.
+
+Triggers on items update user_item_stats, item_tags,
+item_specification_keys and item_daily_activity once per statement from
+its transition tables, so bulk inserts, batch updates and cascading deletes
+(of a category, location or user) cost one rollup update rather than one
+per row. A trigger on item_check_in_outs does the same for
+item_usage_stats. Migrations 029, 034 and 035 install the triggers;
+TRIGGER_DDL is the same DDL for test databases built with create_all.
+
+The rollup tables are tenant-isolated by RLS like the tables they summarize
+(migration 039). The trigger functions are SECURITY DEFINER, so cascaded
+and admin writes, made without the owner's tenant context, still maintain
+them.
+
+If the rollups ever drift (e.g. after manual SQL with triggers disabled),
+rebuild them from the source tables:
+
+Usage:
+    uv run python -m src.items.rollups [--user-id UUID]
+"""
+
+import argparse
+import asyncio
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.config import get_settings
+from src.database import create_session_factory
+
+TRIGGER_DDL = [
+    # Add per-key deltas to a {key: count} object, dropping keys that reach 0
+    """
+    CREATE OR REPLACE FUNCTION item_rollup_merge(
+        counts jsonb, keys text[], deltas integer[]
+    ) RETURNS jsonb AS $$
+        SELECT coalesce(
+            jsonb_object_agg(key, total) FILTER (WHERE total > 0), '{}'::jsonb
+        )
+        FROM (
+            SELECT key, sum(delta) AS total
+            FROM (
+                SELECT key, value::integer FROM jsonb_each_text(counts)
+                UNION ALL
+                SELECT * FROM unnest(keys, deltas)
+            ) AS entries(key, delta)
+            GROUP BY key
+        ) AS totals
+    $$ LANGUAGE sql IMMUTABLE;
+    """,
+    # Apply item rows entering (+1) or leaving (-1) the rollups. Users are
+    # joined before inserting so a cascading user delete adds nothing.
+    """
+    CREATE OR REPLACE FUNCTION item_rollups_apply(
+        p_user_ids uuid[],
+        p_category_ids uuid[],
+        p_location_ids uuid[],
+        p_quantities integer[],
+        p_created_at timestamptz[],
+        p_deltas integer[]
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO user_item_stats (user_id)
+        SELECT DISTINCT c.user_id
+        FROM unnest(p_user_ids) AS c(user_id)
+        JOIN users u ON u.id = c.user_id
+        ON CONFLICT (user_id) DO NOTHING;
+
+        UPDATE user_item_stats s SET
+            total_items = s.total_items + d.items,
+            total_quantity = s.total_quantity + d.quantity,
+            category_counts = item_rollup_merge(
+                s.category_counts, d.category_keys, d.deltas
+            ),
+            location_counts = item_rollup_merge(
+                s.location_counts, d.location_keys, d.deltas
+            ),
+            updated_at = now()
+        FROM (
+            SELECT
+                c.user_id,
+                sum(c.delta) AS items,
+                sum(c.delta * coalesce(c.quantity, 0)) AS quantity,
+                array_agg(coalesce(c.category_id::text, '')) AS category_keys,
+                array_agg(coalesce(c.location_id::text, '')) AS location_keys,
+                array_agg(c.delta) AS deltas
+            FROM unnest(
+                p_user_ids, p_category_ids, p_location_ids, p_quantities, p_deltas
+            ) AS c(user_id, category_id, location_id, quantity, delta)
+            GROUP BY c.user_id
+        ) AS d
+        WHERE s.user_id = d.user_id;
+
+        INSERT INTO item_daily_activity (user_id, day, items_created)
+        SELECT c.user_id, (c.created_at AT TIME ZONE 'UTC')::date, sum(c.delta)
+        FROM unnest(p_user_ids, p_created_at, p_deltas)
+            AS c(user_id, created_at, delta)
+        JOIN users u ON u.id = c.user_id
+        GROUP BY 1, 2
+        HAVING sum(c.delta) <> 0
+        ON CONFLICT (user_id, day) DO UPDATE
+            SET items_created = item_daily_activity.items_created
+                + EXCLUDED.items_created;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION items_rollup_trigger() RETURNS trigger AS $$
+    DECLARE
+        c record;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT
+                array_agg(user_id) AS user_ids,
+                array_agg(category_id) AS category_ids,
+                array_agg(location_id) AS location_ids,
+                array_agg(quantity) AS quantities,
+                array_agg(created_at) AS created_at,
+                array_agg(1) AS deltas
+            INTO c FROM new_items;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT
+                array_agg(user_id) AS user_ids,
+                array_agg(category_id) AS category_ids,
+                array_agg(location_id) AS location_ids,
+                array_agg(quantity) AS quantities,
+                array_agg(created_at) AS created_at,
+                array_agg(-1) AS deltas
+            INTO c FROM old_items;
+        ELSE
+            -- Only rows whose rolled-up columns changed move between groups
+            WITH changed AS (
+                SELECT o.id
+                FROM old_items o
+                JOIN new_items n ON n.id = o.id
+                WHERE (o.user_id, o.category_id, o.location_id, o.quantity,
+                       o.created_at)
+                    IS DISTINCT FROM
+                      (n.user_id, n.category_id, n.location_id, n.quantity,
+                       n.created_at)
+            ), changes AS (
+                SELECT user_id, category_id, location_id, quantity, created_at,
+                       -1 AS delta
+                FROM old_items WHERE id IN (SELECT id FROM changed)
+                UNION ALL
+                SELECT user_id, category_id, location_id, quantity, created_at,
+                       1 AS delta
+                FROM new_items WHERE id IN (SELECT id FROM changed)
+            )
+            SELECT
+                array_agg(user_id) AS user_ids,
+                array_agg(category_id) AS category_ids,
+                array_agg(location_id) AS location_ids,
+                array_agg(quantity) AS quantities,
+                array_agg(created_at) AS created_at,
+                array_agg(delta) AS deltas
+            INTO c FROM changes;
+        END IF;
+
+        IF c.user_ids IS NOT NULL THEN
+            PERFORM item_rollups_apply(
+                c.user_ids, c.category_ids, c.location_ids, c.quantities,
+                c.created_at, c.deltas
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+    """,
+    """
+    CREATE TRIGGER items_rollup_insert_trigger
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_rollup_trigger();
+    """,
+    """
+    CREATE TRIGGER items_rollup_update_trigger
+    AFTER UPDATE ON items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_rollup_trigger();
+    """,
+    """
+    CREATE TRIGGER items_rollup_delete_trigger
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_rollup_trigger();
+    """,
+    # Add per-tag deltas to item_tags, dropping tags that reach 0. Users are
+    # joined before inserting so a cascading user delete adds nothing.
+    """
+    CREATE OR REPLACE FUNCTION item_tags_apply(
+        p_user_ids uuid[], p_tags text[], p_deltas integer[]
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO item_tags (user_id, tag, item_count)
+        SELECT c.user_id, c.tag, sum(c.delta)
+        FROM unnest(p_user_ids, p_tags, p_deltas) AS c(user_id, tag, delta)
+        JOIN users u ON u.id = c.user_id
+        GROUP BY 1, 2
+        HAVING sum(c.delta) <> 0
+        ON CONFLICT (user_id, tag) DO UPDATE
+            SET item_count = item_tags.item_count + EXCLUDED.item_count;
+
+        DELETE FROM item_tags t
+        USING unnest(p_user_ids, p_tags) AS c(user_id, tag)
+        WHERE t.user_id = c.user_id AND t.tag = c.tag AND t.item_count <= 0;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    # An item counts once per distinct tag
+    """
+    CREATE OR REPLACE FUNCTION item_tags_trigger() RETURNS trigger AS $$
+    DECLARE
+        c record;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT
+                array_agg(n.user_id) AS user_ids,
+                array_agg(t.tag) AS tags,
+                array_agg(1) AS deltas
+            INTO c
+            FROM new_items n, LATERAL (SELECT DISTINCT unnest(n.tags)) AS t(tag);
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT
+                array_agg(o.user_id) AS user_ids,
+                array_agg(t.tag) AS tags,
+                array_agg(-1) AS deltas
+            INTO c
+            FROM old_items o, LATERAL (SELECT DISTINCT unnest(o.tags)) AS t(tag);
+        ELSE
+            -- Only rows whose tags (or owner) changed
+            WITH changed AS (
+                SELECT o.id
+                FROM old_items o
+                JOIN new_items n ON n.id = o.id
+                WHERE (o.user_id, o.tags) IS DISTINCT FROM (n.user_id, n.tags)
+            ), changes AS (
+                SELECT o.user_id, t.tag, -1 AS delta
+                FROM old_items o, LATERAL (SELECT DISTINCT unnest(o.tags)) AS t(tag)
+                WHERE o.id IN (SELECT id FROM changed)
+                UNION ALL
+                SELECT n.user_id, t.tag, 1 AS delta
+                FROM new_items n, LATERAL (SELECT DISTINCT unnest(n.tags)) AS t(tag)
+                WHERE n.id IN (SELECT id FROM changed)
+            )
+            SELECT
+                array_agg(user_id) AS user_ids,
+                array_agg(tag) AS tags,
+                array_agg(delta) AS deltas
+            INTO c FROM changes;
+        END IF;
+
+        IF c.user_ids IS NOT NULL THEN
+            PERFORM item_tags_apply(c.user_ids, c.tags, c.deltas);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+    """,
+    """
+    CREATE TRIGGER items_tags_insert_trigger
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_tags_trigger();
+    """,
+    """
+    CREATE TRIGGER items_tags_update_trigger
+    AFTER UPDATE ON items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_tags_trigger();
+    """,
+    """
+    CREATE TRIGGER items_tags_delete_trigger
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_tags_trigger();
+    """,
+    # Specification keys of an item, from the array format
+    # ([{"key": ..., "value": ...}]) or the legacy {key: value} object
+    """
+    CREATE OR REPLACE FUNCTION item_specification_keys(attributes jsonb)
+    RETURNS SETOF text AS $$
+        SELECT key
+        FROM (
+            SELECT spec ->> 'key'
+            FROM jsonb_array_elements(
+                CASE jsonb_typeof(attributes -> 'specifications')
+                    WHEN 'array' THEN attributes -> 'specifications'
+                    ELSE '[]'
+                END
+            ) AS spec
+            WHERE jsonb_typeof(spec) = 'object'
+            UNION
+            SELECT jsonb_object_keys(
+                CASE jsonb_typeof(attributes -> 'specifications')
+                    WHEN 'object' THEN attributes -> 'specifications'
+                    ELSE '{}'
+                END
+            )
+        ) AS keys(key)
+        WHERE key IS NOT NULL
+    $$ LANGUAGE sql IMMUTABLE;
+    """,
+    # Add per-key deltas to item_specification_keys, as item_tags_apply
+    """
+    CREATE OR REPLACE FUNCTION item_specification_keys_apply(
+        p_user_ids uuid[], p_keys text[], p_deltas integer[]
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO item_specification_keys (user_id, key, item_count)
+        SELECT c.user_id, c.key, sum(c.delta)
+        FROM unnest(p_user_ids, p_keys, p_deltas) AS c(user_id, key, delta)
+        JOIN users u ON u.id = c.user_id
+        GROUP BY 1, 2
+        HAVING sum(c.delta) <> 0
+        ON CONFLICT (user_id, key) DO UPDATE
+            SET item_count = item_specification_keys.item_count
+                + EXCLUDED.item_count;
+
+        DELETE FROM item_specification_keys k
+        USING unnest(p_user_ids, p_keys) AS c(user_id, key)
+        WHERE k.user_id = c.user_id AND k.key = c.key AND k.item_count <= 0;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION item_specification_keys_trigger()
+    RETURNS trigger AS $$
+    DECLARE
+        c record;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT
+                array_agg(n.user_id) AS user_ids,
+                array_agg(k.key) AS keys,
+                array_agg(1) AS deltas
+            INTO c
+            FROM new_items n, item_specification_keys(n.attributes) AS k(key);
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT
+                array_agg(o.user_id) AS user_ids,
+                array_agg(k.key) AS keys,
+                array_agg(-1) AS deltas
+            INTO c
+            FROM old_items o, item_specification_keys(o.attributes) AS k(key);
+        ELSE
+            -- Only rows whose specifications (or owner) changed
+            WITH changed AS (
+                SELECT o.id
+                FROM old_items o
+                JOIN new_items n ON n.id = o.id
+                WHERE (o.user_id, o.attributes -> 'specifications')
+                    IS DISTINCT FROM (n.user_id, n.attributes -> 'specifications')
+            ), changes AS (
+                SELECT o.user_id, k.key, -1 AS delta
+                FROM old_items o, item_specification_keys(o.attributes) AS k(key)
+                WHERE o.id IN (SELECT id FROM changed)
+                UNION ALL
+                SELECT n.user_id, k.key, 1 AS delta
+                FROM new_items n, item_specification_keys(n.attributes) AS k(key)
+                WHERE n.id IN (SELECT id FROM changed)
+            )
+            SELECT
+                array_agg(user_id) AS user_ids,
+                array_agg(key) AS keys,
+                array_agg(delta) AS deltas
+            INTO c FROM changes;
+        END IF;
+
+        IF c.user_ids IS NOT NULL THEN
+            PERFORM item_specification_keys_apply(c.user_ids, c.keys, c.deltas);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+    """,
+    """
+    CREATE TRIGGER items_specification_keys_insert_trigger
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_specification_keys_trigger();
+    """,
+    """
+    CREATE TRIGGER items_specification_keys_update_trigger
+    AFTER UPDATE ON items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_specification_keys_trigger();
+    """,
+    """
+    CREATE TRIGGER items_specification_keys_delete_trigger
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION item_specification_keys_trigger();
+    """,
+    # The latest record per item decides last_used_at/last_action_type
+    """
+    CREATE OR REPLACE FUNCTION item_usage_rollup_trigger() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO item_usage_stats (
+            item_id, user_id, check_out_count, last_used_at, last_action_type
+        )
+        SELECT DISTINCT ON (r.item_id)
+            r.item_id,
+            r.user_id,
+            count(*) FILTER (WHERE r.action_type = 'check_out')
+                OVER (PARTITION BY r.item_id),
+            r.occurred_at,
+            r.action_type
+        FROM new_records r
+        ORDER BY r.item_id, r.occurred_at DESC
+        ON CONFLICT (item_id) DO UPDATE SET
+            check_out_count = item_usage_stats.check_out_count
+                + EXCLUDED.check_out_count,
+            last_used_at = greatest(
+                item_usage_stats.last_used_at, EXCLUDED.last_used_at
+            ),
+            last_action_type = CASE
+                WHEN item_usage_stats.last_used_at IS NULL
+                    OR EXCLUDED.last_used_at >= item_usage_stats.last_used_at
+                THEN EXCLUDED.last_action_type
+                ELSE item_usage_stats.last_action_type
+            END;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+    """,
+    """
+    CREATE TRIGGER item_check_in_outs_rollup_trigger
+    AFTER INSERT ON item_check_in_outs
+    REFERENCING NEW TABLE AS new_records
+    FOR EACH STATEMENT EXECUTE FUNCTION item_usage_rollup_trigger();
+    """,
+]
+
+# {where} is empty or restricts every statement to one user
+_REBUILD_SQL = [
+    "DELETE FROM user_item_stats {where}",
+    "DELETE FROM item_daily_activity {where}",
+    "DELETE FROM item_usage_stats {where}",
+    "DELETE FROM item_tags {where}",
+    "DELETE FROM item_specification_keys {where}",
+    """
+    INSERT INTO user_item_stats (
+        user_id, total_items, total_quantity, category_counts, location_counts
+    )
+    SELECT
+        user_id,
+        count(*),
+        coalesce(sum(quantity), 0),
+        item_rollup_merge(
+            '{{}}',
+            array_agg(coalesce(category_id::text, '')),
+            array_agg(1)
+        ),
+        item_rollup_merge(
+            '{{}}',
+            array_agg(coalesce(location_id::text, '')),
+            array_agg(1)
+        )
+    FROM items
+    {where}
+    GROUP BY user_id
+    """,
+    """
+    INSERT INTO item_daily_activity (user_id, day, items_created)
+    SELECT user_id, (created_at AT TIME ZONE 'UTC')::date, count(*)
+    FROM items
+    {where}
+    GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO item_tags (user_id, tag, item_count)
+    SELECT user_id, tag, count(DISTINCT id)
+    FROM items, unnest(tags) AS t(tag)
+    {where}
+    GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO item_specification_keys (user_id, key, item_count)
+    SELECT user_id, key, count(*)
+    FROM items, item_specification_keys(attributes) AS k(key)
+    {where}
+    GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO item_usage_stats (
+        item_id, user_id, check_out_count, last_used_at, last_action_type
+    )
+    SELECT DISTINCT ON (item_id)
+        item_id,
+        user_id,
+        count(*) FILTER (WHERE action_type = 'check_out')
+            OVER (PARTITION BY item_id),
+        occurred_at,
+        action_type
+    FROM item_check_in_outs
+    {where}
+    ORDER BY item_id, occurred_at DESC
+    """,
+]
+
+
+async def rebuild_rollups(session: AsyncSession, user_id: UUID | None = None) -> None:
+    """Recompute the dashboard rollups from items and check-in/out history.
+
+    Writes to items and item_check_in_outs are blocked until the rebuild
+    commits, so no change can slip between the delete and the recompute.
+
+    Args:
+        session: Database session; the rebuild is committed on it
+        user_id: Rebuild only this user's rollups (default: every user)
+    """
+    where = "WHERE user_id = :user_id" if user_id else ""
+    params = {"user_id": user_id} if user_id else {}
+
+    await session.execute(text("LOCK TABLE items, item_check_in_outs IN SHARE MODE"))
+    for statement in _REBUILD_SQL:
+        await session.execute(text(statement.format(where=where)), params)
+    await session.commit()
+
+
+async def main(user_id: UUID | None) -> None:
+    engine = create_async_engine(get_settings().database_url)
+    try:
+        async with create_session_factory(engine)() as session:
+            await rebuild_rollups(session, user_id)
+    finally:
+        await engine.dispose()
+    print(f"Rebuilt dashboard rollups for {user_id or 'all users'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--user-id", type=UUID, help="Only rebuild this user")
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id))
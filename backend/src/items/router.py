@@ -4,6 +4,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from fastapi.responses import Response
+from pydantic import TypeAdapter
 
 from src.ai.service import AIClassificationService, get_ai_service
 from src.ai.usage_service import AIUsageService, get_ai_usage_service
@@ -15,6 +16,8 @@ from src.auth.dependencies import (
 )
 from src.billing.pricing_service import CreditPricingService, get_pricing_service
 from src.billing.router import CreditServiceDep
+from src.categories.schemas import CategoryResponse
+from src.common.responses import json_response
 from src.common.schemas import PaginatedResponse
 from src.database import AsyncSessionDep
 from src.images.schemas import ImageResponse
@@ -34,6 +37,7 @@ from src.items.schemas import (
     ItemCreate,
     ItemDetailResponse,
     ItemListResponse,
+    ItemSearchResult,
     ItemUpdate,
     ItemUsageStatsResponse,
     MostUsedItemResponse,
@@ -45,6 +49,7 @@ from src.locations.qr import QRCodeService, get_qr_service
 from src.locations.schemas import (
     ItemLocationSuggestionRequest,
     ItemLocationSuggestionResponse,
+    LocationResponse,
 )
 from src.locations.service import LocationService
 from src.notifications.alert_service import AlertService
@@ -53,6 +58,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_item_list_adapter = TypeAdapter(list[ItemListResponse])
+_item_page_adapter = TypeAdapter(PaginatedResponse[ItemListResponse])
+_item_search_adapter = TypeAdapter(list[ItemSearchResult])
+
 
 def _get_primary_image_url(item) -> str | None:
     """Get the primary image URL for an item."""
@@ -76,7 +85,50 @@ def _get_image_responses(item) -> list[ImageResponse]:
     return [ImageResponse.model_validate(img) for img in sorted_images]
 
 
-@router.get("")
+def _build_item_list_responses(items) -> list[ItemListResponse]:
+    """Build list responses from loaded items without re-validating them.
+
+    Column values are already typed by the ORM, so items are constructed
+    directly; each distinct category and location is validated only once.
+    """
+    categories: dict[UUID, CategoryResponse] = {}
+    locations: dict[UUID, LocationResponse] = {}
+    responses = []
+    for item in items:
+        category = None
+        if item.category is not None:
+            category = categories.get(item.category.id)
+            if category is None:
+                category = CategoryResponse.model_validate(item.category)
+                categories[item.category.id] = category
+        location = None
+        if item.location is not None:
+            location = locations.get(item.location.id)
+            if location is None:
+                location = LocationResponse.model_validate(item.location)
+                locations[item.location.id] = location
+        responses.append(
+            ItemListResponse.model_construct(
+                id=item.id,
+                name=item.name,
+                description=item.description,
+                quantity=item.quantity,
+                quantity_unit=item.quantity_unit,
+                price=item.price,
+                is_low_stock=item.is_low_stock,
+                tags=item.tags or [],
+                attributes=item.attributes or {},
+                category=category,
+                location=location,
+                primary_image_url=_get_primary_image_url(item),
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+            )
+        )
+    return responses
+
+
+@router.get("", response_model=PaginatedResponse[ItemListResponse])
 async def list_items(
     session: AsyncSessionDep,
     inventory_owner_id: InventoryContextDep,
@@ -103,7 +155,7 @@ async def list_items(
     ),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-) -> PaginatedResponse[ItemListResponse]:
+) -> Response:
     """List items with filtering and pagination.
 
     When filtering by category or location, child categories/locations are included by default.
@@ -158,27 +210,10 @@ async def list_items(
         checked_out=checked_out,
     )
 
-    item_responses = []
-    for item in items:
-        response = ItemListResponse(
-            id=item.id,
-            name=item.name,
-            description=item.description,
-            quantity=item.quantity,
-            quantity_unit=item.quantity_unit,
-            price=item.price,
-            is_low_stock=item.is_low_stock,
-            tags=item.tags or [],
-            attributes=item.attributes or {},
-            category=item.category,
-            location=item.location,
-            primary_image_url=_get_primary_image_url(item),
-            created_at=item.created_at,
-            updated_at=item.updated_at,
-        )
-        item_responses.append(response)
-
-    return PaginatedResponse.create(item_responses, total, page, limit)
+    page_response = PaginatedResponse[ItemListResponse].create(
+        _build_item_list_responses(items), total, page, limit
+    )
+    return json_response(_item_page_adapter, page_response)
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -315,36 +350,33 @@ async def get_recently_used_items(
     return await repo.get_recently_used_items(limit=limit)
 
 
-@router.get("/search")
+@router.get("/search", response_model=list[ItemSearchResult])
 async def search_items(
     session: AsyncSessionDep,
     inventory_owner_id: InventoryContextDep,
     q: str = Query(..., min_length=1),
     limit: int = Query(20, ge=1, le=100),
-) -> list[ItemListResponse]:
-    """Search items by name, description, or tags."""
-    repo = ItemRepository(session, inventory_owner_id)
-    items = await repo.search(q, limit)
+    highlight: bool = Query(
+        False, description="Include a snippet with the matched words highlighted"
+    ),
+) -> Response:
+    """Search items by name, description, or tags, best match first.
 
-    return [
-        ItemListResponse(
-            id=item.id,
-            name=item.name,
-            description=item.description,
-            quantity=item.quantity,
-            quantity_unit=item.quantity_unit,
-            price=item.price,
-            is_low_stock=item.is_low_stock,
-            tags=item.tags or [],
-            attributes=item.attributes or {},
-            category=item.category,
-            location=item.location,
-            primary_image_url=_get_primary_image_url(item),
-            created_at=item.created_at,
-            updated_at=item.updated_at,
-        )
-        for item in items
-    ]
+    Supports web search syntax: "quoted phrases", OR, and -word to exclude.
+    With highlight=true each result has a headline: HTML-escaped text around
+    the matches, with the matched words in <mark> tags.
+    """
+    repo = ItemRepository(session, inventory_owner_id)
+    results = await repo.search(q, limit, highlight=highlight)
+
+    responses = _build_item_list_responses(item for item, _ in results)
+    return json_response(
+        _item_search_adapter,
+        [
+            ItemSearchResult.model_construct(**vars(response), headline=headline)
+            for response, (_, headline) in zip(responses, results, strict=True)
+        ],
+    )
 
 
 @router.post("/find-similar")
@@ -440,19 +472,17 @@ async def suggest_item_location(
         )
 
         if matches:
-            similar_items_data = []
-            for item, _, _ in matches:
-                location_name = None
-                if item.location:
-                    location_name = await location_service.get_path_display(
-                        item.location
-                    )
-                similar_items_data.append(
-                    {
-                        "name": item.name,
-                        "location": location_name,
-                    }
-                )
+            # Display paths were already computed with the locations
+            path_by_location_id = {loc["id"]: loc["path_display"] for loc in locations}
+            similar_items_data = [
+                {
+                    "name": item.name,
+                    "location": path_by_location_id.get(str(item.location_id))
+                    if item.location_id
+                    else None,
+                }
+                for item, _, _ in matches
+            ]
     except Exception:
         # If finding similar items fails, continue without them
         pass
@@ -505,34 +535,16 @@ async def suggest_item_location(
         )
 
 
-@router.get("/low-stock")
+@router.get("/low-stock", response_model=list[ItemListResponse])
 async def list_low_stock_items(
     session: AsyncSessionDep,
     inventory_owner_id: InventoryContextDep,
-) -> list[ItemListResponse]:
+) -> Response:
     """List items that are below their minimum quantity threshold."""
     repo = ItemRepository(session, inventory_owner_id)
     items = await repo.get_all(low_stock_only=True, limit=100)
 
-    return [
-        ItemListResponse(
-            id=item.id,
-            name=item.name,
-            description=item.description,
-            quantity=item.quantity,
-            quantity_unit=item.quantity_unit,
-            price=item.price,
-            is_low_stock=item.is_low_stock,
-            tags=item.tags or [],
-            attributes=item.attributes or {},
-            category=item.category,
-            location=item.location,
-            primary_image_url=_get_primary_image_url(item),
-            created_at=item.created_at,
-            updated_at=item.updated_at,
-        )
-        for item in items
-    ]
+    return json_response(_item_list_adapter, _build_item_list_responses(items))
 
 
 @router.get("/facets")
@@ -94,6 +94,13 @@ class ItemListResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ItemSearchResult(ItemListResponse):
+    """Schema for an item search result."""
+
+    # Escaped snippet with matches in <mark> tags, when highlighting was asked
+    headline: str | None = None
+
+
 class FacetValue(BaseModel):
     """A single value in a facet with count."""
 
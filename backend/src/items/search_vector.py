@@ -0,0 +1,59 @@
+"""
+Full-text search vector of items, kept current by a trigger.
+
+items.search_vector weights the name (A), description (B), tags (C) and
+the string and number values of attributes, specifications included (D).
+The trigger only fires for updates that set one of those columns, and
+recomputes the vector only when one of them actually changed, so quantity
+changes, moves and check-outs never re-parse the item text. JSON keys and
+punctuation are left out of the attribute text.
+
+Migration 033 installs the trigger; TRIGGER_DDL is the same DDL for test
+databases built with create_all.
+"""
+
+TRIGGER_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION items_search_vector(
+        name text, description text, tags text[], attributes jsonb
+    ) RETURNS tsvector AS $$
+        SELECT
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(
+                to_tsvector('english', coalesce(array_to_string(tags, ' '), '')),
+                'C'
+            ) ||
+            setweight(
+                jsonb_to_tsvector(
+                    'english', coalesce(attributes, '{}'), '["string", "numeric"]'
+                ),
+                'D'
+            )
+    $$ LANGUAGE sql IMMUTABLE;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION items_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            IF NEW.name IS NOT DISTINCT FROM OLD.name
+                AND NEW.description IS NOT DISTINCT FROM OLD.description
+                AND NEW.tags IS NOT DISTINCT FROM OLD.tags
+                AND NEW.attributes IS NOT DISTINCT FROM OLD.attributes
+            THEN
+                RETURN NEW;
+            END IF;
+        END IF;
+        NEW.search_vector := items_search_vector(
+            NEW.name, NEW.description, NEW.tags, NEW.attributes
+        );
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER items_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, tags, attributes ON items
+    FOR EACH ROW EXECUTE FUNCTION items_search_vector_update();
+    """,
+]
@@ -1,8 +1,9 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import Response
+from pydantic import TypeAdapter
 
 from src.ai.service import AIClassificationService, get_ai_service
 from src.ai.usage_service import AIUsageService, get_ai_usage_service
@@ -14,6 +15,7 @@ from src.auth.dependencies import (
 from src.auth.service import AuthService, get_auth_service
 from src.billing.pricing_service import CreditPricingService, get_pricing_service
 from src.billing.router import CreditServiceDep
+from src.common.tree_cache import cached_tree_response
 from src.config import Settings, get_settings
 from src.database import AsyncSessionDep
 from src.images.repository import ImageRepository
@@ -36,6 +38,8 @@ from src.locations.service import LocationService
 
 router = APIRouter()
 
+_tree_adapter = TypeAdapter(list[LocationTreeNode])
+
 
 @router.get("")
 async def list_locations(
@@ -48,14 +52,25 @@ async def list_locations(
     return [LocationResponse.model_validate(loc) for loc in locations]
 
 
-@router.get("/tree")
+@router.get("/tree", response_model=list[LocationTreeNode])
 async def get_location_tree(
+    request: Request,
     session: AsyncSessionDep,
     inventory_owner_id: InventoryContextDep,
-) -> list[LocationTreeNode]:
-    """Get locations as a nested tree structure with item counts."""
+) -> Response:
+    """Get locations as a nested tree structure with item counts.
+
+    Served from a cache until a location or item changes, with an ETag;
+    send it back in If-None-Match to get 304 while the tree is unchanged.
+    """
     service = LocationService(session, inventory_owner_id)
-    return await service.get_tree()
+
+    async def build() -> bytes:
+        return _tree_adapter.dump_json(await service.get_tree())
+
+    return await cached_tree_response(
+        request, session, inventory_owner_id, "location_tree", build
+    )
 
 
 @router.post("/analyze-image")
@@ -2,8 +2,10 @@ import re
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import func, literal, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from sqlalchemy_utils import Ltree
 
 from src.locations.models import Location
@@ -287,7 +289,8 @@ class LocationService:
         )
         rows = result.all()
 
-        # Build lookup maps
+        # Build lookup maps. Values are already converted to their response
+        # types, so nodes are constructed without re-validation.
         nodes: dict[UUID, LocationTreeNode] = {}
         for location, item_count, total_value in rows:
             # Convert Decimal to float for JSON serialization
@@ -296,7 +299,7 @@ class LocationService:
                 if isinstance(total_value, Decimal)
                 else float(total_value or 0)
             )
-            nodes[location.id] = LocationTreeNode(
+            nodes[location.id] = LocationTreeNode.model_construct(
                 id=location.id,
                 name=location.name,
                 description=location.description,
@@ -327,7 +330,11 @@ class LocationService:
     async def get_locations_with_sample_items(
         self, sample_limit: int = 5
     ) -> list[dict]:
-        """Get all locations with item counts and sample item names.
+        """Get all locations with item counts, sample item names and display paths.
+
+        Uses a single query: item counts and sample names come from a LATERAL
+        subquery per location, and the display path ("Garage > Red Toolbox")
+        is aggregated from ltree ancestors.
 
         Args:
             sample_limit: Maximum number of sample items per location
@@ -339,36 +346,67 @@ class LocationService:
 
         from src.items.models import Item
 
-        # Get all locations with item counts
+        # Sample item names per location, limited inside the lateral subquery
+        samples = (
+            select(Item.name)
+            .where(Item.location_id == Location.id)
+            .order_by(Item.name)
+            .limit(sample_limit)
+            .correlate(Location)
+            .subquery()
+        )
+        samples_lateral = (
+            select(func.array_agg(samples.c.name).label("names"))
+            .select_from(samples)
+            .lateral("sample_items")
+        )
+
+        item_count = (
+            select(func.count(Item.id))
+            .where(Item.location_id == Location.id)
+            .correlate(Location)
+            .scalar_subquery()
+        )
+
+        ancestor = aliased(Location)
+        path_display = (
+            select(
+                func.string_agg(
+                    ancestor.name,
+                    aggregate_order_by(literal(" > "), func.nlevel(ancestor.path)),
+                )
+            )
+            .where(
+                ancestor.user_id == Location.user_id,
+                func.nlevel(ancestor.path) > 0,
+                ancestor.path.op("@>")(Location.path),
+            )
+            .correlate(Location)
+            .scalar_subquery()
+        )
+
         result = await self.session.execute(
             select(
                 Location,
-                func.count(Item.id).label("item_count"),
+                item_count.label("item_count"),
+                samples_lateral.c.names,
+                path_display.label("path_display"),
             )
-            .outerjoin(Item, Location.id == Item.location_id)
+            .outerjoin(samples_lateral, true())
             .where(Location.user_id == self.user_id)
-            .group_by(Location.id)
             .order_by(Location.path)
         )
-        rows = result.all()
 
         locations_data: list[dict[str, Any]] = []
-        for location, item_count in rows:
-            # Get sample items for this location
-            items_result = await self.session.execute(
-                select(Item.name)
-                .where(Item.location_id == location.id)
-                .limit(sample_limit)
-            )
-            sample_items = [row[0] for row in items_result.fetchall()]
-
+        for location, count, sample_items, display in result.all():
             locations_data.append(
                 {
                     "id": str(location.id),
                     "name": location.name,
                     "type": location.location_type or "unknown",
-                    "item_count": item_count,
-                    "sample_items": sample_items,
+                    "item_count": count,
+                    "sample_items": list(sample_items or []),
+                    "path_display": display or location.name,
                 }
             )
 
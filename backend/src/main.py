@@ -4,14 +4,19 @@ from logging.config import dictConfig
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from slowapi.middleware import SlowAPIMiddleware
-
-from src.common.rate_limiter import configure_rate_limiting
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from src.common.metrics import (
+    MetricsMiddleware,
+    start_metrics_server,
+    stop_metrics_server,
+)
+from src.common.rate_limiter import close_rate_limiter, configure_rate_limiting
 from src.common.request_id_middleware import RequestIDMiddleware
 from src.common.security_headers import SecurityHeadersMiddleware
 from src.config import get_settings
 from src.database import check_db_connectivity, close_db, init_db
+from src.notifications.smtp_pool import close_smtp_pools
 
 
 def _get_log_config() -> dict:
@@ -33,7 +38,7 @@ def _get_log_config() -> dict:
             },
             "access": {
                 "()": "src.common.formatters.RequestIDAccessFormatter",
-                "fmt": '%(levelprefix)s %(asctime)s - %(request_id)s - %(name)s :: %(client_addr)s - "%(request_line)s" %(status_code)s',
+                "fmt": '%(levelprefix)s %(asctime)s - %(request_id)s - %(name)s :: %(client_addr)s - "%(request_line)s" %(status_code)s - db=%(db_queries)s/%(db_time_ms)sms',
                 "use_colors": use_colors,
             },
         },
@@ -77,7 +82,12 @@ async def lifespan(_app: FastAPI):
     """Application lifespan handler."""
     settings = get_settings()
     init_db(settings)
+    if settings.metrics_port is not None:
+        start_metrics_server(settings.metrics_port, settings.metrics_host)
     yield
+    stop_metrics_server()
+    await close_smtp_pools()
+    await close_rate_limiter()
     await close_db()
 
 
@@ -90,6 +100,7 @@ def create_app() -> FastAPI:
         description="Home inventory system with AI-powered item classification",
         version="0.1.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Configure CORS
@@ -107,9 +118,14 @@ def create_app() -> FastAPI:
     # Add security headers to all responses
     app.add_middleware(SecurityHeadersMiddleware)
 
-    # Configure rate limiting
+    # Record request latency and in-flight requests (outermost, so the
+    # timing covers the other middlewares too)
+    app.add_middleware(MetricsMiddleware)
+
+    # Configure rate limiting. Limits are enforced by the @limiter.limit
+    # decorators on the routes that need them rather than by a middleware
+    # wrapping every request.
     configure_rate_limiting(app)
-    app.add_middleware(SlowAPIMiddleware)
 
     # Health check endpoint for Kubernetes probes
     @app.get("/health")
@@ -145,6 +161,7 @@ def create_app() -> FastAPI:
     from src.locations.router import router as locations_router
     from src.notifications.router import router as notifications_router
     from src.profile.router import router as profile_router
+    from src.search.router import router as search_router
     from src.webhooks.router import router as webhooks_router
 
     app.include_router(admin_router, prefix="/api/v1/admin", tags=["admin"])
@@ -163,6 +180,7 @@ def create_app() -> FastAPI:
     )
     app.include_router(images_router, prefix="/api/v1/images", tags=["images"])
     app.include_router(profile_router, prefix="/api/v1/profile", tags=["profile"])
+    app.include_router(search_router, prefix="/api/v1/search", tags=["search"])
     app.include_router(webhooks_router, prefix="/api/v1/webhooks", tags=["webhooks"])
     app.include_router(
         collaboration_router, prefix="/api/v1/collaboration", tags=["collaboration"]
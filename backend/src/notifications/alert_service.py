@@ -1,5 +1,6 @@
 """Alert service for managing and sending low stock alerts."""
 
+import asyncio
 import logging
 from pathlib import Path
 from uuid import UUID
@@ -108,130 +109,250 @@ class AlertService:
             )
             return
 
+        user_name = user.name or user.email.split("@")[0]
+
+        # In digest mode the item waits for the next scheduled digest
+        # (src.notifications.digests) with the user's other low stock items
+        if self.settings.low_stock_alert_digest:
+            await self.repository.queue_low_stock_alert(item.id, user.email, user_name)
+            return
+
         # Queue the email send in background
         background_tasks.add_task(
-            self._send_low_stock_email,
-            item_id=item.id,
-            item_name=item.name,
-            item_quantity=item.quantity,
-            item_quantity_unit=item.quantity_unit,
-            item_min_quantity=item.min_quantity,
+            self._send_low_stock_alerts_background,
+            item_ids=[item.id],
             user_email=user.email,
-            user_name=user.name or user.email.split("@")[0],
+            user_name=user_name,
         )
         logger.info(
             f"Queued low stock alert background task: item_id={item.id}, "
             f"item_name={item.name}, user_email={user.email}, user_id={self.user_id}"
         )
 
-    async def _send_low_stock_email(
+    async def _send_low_stock_alerts_background(
         self,
-        item_id: UUID,
-        item_name: str,
-        item_quantity: int,
-        item_quantity_unit: str,
-        item_min_quantity: int,
+        item_ids: list[UUID],
         user_email: str,
         user_name: str,
     ) -> None:
-        """Background task to send low stock email.
+        """Background task to send low stock emails.
 
-        Creates a new session for the background task.
+        Creates a new session for the background task. Items are reloaded so
+        only those still low on stock and not alerted recently are sent.
         """
-        from src.database import get_session
+        from src.database import background_session
 
         logger.info(
-            f"Background task started: sending low stock email for item_id={item_id}, "
-            f"item_name={item_name}, user_email={user_email}, user_id={self.user_id}"
+            f"Background task started: sending low stock alerts for "
+            f"item_ids={item_ids}, user_email={user_email}, user_id={self.user_id}"
         )
 
-        async for session in get_session():
-            try:
+        try:
+            async with background_session() as session:
                 repo = NotificationRepository(session, self.user_id)
+                items = await repo.get_low_stock_items(item_ids)
+                recent = await repo.get_recently_alerted_item_ids(
+                    [item.id for item in items], "low_stock"
+                )
+                items = [item for item in items if item.id not in recent]
+                if not items:
+                    logger.info(
+                        f"No low stock alerts left to send: user_id={self.user_id}"
+                    )
+                    return
+
+                await self._deliver_low_stock_alerts(repo, items, user_email, user_name)
+
+        except Exception as e:
+            # Provide specific logging for common failure scenarios
+            error_type = type(e).__name__
+            if "user" in str(e).lower() or "User" in str(e):
+                logger.error(
+                    f"Background alert failed for items {item_ids}: "
+                    f"user {self.user_id} may have been deleted. {error_type}: {e}"
+                )
+            elif "item" in str(e).lower() or "Item" in str(e):
+                logger.error(
+                    f"Background alert failed: items {item_ids} may have been "
+                    f"deleted. {error_type}: {e}"
+                )
+            else:
+                logger.error(
+                    f"Background low stock alert failed for items {item_ids}: "
+                    f"{error_type}: {e}",
+                    exc_info=True,
+                )
+
+    async def send_queued_low_stock_digest(self) -> int:
+        """Send the user's queued low stock alerts as one digest per recipient.
+
+        Items no longer low on stock, or alerted within the last 24 hours,
+        are dropped from the queue without an email.
 
-                # Create template context
-                context = {
-                    "user_name": user_name,
-                    "item_name": item_name,
-                    "item_quantity": item_quantity,
-                    "item_quantity_unit": item_quantity_unit,
-                    "item_min_quantity": item_min_quantity,
-                    "item_url": self._build_item_url(item_id),
-                    "preferences_url": self._build_preferences_url(),
+        Returns:
+            Number of items whose alert email was sent
+        """
+        queued = await self.repository.claim_queued_low_stock_alerts()
+        if not queued:
+            return 0
+
+        prefs = await self.repository.get_preferences()
+        if prefs is not None and (
+            not prefs.email_notifications_enabled or not prefs.low_stock_email_enabled
+        ):
+            await self.session.commit()
+            return 0
+
+        items = await self.repository.get_low_stock_items(
+            [entry.item_id for entry in queued]
+        )
+        recent = await self.repository.get_recently_alerted_item_ids(
+            [item.id for item in items], "low_stock"
+        )
+        items_by_id = {item.id: item for item in items if item.id not in recent}
+        by_recipient: dict[tuple[str, str], list[Item]] = {}
+        for entry in queued:
+            if entry.item_id in items_by_id:
+                by_recipient.setdefault(
+                    (entry.recipient_email, entry.recipient_name), []
+                ).append(items_by_id[entry.item_id])
+        if not by_recipient:
+            await self.session.commit()
+            return 0
+
+        sent = 0
+        for (user_email, user_name), recipient_items in by_recipient.items():
+            results = await self._deliver_low_stock_alerts(
+                self.repository, recipient_items, user_email, user_name
+            )
+            sent += sum(results.values())
+        return sent
+
+    def _render_low_stock_email(
+        self, items: list[Item], user_name: str
+    ) -> tuple[str, str, str]:
+        """Render subject, HTML and text bodies for a low stock email.
+
+        A single item uses the per-item template; several items are rendered
+        as one digest.
+        """
+        preferences_url = self._build_preferences_url()
+        if len(items) == 1:
+            item = items[0]
+            context = {
+                "user_name": user_name,
+                "item_name": item.name,
+                "item_quantity": item.quantity,
+                "item_quantity_unit": item.quantity_unit,
+                "item_min_quantity": item.min_quantity,
+                "item_url": self._build_item_url(item.id),
+                "preferences_url": preferences_url,
+            }
+            return (
+                f"Low Stock Alert: {item.name}",
+                self._render_template("low_stock_alert.html", **context),
+                self._render_template("low_stock_alert.txt", **context),
+            )
+
+        context = {
+            "user_name": user_name,
+            "items": [
+                {
+                    "name": item.name,
+                    "quantity": item.quantity,
+                    "quantity_unit": item.quantity_unit,
+                    "min_quantity": item.min_quantity,
+                    "url": self._build_item_url(item.id),
                 }
+                for item in items
+            ],
+            "preferences_url": preferences_url,
+        }
+        return (
+            f"Low Stock Alert: {len(items)} items running low",
+            self._render_template("low_stock_digest.html", **context),
+            self._render_template("low_stock_digest.txt", **context),
+        )
 
-                # Render templates
-                logger.info(f"Rendering email templates for item_id={item_id}")
-                html_body = self._render_template("low_stock_alert.html", **context)
-                text_body = self._render_template("low_stock_alert.txt", **context)
+    async def _deliver_low_stock_alerts(
+        self,
+        repo: NotificationRepository,
+        items: list[Item],
+        user_email: str,
+        user_name: str,
+    ) -> dict[UUID, bool]:
+        """Send low stock emails for items and record their alert history.
 
-                subject = f"Low Stock Alert: {item_name}"
+        Sends one email per item, or a single digest for all items when
+        low_stock_alert_digest is enabled. Alert history is written in one
+        batch before sending and updated in one batch afterwards; every item
+        gets its own record so per-item deduplication keeps working.
 
-                # Create alert history record (pending)
-                logger.info(
-                    f"Creating alert history record: item_id={item_id}, "
-                    f"recipient={user_email}, status=PENDING"
-                )
-                alert = await repo.create_alert_history(
-                    item_id=item_id,
-                    alert_type="low_stock",
-                    channel="email",
-                    recipient_email=user_email,
-                    subject=subject,
-                    item_quantity=item_quantity,
-                    item_min_quantity=item_min_quantity,
-                    status=AlertStatus.PENDING.value,
-                )
-                logger.info(f"Alert history record created: alert_id={alert.id}")
+        Returns:
+            Whether the email for each item was sent, by item ID
+        """
+        if self.settings.low_stock_alert_digest:
+            batches = [items]
+        else:
+            batches = [[item] for item in items]
+        emails = [
+            (batch, *self._render_low_stock_email(batch, user_name))
+            for batch in batches
+        ]
+
+        alerts = await repo.create_alert_histories(
+            [
+                {
+                    "item_id": item.id,
+                    "alert_type": "low_stock",
+                    "channel": "email",
+                    "recipient_email": user_email,
+                    "subject": subject,
+                    "item_quantity": item.quantity,
+                    "item_min_quantity": item.min_quantity,
+                }
+                for batch, subject, _, _ in emails
+                for item in batch
+            ]
+        )
+        alert_by_item = {alert.item_id: alert for alert in alerts}
 
-                # Send email
-                logger.info(
-                    f"Sending email via EmailService: to={user_email}, "
-                    f"subject={subject}, item_id={item_id}"
-                )
-                success = await self.email_service.send_email(
+        # Sends share the pooled SMTP connections
+        logger.info(
+            f"Sending {len(emails)} low stock email(s) for {len(items)} item(s): "
+            f"to={user_email}, user_id={self.user_id}"
+        )
+        results = await asyncio.gather(
+            *(
+                self.email_service.send_email(
                     to_email=user_email,
                     subject=subject,
                     html_body=html_body,
                     text_body=text_body,
                 )
+                for _, subject, html_body, text_body in emails
+            )
+        )
 
-                # Update alert status
-                if success:
-                    await repo.update_alert_status(alert.id, AlertStatus.SENT.value)
-                    logger.info(
-                        f"Low stock alert sent successfully: item_id={item_id}, "
-                        f"alert_id={alert.id}, recipient={user_email}"
-                    )
-                else:
-                    await repo.update_alert_status(
-                        alert.id, AlertStatus.FAILED.value, "Email send failed"
-                    )
-                    logger.error(
-                        f"Failed to send low stock alert: item_id={item_id}, "
-                        f"alert_id={alert.id}, recipient={user_email} - "
-                        f"EmailService.send_email returned False"
-                    )
-
-            except Exception as e:
-                # Provide specific logging for common failure scenarios
-                error_type = type(e).__name__
-                if "user" in str(e).lower() or "User" in str(e):
-                    logger.error(
-                        f"Background alert failed for item {item_id}: "
-                        f"user {self.user_id} may have been deleted. {error_type}: {e}"
-                    )
-                elif "item" in str(e).lower() or "Item" in str(e):
-                    logger.error(
-                        f"Background alert failed: item {item_id} may have been deleted. "
-                        f"{error_type}: {e}"
-                    )
-                else:
-                    logger.error(
-                        f"Background low stock alert failed for item {item_id}: "
-                        f"{error_type}: {e}",
-                        exc_info=True,
+        sent: dict[UUID, bool] = {}
+        updates = []
+        for (batch, subject, _, _), success in zip(emails, results, strict=True):
+            if not success:
+                logger.error(
+                    f"Failed to send low stock alert: subject={subject}, "
+                    f"recipient={user_email} - EmailService.send_email returned False"
+                )
+            for item in batch:
+                sent[item.id] = success
+                updates.append(
+                    (
+                        alert_by_item[item.id],
+                        AlertStatus.SENT.value if success else AlertStatus.FAILED.value,
+                        None if success else "Email send failed",
                     )
+                )
+        await repo.update_alert_statuses(updates)
+        return sent
 
     async def trigger_low_stock_alerts(
         self,
@@ -294,15 +415,13 @@ class AlertService:
         failed_count = 0
         item_summaries: list[AlertedItemSummary] = []
 
+        # Check deduplication for all items at once
+        recent = await self.repository.get_recently_alerted_item_ids(
+            [item.id for item in items], "low_stock"
+        )
+        to_send = []
         for item in items:
-            logger.info(
-                f"Processing manual alert for item: item_id={item.id}, "
-                f"item_name={item.name}, quantity={item.quantity}, "
-                f"min_quantity={item.min_quantity}"
-            )
-
-            # Check deduplication
-            if await self.repository.was_alerted_recently(item.id, "low_stock"):
+            if item.id in recent:
                 logger.info(
                     f"Skipping - recently alerted: item_id={item.id}, user_id={self.user_id}"
                 )
@@ -315,35 +434,37 @@ class AlertService:
                         message="Alert sent within last 24 hours",
                     )
                 )
-                continue
-
-            # Send alert immediately (not in background for manual trigger)
-            try:
-                logger.info(f"Sending sync alert for item: item_id={item.id}")
-                await self._send_low_stock_alert_sync(item, user)
-                triggered_count += 1
-                logger.info(f"Successfully sent alert for item: item_id={item.id}")
-                item_summaries.append(
-                    AlertedItemSummary(
-                        item_id=item.id,
-                        item_name=item.name,
-                        status="sent",
+            else:
+                to_send.append(item)
+
+        # Send alerts immediately (not in background for manual trigger)
+        if to_send:
+            sent = await self._deliver_low_stock_alerts(
+                self.repository,
+                to_send,
+                user.email,
+                user.name or user.email.split("@")[0],
+            )
+            for item in to_send:
+                if sent[item.id]:
+                    triggered_count += 1
+                    item_summaries.append(
+                        AlertedItemSummary(
+                            item_id=item.id,
+                            item_name=item.name,
+                            status="sent",
+                        )
                     )
-                )
-            except Exception as e:
-                failed_count += 1
-                logger.error(
-                    f"Failed to send manual alert: item_id={item.id}, error={e}",
-                    exc_info=True,
-                )
-                item_summaries.append(
-                    AlertedItemSummary(
-                        item_id=item.id,
-                        item_name=item.name,
-                        status="failed",
-                        message=str(e),
+                else:
+                    failed_count += 1
+                    item_summaries.append(
+                        AlertedItemSummary(
+                            item_id=item.id,
+                            item_name=item.name,
+                            status="failed",
+                            message="Failed to send email",
+                        )
                     )
-                )
 
         logger.info(
             f"Manual trigger complete: user_id={self.user_id}, "
@@ -356,70 +477,6 @@ class AlertService:
             items=item_summaries,
         )
 
-    async def _send_low_stock_alert_sync(self, item: Item, user: User) -> None:
-        """Send a low stock alert synchronously (for manual triggers)."""
-        logger.info(
-            f"Sending sync low stock alert: item_id={item.id}, "
-            f"item_name={item.name}, user_email={user.email}"
-        )
-
-        context = {
-            "user_name": user.name or user.email.split("@")[0],
-            "item_name": item.name,
-            "item_quantity": item.quantity,
-            "item_quantity_unit": item.quantity_unit,
-            "item_min_quantity": item.min_quantity,
-            "item_url": self._build_item_url(item.id),
-            "preferences_url": self._build_preferences_url(),
-        }
-
-        html_body = self._render_template("low_stock_alert.html", **context)
-        text_body = self._render_template("low_stock_alert.txt", **context)
-
-        subject = f"Low Stock Alert: {item.name}"
-
-        # Create alert history record
-        logger.info(
-            f"Creating alert history (sync): item_id={item.id}, recipient={user.email}"
-        )
-        alert = await self.repository.create_alert_history(
-            item_id=item.id,
-            alert_type="low_stock",
-            channel="email",
-            recipient_email=user.email,
-            subject=subject,
-            item_quantity=item.quantity,
-            item_min_quantity=item.min_quantity,
-            status=AlertStatus.PENDING.value,
-        )
-        logger.info(f"Alert history created (sync): alert_id={alert.id}")
-
-        # Send email
-        logger.info(
-            f"Calling EmailService.send_email (sync): to={user.email}, item_id={item.id}"
-        )
-        success = await self.email_service.send_email(
-            to_email=user.email,
-            subject=subject,
-            html_body=html_body,
-            text_body=text_body,
-        )
-
-        if success:
-            await self.repository.update_alert_status(alert.id, AlertStatus.SENT.value)
-            logger.info(
-                f"Sync alert sent successfully: item_id={item.id}, alert_id={alert.id}"
-            )
-        else:
-            await self.repository.update_alert_status(
-                alert.id, AlertStatus.FAILED.value, "Email send failed"
-            )
-            logger.error(
-                f"Sync alert failed - EmailService returned False: "
-                f"item_id={item.id}, alert_id={alert.id}"
-            )
-            raise RuntimeError("Failed to send email")
-
 
 def get_alert_service(
     session: AsyncSession,
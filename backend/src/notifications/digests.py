@@ -0,0 +1,76 @@
+"""
+Scheduled low stock digest emails.
+
+With LOW_STOCK_ALERT_DIGEST set, a check-out that leaves an item low on
+stock queues it in low_stock_alert_queue instead of emailing right away.
+Each run of this module sends every user's queued items as one digest, so
+the time between runs is the digest window. Items that are no longer low,
+or were alerted within the last 24 hours, are dropped from the queue.
+Queued rows are removed in the transaction that records the alerts, so
+overlapping runs never send the same items twice.
+
+Run it on the window you want (e.g. hourly, from cron).
+
+Usage:
+    uv run python -m src.notifications.digests
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.config import Settings, get_settings
+from src.database import create_session_factory, set_tenant_context
+from src.notifications.alert_service import AlertService
+from src.notifications.models import LowStockAlertQueue
+from src.notifications.smtp_pool import close_smtp_pools
+
+logger = logging.getLogger(__name__)
+
+
+async def send_low_stock_digests(
+    session_factory: async_sessionmaker[AsyncSession], settings: Settings
+) -> int:
+    """Send the queued low stock alerts of every user.
+
+    Each user is handled in a session of their own, so one failure leaves
+    the other users' digests (and that user's queue) intact.
+
+    Returns:
+        Number of items whose alert email was sent
+    """
+    async with session_factory() as session:
+        user_ids = (
+            await session.scalars(select(LowStockAlertQueue.user_id).distinct())
+        ).all()
+
+    sent = 0
+    for user_id in user_ids:
+        try:
+            async with session_factory() as session:
+                await set_tenant_context(session, user_id)
+                service = AlertService(session, user_id, settings)
+                sent += await service.send_queued_low_stock_digest()
+        except Exception:
+            logger.exception(f"Low stock digest failed: user_id={user_id}")
+    return sent
+
+
+async def main() -> None:
+    settings = get_settings()
+    engine = create_async_engine(settings.database_url)
+    try:
+        sent = await send_low_stock_digests(create_session_factory(engine), settings)
+    finally:
+        await close_smtp_pools()
+        await engine.dispose()
+    print(f"Sent low stock digests for {sent} item(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.parse_args()
+    asyncio.run(main())
@@ -6,7 +6,9 @@ from email.mime.text import MIMEText
 
 import aiosmtplib
 
+from src.common.metrics import EMAIL_QUEUE_DEPTH
 from src.config import Settings
+from src.notifications.smtp_pool import get_smtp_pool
 
 logger = logging.getLogger(__name__)
 
@@ -81,33 +83,20 @@ class EmailService:
             password = self.settings.smtp_password or None
 
             logger.info(
-                f"Connecting to SMTP server: host={self.settings.smtp_host}, "
+                f"Sending via SMTP server: host={self.settings.smtp_host}, "
                 f"port={self.settings.smtp_port}, use_tls={self.settings.smtp_use_tls}, "
                 f"auth={'yes' if username else 'no'}"
             )
 
-            if self.settings.smtp_use_tls:
-                await aiosmtplib.send(
-                    message,
-                    hostname=self.settings.smtp_host,
-                    port=self.settings.smtp_port,
-                    username=username,
-                    password=password,
-                    start_tls=True,
-                )
-            else:
-                # Warn if credentials are sent without TLS
-                if username or password:
-                    logger.warning(
-                        "SMTP credentials will be sent without TLS encryption"
-                    )
-                await aiosmtplib.send(
-                    message,
-                    hostname=self.settings.smtp_host,
-                    port=self.settings.smtp_port,
-                    username=username,
-                    password=password,
-                )
+            # Warn if credentials are sent without TLS
+            if not self.settings.smtp_use_tls and (username or password):
+                logger.warning("SMTP credentials may be sent without TLS encryption")
+
+            EMAIL_QUEUE_DEPTH.inc()
+            try:
+                await get_smtp_pool(self.settings).send_message(message)
+            finally:
+                EMAIL_QUEUE_DEPTH.dec()
 
             logger.info(
                 f"Email sent successfully: to={to_email}, subject={subject}, "
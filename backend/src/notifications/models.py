@@ -52,9 +52,13 @@ class NotificationPreferences(Base):
 
 
 class AlertHistory(Base):
-    """Track sent alerts for deduplication and audit."""
+    """Track sent alerts for deduplication and audit.
+
+    Partitioned by month on sent_at (see src.common.partitions).
+    """
 
     __tablename__ = "alert_history"
+    __table_args__ = {"postgresql_partition_by": "RANGE (sent_at)"}
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True, server_default=func.gen_random_uuid()
@@ -88,7 +92,10 @@ class AlertHistory(Base):
 
     # Timestamps
     sent_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), index=True
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        index=True,
     )
 
     # Relationships
@@ -96,6 +103,31 @@ class AlertHistory(Base):
     item: Mapped["Item"] = relationship(back_populates="alert_history")
 
 
+class LowStockAlertQueue(Base):
+    """Low stock alerts waiting for the next digest.
+
+    Check-outs queue items here in digest mode; src.notifications.digests
+    sends them and removes the rows.
+    """
+
+    __tablename__ = "low_stock_alert_queue"
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    item_id: Mapped[UUID] = mapped_column(
+        ForeignKey("items.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    # Who checked the item out, as for immediate alerts
+    recipient_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    recipient_name: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    queued_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
 # Import at bottom to avoid circular imports
 from src.items.models import Item  # noqa: E402
 from src.users.models import User  # noqa: E402
@@ -2,14 +2,21 @@
 
 import logging
 from datetime import UTC, datetime, timedelta
-from uuid import UUID
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.items.models import Item
-from src.notifications.models import AlertHistory, AlertStatus, NotificationPreferences
+from src.notifications.models import (
+    AlertHistory,
+    AlertStatus,
+    LowStockAlertQueue,
+    NotificationPreferences,
+)
 from src.notifications.schemas import NotificationPreferencesUpdate
 
 logger = logging.getLogger(__name__)
@@ -99,6 +106,78 @@ class NotificationRepository:
         )
         return was_alerted
 
+    async def get_recently_alerted_item_ids(
+        self,
+        item_ids: list[UUID],
+        alert_type: str,
+        within_hours: int = 24,
+    ) -> set[UUID]:
+        """Get the items among item_ids that were alerted within the time window.
+
+        Batched form of was_alerted_recently for deduplicating many items
+        with one query.
+        """
+        if not item_ids:
+            return set()
+        cutoff = datetime.now(UTC) - timedelta(hours=within_hours)
+        result = await self.session.execute(
+            select(AlertHistory.item_id)
+            .where(
+                AlertHistory.user_id == self.user_id,
+                AlertHistory.item_id.in_(item_ids),
+                AlertHistory.alert_type == alert_type,
+                AlertHistory.status == AlertStatus.SENT.value,
+                AlertHistory.sent_at >= cutoff,
+            )
+            .distinct()
+        )
+        alerted = set(result.scalars().all())
+        logger.info(
+            f"Batch deduplication check: user_id={self.user_id}, "
+            f"items_checked={len(item_ids)}, alerted_recently={len(alerted)}"
+        )
+        return alerted
+
+    async def queue_low_stock_alert(
+        self, item_id: UUID, recipient_email: str, recipient_name: str
+    ) -> None:
+        """Queue a low stock alert for the next digest (once per item)."""
+        await self.session.execute(
+            insert(LowStockAlertQueue)
+            .values(
+                user_id=self.user_id,
+                item_id=item_id,
+                recipient_email=recipient_email,
+                recipient_name=recipient_name,
+            )
+            .on_conflict_do_nothing()
+        )
+        await self.session.commit()
+        logger.info(
+            f"Low stock alert queued for digest: item_id={item_id}, "
+            f"user_id={self.user_id}"
+        )
+
+    async def claim_queued_low_stock_alerts(self) -> list[Row]:
+        """Remove and return the user's queued low stock alerts.
+
+        Not committed: the removal commits with the alert history recorded
+        for the items, and a concurrent claim waits for it and gets nothing.
+
+        Returns:
+            (item_id, recipient_email, recipient_name) rows
+        """
+        result = await self.session.execute(
+            delete(LowStockAlertQueue)
+            .where(LowStockAlertQueue.user_id == self.user_id)
+            .returning(
+                LowStockAlertQueue.item_id,
+                LowStockAlertQueue.recipient_email,
+                LowStockAlertQueue.recipient_name,
+            )
+        )
+        return list(result.all())
+
     async def create_alert_history(
         self,
         item_id: UUID,
@@ -136,6 +215,62 @@ class NotificationRepository:
         logger.info(f"Alert history created: alert_id={alert.id}, item_id={item_id}")
         return alert
 
+    async def create_alert_histories(
+        self, entries: list[dict[str, Any]]
+    ) -> list[AlertHistory]:
+        """Create several alert history records in a single write.
+
+        Args:
+            entries: Keyword arguments for each record, as accepted by
+                create_alert_history
+
+        Returns:
+            The created records, in the same order as entries
+        """
+        now = datetime.now(UTC)
+        alerts = [
+            AlertHistory(
+                id=uuid4(),
+                user_id=self.user_id,
+                item_id=entry["item_id"],
+                alert_type=entry["alert_type"],
+                channel=entry["channel"],
+                recipient_email=entry["recipient_email"],
+                subject=entry["subject"],
+                item_quantity_at_alert=entry["item_quantity"],
+                item_min_quantity=entry["item_min_quantity"],
+                status=entry.get("status", AlertStatus.PENDING.value),
+                error_message=entry.get("error_message"),
+                sent_at=now,
+            )
+            for entry in entries
+        ]
+        self.session.add_all(alerts)
+        await self.session.commit()
+        logger.info(
+            f"Alert history records created: user_id={self.user_id}, "
+            f"count={len(alerts)}"
+        )
+        return alerts
+
+    async def update_alert_statuses(
+        self,
+        updates: list[tuple[AlertHistory, str, str | None]],
+    ) -> None:
+        """Update the status of several alert history records in a single write.
+
+        Args:
+            updates: (alert, status, error_message) for each record
+        """
+        for alert, status, error_message in updates:
+            alert.status = status
+            if error_message:
+                alert.error_message = error_message
+        await self.session.commit()
+        logger.info(
+            f"Alert statuses updated: user_id={self.user_id}, count={len(updates)}"
+        )
+
     async def update_alert_status(
         self,
         alert_id: UUID,
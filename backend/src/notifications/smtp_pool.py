@@ -0,0 +1,167 @@
+"""
+Pooled SMTP connections for outgoing email.
+
+Opening an SMTP connection costs a TCP connect, EHLO, STARTTLS handshake and
+login. The pool keeps a few authenticated connections open per SMTP server
+and reuses them across emails, reconnecting transparently when the server
+has dropped an idle connection.
+"""
+
+import asyncio
+import logging
+import time
+from email.message import Message
+
+import aiosmtplib
+
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Maximum concurrent connections per SMTP server
+DEFAULT_POOL_SIZE = 2
+
+# Servers commonly drop idle clients after a few minutes; connections idle for
+# longer than this are closed and reopened rather than reused
+DEFAULT_IDLE_TIMEOUT_SECONDS = 60.0
+
+
+class SMTPConnectionPool:
+    """A bounded pool of reusable SMTP connections to one server."""
+
+    def __init__(
+        self,
+        *,
+        hostname: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        start_tls: bool | None = None,
+        size: int = DEFAULT_POOL_SIZE,
+        idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.size = size
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._idle: list[tuple[aiosmtplib.SMTP, float]] = []
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _bind_loop(self) -> asyncio.Semaphore:
+        """Reset the pool if it is used from a different event loop.
+
+        Connections belong to the loop that opened them, so a pool created
+        under one loop (e.g. in tests) cannot hand them to another.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop or self._semaphore is None:
+            for client, _ in self._idle:
+                client.close()
+            self._idle = []
+            self._semaphore = asyncio.Semaphore(self.size)
+            self._loop = loop
+        return self._semaphore
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open and authenticate a new connection."""
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+        )
+        await client.connect()
+        logger.info(f"Opened SMTP connection: host={self.hostname}, port={self.port}")
+        return client
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        """Take a live idle connection, or open a new one."""
+        now = time.monotonic()
+        while self._idle:
+            client, last_used = self._idle.pop()
+            if client.is_connected and now - last_used < self.idle_timeout_seconds:
+                return client
+            client.close()
+        return await self._connect()
+
+    def _release(self, client: aiosmtplib.SMTP) -> None:
+        """Return a connection to the pool for reuse."""
+        if client.is_connected:
+            self._idle.append((client, time.monotonic()))
+
+    async def send_message(self, message: Message) -> None:
+        """Send a message over a pooled connection.
+
+        A connection the server has closed since its last use is replaced
+        and the send retried once.
+
+        Raises:
+            aiosmtplib.SMTPException: If the message could not be sent
+        """
+        async with self._bind_loop():
+            client = await self._acquire()
+            try:
+                try:
+                    await client.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    logger.info(
+                        "SMTP connection was closed by the server, reconnecting"
+                    )
+                    client.close()
+                    client = await self._connect()
+                    await client.send_message(message)
+            except BaseException:
+                # Don't reuse a connection in an unknown state
+                client.close()
+                raise
+            self._release(client)
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        idle, self._idle = self._idle, []
+        for client, _ in idle:
+            try:
+                await client.quit()
+            except Exception:
+                client.close()
+
+
+_pools: dict[tuple, SMTPConnectionPool] = {}
+
+
+def get_smtp_pool(settings: Settings) -> SMTPConnectionPool:
+    """Get the process-wide connection pool for the configured SMTP server."""
+    key = (
+        settings.smtp_host,
+        settings.smtp_port,
+        settings.smtp_username,
+        settings.smtp_password,
+        settings.smtp_use_tls,
+        settings.smtp_pool_size,
+    )
+    pool = _pools.get(key)
+    if pool is None:
+        pool = SMTPConnectionPool(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_username or None,
+            password=settings.smtp_password or None,
+            # Require STARTTLS when TLS is enabled; otherwise use it if offered
+            start_tls=True if settings.smtp_use_tls else None,
+            size=settings.smtp_pool_size,
+        )
+        _pools[key] = pool
+    return pool
+
+
+async def close_smtp_pools() -> None:
+    """Close all pooled SMTP connections (on application shutdown)."""
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.close()
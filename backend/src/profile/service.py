@@ -1,12 +1,14 @@
 import json
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from decimal import Decimal
 from uuid import UUID
 
 from openai import AsyncOpenAI
-from sqlalchemy import select
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.ai.service import create_chat_completion
 from src.config import Settings, get_settings
 from src.items.models import Item, ItemCheckInOut
 from src.profile.models import UserSystemProfile
@@ -15,6 +17,9 @@ from src.profile.schemas import (
     PurgeRecommendationWithItem,
 )
 
+# Rows fetched per round-trip when streaming items into the purge prompt
+ITEM_BATCH_SIZE = 100
+
 PURGE_SYSTEM_PROMPT = """You are an inventory management assistant helping users identify items that could potentially be purged or decluttered from their inventory.
 
 Your role is to analyze items based on:
@@ -81,52 +86,57 @@ class PurgeRecommendationService:
         self.settings = settings or get_settings()
         self.client = AsyncOpenAI(api_key=self.settings.openai_api_key)
 
-    async def _get_items_with_usage(
-        self, user_id: UUID, _profile: UserSystemProfile, limit: int = 200
-    ) -> list[dict]:
-        """Get items with their usage data for analysis."""
-        # Get items for the user, limited to prevent token overflow
-        result = await self.session.execute(
-            select(Item)
+    @staticmethod
+    def _items_with_usage_query() -> Select:
+        """Build the item query with category, location and last check-out.
+
+        Category and location names are joined in and the last check-out is a
+        correlated ``max(occurred_at)`` over the indexed ``item_id`` column, so
+        any number of items is loaded in a single round-trip.
+        """
+        from src.categories.models import Category
+        from src.locations.models import Location
+
+        last_used = (
+            select(func.max(ItemCheckInOut.occurred_at))
+            .where(
+                ItemCheckInOut.item_id == Item.id,
+                ItemCheckInOut.action_type == "check_out",
+            )
+            .correlate(Item)
+            .scalar_subquery()
+        )
+        return (
+            select(
+                Item,
+                Category.name.label("category_name"),
+                Location.name.label("location_name"),
+                last_used.label("last_used"),
+            )
+            .outerjoin(Category, Item.category_id == Category.id)
+            .outerjoin(Location, Item.location_id == Location.id)
+        )
+
+    async def _iter_items_with_usage(
+        self,
+        user_id: UUID,
+        _profile: UserSystemProfile,
+        limit: int = 200,
+        batch_size: int = ITEM_BATCH_SIZE,
+    ) -> AsyncIterator[list[dict]]:
+        """Stream items with their usage data for analysis in batches."""
+        now = datetime.now(UTC)
+        query = (
+            self._items_with_usage_query()
             .where(Item.user_id == user_id)
             .order_by(Item.updated_at.desc())
             .limit(limit)
+            .execution_options(yield_per=batch_size)
         )
-        items = result.scalars().all()
-
-        # Get last check-out for each item
-        items_data = []
-        for item in items:
-            # Get the last check-out event
-            checkout_result = await self.session.execute(
-                select(ItemCheckInOut)
-                .where(
-                    ItemCheckInOut.item_id == item.id,
-                    ItemCheckInOut.action_type == "check_out",
-                )
-                .order_by(ItemCheckInOut.occurred_at.desc())
-                .limit(1)
-            )
-            last_checkout = checkout_result.scalar_one_or_none()
-
-            last_used = last_checkout.occurred_at if last_checkout else None
-            days_since_use = (datetime.now(UTC) - last_used).days if last_used else None
-
-            # Get category name
-            category_name = None
-            if item.category_id:
-                await self.session.refresh(item, ["category"])
-                if item.category:
-                    category_name = item.category.name
-
-            # Get location name
-            location_name = None
-            if item.location_id:
-                await self.session.refresh(item, ["location"])
-                if item.location:
-                    location_name = item.location.name
-
-            items_data.append(
+        result = await self.session.stream(query)
+
+        async for rows in result.partitions():
+            yield [
                 {
                     "id": str(item.id),
                     "name": item.name,
@@ -136,11 +146,25 @@ class PurgeRecommendationService:
                     "category_name": category_name,
                     "location_name": location_name,
                     "last_used": last_used,
-                    "days_since_use": days_since_use,
+                    "days_since_use": (now - last_used).days if last_used else None,
                 }
-            )
-
-        return items_data
+                for item, category_name, location_name, last_used in rows
+            ]
+
+    @staticmethod
+    def _format_item_line(item: dict) -> str:
+        """Format one item as a line of the purge analysis prompt."""
+        last_used_str = (
+            item["last_used"].strftime("%Y-%m-%d") if item["last_used"] else "never"
+        )
+        days_str = str(item["days_since_use"]) if item["days_since_use"] else "N/A"
+        return (
+            f"{item['id']} | {item['name']} | {item['quantity']} | "
+            f"{item['quantity_unit']} | ${item['price'] or 0:.2f} | "
+            f"{item['category_name'] or 'uncategorized'} | "
+            f"{item['location_name'] or 'no location'} | "
+            f"{last_used_str} | {days_str} days"
+        )
 
     async def _get_category_names(self, category_ids: list[UUID]) -> list[str]:
         """Get category names from IDs."""
@@ -162,12 +186,18 @@ class PurgeRecommendationService:
         items_to_analyze: int = 50,
     ) -> list[PurgeRecommendationCreate]:
         """Generate purge recommendations using AI."""
-        # Get items with usage data, limited to items_to_analyze
-        items_data = await self._get_items_with_usage(
+        # Stream items with usage data, limited to items_to_analyze, formatting
+        # each batch for the prompt as it arrives
+        items_map: dict[str, dict] = {}
+        items_list: list[str] = []
+        async for batch in self._iter_items_with_usage(
             user_id, profile, items_to_analyze
-        )
+        ):
+            for item in batch:
+                items_map[item["id"]] = item
+                items_list.append(self._format_item_line(item))
 
-        if not items_data:
+        if not items_map:
             return []
 
         # Get interest category names
@@ -175,21 +205,6 @@ class PurgeRecommendationService:
             profile.interest_category_ids or []
         )
 
-        # Format items list for the prompt
-        items_list = []
-        for item in items_data:
-            last_used_str = (
-                item["last_used"].strftime("%Y-%m-%d") if item["last_used"] else "never"
-            )
-            days_str = str(item["days_since_use"]) if item["days_since_use"] else "N/A"
-            items_list.append(
-                f"{item['id']} | {item['name']} | {item['quantity']} | "
-                f"{item['quantity_unit']} | ${item['price'] or 0:.2f} | "
-                f"{item['category_name'] or 'uncategorized'} | "
-                f"{item['location_name'] or 'no location'} | "
-                f"{last_used_str} | {days_str} days"
-            )
-
         # Build the prompt
         user_prompt = PURGE_USER_PROMPT.format(
             hobby_types=", ".join(profile.hobby_types) or "not specified",
@@ -208,7 +223,9 @@ class PurgeRecommendationService:
         )
 
         # Call OpenAI API
-        response = await self.client.chat.completions.create(
+        response = await create_chat_completion(
+            self.client,
+            "purge_recommendations",
             model=self.settings.openai_model,
             messages=[
                 {"role": "system", "content": PURGE_SYSTEM_PROMPT},
@@ -233,7 +250,6 @@ class PurgeRecommendationService:
 
         # Convert to PurgeRecommendationCreate objects
         recommendations = []
-        items_map = {item["id"]: item for item in items_data}
 
         for rec_data in recommendations_data:
             item_id = rec_data.get("item_id")
@@ -257,44 +273,22 @@ class PurgeRecommendationService:
         recommendations: list,  # List of PurgeRecommendation models
     ) -> list[PurgeRecommendationWithItem]:
         """Enrich recommendations with item details."""
-        result = []
+        if not recommendations:
+            return []
 
-        for rec in recommendations:
-            # Get the item with relationships
-            item_result = await self.session.execute(
-                select(Item).where(Item.id == rec.item_id)
-            )
-            item = item_result.scalar_one_or_none()
+        query = self._items_with_usage_query().where(
+            Item.id.in_([rec.item_id for rec in recommendations])
+        )
+        rows = (await self.session.execute(query)).all()
+        items_by_id = {row.Item.id: row for row in rows}
 
-            if not item:
+        result = []
+        for rec in recommendations:
+            row = items_by_id.get(rec.item_id)
+            if not row:
                 continue
 
-            # Get category name
-            category_name = None
-            if item.category_id:
-                await self.session.refresh(item, ["category"])
-                if item.category:
-                    category_name = item.category.name
-
-            # Get location name
-            location_name = None
-            if item.location_id:
-                await self.session.refresh(item, ["location"])
-                if item.location:
-                    location_name = item.location.name
-
-            # Get last usage
-            checkout_result = await self.session.execute(
-                select(ItemCheckInOut)
-                .where(
-                    ItemCheckInOut.item_id == item.id,
-                    ItemCheckInOut.action_type == "check_out",
-                )
-                .order_by(ItemCheckInOut.occurred_at.desc())
-                .limit(1)
-            )
-            last_checkout = checkout_result.scalar_one_or_none()
-
+            item = row.Item
             result.append(
                 PurgeRecommendationWithItem(
                     id=rec.id,
@@ -311,9 +305,9 @@ class PurgeRecommendationService:
                     item_quantity=item.quantity,
                     item_quantity_unit=item.quantity_unit,
                     item_price=item.price,
-                    item_category_name=category_name,
-                    item_location_name=location_name,
-                    last_used_at=(last_checkout.occurred_at if last_checkout else None),
+                    item_category_name=row.category_name,
+                    item_location_name=row.location_name,
+                    last_used_at=row.last_used,
                 )
             )
 
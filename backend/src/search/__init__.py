@@ -0,0 +1 @@
+"""Typeahead suggestions across items, categories and locations."""
@@ -0,0 +1,73 @@
+"""
+Short-lived cache of typeahead responses.
+
+The search box asks for suggestions on every keystroke, and backspacing or
+retyping repeats earlier prefixes. Serialized responses are kept for a few
+seconds per inventory and normalized prefix; edits show up once the entry
+expires.
+"""
+
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from uuid import UUID
+
+DEFAULT_TTL_SECONDS = 30
+
+# Bound memory use across all users in this process
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def normalize_prefix(query: str) -> str:
+    """Lowercase and collapse whitespace, so equivalent prefixes share an entry."""
+    return " ".join(query.lower().split())
+
+
+class SuggestionCache:
+    """In-memory LRU cache of serialized suggestion responses."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, bytes]] = OrderedDict()
+
+    @staticmethod
+    def make_key(inventory_owner_id: UUID, query: str, limit: int) -> tuple:
+        """Build the cache key for a suggestion request."""
+        return (inventory_owner_id, normalize_prefix(query), limit)
+
+    def get(self, key: tuple) -> bytes | None:
+        """Return a cached response, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, content = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return content
+
+    def set(self, key: tuple, content: bytes) -> None:
+        """Store a response, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache
+def get_suggestion_cache() -> SuggestionCache:
+    """Get the process-wide suggestion cache."""
+    return SuggestionCache()
@@ -0,0 +1,158 @@
+import re
+from functools import cache
+from uuid import UUID
+
+from sqlalchemy import (
+    Select,
+    bindparam,
+    case,
+    false,
+    func,
+    literal,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.categories.models import Category
+from src.items.models import Item
+from src.locations.models import Location
+from src.search.schemas import Suggestion
+
+# Trigram indexes only narrow down substring patterns of 3+ characters;
+# shorter input matches names by word prefix instead
+MIN_SUBSTRING_LENGTH = 3
+
+
+def _prefix_tsquery(query: str) -> str | None:
+    """to_tsquery input matching every word of the input as a prefix.
+
+    Only letters and digits are kept, so the result never contains tsquery
+    operators from the input.
+    """
+    words = re.findall(r"[^\W_]+", query.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def _like_escaped(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", r"\%").replace("_", r"\_")
+
+
+@cache
+def _suggest_statement(substring: bool, words: bool) -> Select:
+    """The suggestion query for one input shape, built once and reused.
+
+    Building the union and computing its SQL cache key took longer than
+    running it; the input is passed as bound parameters instead.
+
+    Args:
+        substring: Match names containing the input (input of at least
+            MIN_SUBSTRING_LENGTH characters), not just word prefixes
+        words: The input has letters or digits to match search_vector by
+    """
+    limit = bindparam("limit")
+
+    def branch(model, kind: str, condition):
+        match = case(
+            (model.name.ilike(bindparam("prefix"), escape="\\"), 0),
+            (model.name.ilike(bindparam("word_prefix"), escape="\\"), 1),
+            else_=2,
+        )
+        # Each branch is cut down to the limit before the union
+        return (
+            select(
+                model.id,
+                model.name,
+                literal(kind).label("kind"),
+                match.label("match"),
+            )
+            .where(model.user_id == bindparam("user_id"), condition)
+            .order_by(match, func.length(model.name), model.name)
+            .limit(limit)
+        )
+
+    def name_matches(model):
+        if not substring:
+            return model.name.ilike(bindparam("prefix"), escape="\\") | (
+                model.name.ilike(bindparam("word_prefix"), escape="\\")
+            )
+        return model.name.ilike(bindparam("substring"), escape="\\")
+
+    # Item names are in search_vector too; for short input the GIN index
+    # alone finds them
+    item_conditions = []
+    if substring:
+        item_conditions.append(name_matches(Item))
+    if words:
+        item_conditions.append(
+            Item.search_vector.op("@@")(
+                func.to_tsquery("english", bindparam("tsquery"))
+            )
+        )
+    suggestions = union_all(
+        branch(Item, "item", or_(false(), *item_conditions)),
+        branch(Category, "category", name_matches(Category)),
+        branch(Location, "location", name_matches(Location)),
+    ).subquery()
+    return (
+        select(suggestions.c.id, suggestions.c.name, suggestions.c.kind)
+        .order_by(
+            suggestions.c.match,
+            func.length(suggestions.c.name),
+            suggestions.c.name,
+        )
+        .limit(limit)
+    )
+
+
+class SuggestionRepository:
+    """Typeahead lookups across a user's items, categories and locations."""
+
+    def __init__(self, session: AsyncSession, user_id: UUID):
+        self.session = session
+        self.user_id = user_id
+
+    async def suggest(self, query: str, limit: int = 8) -> list[Suggestion]:
+        """Find items, categories and locations matching a typed prefix.
+
+        Names containing the input match through their trigram indexes
+        (created by migration 032), and items also match every word as a
+        prefix of their search_vector, so descriptions and tags count too.
+        Input shorter than MIN_SUBSTRING_LENGTH only matches word prefixes.
+        All three are read in one UNION statement; names starting with the
+        input come first, then names with a word starting with it, shorter
+        names first.
+
+        Args:
+            query: What has been typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            Suggestions, best match first
+        """
+        text = " ".join(query.split())
+        if not text:
+            return []
+        escaped = _like_escaped(text)
+        tsquery = _prefix_tsquery(text)
+        statement = _suggest_statement(
+            len(text) >= MIN_SUBSTRING_LENGTH, tsquery is not None
+        )
+        result = await self.session.execute(
+            statement,
+            {
+                "user_id": self.user_id,
+                "prefix": f"{escaped}%",
+                "word_prefix": f"% {escaped}%",
+                "substring": f"%{escaped}%",
+                "tsquery": tsquery,
+                "limit": limit,
+            },
+        )
+        return [
+            Suggestion.model_construct(id=id, name=name, kind=kind)
+            for id, name, kind in result
+        ]
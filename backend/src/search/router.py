@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Query, Response
+from pydantic import TypeAdapter
+
+from src.auth.dependencies import InventoryContextDep
+from src.database import AsyncSessionDep
+from src.search.cache import get_suggestion_cache
+from src.search.repository import SuggestionRepository
+from src.search.schemas import Suggestion
+
+router = APIRouter()
+
+_suggestion_adapter = TypeAdapter(list[Suggestion])
+
+
+@router.get("/suggest", response_model=list[Suggestion])
+async def suggest(
+    session: AsyncSessionDep,
+    inventory_owner_id: InventoryContextDep,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+) -> Response:
+    """Typeahead suggestions for the search box.
+
+    Returns items, categories and locations whose names contain the input
+    (items also match by description and tags), with only their id, name
+    and kind. Responses are cached briefly per inventory and prefix.
+    """
+    cache = get_suggestion_cache()
+    key = cache.make_key(inventory_owner_id, q, limit)
+    content = cache.get(key)
+    if content is None:
+        repo = SuggestionRepository(session, inventory_owner_id)
+        content = _suggestion_adapter.dump_json(await repo.suggest(q, limit))
+        cache.set(key, content)
+    return Response(content=content, media_type="application/json")
@@ -0,0 +1,16 @@
+"""Search suggestion schemas."""
+
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+SuggestionKind = Literal["item", "category", "location"]
+
+
+class Suggestion(BaseModel):
+    """A typeahead match: just enough to show it and link to it."""
+
+    id: UUID
+    name: str
+    kind: SuggestionKind
@@ -0,0 +1,90 @@
+"""
+Per-endpoint circuit breaker for webhook delivery.
+
+Receivers that keep failing are skipped for a cool-down period instead of
+tying up a delivery slot for every retry of every event. After the cool-down
+a single trial delivery is let through; success closes the circuit again.
+"""
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Consecutive failed attempts before an endpoint is skipped
+DEFAULT_FAILURE_THRESHOLD = 5
+
+# Seconds an open circuit stays open before a trial delivery is allowed
+DEFAULT_RESET_TIMEOUT_SECONDS = 60.0
+
+
+@dataclass
+class _CircuitState:
+    failures: int = 0
+    opened_at: float | None = None
+    trial_in_progress: bool = False
+
+
+class CircuitBreaker:
+    """In-memory circuit breaker keyed by endpoint."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout_seconds: float = DEFAULT_RESET_TIMEOUT_SECONDS,
+    ):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._states: dict[str, _CircuitState] = {}
+
+    def allow(self, endpoint: str) -> bool:
+        """Check whether a delivery attempt to an endpoint may be made.
+
+        While the circuit is open, attempts are rejected until the reset
+        timeout has passed; then exactly one trial attempt is allowed.
+        """
+        state = self._states.get(endpoint)
+        if state is None or state.opened_at is None:
+            return True
+        if state.trial_in_progress:
+            return False
+        if time.monotonic() - state.opened_at < self._reset_timeout_seconds:
+            return False
+        state.trial_in_progress = True
+        return True
+
+    def is_open(self, endpoint: str) -> bool:
+        """Check whether an endpoint's circuit is currently open."""
+        state = self._states.get(endpoint)
+        return state is not None and state.opened_at is not None
+
+    def record_success(self, endpoint: str) -> None:
+        """Close the circuit for an endpoint."""
+        self._states.pop(endpoint, None)
+
+    def record_failure(self, endpoint: str) -> None:
+        """Count a failed attempt, opening the circuit at the threshold."""
+        state = self._states.setdefault(endpoint, _CircuitState())
+        state.failures += 1
+        if state.trial_in_progress or state.failures >= self._failure_threshold:
+            state.opened_at = time.monotonic()
+            state.trial_in_progress = False
+
+    def release_trial(self, endpoint: str) -> None:
+        """End a trial attempt that recorded no outcome (e.g. cancelled).
+
+        The circuit stays open and the next attempt is let through as the
+        trial. No-op once the trial's success or failure was recorded.
+        """
+        state = self._states.get(endpoint)
+        if state is not None:
+            state.trial_in_progress = False
+
+    def reset(self) -> None:
+        """Close all circuits."""
+        self._states.clear()
+
+
+@lru_cache
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the process-wide webhook circuit breaker."""
+    return CircuitBreaker()
@@ -1,15 +1,22 @@
-"""Webhook HTTP execution with retry logic."""
+"""Webhook HTTP execution with concurrent fan-out and retry logic."""
 
 import asyncio
 import json
 import logging
 import re
 from datetime import UTC, datetime
+from uuid import uuid4
 
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.common.url_validator import SSRFValidationError, validate_webhook_url
+from src.common.url_validator import (
+    PinnedIPTransport,
+    SSRFValidationError,
+    ValidatedURL,
+    validate_webhook_url_async,
+)
+from src.webhooks.circuit_breaker import CircuitBreaker, get_circuit_breaker
 from src.webhooks.models import WebhookConfig, WebhookExecution
 from src.webhooks.repository import WebhookRepository
 from src.webhooks.template import build_default_payload, render_template
@@ -52,12 +59,46 @@ def sanitize_headers_for_logging(headers: dict[str, str]) -> dict[str, str]:
     return sanitized
 
 
+# Concurrent requests to a single receiver host during a fan-out
+MAX_CONNECTIONS_PER_HOST = 4
+
+CIRCUIT_OPEN_MESSAGE = "Circuit open: endpoint skipped after repeated failures"
+
+
+class _PayloadRenderer:
+    """Renders request bodies for one event, once per distinct template."""
+
+    def __init__(self, event_payload: dict):
+        self.event_payload = event_payload
+        self._bodies: dict[tuple[str, str | None], str] = {}
+
+    def render(self, config: WebhookConfig) -> str:
+        key = (config.event_type, config.body_template)
+        if key not in self._bodies:
+            if config.body_template:
+                self._bodies[key] = render_template(
+                    config.body_template, self.event_payload
+                )
+            else:
+                self._bodies[key] = json.dumps(
+                    build_default_payload(config.event_type, self.event_payload)
+                )
+        return self._bodies[key]
+
+
 class WebhookExecutor:
     """Handles webhook execution with retry logic."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        circuit_breaker: CircuitBreaker | None = None,
+        max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+    ):
         self.session = session
         self.repository = WebhookRepository(session)
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker()
+        self.max_connections_per_host = max_connections_per_host
 
     async def execute(
         self,
@@ -65,95 +106,175 @@ class WebhookExecutor:
         event_payload: dict,
     ) -> WebhookExecution:
         """Execute a webhook with the given payload."""
-        # Validate URL for SSRF before execution
-        try:
-            validate_webhook_url(config.url)
-        except SSRFValidationError as e:
-            logger.error(f"Webhook URL validation failed: {e}")
-            # Create a failed execution record
-            execution = await self.repository.create_execution(
-                webhook_config_id=config.id,
-                event_type=config.event_type,
-                event_payload=event_payload,
-                request_url=config.url,
-                request_headers={},
-                request_body="",
+        executions = await self.execute_many([config], event_payload)
+        return executions[0]
+
+    async def execute_many(
+        self,
+        configs: list[WebhookConfig],
+        event_payload: dict,
+    ) -> list[WebhookExecution]:
+        """Deliver an event to several webhook configs concurrently.
+
+        Request bodies are rendered once per distinct template and shared
+        across subscribers. Execution records are written twice per fan-out:
+        once when deliveries start and once with their final states.
+
+        Args:
+            configs: Webhook configs subscribed to the event
+            event_payload: Event data to send
+
+        Returns:
+            Execution records in the same order as configs
+        """
+        # Validate URLs for SSRF before execution
+        targets = await asyncio.gather(
+            *(validate_webhook_url_async(config.url) for config in configs),
+            return_exceptions=True,
+        )
+
+        renderer = _PayloadRenderer(event_payload)
+        executions: list[WebhookExecution] = []
+        deliveries = []
+        for config, target in zip(configs, targets, strict=True):
+            if isinstance(target, BaseException):
+                if not isinstance(target, SSRFValidationError):
+                    raise target
+                logger.error(f"Webhook URL validation failed: {target}")
+                # Record a failed execution without sending anything
+                executions.append(
+                    self._new_execution(
+                        config,
+                        event_payload,
+                        headers={},
+                        body="",
+                        status="failed",
+                        error_message=f"URL validation failed: {target}",
+                    )
+                )
+                continue
+
+            # Build headers
+            headers = {
+                "Content-Type": "application/json",
+                "User-Agent": "HomERP-Webhook/1.0",
+                **config.headers,
+            }
+            body = renderer.render(config)
+
+            # Actual headers are used for the request, but sanitized version
+            # is stored
+            execution = self._new_execution(
+                config,
+                event_payload,
+                headers=sanitize_headers_for_logging(headers),
+                body=body,
             )
-            execution.status = "failed"
-            execution.error_message = f"URL validation failed: {e}"
-            execution.completed_at = datetime.now(UTC)
-            await self.repository.update_execution(execution)
-            return execution
-
-        # Build request body
-        if config.body_template:
-            request_body = render_template(config.body_template, event_payload)
-        else:
-            request_body = json.dumps(
-                build_default_payload(config.event_type, event_payload)
+            executions.append(execution)
+            deliveries.append((execution, config, headers, body, target))
+
+        await self.repository.create_executions(executions)
+
+        # Limit concurrent connections per receiver host
+        host_limits: dict[str, asyncio.Semaphore] = {}
+        await asyncio.gather(
+            *(
+                self._execute_with_retries(
+                    execution,
+                    config,
+                    headers,
+                    body,
+                    target,
+                    host_limits.setdefault(
+                        target.hostname,
+                        asyncio.Semaphore(self.max_connections_per_host),
+                    ),
+                )
+                for execution, config, headers, body, target in deliveries
             )
+        )
 
-        # Build headers
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "HomERP-Webhook/1.0",
-            **config.headers,
-        }
-
-        # Create execution record with sanitized headers
-        # Actual headers are used for the request, but sanitized version is stored
-        sanitized_headers = sanitize_headers_for_logging(headers)
-        execution = await self.repository.create_execution(
+        await self.repository.update_executions()
+        return executions
+
+    @staticmethod
+    def _new_execution(
+        config: WebhookConfig,
+        event_payload: dict,
+        *,
+        headers: dict,
+        body: str,
+        status: str = "pending",
+        error_message: str | None = None,
+    ) -> WebhookExecution:
+        """Build an execution record for a delivery."""
+        now = datetime.now(UTC)
+        return WebhookExecution(
+            id=uuid4(),
             webhook_config_id=config.id,
             event_type=config.event_type,
             event_payload=event_payload,
             request_url=config.url,
-            request_headers=sanitized_headers,
-            request_body=request_body,
+            request_headers=headers,
+            request_body=body,
+            status=status,
+            attempt_number=1,
+            error_message=error_message,
+            executed_at=now,
+            completed_at=now if status != "pending" else None,
         )
 
-        # Execute with retries
-        await self._execute_with_retries(execution, config, headers, request_body)
-
-        return execution
-
     async def _execute_with_retries(
         self,
         execution: WebhookExecution,
         config: WebhookConfig,
         headers: dict,
         body: str,
+        target: ValidatedURL,
+        host_limit: asyncio.Semaphore,
     ) -> None:
-        """Execute webhook with exponential backoff retries."""
+        """Execute webhook with exponential backoff retries.
+
+        Only updates the execution in memory; the caller persists the final
+        state of all deliveries together.
+        """
         max_attempts = config.retry_count + 1  # Initial + retries
 
         for attempt in range(1, max_attempts + 1):
             execution.attempt_number = attempt
 
             if attempt > 1:
-                execution.status = "retrying"
-                await self.repository.update_execution(execution)
                 # Exponential backoff: 2^attempt seconds (2, 4, 8...)
                 await asyncio.sleep(2**attempt)
 
-            # Re-validate URL before each attempt to protect against DNS rebinding
-            # DNS records could change between validation and execution
-            try:
-                validate_webhook_url(config.url)
-            except SSRFValidationError as e:
-                execution.error_message = (
-                    f"URL validation failed on attempt {attempt}: {e}"
-                )
-                logger.error(
-                    f"Webhook URL re-validation failed on attempt {attempt}: {e}"
-                )
-                execution.status = "failed"
-                execution.completed_at = datetime.now(UTC)
-                await self.repository.update_execution(execution)
-                return
+                # Re-validate URL before each retry; the request is pinned to
+                # the validated IP so DNS rebinding cannot redirect it
+                try:
+                    target = await validate_webhook_url_async(config.url)
+                except SSRFValidationError as e:
+                    execution.error_message = (
+                        f"URL validation failed on attempt {attempt}: {e}"
+                    )
+                    logger.error(
+                        f"Webhook URL re-validation failed on attempt {attempt}: {e}"
+                    )
+                    self.circuit_breaker.record_failure(config.url)
+                    break
+
+            # Skip receivers that are known to be down
+            if not self.circuit_breaker.allow(config.url):
+                execution.error_message = CIRCUIT_OPEN_MESSAGE
+                logger.warning(f"Webhook {config.event_type} skipped: circuit open")
+                break
 
             try:
-                async with httpx.AsyncClient(timeout=config.timeout_seconds) as client:
+                async with (
+                    host_limit,
+                    httpx.AsyncClient(
+                        timeout=config.timeout_seconds,
+                        transport=PinnedIPTransport(target),
+                    ) as client,
+                ):
                     response = await client.request(
                         method=config.http_method,
                         url=config.url,
@@ -166,9 +287,9 @@ class WebhookExecutor:
                 execution.response_body = response.text[:10000]
 
                 if 200 <= response.status_code < 300:
+                    self.circuit_breaker.record_success(config.url)
                     execution.status = "success"
                     execution.completed_at = datetime.now(UTC)
-                    await self.repository.update_execution(execution)
                     logger.info(
                         f"Webhook {config.event_type} succeeded: {response.status_code}"
                     )
@@ -189,13 +310,18 @@ class WebhookExecutor:
             except Exception as e:
                 execution.error_message = f"Unexpected error: {e}"
                 logger.error(f"Webhook {config.event_type} error: {e}", exc_info=True)
+            finally:
+                # A cancelled trial records no outcome; free it so the circuit
+                # does not reject the endpoint for good. A failure recorded
+                # below still reopens it.
+                self.circuit_breaker.release_trial(config.url)
 
-            await self.repository.update_execution(execution)
+            self.circuit_breaker.record_failure(config.url)
 
-        # All attempts exhausted
+        # All attempts exhausted or delivery abandoned
         execution.status = "failed"
         execution.completed_at = datetime.now(UTC)
-        await self.repository.update_execution(execution)
         logger.error(
-            f"Webhook {config.event_type} failed after {max_attempts} attempts"
+            f"Webhook {config.event_type} failed after {execution.attempt_number} "
+            f"attempt(s)"
         )
@@ -1,7 +1,16 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -12,13 +21,14 @@ class WebhookConfig(Base):
     """Webhook configuration for system events."""
 
     __tablename__ = "webhook_configs"
+    __table_args__ = (
+        UniqueConstraint("event_type", "url", name="uq_webhook_configs_event_type_url"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True, server_default=func.gen_random_uuid()
     )
-    event_type: Mapped[str] = mapped_column(
-        String(100), unique=True, nullable=False, index=True
-    )
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     url: Mapped[str] = mapped_column(String(2048), nullable=False)
     http_method: Mapped[str] = mapped_column(String(10), nullable=False, default="POST")
     headers: Mapped[dict] = mapped_column(JSONB, default=dict, server_default="{}")
@@ -44,9 +54,13 @@ class WebhookConfig(Base):
 
 
 class WebhookExecution(Base):
-    """Webhook execution log entry."""
+    """Webhook execution log entry.
+
+    Partitioned by month on executed_at (see src.common.partitions).
+    """
 
     __tablename__ = "webhook_executions"
+    __table_args__ = {"postgresql_partition_by": "RANGE (executed_at)"}
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True, server_default=func.gen_random_uuid()
@@ -69,7 +83,7 @@ class WebhookExecution(Base):
     attempt_number: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
     error_message: Mapped[str | None] = mapped_column(Text)
     executed_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now()
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
     )
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
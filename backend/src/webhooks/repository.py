@@ -30,22 +30,41 @@ class WebhookRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_by_event_type(self, event_type: str) -> WebhookConfig | None:
-        """Get webhook config by event type."""
+    async def get_by_event_type_and_url(
+        self, event_type: str, url: str
+    ) -> WebhookConfig | None:
+        """Get webhook config by event type and receiver URL."""
         result = await self.session.execute(
-            select(WebhookConfig).where(WebhookConfig.event_type == event_type)
+            select(WebhookConfig).where(
+                WebhookConfig.event_type == event_type,
+                WebhookConfig.url == url,
+            )
         )
         return result.scalar_one_or_none()
 
-    async def get_active_by_event_type(self, event_type: str) -> WebhookConfig | None:
-        """Get active webhook config by event type."""
+    async def get_active_by_event_type(self, event_type: str) -> list[WebhookConfig]:
+        """Get all active webhook configs subscribed to an event type."""
         result = await self.session.execute(
-            select(WebhookConfig).where(
+            select(WebhookConfig)
+            .where(
                 WebhookConfig.event_type == event_type,
                 WebhookConfig.is_active == True,  # noqa: E712
             )
+            .order_by(WebhookConfig.created_at)
         )
-        return result.scalar_one_or_none()
+        return list(result.scalars().all())
+
+    async def get_active_by_ids(self, config_ids: list[UUID]) -> list[WebhookConfig]:
+        """Get the active webhook configs among the given IDs."""
+        result = await self.session.execute(
+            select(WebhookConfig)
+            .where(
+                WebhookConfig.id.in_(config_ids),
+                WebhookConfig.is_active == True,  # noqa: E712
+            )
+            .order_by(WebhookConfig.created_at)
+        )
+        return list(result.scalars().all())
 
     async def create(self, data: WebhookConfigCreate) -> WebhookConfig:
         """Create a new webhook config."""
@@ -126,34 +145,11 @@ class WebhookRepository:
         result = await self.session.execute(query)
         return result.scalar_one()
 
-    async def create_execution(
-        self,
-        *,
-        webhook_config_id: UUID,
-        event_type: str,
-        event_payload: dict,
-        request_url: str,
-        request_headers: dict,
-        request_body: str,
-    ) -> WebhookExecution:
-        """Create a new webhook execution record."""
-        execution = WebhookExecution(
-            webhook_config_id=webhook_config_id,
-            event_type=event_type,
-            event_payload=event_payload,
-            request_url=request_url,
-            request_headers=request_headers,
-            request_body=request_body,
-            status="pending",
-            attempt_number=1,
-        )
-        self.session.add(execution)
+    async def create_executions(self, executions: list[WebhookExecution]) -> None:
+        """Create webhook execution records in a single write."""
+        self.session.add_all(executions)
         await self.session.commit()
-        await self.session.refresh(execution)
-        return execution
 
-    async def update_execution(self, execution: WebhookExecution) -> WebhookExecution:
-        """Update a webhook execution record."""
+    async def update_executions(self) -> None:
+        """Persist state changes of pending webhook execution records."""
         await self.session.commit()
-        await self.session.refresh(execution)
-        return execution
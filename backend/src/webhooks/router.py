@@ -62,12 +62,15 @@ async def create_config(
     """Create a new webhook configuration."""
     repo = WebhookRepository(session)
 
-    # Check for duplicate event_type
-    existing = await repo.get_by_event_type(data.event_type)
+    # Each receiver can subscribe to an event type once
+    existing = await repo.get_by_event_type_and_url(data.event_type, str(data.url))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail=f"Webhook for event type '{data.event_type}' already exists",
+            detail=(
+                f"Webhook for event type '{data.event_type}' and this URL "
+                "already exists"
+            ),
         )
 
     config = await repo.create(data)
@@ -107,6 +110,20 @@ async def update_config(
             detail="Webhook configuration not found",
         )
 
+    # A new URL must not already be subscribed to this event type
+    if data.url is not None:
+        existing = await repo.get_by_event_type_and_url(
+            config.event_type, str(data.url)
+        )
+        if existing and existing.id != config_id:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=(
+                    f"Webhook for event type '{config.event_type}' and this URL "
+                    "already exists"
+                ),
+            )
+
     config = await repo.update(config, data)
     return WebhookConfigResponse.model_validate(config)
 
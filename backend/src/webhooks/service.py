@@ -7,6 +7,7 @@ from uuid import UUID
 from fastapi import BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.common.metrics import WEBHOOK_QUEUE_DEPTH
 from src.webhooks.executor import WebhookExecutor
 from src.webhooks.repository import WebhookRepository
 
@@ -26,7 +27,7 @@ class WebhookService:
         payload: dict,
         background_tasks: BackgroundTasks,
     ) -> None:
-        """Trigger webhook for an event type.
+        """Trigger all webhooks subscribed to an event type.
 
         Runs asynchronously in background to not block the response.
 
@@ -35,9 +36,9 @@ class WebhookService:
             payload: Event data to send to the webhook
             background_tasks: FastAPI BackgroundTasks for async execution
         """
-        config = await self.repository.get_active_by_event_type(event_type)
+        configs = await self.repository.get_active_by_event_type(event_type)
 
-        if not config:
+        if not configs:
             logger.debug(f"No active webhook configured for {event_type}")
             return
 
@@ -45,39 +46,42 @@ class WebhookService:
         payload["timestamp"] = datetime.now(UTC).isoformat()
 
         # Execute in background
+        WEBHOOK_QUEUE_DEPTH.inc(len(configs))
         background_tasks.add_task(
-            self._execute_webhook,
-            config.id,
+            self._execute_webhooks,
+            [config.id for config in configs],
             event_type,
             payload,
         )
-        logger.info(f"Queued webhook for {event_type}")
+        logger.info(f"Queued {len(configs)} webhook(s) for {event_type}")
 
-    async def _execute_webhook(
+    async def _execute_webhooks(
         self,
-        config_id: UUID,
+        config_ids: list[UUID],
         _event_type: str,
         payload: dict,
     ) -> None:
-        """Background task to execute webhook.
+        """Background task to deliver an event to its webhooks.
 
         Creates a new session for the background task to avoid
         session conflicts with the main request.
         """
-        from src.database import get_session
+        from src.database import background_session
 
-        async for session in get_session():
-            try:
+        try:
+            async with background_session() as session:
                 repo = WebhookRepository(session)
-                config = await repo.get_by_id(config_id)
+                configs = await repo.get_active_by_ids(config_ids)
 
-                if not config or not config.is_active:
+                if not configs:
                     return
 
                 executor = WebhookExecutor(session)
-                await executor.execute(config, payload)
-            except Exception as e:
-                logger.error(f"Background webhook execution failed: {e}", exc_info=True)
+                await executor.execute_many(configs, payload)
+        except Exception as e:
+            logger.error(f"Background webhook execution failed: {e}", exc_info=True)
+        finally:
+            WEBHOOK_QUEUE_DEPTH.dec(len(config_ids))
 
 
 def get_webhook_service(session: AsyncSession) -> WebhookService:
@@ -2,6 +2,7 @@
 
 import json
 import re
+from functools import lru_cache
 from typing import Any
 
 
@@ -22,6 +23,18 @@ def escape_json_string(value: str) -> str:
     return json.dumps(value)[1:-1]
 
 
+def _lookup(data: dict, keys: tuple[str, ...]) -> Any:
+    """Get a nested value from dict using pre-split path keys."""
+    value: Any = data
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+        if value is None:
+            return None
+    return value
+
+
 def get_nested_value(data: dict, path: str) -> Any:
     """Get a nested value from dict using dot notation.
 
@@ -32,16 +45,60 @@ def get_nested_value(data: dict, path: str) -> Any:
     Returns:
         The value at the path, or None if not found
     """
-    keys = path.split(".")
-    value = data
-    for key in keys:
-        if isinstance(value, dict):
-            value = value.get(key)
-        else:
-            return None
-        if value is None:
-            return None
-    return value
+    return _lookup(data, tuple(path.split(".")))
+
+
+# Matches {{variable}} placeholders
+TEMPLATE_VARIABLE_PATTERN = re.compile(r"\{\{\s*([a-zA-Z_][a-zA-Z0-9_.]*)\s*\}\}")
+
+
+class CompiledTemplate:
+    """A body template parsed into literal segments and variable paths.
+
+    Rendering walks the pre-split segments instead of re-running the
+    placeholder regex and splitting variable paths for every delivery.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        segments: list[str | tuple[str, ...]] = []
+        position = 0
+        for match in TEMPLATE_VARIABLE_PATTERN.finditer(template):
+            if match.start() > position:
+                segments.append(template[position : match.start()])
+            segments.append(tuple(match.group(1).strip().split(".")))
+            position = match.end()
+        if position < len(template):
+            segments.append(template[position:])
+        self.segments = tuple(segments)
+
+    def render(self, context: dict) -> str:
+        """Render the template with values from context."""
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            value = _lookup(context, segment)
+            if value is None:
+                continue
+            # Escape string values for safe JSON embedding
+            if isinstance(value, str):
+                parts.append(escape_json_string(value))
+            else:
+                parts.append(str(value))
+        return "".join(parts)
+
+
+@lru_cache(maxsize=256)
+def compile_template(template: str) -> CompiledTemplate:
+    """Compile a body template, caching the result.
+
+    Compiled templates are keyed by their text, so updating a config's
+    body_template compiles the new text on first use and the old entry ages
+    out of the cache.
+    """
+    return CompiledTemplate(template)
 
 
 def render_template(template: str, context: dict) -> str:
@@ -59,20 +116,7 @@ def render_template(template: str, context: dict) -> str:
     Returns:
         Rendered template string
     """
-
-    def replace_var(match: re.Match) -> str:
-        var_path = match.group(1).strip()
-        value = get_nested_value(context, var_path)
-        if value is None:
-            return ""
-        # Escape string values for safe JSON embedding
-        if isinstance(value, str):
-            return escape_json_string(value)
-        return str(value)
-
-    # Match {{variable}} patterns
-    pattern = r"\{\{\s*([a-zA-Z_][a-zA-Z0-9_.]*)\s*\}\}"
-    return re.sub(pattern, replace_var, template)
+    return compile_template(template).render(context)
 
 
 def build_default_payload(event_type: str, context: dict) -> dict:
@@ -0,0 +1,409 @@
+"""Tests for the admin analytics rollups."""
+
+import asyncio
+import uuid
+from datetime import UTC, datetime, time, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from httpx import AsyncClient
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.admin import rollups
+from src.admin.models import PackDailySales, PlatformDailyStats
+from src.admin.rollups import refresh_rollups, rollups_live_from
+from src.admin.router import get_stats
+from src.ai.models import AIUsageDaily, AIUsageLog
+from src.ai.usage_service import AIUsageService
+from src.billing.models import CreditPack, CreditTransaction
+from src.config import Settings
+from src.users.models import User
+from tests.conftest import QueryCounter
+
+
+def _days_ago(days: int, hour: int = 12) -> datetime:
+    today = datetime.now(UTC).date()
+    return datetime.combine(today - timedelta(days=days), time(hour), tzinfo=UTC)
+
+
+def _user(created_at: datetime) -> User:
+    suffix = uuid.uuid4().hex[:8]
+    return User(
+        id=uuid.uuid4(),
+        email=f"{suffix}@example.com",
+        name=suffix,
+        oauth_provider="google",
+        oauth_id=f"google_{suffix}",
+        created_at=created_at,
+    )
+
+
+def _purchase(user: User, pack: CreditPack, created_at: datetime) -> CreditTransaction:
+    return CreditTransaction(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        amount=pack.credits,
+        transaction_type="purchase",
+        description="Purchase",
+        credit_pack_id=pack.id,
+        created_at=created_at,
+    )
+
+
+def _usage(user: User, created_at: datetime, **fields) -> AIUsageLog:
+    return AIUsageLog(
+        user_id=user.id,
+        operation_type=fields.get("operation_type", "image_classification"),
+        model=fields.get("model", "gpt-4o"),
+        prompt_tokens=100,
+        completion_tokens=50,
+        total_tokens=150,
+        estimated_cost_usd=Decimal("0.001500"),
+        created_at=created_at,
+    )
+
+
+async def _platform_day(session: AsyncSession, days_ago: int):
+    return (
+        await session.execute(
+            select(PlatformDailyStats).where(
+                PlatformDailyStats.day == _days_ago(days_ago).date()
+            )
+        )
+    ).scalar_one_or_none()
+
+
+class TestRefreshRollups:
+    """Tests for rolling up closed days."""
+
+    async def test_rolls_up_every_closed_day(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        credit_pack: CreditPack,
+    ):
+        """Each closed day since the first signup gets a row, today none."""
+        old = _user(_days_ago(5))
+        async_session.add(old)
+        await async_session.flush()
+        async_session.add_all(
+            [
+                _purchase(old, credit_pack, _days_ago(3)),
+                _purchase(old, credit_pack, _days_ago(3, hour=18)),
+                _purchase(test_user, credit_pack, datetime.now(UTC)),
+                _usage(old, _days_ago(2)),
+            ]
+        )
+        await async_session.commit()
+
+        assert await refresh_rollups(async_session) == 5
+
+        days = (await async_session.execute(select(PlatformDailyStats))).scalars().all()
+        assert sorted(d.day for d in days) == [
+            _days_ago(n).date() for n in range(5, 0, -1)
+        ]
+        purchase_day = await _platform_day(async_session, 3)
+        assert purchase_day.credits_purchased == 2 * credit_pack.credits
+        assert (await _platform_day(async_session, 5)).signups == 1
+        sales = (await async_session.execute(select(PackDailySales))).scalars().all()
+        assert [(s.day, s.purchases, s.revenue_cents) for s in sales] == [
+            (_days_ago(3).date(), 2, 2 * credit_pack.price_cents)
+        ]
+        usage = (await async_session.execute(select(AIUsageDaily))).scalars().all()
+        assert [(u.day, u.calls, u.total_tokens) for u in usage] == [
+            (_days_ago(2).date(), 1, 150)
+        ]
+
+    async def test_live_from_covers_missing_and_stale_days(
+        self,
+        async_session: AsyncSession,
+        query_counter: QueryCounter,
+        test_user: User,  # noqa: ARG002
+    ):
+        """Days not rolled up or stale are left to live aggregation."""
+        today = datetime.now(UTC).date()
+        async_session.add(_user(_days_ago(3)))
+        await async_session.commit()
+        assert await rollups_live_from(async_session, today) == _days_ago(3).date()
+
+        await refresh_rollups(async_session)
+        with query_counter.budget(1, "rollups_live_from"):
+            assert await rollups_live_from(async_session, today) == today
+
+        await async_session.execute(
+            update(PlatformDailyStats)
+            .where(PlatformDailyStats.day == _days_ago(2).date())
+            .values(refreshed_at=None)
+        )
+        await async_session.commit()
+        assert await rollups_live_from(async_session, today) == _days_ago(2).date()
+
+    async def test_requests_do_not_refresh(
+        self,
+        async_session: AsyncSession,
+        admin_user: User,
+        test_user: User,  # noqa: ARG002
+    ):
+        """Stats requests aggregate what is missing instead of rolling it up."""
+        async_session.add(_user(_days_ago(3)))
+        await async_session.commit()
+
+        assert (await get_stats(admin_user, async_session)).total_users == 3
+        assert (await async_session.execute(select(PlatformDailyStats))).first() is None
+
+    async def test_refund_of_rolled_up_purchase_marks_day_stale(
+        self,
+        async_session: AsyncSession,
+        admin_user: User,
+        test_user: User,
+        credit_pack: CreditPack,
+    ):
+        """Refunding an old purchase is reflected before the next refresh."""
+        purchase = _purchase(test_user, credit_pack, _days_ago(3))
+        async_session.add(purchase)
+        await async_session.commit()
+        await refresh_rollups(async_session)
+        assert (
+            await get_stats(admin_user, async_session)
+        ).total_revenue_cents == credit_pack.price_cents
+
+        await async_session.execute(
+            update(CreditTransaction)
+            .where(CreditTransaction.id == purchase.id)
+            .values(is_refunded=True)
+        )
+        await async_session.commit()
+        assert (await _platform_day(async_session, 3)).refreshed_at is None
+
+        stats = await get_stats(admin_user, async_session)
+        assert stats.total_revenue_cents == 0
+        assert stats.total_credits_purchased == 0
+        assert (await _platform_day(async_session, 3)).refreshed_at is None
+
+        await refresh_rollups(async_session)
+        assert (await _platform_day(async_session, 3)).credits_purchased == 0
+
+    async def test_deleted_account_is_removed_from_rolled_up_days(
+        self,
+        async_session: AsyncSession,
+        admin_user: User,
+        test_user: User,  # noqa: ARG002
+    ):
+        """Totals keep matching the users table after an account is deleted."""
+        old = _user(_days_ago(4))
+        async_session.add(old)
+        await async_session.commit()
+        await refresh_rollups(async_session)
+        assert (await get_stats(admin_user, async_session)).total_users == 3
+
+        await async_session.execute(delete(User).where(User.id == old.id))
+        await async_session.commit()
+
+        assert (await get_stats(admin_user, async_session)).total_users == 2
+
+    async def test_write_during_recompute_leaves_day_stale(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        credit_pack: CreditPack,
+    ):
+        """A day written to after its counter was read is not overwritten."""
+        purchase = _purchase(test_user, credit_pack, _days_ago(3))
+        async_session.add(purchase)
+        await async_session.commit()
+        await refresh_rollups(async_session)
+        await async_session.execute(
+            update(CreditTransaction)
+            .where(CreditTransaction.id == purchase.id)
+            .values(is_refunded=True)
+        )
+        await async_session.commit()
+
+        refund_back = (
+            f"UPDATE credit_transactions SET is_refunded = false "
+            f"WHERE id = '{purchase.id}'"
+        )
+        with patch(
+            "src.admin.rollups._REFRESH_SQL", [*rollups._REFRESH_SQL, refund_back]
+        ):
+            assert await refresh_rollups(async_session) == 0
+        day = await _platform_day(async_session, 3)
+        assert day.refreshed_at is None
+
+        assert await refresh_rollups(async_session) == 1
+        day = await _platform_day(async_session, 3)
+        assert day.credits_purchased == credit_pack.credits
+
+    async def test_waits_for_writes_in_flight_on_new_days(
+        self,
+        async_engine,
+        async_session: AsyncSession,
+        test_user: User,
+        credit_pack: CreditPack,
+    ):
+        """A write still uncommitted when a day is first rolled up is included."""
+        async_session.add(_user(_days_ago(2)))
+        await async_session.commit()
+        factory = async_sessionmaker(async_engine, expire_on_commit=False)
+        async with factory() as writer:
+            writer.add(_purchase(test_user, credit_pack, _days_ago(1)))
+            await writer.flush()
+            refresh = asyncio.create_task(refresh_rollups(async_session))
+            await asyncio.sleep(0.3)
+            assert not refresh.done()
+            await writer.commit()
+        await refresh
+
+        day = await _platform_day(async_session, 1)
+        assert day.refreshed_at is not None
+        assert day.credits_purchased == credit_pack.credits
+
+    async def test_rebuild_repairs_drift(
+        self,
+        async_session: AsyncSession,
+        test_user: User,  # noqa: ARG002
+    ):
+        """A rebuild recomputes every day from the source tables."""
+        async_session.add(_user(_days_ago(2)))
+        await async_session.commit()
+        await refresh_rollups(async_session)
+        await async_session.execute(update(PlatformDailyStats).values(signups=99))
+        await async_session.commit()
+
+        await refresh_rollups(async_session, rebuild=True)
+
+        assert (await _platform_day(async_session, 2)).signups == 1
+        assert (await _platform_day(async_session, 1)).signups == 0
+
+    async def test_rebuild_keeps_ai_usage_past_log_retention(
+        self,
+        async_session: AsyncSession,
+        test_settings: Settings,
+        test_user: User,
+    ):
+        """Days whose logs were detached by retention keep their AI rollups."""
+        async_session.add(_usage(test_user, _days_ago(100)))
+        await async_session.commit()
+        await refresh_rollups(async_session)
+        await async_session.execute(delete(AIUsageLog))
+        await async_session.commit()
+
+        test_settings.ai_usage_log_retention_months = 2
+        with patch("src.admin.rollups.get_settings", return_value=test_settings):
+            await refresh_rollups(async_session, rebuild=True)
+
+        usage = (await async_session.execute(select(AIUsageDaily))).scalars().all()
+        assert [(u.day, u.calls) for u in usage] == [(_days_ago(100).date(), 1)]
+
+
+class TestStatsFromRollups:
+    """Tests for the admin stats endpoints combining rollups and today."""
+
+    async def test_series_combine_closed_days_and_today(
+        self,
+        admin_client: AsyncClient,
+        async_session: AsyncSession,
+        test_user: User,
+        credit_pack: CreditPack,
+    ):
+        """Closed days come from the rollups and today from live rows."""
+        async_session.add_all(
+            [
+                _purchase(test_user, credit_pack, _days_ago(2)),
+                _purchase(test_user, credit_pack, datetime.now(UTC)),
+                _purchase(test_user, credit_pack, _days_ago(40)),
+            ]
+        )
+        await async_session.commit()
+        await refresh_rollups(async_session)
+
+        revenue = (
+            await admin_client.get("/api/v1/admin/stats/revenue?time_range=7d")
+        ).json()
+        packs = (await admin_client.get("/api/v1/admin/stats/packs")).json()
+
+        price = credit_pack.price_cents
+        values = [point["value"] for point in revenue["data"]]
+        assert values == [0, 0, 0, 0, price, 0, price]
+        assert revenue["period_revenue_cents"] == 2 * price
+        assert revenue["total_revenue_cents"] == 3 * price
+        assert packs["total_purchases"] == 2
+        assert packs["packs"][0]["total_revenue_cents"] == 2 * price
+
+    async def test_signups_and_credits(
+        self,
+        admin_client: AsyncClient,
+        async_session: AsyncSession,
+        test_user: User,
+    ):
+        """Signups and credit usage per day match the source rows."""
+        async_session.add(_user(_days_ago(1)))
+        async_session.add(
+            CreditTransaction(
+                user_id=test_user.id,
+                amount=-3,
+                transaction_type="usage",
+                description="Usage",
+                created_at=_days_ago(1),
+            )
+        )
+        await async_session.commit()
+        await refresh_rollups(async_session)
+
+        signups = (await admin_client.get("/api/v1/admin/stats/signups")).json()
+        credits = (await admin_client.get("/api/v1/admin/stats/credits")).json()
+
+        # admin_user and test_user signed up today
+        assert [p["value"] for p in signups["data"]][-2:] == [1, 2]
+        assert signups["total_users"] == 3
+        assert [p["usage"] for p in credits["data"]][-2:] == [3, 0]
+        assert credits["total_used"] == 3
+
+
+class TestAIUsageFromRollups:
+    """Tests for AI usage analytics reading ai_usage_daily."""
+
+    async def test_matches_log_aggregation_for_any_range(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """Rollups plus partial edge days give the same answer as the logs."""
+        async_session.add_all(
+            [
+                _usage(test_user, _days_ago(days, hour))
+                for days in range(6)
+                for hour in (1, 13, 23)
+            ]
+            + [_usage(test_user, _days_ago(2), model="gpt-4o-mini")]
+        )
+        await async_session.commit()
+        await refresh_rollups(async_session)
+        live_from = await rollups_live_from(async_session, datetime.now(UTC).date())
+        service = AIUsageService()
+
+        ranges = [
+            (None, None),
+            (_days_ago(4, hour=12), None),
+            (_days_ago(5, hour=0), _days_ago(1, hour=0)),
+            (_days_ago(3, hour=2).replace(tzinfo=None), _days_ago(3, hour=20)),
+            (None, _days_ago(2, hour=13)),
+        ]
+        for start_date, end_date in ranges:
+            for method, kwargs in [
+                (service.get_usage_summary, {}),
+                (service.get_usage_by_user, {}),
+            ]:
+                expected = await method(
+                    async_session, start_date=start_date, end_date=end_date, **kwargs
+                )
+                actual = await method(
+                    async_session,
+                    start_date=start_date,
+                    end_date=end_date,
+                    live_from=live_from,
+                )
+                assert actual == expected, (method.__name__, start_date, end_date)
+
+        daily = await service.get_daily_usage(async_session, 3, live_from=live_from)
+        assert daily == await service.get_daily_usage(async_session, 3)
+        assert [d["total_calls"] for d in daily] == [3, 3, 4]
@@ -2,9 +2,12 @@
 
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+from openai import RateLimitError
+from prometheus_client import REGISTRY
 
-from src.ai.service import AIClassificationService
+from src.ai.service import AIClassificationService, create_chat_completion
 
 
 def create_mock_openai_response(content: str, model: str = "gpt-4o") -> MagicMock:
@@ -292,3 +295,54 @@ class TestAIClassificationService:
         assert result.suggestions[0].location_name == "Hardware Drawer"
         assert result.suggestions[0].confidence == 0.95
         assert result.suggestions[0].reasoning == "Good match for fasteners"
+
+
+class TestCreateChatCompletion:
+    """Tests for OpenAI call metrics."""
+
+    def _sample(self, name: str, labels: dict[str, str]) -> float:
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    async def test_records_latency_and_tokens_by_operation(self):
+        """Successful calls record latency and prompt/completion tokens."""
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(
+            return_value=create_mock_openai_response("{}")
+        )
+        labels = {"operation": "metrics_test"}
+        calls = self._sample("homerp_openai_request_duration_seconds_count", labels)
+        prompt = self._sample(
+            "homerp_openai_tokens_total", {**labels, "kind": "prompt"}
+        )
+
+        response = await create_chat_completion(client, "metrics_test", model="m")
+
+        assert response.usage.prompt_tokens == 100
+        client.chat.completions.create.assert_awaited_once_with(model="m")
+        assert (
+            self._sample("homerp_openai_request_duration_seconds_count", labels)
+            == calls + 1
+        )
+        assert (
+            self._sample("homerp_openai_tokens_total", {**labels, "kind": "prompt"})
+            == prompt + 100
+        )
+
+    async def test_counts_rate_limited_calls(self):
+        """429s from OpenAI are counted by operation and re-raised."""
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(
+            side_effect=RateLimitError(
+                "Rate limit reached",
+                response=httpx.Response(429, request=request),
+                body=None,
+            )
+        )
+        labels = {"operation": "metrics_test_429"}
+        before = self._sample("homerp_openai_rate_limited_total", labels)
+
+        with pytest.raises(RateLimitError):
+            await create_chat_completion(client, "metrics_test_429", model="m")
+
+        assert self._sample("homerp_openai_rate_limited_total", labels) == before + 1
@@ -0,0 +1,132 @@
+"""Tests for token-budgeted assistant conversation history."""
+
+from src.ai.history import (
+    TRUNCATION_MARKER,
+    build_history_window,
+    estimate_tokens,
+    format_transcript,
+    split_into_turns,
+)
+
+
+def _turn(index: int, tool_result: str = "") -> list[dict]:
+    """Build one conversation turn, optionally with a tool call."""
+    messages: list[dict] = [{"role": "user", "content": f"question {index}"}]
+    if tool_result:
+        messages.append(
+            {
+                "role": "assistant",
+                "tool_calls": [
+                    {
+                        "id": f"call_{index}",
+                        "type": "function",
+                        "function": {"name": "search_items", "arguments": "{}"},
+                    }
+                ],
+            }
+        )
+        messages.append(
+            {
+                "role": "tool",
+                "tool_call_id": f"call_{index}",
+                "name": "search_items",
+                "content": tool_result,
+            }
+        )
+    messages.append({"role": "assistant", "content": f"answer {index}"})
+    return messages
+
+
+class TestSplitIntoTurns:
+    """Tests for grouping messages into turns."""
+
+    def test_turns_start_at_user_messages(self):
+        """Each turn should begin with a user message."""
+        messages = _turn(1, tool_result="[]") + _turn(2)
+        turns = split_into_turns(messages)
+
+        assert len(turns) == 2
+        assert [len(turn) for turn in turns] == [4, 2]
+        assert all(turn[0]["role"] == "user" for turn in turns)
+
+    def test_leading_assistant_messages_form_a_turn(self):
+        """Messages before the first user message should not be dropped."""
+        messages = [{"role": "assistant", "content": "hi"}, *_turn(1)]
+        turns = split_into_turns(messages)
+
+        assert len(turns) == 2
+        assert turns[0] == [{"role": "assistant", "content": "hi"}]
+
+
+class TestBuildHistoryWindow:
+    """Tests for fitting history into a token budget."""
+
+    def test_short_history_kept_verbatim(self):
+        """History within budget should be returned unchanged."""
+        messages = _turn(1, tool_result="x" * 100) + _turn(2)
+        window = build_history_window(
+            messages, token_budget=10_000, recent_turns=3, max_tool_chars=50
+        )
+
+        assert window.messages == messages
+        assert window.overflow == []
+
+    def test_old_tool_results_truncated(self):
+        """Tool payloads outside the recent turns should be truncated."""
+        big = "x" * 5000
+        messages = _turn(1, tool_result=big) + _turn(2, tool_result=big)
+        window = build_history_window(
+            messages, token_budget=10_000, recent_turns=1, max_tool_chars=100
+        )
+
+        old_tool, recent_tool = (m for m in window.messages if m["role"] == "tool")
+        assert old_tool["content"] == "x" * 100 + TRUNCATION_MARKER
+        assert recent_tool["content"] == big
+        # Source messages are not mutated
+        assert messages[2]["content"] == big
+
+    def test_overflow_returns_oldest_whole_turns(self):
+        """Turns that do not fit should overflow oldest-first, intact."""
+        messages = [m for i in range(10) for m in _turn(i, tool_result="y" * 400)]
+        window = build_history_window(
+            messages, token_budget=300, recent_turns=2, max_tool_chars=2000
+        )
+
+        assert window.overflow
+        assert window.overflow[0] == messages[0]
+        assert window.overflow == messages[: len(window.overflow)]
+        assert window.messages[0]["role"] == "user"
+        assert window.messages[-4:] == messages[-4:]
+        assert len(window.overflow) + len(window.messages) == len(messages)
+
+    def test_recent_turns_kept_even_over_budget(self):
+        """The most recent turns are always kept, even if over budget."""
+        messages = _turn(1) + _turn(2, tool_result="z" * 10_000)
+        window = build_history_window(
+            messages, token_budget=10, recent_turns=1, max_tool_chars=100
+        )
+
+        assert window.messages == messages[2:]
+        assert window.overflow == messages[:2]
+        assert window.estimated_tokens > 10
+
+
+class TestEstimateTokensAndTranscript:
+    """Tests for token estimation and summarizer transcripts."""
+
+    def test_estimate_counts_tool_calls(self):
+        """Tool call payloads should count toward the estimate."""
+        plain = {"role": "assistant", "content": ""}
+        with_calls = {**plain, "tool_calls": [{"id": "call_1" * 20}]}
+
+        assert estimate_tokens(with_calls) > estimate_tokens(plain)
+
+    def test_format_transcript(self):
+        """Transcript should include roles, tool names, and truncated results."""
+        transcript = format_transcript(
+            _turn(1, tool_result="r" * 1000), max_tool_chars=10
+        )
+
+        assert "user: question 1" in transcript
+        assert "tool (search_items): " + "r" * 10 + TRUNCATION_MARKER in transcript
+        assert "assistant: answer 1" in transcript
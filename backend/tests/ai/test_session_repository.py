@@ -3,8 +3,10 @@
 import uuid
 
 import pytest
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.ai.models import AIConversationMessage
 from src.ai.session_repository import AISessionRepository
 from src.users.models import User
 
@@ -351,6 +353,57 @@ class TestAISessionRepository:
             "content": "I found no drills in your inventory.",
         }
 
+    async def test_get_messages_for_openai_skips_summarized(
+        self, repo: AISessionRepository
+    ):
+        """Test that summarized messages can be skipped, keeping batch order."""
+        session = await repo.create_session("Skip Test")
+        await repo.add_messages_batch(
+            session.id,
+            [{"role": "user", "content": f"message {i}"} for i in range(5)],
+        )
+
+        messages = await repo.get_messages_for_openai(session.id, skip=3)
+
+        assert [m["content"] for m in messages] == ["message 3", "message 4"]
+
+    async def test_get_messages_for_openai_skip_with_tied_timestamps(
+        self, repo: AISessionRepository, async_session: AsyncSession
+    ):
+        """Messages sharing a created_at are skipped in one stable order."""
+        session = await repo.create_session("Tie Test")
+        created = await repo.add_messages_batch(
+            session.id,
+            [{"role": "user", "content": f"message {i}"} for i in range(6)],
+        )
+        # Batches from before explicit timestamps share the server's now()
+        await async_session.execute(
+            update(AIConversationMessage)
+            .where(AIConversationMessage.session_id == session.id)
+            .values(created_at=created[0].created_at)
+        )
+        await async_session.commit()
+
+        in_order = [
+            f"message {i}"
+            for i, _ in sorted(enumerate(created), key=lambda pair: pair[1].id)
+        ]
+        for _ in range(3):
+            messages = await repo.get_messages_for_openai(session.id, skip=2)
+            assert [m["content"] for m in messages] == in_order[2:]
+
+    async def test_update_summary(self, repo: AISessionRepository):
+        """Test storing the rolling conversation summary."""
+        session = await repo.create_session("Summary Test")
+        assert session.summary is None
+        assert session.summarized_message_count == 0
+
+        await repo.update_summary(session, "User asked about drills.", 4)
+
+        updated = await repo.get_session(session.id)
+        assert updated.summary == "User asked about drills."
+        assert updated.summarized_message_count == 4
+
     async def test_get_message_count(self, repo: AISessionRepository):
         """Test counting messages in a session."""
         session = await repo.create_session("Count Test")
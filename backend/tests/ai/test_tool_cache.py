@@ -0,0 +1,153 @@
+"""Tests for the AI tool result cache and compact tool output."""
+
+import uuid
+from unittest.mock import patch
+
+from src.ai.tool_cache import ToolResultCache, normalize_arguments
+from src.ai.tools import DEFAULT_COMPACT_FIELDS, compact_tool_result
+
+
+class TestNormalizeArguments:
+    """Tests for cache key argument normalization."""
+
+    def test_equivalent_arguments_match(self):
+        """Key order, case, whitespace and empty values should not matter."""
+        a = normalize_arguments({"query": " Drill ", "limit": 10, "tags": None})
+        b = normalize_arguments({"limit": 10, "query": "drill"})
+        assert a == b
+
+    def test_list_order_ignored(self):
+        """Tag lists should match regardless of order."""
+        a = normalize_arguments({"tags": ["b", "A"]})
+        b = normalize_arguments({"tags": ["a", "b"]})
+        assert a == b
+
+    def test_different_arguments_differ(self):
+        """Different limits should produce different keys."""
+        assert normalize_arguments({"limit": 5}) != normalize_arguments({"limit": 6})
+
+
+class TestToolResultCache:
+    """Tests for ToolResultCache."""
+
+    def test_get_set(self):
+        """Stored results should be returned for the same key."""
+        cache = ToolResultCache()
+        key = cache.make_key(uuid.uuid4(), "search_items", {"query": "x"}, "v1")
+
+        assert cache.get(key) is None
+        cache.set(key, '{"count": 0}')
+        assert cache.get(key) == '{"count": 0}'
+
+    def test_inventory_version_is_part_of_key(self):
+        """A new inventory version should miss the cache."""
+        cache = ToolResultCache()
+        conversation_id = uuid.uuid4()
+        cache.set(cache.make_key(conversation_id, "search_items", {}, "v1"), "old")
+
+        assert (
+            cache.get(cache.make_key(conversation_id, "search_items", {}, "v2")) is None
+        )
+
+    def test_entries_expire(self):
+        """Entries older than the TTL should be dropped."""
+        cache = ToolResultCache(ttl_seconds=10)
+        key = cache.make_key(uuid.uuid4(), "search_items", {}, "v1")
+
+        with patch("src.ai.tool_cache.time.monotonic", return_value=100.0):
+            cache.set(key, "result")
+        with patch("src.ai.tool_cache.time.monotonic", return_value=111.0):
+            assert cache.get(key) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """The least recently used entry should be evicted first."""
+        cache = ToolResultCache(max_entries=2)
+        conversation_id = uuid.uuid4()
+        keys = [
+            cache.make_key(conversation_id, "search_items", {"query": q}, "v1")
+            for q in ("a", "b", "c")
+        ]
+        cache.set(keys[0], "a")
+        cache.set(keys[1], "b")
+        cache.get(keys[0])
+        cache.set(keys[2], "c")
+
+        assert cache.get(keys[0]) == "a"
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) == "c"
+
+    def test_invalidate_conversation(self):
+        """Invalidating a conversation should keep other conversations."""
+        cache = ToolResultCache()
+        first, second = uuid.uuid4(), uuid.uuid4()
+        cache.set(cache.make_key(first, "search_items", {}, "v1"), "first")
+        cache.set(cache.make_key(second, "search_items", {}, "v1"), "second")
+
+        cache.invalidate_conversation(first)
+
+        assert cache.get(cache.make_key(first, "search_items", {}, "v1")) is None
+        assert cache.get(cache.make_key(second, "search_items", {}, "v1")) == "second"
+
+
+class TestCompactToolResult:
+    """Tests for the columnar tool output format."""
+
+    ITEMS = [
+        {
+            "id": "1",
+            "name": "Drill",
+            "markdown_link": "[Drill](/items/1)",
+            "quantity": 1,
+            "quantity_unit": "pcs",
+            "description": "Cordless drill",
+            "specifications": [{"key": "voltage", "value": "18V"}],
+        },
+        {
+            "id": "2",
+            "name": "Hammer",
+            "markdown_link": "[Hammer](/items/2)",
+            "quantity": 2,
+            "quantity_unit": "pcs",
+            "location": "garage",
+        },
+    ]
+
+    def test_default_fields(self):
+        """Without field selection, the default fields should be used."""
+        result = compact_tool_result({"items": self.ITEMS, "count": 2})
+
+        assert result["count"] == 2
+        assert result["items"]["columns"] == DEFAULT_COMPACT_FIELDS
+        location = DEFAULT_COMPACT_FIELDS.index("location")
+        assert result["items"]["rows"][1][location] == "garage"
+        assert result["items"]["rows"][0][location] is None
+
+    def test_field_selection_keeps_markdown_link(self):
+        """Selected fields are returned, always including markdown_link."""
+        result = compact_tool_result(
+            {"items": self.ITEMS}, fields=["specifications", "bogus"]
+        )
+
+        assert result["items"]["columns"] == ["markdown_link", "specifications"]
+        assert result["items"]["rows"][0] == [
+            "[Drill](/items/1)",
+            [{"key": "voltage", "value": "18V"}],
+        ]
+
+    def test_tool_specific_extras_kept(self):
+        """Non-item keys such as similarity_score should always be kept."""
+        similar = [{**self.ITEMS[0], "similarity_score": 0.9, "match_reasons": []}]
+        result = compact_tool_result({"similar_items": similar}, fields=["name"])
+
+        assert result["similar_items"]["columns"] == [
+            "markdown_link",
+            "name",
+            "similarity_score",
+            "match_reasons",
+        ]
+
+    def test_non_list_results_unchanged(self):
+        """Results without item lists should pass through unchanged."""
+        summary = {"total_items": 5, "top_categories": [{"name": "Tools"}]}
+        assert compact_tool_result(summary) == summary
@@ -1,12 +1,16 @@
 """Tests for AI tool executor."""
 
+import asyncio
 import json
 import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy_utils import Ltree
 
+from src.ai.tool_cache import ToolResultCache
 from src.ai.tool_executor import ToolExecutor, _escape_like_pattern
 from src.categories.models import Category
 from src.items.models import Item
@@ -423,3 +427,273 @@ class TestToolExecutorIsolation:
 
         # Should only count test_user's item
         assert data["total_items"] == 1
+
+
+class TestToolExecutorBatch:
+    """Tests for concurrent execution of a turn's tool calls."""
+
+    @staticmethod
+    def _fake_session_factory():
+        """Session factory yielding mock sessions (no database needed)."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        @asynccontextmanager
+        async def factory():
+            yield session
+
+        return factory
+
+    async def test_batch_without_session_factory_runs_sequentially(self):
+        """Test that calls run one at a time on the request session."""
+        executor = ToolExecutor(MagicMock(), uuid.uuid4())
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_execute(_self, tool_name, _arguments):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return json.dumps({"tool": tool_name})
+
+        with patch.object(ToolExecutor, "execute", fake_execute):
+            results = await executor.execute_batch(
+                [("search_items", {}), ("get_low_stock_items", {})]
+            )
+
+        assert [json.loads(r)["tool"] for r in results] == [
+            "search_items",
+            "get_low_stock_items",
+        ]
+        assert max_in_flight == 1
+
+    async def test_batch_runs_concurrently_with_cap_and_preserves_order(self):
+        """Test that read-only tools run concurrently up to the cap, in order."""
+        executor = ToolExecutor(
+            MagicMock(),
+            uuid.uuid4(),
+            session_factory=self._fake_session_factory(),
+            max_concurrency=2,
+        )
+        in_flight = 0
+        max_in_flight = 0
+        delays = {"search_items": 0.03, "get_low_stock_items": 0.01}
+
+        async def fake_execute(_self, tool_name, arguments):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(delays.get(tool_name, 0.02))
+            in_flight -= 1
+            return json.dumps({"tool": tool_name, "args": arguments})
+
+        calls = [
+            ("search_items", {"query": "drill"}),
+            ("get_low_stock_items", {}),
+            ("get_inventory_summary", {}),
+            ("filter_items", {"tags": ["drill"]}),
+        ]
+        with patch.object(ToolExecutor, "execute", fake_execute):
+            results = await executor.execute_batch(calls)
+
+        assert [json.loads(r)["tool"] for r in results] == [n for n, _ in calls]
+        assert json.loads(results[0])["args"] == {"query": "drill"}
+        assert max_in_flight == 2
+
+    async def test_batch_session_error_returned_as_json(self):
+        """Test that failing to open a tool session yields an error result."""
+
+        @asynccontextmanager
+        async def failing_factory():
+            raise RuntimeError("pool exhausted")
+            yield  # pragma: no cover
+
+        executor = ToolExecutor(
+            MagicMock(), uuid.uuid4(), session_factory=failing_factory
+        )
+        results = await executor.execute_batch(
+            [("search_items", {}), ("get_inventory_summary", {})]
+        )
+
+        assert len(results) == 2
+        for result in results:
+            assert "pool exhausted" in json.loads(result)["error"]
+
+    async def test_batch_matches_sequential_results(
+        self,
+        async_engine,
+        async_session: AsyncSession,
+        test_user: User,
+        test_category: Category,
+        test_location: Location,
+    ):
+        """Test that concurrent results match sequential execution."""
+        for name in ("Drill", "Hammer"):
+            async_session.add(
+                Item(
+                    id=uuid.uuid4(),
+                    user_id=test_user.id,
+                    name=name,
+                    quantity=1,
+                    min_quantity=2,
+                    category_id=test_category.id,
+                    location_id=test_location.id,
+                )
+            )
+        await async_session.commit()
+
+        calls = [
+            ("search_items", {"query": "drill"}),
+            ("get_low_stock_items", {}),
+            ("get_inventory_summary", {}),
+        ]
+        sequential = await ToolExecutor(async_session, test_user.id).execute_batch(
+            calls
+        )
+        concurrent = await ToolExecutor(
+            async_session,
+            test_user.id,
+            session_factory=async_sessionmaker(
+                async_engine, class_=AsyncSession, expire_on_commit=False
+            ),
+        ).execute_batch(calls)
+
+        assert [json.loads(r) for r in concurrent] == [
+            json.loads(r) for r in sequential
+        ]
+
+
+class TestToolExecutorCacheAndCompactOutput:
+    """Tests for cached tool results and compact tool output."""
+
+    @pytest.fixture
+    def search_result(self) -> dict:
+        """Verbose search result as produced by the tool handlers."""
+        return {
+            "items": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "name": f"Item {i}",
+                    "markdown_link": f"[Item {i}](/items/{i})",
+                    "quantity": i,
+                    "quantity_unit": "pcs",
+                    "description": "A fairly long description " * 4,
+                }
+                for i in range(5)
+            ],
+            "count": 5,
+            "query": "item",
+        }
+
+    def _executor(self, **kwargs) -> ToolExecutor:
+        executor = ToolExecutor(MagicMock(), uuid.uuid4(), **kwargs)
+        executor.item_repo.get_inventory_version = AsyncMock(return_value="v1")
+        return executor
+
+    async def test_cache_hit_skips_tool(self, search_result: dict):
+        """Test that repeated calls in a conversation are served from cache."""
+        cache = ToolResultCache()
+        conversation_id = uuid.uuid4()
+        run_tool = AsyncMock(return_value=search_result)
+
+        with patch.object(ToolExecutor, "_run_tool", run_tool):
+            executor = self._executor(
+                result_cache=cache, conversation_id=conversation_id
+            )
+            first = await executor.execute("search_items", {"query": "Item"})
+            # Equivalent arguments in a later turn hit the cache
+            later = self._executor(result_cache=cache, conversation_id=conversation_id)
+            second = await later.execute("search_items", {"query": " item "})
+
+        assert first == second
+        assert run_tool.await_count == 1
+        assert later.stats.cache_hits == 1
+
+    async def test_cache_miss_on_inventory_change(self, search_result: dict):
+        """Test that a new inventory version bypasses cached results."""
+        cache = ToolResultCache()
+        conversation_id = uuid.uuid4()
+        run_tool = AsyncMock(return_value=search_result)
+
+        with patch.object(ToolExecutor, "_run_tool", run_tool):
+            await self._executor(
+                result_cache=cache, conversation_id=conversation_id
+            ).execute("search_items", {"query": "item"})
+            changed = self._executor(
+                result_cache=cache, conversation_id=conversation_id
+            )
+            changed.item_repo.get_inventory_version = AsyncMock(return_value="v2")
+            await changed.execute("search_items", {"query": "item"})
+
+        assert run_tool.await_count == 2
+
+    async def test_errors_not_cached(self):
+        """Test that error results are not cached."""
+        cache = ToolResultCache()
+        run_tool = AsyncMock(return_value={"error": "Item not found: x"})
+
+        with patch.object(ToolExecutor, "_run_tool", run_tool):
+            executor = self._executor(result_cache=cache, conversation_id=uuid.uuid4())
+            await executor.execute("get_item_details", {"item_id": "x"})
+            await executor.execute("get_item_details", {"item_id": "x"})
+
+        assert run_tool.await_count == 2
+        assert len(cache) == 0
+
+    async def test_compact_output_saves_tokens(self, search_result: dict):
+        """Test columnar output with field selection and token accounting."""
+        with patch.object(
+            ToolExecutor, "_run_tool", AsyncMock(return_value=search_result)
+        ):
+            executor = self._executor(compact_output=True)
+            result = await executor.execute(
+                "search_items", {"query": "item", "fields": ["name"]}
+            )
+
+        data = json.loads(result)
+        assert data["count"] == 5
+        assert data["items"]["columns"] == ["markdown_link", "name"]
+        assert data["items"]["rows"][0] == ["[Item 0](/items/0)", "Item 0"]
+        assert executor.stats.tokens_saved > 0
+        assert len(result) < len(json.dumps(search_result))
+
+    async def test_inventory_version_follows_renames(
+        self,
+        async_session: AsyncSession,
+        test_category: Category,
+        test_location: Location,
+    ):
+        """Test that renaming a category or location changes the version."""
+        executor = ToolExecutor(async_session, test_category.user_id)
+        versions = [await executor.item_repo.get_inventory_version()]
+
+        test_category.name = "Renamed category"
+        await async_session.commit()
+        versions.append(await executor.item_repo.get_inventory_version())
+
+        test_location.name = "Renamed location"
+        await async_session.commit()
+        versions.append(await executor.item_repo.get_inventory_version())
+
+        assert len(set(versions)) == 3
+
+    async def test_inventory_version_follows_item_writes(
+        self, async_session: AsyncSession, test_item: Item, query_counter
+    ):
+        """Test that any item write changes the version, read in one lookup."""
+        executor = ToolExecutor(async_session, test_item.user_id)
+        with query_counter.capture() as statements:
+            versions = [await executor.item_repo.get_inventory_version()]
+        assert len(statements) == 1
+
+        test_item.description = "Changed notes"
+        await async_session.commit()
+        versions.append(await executor.item_repo.get_inventory_version())
+
+        await async_session.delete(test_item)
+        await async_session.commit()
+        versions.append(await executor.item_repo.get_inventory_version())
+
+        assert len(set(versions)) == 3
@@ -0,0 +1,94 @@
+"""Tests for the benchmark data generator."""
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from benchmarks.seed import SeedConfig, delete_bench_tenants, seed
+from src.categories.models import Category
+from src.images.models import Image
+from src.items.models import Item, ItemCheckInOut
+from src.locations.models import Location
+from src.users.models import User
+
+SMALL = SeedConfig(
+    items_per_tenant=250,
+    category_depth=3,
+    location_depth=3,
+    ai_sessions_per_tenant=2,
+    messages_per_session=4,
+)
+
+
+async def _count(engine: AsyncEngine, model, *where) -> int:
+    async with engine.connect() as conn:
+        return (
+            await conn.execute(select(func.count()).select_from(model).where(*where))
+        ).scalar_one()
+
+
+class TestSeed:
+    """Tests for seeding benchmark tenants."""
+
+    async def test_reported_counts_match_rows(self, async_engine: AsyncEngine):
+        """Every generated row should be written for the tenant."""
+        [tenant] = await seed(async_engine, SMALL)
+
+        owned = {
+            "categories": Category,
+            "locations": Location,
+            "items": Item,
+            "images": Image,
+            "check_in_outs": ItemCheckInOut,
+        }
+        for name, model in owned.items():
+            rows = await _count(async_engine, model, model.user_id == tenant.user_id)
+            assert rows == tenant.row_counts[name], name
+        assert tenant.row_counts["items"] == 250
+        assert len(tenant.item_ids) == 250
+
+    async def test_hierarchies_reach_configured_depth(self, async_engine: AsyncEngine):
+        """Category and location paths should nest to the configured depth."""
+        [tenant] = await seed(async_engine, SMALL)
+
+        async with async_engine.connect() as conn:
+            category_depth = (
+                await conn.execute(
+                    select(func.max(func.nlevel(Category.path))).where(
+                        Category.user_id == tenant.user_id
+                    )
+                )
+            ).scalar_one()
+            orphans = (
+                await conn.execute(
+                    select(func.count()).where(
+                        Location.user_id == tenant.user_id,
+                        func.nlevel(Location.path) > 1,
+                        Location.parent_id.is_(None),
+                    )
+                )
+            ).scalar_one()
+
+        assert category_depth == 3
+        assert orphans == 0
+
+    async def test_reseeding_replaces_tenants_deterministically(
+        self, async_engine: AsyncEngine
+    ):
+        """The same seed should recreate the same tenant in place."""
+        [first] = await seed(async_engine, SMALL)
+        [second] = await seed(async_engine, SMALL)
+
+        assert second.user_id == first.user_id
+        assert second.item_ids == first.item_ids
+        assert await _count(async_engine, User) == 1
+
+    async def test_delete_leaves_other_users(
+        self, async_engine: AsyncEngine, test_user
+    ):
+        """Only benchmark tenants should be removed."""
+        await seed(async_engine, SMALL)
+
+        await delete_bench_tenants(async_engine)
+
+        assert await _count(async_engine, User) == 1
+        assert await _count(async_engine, Item) == 0
@@ -5,6 +5,7 @@ import uuid
 from httpx import AsyncClient
 
 from src.categories.models import Category
+from src.items.models import Item
 
 
 class TestListCategoriesEndpoint:
@@ -60,6 +61,53 @@ class TestGetCategoryTreeEndpoint:
         assert len(data) == 1
         assert data[0]["name"] == test_category.name
 
+    async def test_get_category_tree_not_modified(
+        self, authenticated_client: AsyncClient, test_item: Item
+    ):
+        """The ETag answers 304 until an item or category changes."""
+        response = await authenticated_client.get("/api/v1/categories/tree")
+        etag = response.headers["etag"]
+
+        response = await authenticated_client.get(
+            "/api/v1/categories/tree", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+        await authenticated_client.put(
+            f"/api/v1/items/{test_item.id}", json={"quantity": 5}
+        )
+        response = await authenticated_client.get(
+            "/api/v1/categories/tree", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    async def test_get_category_tree_reflects_changes(
+        self,
+        authenticated_client: AsyncClient,
+        test_category: Category,
+        test_item: Item,
+    ):
+        """Cached trees are not served after the categories or items change."""
+        response = await authenticated_client.get("/api/v1/categories/tree")
+        assert response.json()[0]["item_count"] == 1
+
+        await authenticated_client.post(
+            "/api/v1/items",
+            json={"name": "Second", "category_id": str(test_category.id)},
+        )
+        await authenticated_client.put(
+            f"/api/v1/categories/{test_category.id}", json={"name": "Renamed"}
+        )
+        response = await authenticated_client.get("/api/v1/categories/tree")
+
+        assert response.json()[0]["item_count"] == 2
+        assert response.json()[0]["name"] == "Renamed"
+
 
 class TestCreateCategoryEndpoint:
     """Tests for POST /api/v1/categories."""
@@ -195,6 +243,57 @@ class TestGetCategoryTemplateEndpoint:
         data = response.json()
         assert "fields" in data
 
+    async def test_get_category_template_inherits_and_follows_updates(
+        self, authenticated_client: AsyncClient
+    ):
+        """Child fields override inherited ones; template edits show up."""
+        parent = (
+            await authenticated_client.post(
+                "/api/v1/categories",
+                json={
+                    "name": "Electronics",
+                    "attribute_template": {
+                        "fields": [
+                            {"name": "voltage", "label": "Voltage", "type": "text"},
+                            {"name": "brand", "label": "Brand", "type": "text"},
+                        ]
+                    },
+                },
+            )
+        ).json()
+        child = (
+            await authenticated_client.post(
+                "/api/v1/categories",
+                json={
+                    "name": "Power Supplies",
+                    "parent_id": parent["id"],
+                    "attribute_template": {
+                        "fields": [
+                            {"name": "voltage", "label": "Output", "type": "number"}
+                        ]
+                    },
+                },
+            )
+        ).json()
+        url = f"/api/v1/categories/{child['id']}/template"
+
+        data = (await authenticated_client.get(url)).json()
+
+        assert {f["name"]: f["label"] for f in data["fields"]} == {
+            "voltage": "Output",
+            "brand": "Brand",
+        }
+        assert data["inherited_from"] == [parent["id"], child["id"]]
+
+        await authenticated_client.put(
+            f"/api/v1/categories/{parent['id']}",
+            json={"attribute_template": {"fields": []}},
+        )
+        data = (await authenticated_client.get(url)).json()
+
+        assert [f["name"] for f in data["fields"]] == ["voltage"]
+        assert data["inherited_from"] == [child["id"]]
+
     async def test_get_category_template_not_found(
         self, authenticated_client: AsyncClient
     ):
@@ -4,6 +4,8 @@ These tests ensure that hierarchical category operations work correctly
 with PostgreSQL's ltree type.
 """
 
+import uuid
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -323,6 +325,44 @@ class TestCategoryMergedTemplate:
         assert "size" in field_names
         assert len(merged.inherited_from) == 2
 
+    async def test_merged_templates_skip_ancestors_without_fields(
+        self,
+        category_service: CategoryService,
+        root_category: Category,
+        child_category: Category,
+        grandchild_category: Category,
+        async_session: AsyncSession,
+    ):
+        """Fields come from every ancestor that has some, nearest last."""
+        root_category.attribute_template = {
+            "fields": [{"name": "material", "label": "Material", "type": "text"}]
+        }
+        grandchild_category.attribute_template = {
+            "fields": [{"name": "size", "label": "Size", "type": "text"}]
+        }
+        await async_session.commit()
+
+        templates = await category_service.get_merged_templates()
+
+        assert [f.name for f in templates[grandchild_category.id].fields] == [
+            "material",
+            "size",
+        ]
+        assert templates[grandchild_category.id].inherited_from == [
+            root_category.id,
+            grandchild_category.id,
+        ]
+        assert [f.name for f in templates[child_category.id].fields] == ["material"]
+
+    async def test_merged_template_of_unknown_category_is_empty(
+        self, category_service: CategoryService
+    ):
+        """Unknown categories get an empty template."""
+        merged = await category_service.get_merged_template(uuid.uuid4())
+
+        assert merged.fields == []
+        assert merged.inherited_from == []
+
 
 class TestCategoryCreateFromPath:
     """Tests for creating categories from AI-suggested paths."""
@@ -0,0 +1,162 @@
+"""Tests for Prometheus metrics and per-request database accounting."""
+
+import logging
+from urllib.request import urlopen
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from src.common.formatters import RequestIDFormatter
+from src.common.metrics import (
+    MetricsMiddleware,
+    instrument_engine,
+    start_metrics_server,
+    stop_metrics_server,
+)
+from src.common.request_context import get_query_stats, start_query_stats
+
+
+def _sample(name: str, labels: dict[str, str] | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/things/{thing_id}")
+    async def get_thing(thing_id: int):
+        return {"id": thing_id}
+
+    return app
+
+
+class TestMetricsMiddleware:
+    """Tests for request latency and in-flight metrics."""
+
+    def test_latency_is_labelled_by_route_template(self):
+        """Requests are counted under the route template, not the raw path."""
+        labels = {"method": "GET", "route": "/things/{thing_id}", "status": "200"}
+        before = _sample("homerp_http_request_duration_seconds_count", labels)
+
+        with TestClient(_app()) as client:
+            client.get("/things/1")
+            client.get("/things/2")
+
+        after = _sample("homerp_http_request_duration_seconds_count", labels)
+        assert after - before == 2
+
+    def test_unmatched_paths_share_one_label(self):
+        """Unknown paths are grouped so label cardinality stays bounded."""
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = _sample("homerp_http_request_duration_seconds_count", labels)
+
+        with TestClient(_app()) as client:
+            client.get("/nope/1")
+            client.get("/nope/2")
+
+        after = _sample("homerp_http_request_duration_seconds_count", labels)
+        assert after - before == 2
+
+    def test_in_flight_returns_to_previous_value(self):
+        """The in-flight gauge is decremented when requests finish."""
+        before = _sample("homerp_http_requests_in_flight")
+
+        with TestClient(_app()) as client:
+            client.get("/things/1")
+
+        assert _sample("homerp_http_requests_in_flight") == before
+
+
+class TestMetricsEndpoint:
+    """Tests for the internal metrics server."""
+
+    def test_metrics_server_exposes_prometheus_text(self, client: TestClient):
+        """The metrics port serves the Prometheus text format."""
+        client.get("/health")
+
+        server = start_metrics_server(0, "127.0.0.1")
+        try:
+            with urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+                content_type = response.headers["content-type"]
+                body = response.read().decode()
+        finally:
+            stop_metrics_server()
+
+        assert content_type.startswith("text/plain")
+        assert "homerp_http_request_duration_seconds_bucket" in body
+        assert 'route="/health"' in body
+        assert "homerp_openai_tokens_total" in body
+
+    def test_public_app_does_not_serve_metrics(self, client: TestClient):
+        """/metrics is not reachable through the public API."""
+        assert client.get("/metrics").status_code == 404
+        assert "/metrics" not in client.get("/openapi.json").json()["paths"]
+
+    def test_taken_port_does_not_fail_startup(self):
+        """A second worker that cannot bind the port carries on without it."""
+        server = start_metrics_server(0, "127.0.0.1")
+        try:
+            assert start_metrics_server(server.server_port, "127.0.0.1") is None
+        finally:
+            stop_metrics_server()
+
+
+class TestQueryAccounting:
+    """Tests for per-request query counting."""
+
+    async def test_counts_queries_and_time_for_current_request(self, async_engine):
+        """Each statement updates the current request's stats."""
+        instrument_engine(async_engine, slow_query_threshold_ms=0)
+        stats = start_query_stats()
+
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+
+        assert stats.queries == 2
+        assert stats.seconds > 0
+        assert get_query_stats() is stats
+
+    async def test_logs_statements_over_threshold(self, async_engine, caplog):
+        """Statements slower than the threshold are logged as warnings."""
+        instrument_engine(async_engine, slow_query_threshold_ms=10)
+        before = _sample("homerp_db_slow_queries_total")
+
+        with caplog.at_level(logging.WARNING, logger="src.common.metrics"):
+            async with async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT pg_sleep(0.05)"))
+
+        slow = [r for r in caplog.records if "Slow query" in r.getMessage()]
+        assert len(slow) == 1
+        assert "pg_sleep" in slow[0].getMessage()
+        assert _sample("homerp_db_slow_queries_total") - before == 1
+
+
+class TestFormatterQueryStats:
+    """Tests for DB stats on log records."""
+
+    def _format(self) -> logging.LogRecord:
+        record = logging.LogRecord("test", logging.INFO, "", 0, "message", (), None)
+        RequestIDFormatter(fmt="%(db_queries)s %(db_time_ms)s").format(record)
+        return record
+
+    def test_record_has_placeholders_outside_requests(self):
+        """Outside a request the DB fields are dashes."""
+        record = self._format()
+        assert record.db_queries == "-"
+        assert record.db_time_ms == "-"
+
+    async def test_record_includes_current_request_stats(self):
+        """Inside a request the DB fields reflect the request's queries."""
+        stats = start_query_stats()
+        stats.queries = 3
+        stats.seconds = 0.0125
+
+        record = self._format()
+
+        assert record.db_queries == 3
+        assert record.db_time_ms == "12.5"
@@ -0,0 +1,181 @@
+"""Tests for the monthly partitions of the log tables."""
+
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.ai.models import AIUsageLog
+from src.common.partitions import (
+    add_months,
+    create_partitions,
+    detach_expired_partitions,
+    month_start,
+    partition_name,
+)
+from src.users.models import User
+from src.webhooks.models import WebhookConfig, WebhookExecution
+
+
+def _at(month: date) -> datetime:
+    return datetime(month.year, month.month, 15, 12, tzinfo=UTC)
+
+
+def _usage(user: User, created_at: datetime) -> AIUsageLog:
+    return AIUsageLog(
+        user_id=user.id,
+        operation_type="image_classification",
+        model="gpt-4o",
+        prompt_tokens=100,
+        completion_tokens=50,
+        total_tokens=150,
+        estimated_cost_usd=Decimal("0.001500"),
+        created_at=created_at,
+    )
+
+
+def _execution(config: WebhookConfig, executed_at: datetime) -> WebhookExecution:
+    return WebhookExecution(
+        webhook_config_id=config.id,
+        event_type=config.event_type,
+        event_payload={},
+        request_url=config.url,
+        request_headers={},
+        request_body="{}",
+        status="success",
+        executed_at=executed_at,
+    )
+
+
+async def _partition_of(session: AsyncSession, model, row) -> str:
+    return (
+        await session.execute(
+            select(text("tableoid::regclass::text")).where(model.id == row.id)
+        )
+    ).scalar_one()
+
+
+async def _partitions(session: AsyncSession, table: str) -> set[str]:
+    result = await session.execute(
+        text(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+    return set(result.scalars())
+
+
+class TestMonthHelpers:
+    """Tests for the month arithmetic."""
+
+    def test_add_months_crosses_years(self):
+        """Adding and subtracting months rolls the year over."""
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+        assert month_start(date(2026, 10, 18)) == date(2026, 10, 1)
+
+
+class TestCreatePartitions:
+    """Tests for creating the monthly partitions ahead of time."""
+
+    async def test_rows_are_routed_to_their_month(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """New rows land in the current month's partition."""
+        log = _usage(test_user, datetime.now(UTC))
+        async_session.add(log)
+        await async_session.commit()
+
+        this_month = month_start(datetime.now(UTC).date())
+        assert await _partition_of(async_session, AIUsageLog, log) == (
+            partition_name("ai_usage_logs", this_month)
+        )
+
+    async def test_creates_months_ahead_once(self, async_session: AsyncSession):
+        """Partitions up to N months ahead are created, existing ones skipped."""
+        this_month = month_start(datetime.now(UTC).date())
+
+        created = await create_partitions(async_session, months_ahead=3)
+
+        assert partition_name("alert_history", add_months(this_month, 3)) in created
+        assert partition_name("alert_history", this_month) not in created
+        assert await create_partitions(async_session, months_ahead=3) == []
+
+    async def test_moves_rows_out_of_the_default_partition(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """Rows written before their month's partition existed are moved into it."""
+        month = add_months(month_start(datetime.now(UTC).date()), 6)
+        log = _usage(test_user, _at(month))
+        async_session.add(log)
+        await async_session.commit()
+        assert await _partition_of(async_session, AIUsageLog, log) == (
+            "ai_usage_logs_default"
+        )
+
+        created = await create_partitions(async_session, months_ahead=0, today=month)
+        await async_session.commit()
+
+        name = partition_name("ai_usage_logs", month)
+        assert name in created
+        assert await _partition_of(async_session, AIUsageLog, log) == name
+        assert (
+            await async_session.execute(select(func.count(AIUsageLog.id)))
+        ).scalar() == 1
+
+
+class TestDetachExpiredPartitions:
+    """Tests for the retention job."""
+
+    async def _old_partitions(
+        self, session: AsyncSession, config: WebhookConfig, months: list[date]
+    ) -> None:
+        for month in months:
+            await create_partitions(session, months_ahead=0, today=month)
+            session.add(_execution(config, _at(month)))
+        await session.commit()
+
+    async def test_detaches_partitions_past_retention(
+        self, async_session: AsyncSession, test_webhook_config: WebhookConfig
+    ):
+        """Months older than the retention leave the table but are kept aside."""
+        this_month = month_start(datetime.now(UTC).date())
+        expired = add_months(this_month, -8)
+        kept = add_months(this_month, -6)
+        await self._old_partitions(async_session, test_webhook_config, [expired, kept])
+
+        detached = await detach_expired_partitions(
+            async_session, {"webhook_executions": 6, "alert_history": 0}
+        )
+        await async_session.commit()
+
+        name = partition_name("webhook_executions", expired)
+        assert detached == [name]
+        assert name not in await _partitions(async_session, "webhook_executions")
+        executions = (await async_session.execute(select(WebhookExecution))).scalars()
+        assert [e.executed_at for e in executions] == [_at(kept)]
+        archived = await async_session.execute(text(f"SELECT count(*) FROM {name}"))
+        assert archived.scalar() == 1
+        await async_session.execute(text(f"DROP TABLE {name}"))
+        await async_session.commit()
+
+    async def test_drops_detached_partitions_when_configured(
+        self, async_session: AsyncSession, test_webhook_config: WebhookConfig
+    ):
+        """With drop set, expired partitions are removed entirely."""
+        expired = add_months(month_start(datetime.now(UTC).date()), -3)
+        await self._old_partitions(async_session, test_webhook_config, [expired])
+
+        detached = await detach_expired_partitions(
+            async_session, {"webhook_executions": 1}, drop=True
+        )
+        await async_session.commit()
+
+        name = partition_name("webhook_executions", expired)
+        assert detached == [name]
+        exists = await async_session.execute(
+            text("SELECT to_regclass(:name)"), {"name": name}
+        )
+        assert exists.scalar() is None
@@ -1,11 +1,20 @@
 """Tests for rate limiting configuration."""
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
 
-from src.common.rate_limiter import configure_rate_limiting
+from src.common.rate_limiter import (
+    MemoryRateLimitStorage,
+    RateLimiter,
+    RateLimitExceeded,
+    RedisRateLimitStorage,
+    configure_rate_limiting,
+    parse_rate_limits,
+    rate_limit_exceeded_handler,
+)
 from src.config import Settings
 
 
@@ -38,11 +47,11 @@ class TestRateLimitingConfiguration:
             jwt_secret="a" * 32,
         )
 
-        # Mock storage_from_string to simulate connection failure
+        # Mock storage creation to simulate connection failure
         with (
             patch("src.config.get_settings", return_value=settings),
             patch(
-                "limits.storage.storage_from_string",
+                "src.common.rate_limiter.create_redis_storage",
                 side_effect=Exception("Connection refused"),
             ),
             pytest.raises(
@@ -91,3 +100,131 @@ class TestRateLimitingConfiguration:
         with patch("src.config.get_settings", return_value=settings):
             configure_rate_limiting(app)
             assert app.state.limiter is not None
+
+
+def _limited_app(limiter: RateLimiter, limit: str) -> FastAPI:
+    """Build an app with one rate limited and one unlimited route."""
+    app = FastAPI()
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+
+    @app.get("/limited")
+    @limiter.limit(limit)
+    async def limited(request: Request):  # noqa: ARG001
+        return {"ok": True}
+
+    @app.get("/open")
+    async def open_route():
+        return {"ok": True}
+
+    return app
+
+
+class TestParseRateLimits:
+    """Tests for parse_rate_limits."""
+
+    def test_parses_single_and_multiple_limits(self):
+        """Limits separated by semicolons should all be parsed."""
+        limits = parse_rate_limits("10/minute; 200/hour")
+
+        assert [(lim.amount, lim.period_seconds) for lim in limits] == [
+            (10, 60),
+            (200, 3600),
+        ]
+        assert str(limits[0]) == "10/minute"
+
+    def test_parses_multiplier(self):
+        """A multiplier before the unit should scale the period."""
+        assert parse_rate_limits("5/10seconds")[0].period_seconds == 10
+
+    def test_rejects_invalid_limit(self):
+        """Unparseable limits should raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid rate limit"):
+            parse_rate_limits("ten per minute")
+
+
+class TestRateLimiter:
+    """Tests for the route rate limiter."""
+
+    def test_limits_decorated_route_only(self):
+        """Requests over the limit should get 429; other routes are unaffected."""
+        limiter = RateLimiter(key_func=lambda _request: "client")
+        client = TestClient(_limited_app(limiter, "2/minute"))
+
+        assert client.get("/limited").status_code == 200
+        assert client.get("/limited").status_code == 200
+        response = client.get("/limited")
+
+        assert response.status_code == 429
+        assert response.json() == {"error": "Rate limit exceeded: 2/minute"}
+        assert 0 < int(response.headers["Retry-After"]) <= 60
+        assert client.get("/open").status_code == 200
+
+    def test_clients_limited_independently(self):
+        """Each client identifier should have its own counter."""
+        limiter = RateLimiter(key_func=lambda request: request.headers["x-client"])
+        client = TestClient(_limited_app(limiter, "1/minute"))
+
+        assert client.get("/limited", headers={"x-client": "a"}).status_code == 200
+        assert client.get("/limited", headers={"x-client": "b"}).status_code == 200
+        assert client.get("/limited", headers={"x-client": "a"}).status_code == 429
+
+    def test_all_limits_checked_in_one_storage_call(self):
+        """Every limit of a route should be counted in a single round-trip."""
+        storage = MemoryRateLimitStorage()
+        limiter = RateLimiter(key_func=lambda _request: "client", storage=storage)
+        client = TestClient(_limited_app(limiter, "5/minute;100/hour"))
+
+        with patch.object(storage, "hit", wraps=storage.hit) as hit:
+            client.get("/limited")
+
+        hit.assert_called_once()
+        assert [period for _, period in hit.call_args.args[0]] == [60, 3600]
+
+    def test_blocked_client_rejected_without_storage_call(self):
+        """Once over the limit, rejections should not reach the storage."""
+        storage = MemoryRateLimitStorage()
+        limiter = RateLimiter(key_func=lambda _request: "client", storage=storage)
+        client = TestClient(_limited_app(limiter, "1/minute"))
+        client.get("/limited")
+        client.get("/limited")
+
+        with patch.object(storage, "hit", wraps=storage.hit) as hit:
+            assert client.get("/limited").status_code == 429
+
+        hit.assert_not_called()
+
+    def test_storage_failure_falls_back_to_memory(self):
+        """If the storage errors, limits should still be enforced locally."""
+        storage = AsyncMock()
+        storage.hit.side_effect = ConnectionError("Redis unavailable")
+        limiter = RateLimiter(key_func=lambda _request: "client", storage=storage)
+        client = TestClient(_limited_app(limiter, "1/minute"))
+
+        assert client.get("/limited").status_code == 200
+        assert client.get("/limited").status_code == 429
+
+    def test_route_without_request_parameter_rejected(self):
+        """Decorating a route without a request parameter should fail early."""
+        limiter = RateLimiter(key_func=lambda _request: "client")
+
+        with pytest.raises(TypeError, match="request"):
+
+            @limiter.limit("1/minute")
+            async def route():
+                return None
+
+
+class TestRedisRateLimitStorage:
+    """Tests for the Redis storage."""
+
+    async def test_hit_runs_single_script_call(self):
+        """All windows should be sent to Redis in one script invocation."""
+        storage = RedisRateLimitStorage("redis://localhost:6379")
+        script = AsyncMock(return_value=[1, 60, 4, 3500])
+        storage._hit_script = script
+
+        result = await storage.hit([("a", 60), ("b", 3600)])
+
+        script.assert_awaited_once_with(keys=["a", "b"], args=[60, 3600])
+        assert result == [(1, 60), (4, 3500)]
+        await storage.close()
@@ -178,3 +178,22 @@ class TestRequestIDMiddlewareUnit:
         from src.common.request_id_middleware import REQUEST_ID_HEADER
 
         assert REQUEST_ID_HEADER == "X-Request-ID"
+
+    def test_request_id_visible_to_route(self):
+        """The route should see the same request ID as the response header."""
+        from fastapi import FastAPI
+
+        from src.common.request_context import get_request_id
+        from src.common.request_id_middleware import RequestIDMiddleware
+
+        app = FastAPI()
+
+        @app.get("/id")
+        async def current_request_id():
+            return {"request_id": get_request_id()}
+
+        app.add_middleware(RequestIDMiddleware)
+        response = TestClient(app).get("/id", headers={"x-request-id": "abc-123"})
+
+        assert response.json() == {"request_id": "abc-123"}
+        assert response.headers["X-Request-ID"] == "abc-123"
@@ -0,0 +1,36 @@
+"""Tests for JSON response helpers."""
+
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from pydantic import BaseModel, TypeAdapter
+
+from src.common.responses import json_response
+
+
+class Sample(BaseModel):
+    name: str
+    price: Decimal
+    created_at: datetime
+
+
+class TestJsonResponse:
+    """Tests for json_response."""
+
+    def test_serializes_like_pydantic(self):
+        """The body should match pydantic's JSON mode serialization."""
+        adapter = TypeAdapter(list[Sample])
+        content = [
+            Sample(
+                name="Drill",
+                price=Decimal("12.50"),
+                created_at=datetime(2026, 1, 2, tzinfo=UTC),
+            )
+        ]
+
+        response = json_response(adapter, content, status_code=201)
+
+        assert response.status_code == 201
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == adapter.dump_python(content, mode="json")
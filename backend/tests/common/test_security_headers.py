@@ -1,8 +1,35 @@
 """Tests for security headers middleware."""
 
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 
+from src.common.security_headers import (
+    SecurityHeadersMiddleware,
+    StrictSecurityHeadersMiddleware,
+)
+
+
+def _app(middleware) -> FastAPI:
+    """Build a minimal app wrapped in the given middleware."""
+    app = FastAPI()
+
+    @app.get("/plain")
+    async def plain():
+        return PlainTextResponse("ok", headers={"Server": "uvicorn"})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for chunk in (b"a", b"b", b"c"):
+                yield chunk
+
+        return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+    app.add_middleware(middleware)
+    return app
+
 
 class TestSecurityHeaders:
     """Test that security headers are added to responses."""
@@ -81,3 +108,28 @@ class TestSecurityHeadersUnit:
         from src.common.security_headers import StrictSecurityHeadersMiddleware
 
         assert StrictSecurityHeadersMiddleware is not None
+
+    def test_server_header_removed(self):
+        """A server header set by the route should be stripped."""
+        client = TestClient(_app(SecurityHeadersMiddleware))
+        response = client.get("/plain")
+        assert "server" not in response.headers
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+    def test_streamed_response_passes_through(self):
+        """Streamed bodies should be forwarded unchanged with headers added."""
+        client = TestClient(_app(SecurityHeadersMiddleware))
+        response = client.get("/stream")
+        assert response.content == b"abc"
+        assert response.headers["X-Frame-Options"] == "SAMEORIGIN"
+        assert "Strict-Transport-Security" not in response.headers
+
+    def test_strict_middleware_adds_hsts(self):
+        """StrictSecurityHeadersMiddleware should add HSTS to the base headers."""
+        client = TestClient(_app(StrictSecurityHeadersMiddleware))
+        response = client.get("/plain")
+        assert (
+            response.headers["Strict-Transport-Security"]
+            == "max-age=31536000; includeSubDomains"
+        )
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
@@ -0,0 +1,127 @@
+"""Tests for the tree version triggers and the tree cache."""
+
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.categories.models import Category
+from src.common.tree_cache import (
+    TreeCache,
+    TreeVersions,
+    get_tree_versions,
+)
+from src.items.models import Item
+from src.locations.models import Location
+from src.users.models import User
+
+
+class TestTreeVersionTriggers:
+    """Tests for which writes replace which version tokens."""
+
+    async def test_user_without_writes_has_initial_tokens(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """A user who never wrote anything reads the initial tokens."""
+        assert await get_tree_versions(async_session, test_user.id) == TreeVersions()
+
+    async def test_category_and_location_writes(
+        self,
+        async_session: AsyncSession,
+        test_category: Category,
+        test_location: Location,
+    ):
+        """Category and location changes replace only their own token."""
+        user_id = test_category.user_id
+        before = await get_tree_versions(async_session, user_id)
+
+        test_category.attribute_template = {"fields": []}
+        await async_session.commit()
+        after_category = await get_tree_versions(async_session, user_id)
+
+        assert after_category.categories != before.categories
+        assert after_category.locations == before.locations
+        assert after_category.items == before.items
+
+        await async_session.execute(
+            delete(Location).where(Location.id == test_location.id)
+        )
+        await async_session.commit()
+        after_location = await get_tree_versions(async_session, user_id)
+
+        assert after_location.locations != after_category.locations
+        assert after_location.categories == after_category.categories
+
+    async def test_item_writes_that_change_the_trees(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """Item quantity, price and placement changes replace the item token."""
+        user_id = test_item.user_id
+        for values in (
+            {"quantity": 7},
+            {"price": Decimal("9.99")},
+            {"location_id": None},
+        ):
+            before = await get_tree_versions(async_session, user_id)
+
+            await async_session.execute(
+                update(Item).where(Item.id == test_item.id).values(**values)
+            )
+            await async_session.commit()
+
+            after = await get_tree_versions(async_session, user_id)
+            assert after.items != before.items
+            assert after.categories == before.categories
+
+    async def test_item_writes_that_leave_the_trees_alone(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """Renames and notes do not invalidate the cached trees."""
+        before = await get_tree_versions(async_session, test_item.user_id)
+
+        test_item.name = "Renamed"
+        test_item.description = "Changed"
+        await async_session.commit()
+
+        assert await get_tree_versions(async_session, test_item.user_id) == before
+
+    async def test_deleting_user_removes_versions(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """A cascading user delete neither fails nor leaves a version row."""
+        user_id = test_item.user_id
+
+        await async_session.execute(delete(User).where(User.id == user_id))
+        await async_session.commit()
+
+        assert await get_tree_versions(async_session, user_id) == TreeVersions()
+
+
+class TestTreeCache:
+    """Tests for TreeCache keys, ETags and eviction."""
+
+    def test_keys_and_etags_follow_the_tokens(self):
+        """Only the tokens a kind is built from affect its key and ETag."""
+        user_id = uuid.uuid4()
+        versions = TreeVersions(uuid.uuid4(), uuid.uuid4(), uuid.uuid4())
+        moved = TreeVersions(versions.categories, uuid.uuid4(), versions.items)
+
+        assert TreeCache.make_key(user_id, "category_tree", versions) == (
+            TreeCache.make_key(user_id, "category_tree", moved)
+        )
+        assert versions.etag("category_tree") == moved.etag("category_tree")
+        assert versions.etag("location_tree") != moved.etag("location_tree")
+        assert versions.etag("category_tree") != versions.etag("location_tree")
+
+    def test_evicts_least_recently_used(self):
+        """Entries beyond max_entries are evicted oldest-access first."""
+        cache = TreeCache(max_entries=2)
+        cache.set(("a",), b"1")
+        cache.set(("b",), b"2")
+        cache.get(("a",))
+        cache.set(("c",), b"3")
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == b"1"
+        assert len(cache) == 2
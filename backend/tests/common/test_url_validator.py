@@ -1,15 +1,22 @@
 """Tests for URL validation and SSRF protection."""
 
-from unittest.mock import patch
+import socket
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
 from src.common.url_validator import (
+    PinnedIPTransport,
     SSRFValidationError,
+    ValidatedURL,
     _get_allowed_networks,
+    clear_dns_cache,
     is_ip_blocked,
     is_ip_in_allowlist,
+    resolve_hostname_async,
     validate_webhook_url,
+    validate_webhook_url_async,
 )
 from src.config import get_settings
 
@@ -305,3 +312,129 @@ class TestAllowedNetworks:
             with pytest.raises(SSRFValidationError) as exc_info:
                 validate_webhook_url("http://other-service.local/webhook")
             assert "blocked" in str(exc_info.value).lower()
+
+
+def _addrinfo(*ips: str) -> list:
+    """Build getaddrinfo-style results for the given addresses."""
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (ip, 0)) for ip in ips]
+
+
+class TestAsyncResolution:
+    """Tests for non-blocking DNS resolution and async validation."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Clear the DNS cache before and after each test."""
+        clear_dns_cache()
+        yield
+        clear_dns_cache()
+
+    async def test_resolution_is_cached(self):
+        """Repeated lookups within the TTL should hit the resolver once."""
+        loop_resolver = AsyncMock(return_value=_addrinfo("93.184.216.34") * 2)
+        with patch("asyncio.BaseEventLoop.getaddrinfo", loop_resolver):
+            first = await resolve_hostname_async("hooks.service.io")
+            second = await resolve_hostname_async("hooks.service.io")
+
+        assert first == second == ["93.184.216.34"]
+        assert loop_resolver.await_count == 1
+
+    async def test_expired_entries_resolved_again(self):
+        """Lookups after the TTL should query the resolver again."""
+        loop_resolver = AsyncMock(return_value=_addrinfo("93.184.216.34"))
+        with patch("asyncio.BaseEventLoop.getaddrinfo", loop_resolver):
+            with patch("src.common.url_validator.time.monotonic", return_value=0.0):
+                await resolve_hostname_async("hooks.service.io")
+            with patch("src.common.url_validator.time.monotonic", return_value=31.0):
+                await resolve_hostname_async("hooks.service.io")
+
+        assert loop_resolver.await_count == 2
+
+    async def test_resolution_failure_raises(self):
+        """Resolver errors should surface as SSRF validation errors."""
+        loop_resolver = AsyncMock(side_effect=socket.gaierror("no such host"))
+        with (
+            patch("asyncio.BaseEventLoop.getaddrinfo", loop_resolver),
+            pytest.raises(SSRFValidationError, match="resolve"),
+        ):
+            await resolve_hostname_async("missing.service.io")
+
+    async def test_validated_url_pins_first_address(self):
+        """Async validation should return the address to connect to."""
+        with patch(
+            "src.common.url_validator.resolve_hostname_async",
+            AsyncMock(return_value=["93.184.216.34", "93.184.216.35"]),
+        ):
+            target = await validate_webhook_url_async("https://hooks.service.io/x")
+
+        assert target == ValidatedURL(
+            url="https://hooks.service.io/x",
+            hostname="hooks.service.io",
+            ip="93.184.216.34",
+        )
+
+    async def test_any_blocked_address_rejected(self):
+        """A hostname with any blocked address should be rejected."""
+        with (
+            patch(
+                "src.common.url_validator.resolve_hostname_async",
+                AsyncMock(return_value=["93.184.216.34", "10.0.0.1"]),
+            ),
+            pytest.raises(SSRFValidationError, match="blocked"),
+        ):
+            await validate_webhook_url_async("https://rebind.service.io/x")
+
+    async def test_blocked_ip_literal_rejected(self):
+        """IP literals are checked without DNS resolution."""
+        with pytest.raises(SSRFValidationError, match="blocked"):
+            await validate_webhook_url_async("http://169.254.169.254/latest")
+
+
+class TestPinnedIPTransport:
+    """Tests for connecting to the validated IP address."""
+
+    async def _send(self, target: ValidatedURL, url: str) -> httpx.Request:
+        """Send a request through the transport and return what was sent."""
+        sent: list[httpx.Request] = []
+
+        async def capture(_self, request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            return httpx.Response(200)
+
+        with patch.object(httpx.AsyncHTTPTransport, "handle_async_request", capture):
+            async with httpx.AsyncClient(transport=PinnedIPTransport(target)) as client:
+                await client.post(url, content="{}")
+        return sent[0]
+
+    async def test_connects_to_pinned_ip_with_original_host(self):
+        """The connection should use the IP while keeping Host and SNI."""
+        target = ValidatedURL(
+            url="https://hooks.service.io/x",
+            hostname="hooks.service.io",
+            ip="93.184.216.34",
+        )
+        request = await self._send(target, "https://hooks.service.io:8443/x?a=1")
+
+        assert request.url == httpx.URL("https://93.184.216.34:8443/x?a=1")
+        assert request.headers["Host"] == "hooks.service.io:8443"
+        assert request.extensions["sni_hostname"] == "hooks.service.io"
+
+    async def test_rejects_other_hosts(self):
+        """Requests to a host other than the validated one should fail."""
+        target = ValidatedURL(
+            url="https://hooks.service.io/x",
+            hostname="hooks.service.io",
+            ip="93.184.216.34",
+        )
+        with pytest.raises(SSRFValidationError):
+            await self._send(target, "https://internal.service.io/x")
+
+    async def test_unresolved_target_passes_through(self):
+        """Targets without a pinned IP should be sent unchanged."""
+        target = ValidatedURL(
+            url="https://example.com/x", hostname="example.com", ip=None
+        )
+        request = await self._send(target, "https://example.com/x")
+
+        assert request.url == httpx.URL("https://example.com/x")
+        assert "sni_hostname" not in request.extensions
@@ -20,24 +20,31 @@ os.environ["DEBUG"] = "true"
 os.environ["ENVIRONMENT"] = "development"
 
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy_utils import Ltree
 from testcontainers.postgres import PostgresContainer
 
+from src.admin.rollups import TRIGGER_DDL as ANALYTICS_TRIGGER_DDL
 from src.ai.models import AIModelSettings
 from src.billing.models import AppSetting, CreditPack, CreditPricing, CreditTransaction
 from src.categories.models import Category
+from src.common.partitions import create_partitions
+from src.common.tree_cache import TRIGGER_DDL as TREE_VERSION_TRIGGER_DDL
 from src.config import Settings
 from src.database import Base
 from src.feedback.models import Feedback
 from src.images.models import Image
 from src.items.models import Item
+from src.items.rollups import TRIGGER_DDL as ROLLUP_TRIGGER_DDL
+from src.items.search_vector import TRIGGER_DDL as SEARCH_VECTOR_TRIGGER_DDL
 from src.locations.models import Location
 from src.users.models import User
 from src.webhooks.models import WebhookConfig
@@ -108,31 +115,24 @@ async def async_engine(database_url: str):
     # Create all tables from the real models
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await create_partitions(conn, months_ahead=1)
 
-    # Create trigger for items full-text search vector
-    # This is normally created by migration 026, but tests use create_all
+    # Trigger for the items full-text search vector, normally created by
+    # migrations 026 and 033
     async with engine.begin() as conn:
-        await conn.execute(
-            text("""
-            CREATE OR REPLACE FUNCTION items_search_vector_update() RETURNS trigger AS $$
-            BEGIN
-                NEW.search_vector :=
-                    setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
-                    setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
-                    setweight(to_tsvector('english', coalesce(array_to_string(NEW.tags, ' '), '')), 'C') ||
-                    setweight(to_tsvector('english', coalesce(NEW.attributes::text, '')), 'D');
-                RETURN NEW;
-            END;
-            $$ LANGUAGE plpgsql;
-        """)
-        )
-        await conn.execute(
-            text("""
-            CREATE TRIGGER items_search_vector_trigger
-            BEFORE INSERT OR UPDATE ON items
-            FOR EACH ROW EXECUTE FUNCTION items_search_vector_update();
-        """)
-        )
+        for statement in SEARCH_VECTOR_TRIGGER_DDL:
+            await conn.execute(text(statement))
+
+    # Dashboard and admin analytics rollup triggers, normally created by
+    # migrations 029, 030, 034 and 035
+    async with engine.begin() as conn:
+        for statement in [*ROLLUP_TRIGGER_DDL, *ANALYTICS_TRIGGER_DDL]:
+            await conn.execute(text(statement))
+
+    # Tree version triggers, normally created by migration 036
+    async with engine.begin() as conn:
+        for statement in TREE_VERSION_TRIGGER_DDL:
+            await conn.execute(text(statement))
 
     yield engine
 
@@ -160,6 +160,81 @@ async def async_session(async_engine) -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
+class QueryCounter:
+    """Counts SQL statements executed through the test engine.
+
+    budget() asserts an upper bound for a block, and assert_constant() fails
+    when a request's statement count grows with the rows it returns (an N+1).
+    """
+
+    def __init__(self) -> None:
+        self._active: list[list[str]] = []
+
+    def record(self, _conn, _cursor, statement, *_args) -> None:
+        for statements in self._active:
+            statements.append(statement)
+
+    @contextmanager
+    def capture(self) -> Iterator[list[str]]:
+        """Collect the statements executed inside the block."""
+        statements: list[str] = []
+        self._active.append(statements)
+        try:
+            yield statements
+        finally:
+            self._active.remove(statements)
+
+    @contextmanager
+    def budget(self, max_statements: int, label: str = "block") -> Iterator[list[str]]:
+        """Fail if the block executes more than max_statements statements."""
+        with self.capture() as statements:
+            yield statements
+        assert len(statements) <= max_statements, self._report(
+            f"{label} executed {len(statements)} statements (budget {max_statements})",
+            statements,
+        )
+
+    async def assert_constant(
+        self,
+        request: Callable[[], Awaitable[object]],
+        grow: Callable[[], Awaitable[object]],
+        label: str = "request",
+    ) -> int:
+        """Fail if request needs more statements after grow() adds rows.
+
+        Returns:
+            The statement count before growing
+        """
+        with self.capture() as before:
+            await request()
+        await grow()
+        with self.capture() as after:
+            await request()
+        assert len(after) <= len(before), self._report(
+            f"{label} went from {len(before)} to {len(after)} statements "
+            "as results grew (N+1?)",
+            after,
+        )
+        return len(before)
+
+    @staticmethod
+    def _report(message: str, statements: list[str]) -> str:
+        listing = "\n".join(
+            f"  {i}. {' '.join(statement.split())[:200]}"
+            for i, statement in enumerate(statements, 1)
+        )
+        return f"{message}:\n{listing}"
+
+
+@pytest.fixture
+def query_counter(async_engine) -> Iterator[QueryCounter]:
+    """Count SQL statements per request through engine events."""
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter.record)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter.record)
+
+
 @pytest.fixture
 def user_id() -> uuid.UUID:
     """Generate a test user ID."""
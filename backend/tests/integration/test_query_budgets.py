@@ -0,0 +1,356 @@
+"""Integration tests for SQL statement budgets on the main routers.
+
+Tests verify:
+- Each hot endpoint stays within its statement budget
+- Statement counts stay flat as the number of returned rows grows (no N+1)
+"""
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy_utils import Ltree
+
+from src.categories.models import Category
+from src.images.models import Image
+from src.images.repository import ImageRepository
+from src.items.models import Item
+from src.locations.models import Location
+from src.users.models import User
+from tests.conftest import QueryCounter
+
+# Statement budgets per request. Raise one only with a reason: a higher count
+# usually means a per-row query crept in. Check-out reloads the item with its
+# relations before and after recording the usage, hence its larger budget.
+# The trees read their version tokens first; a cache hit is 1 statement.
+# Batch creation inserts inside a savepoint so a failing row can be retried
+# on its own, which adds SAVEPOINT and RELEASE.
+BUDGETS = {
+    ("GET", "/api/v1/items"): 5,
+    ("GET", "/api/v1/items/search"): 4,
+    ("GET", "/api/v1/items/facets"): 4,
+    ("GET", "/api/v1/items/low-stock"): 4,
+    ("GET", "/api/v1/items/stats/dashboard"): 4,
+    ("GET", "/api/v1/items/stats/most-used"): 1,
+    ("GET", "/api/v1/items/stats/recently-used"): 1,
+    ("GET", "/api/v1/items/{item_id}"): 4,
+    ("POST", "/api/v1/items/{item_id}/check-out"): 13,
+    ("POST", "/api/v1/items/batch"): 5,
+    ("GET", "/api/v1/categories"): 1,
+    ("GET", "/api/v1/categories/tree"): 2,
+    ("POST", "/api/v1/categories/from-path"): 6,
+    ("GET", "/api/v1/locations"): 1,
+    ("GET", "/api/v1/locations/tree"): 2,
+    ("GET", "/api/v1/search/suggest"): 1,
+}
+
+
+async def _add_items(
+    async_session: AsyncSession,
+    user: User,
+    count: int,
+    category: Category | None = None,
+    location: Location | None = None,
+) -> list[Item]:
+    items = [
+        Item(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            name=f"Multimeter {uuid.uuid4().hex[:8]}",
+            quantity=1,
+            min_quantity=5,
+            category_id=category.id if category else None,
+            location_id=location.id if location else None,
+            attributes={"brand": "Fluke"},
+            tags=["electronics"],
+        )
+        for _ in range(count)
+    ]
+    async_session.add_all(items)
+    await async_session.commit()
+    return items
+
+
+async def _add_tree(async_session: AsyncSession, model, user: User, count: int):
+    """Add a parent node with count children to a category or location tree."""
+    parent_label = f"n{uuid.uuid4().hex[:8]}"
+    parent = model(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        name=parent_label,
+        path=Ltree(parent_label),
+    )
+    async_session.add(parent)
+    await async_session.flush()
+    for i in range(count):
+        async_session.add(
+            model(
+                id=uuid.uuid4(),
+                user_id=user.id,
+                name=f"{parent_label} child {i}",
+                parent_id=parent.id,
+                path=Ltree(f"{parent_label}.c{i}"),
+            )
+        )
+    await async_session.commit()
+
+
+class TestEndpointBudgets:
+    """Each main endpoint should stay within its statement budget."""
+
+    @pytest.mark.parametrize(
+        ("method", "route", "params", "body"),
+        [
+            ("GET", "/api/v1/items", {"limit": 50}, None),
+            ("GET", "/api/v1/items/search", {"q": "multimeter"}, None),
+            ("GET", "/api/v1/items/facets", None, None),
+            ("GET", "/api/v1/items/low-stock", None, None),
+            ("GET", "/api/v1/items/stats/dashboard", None, None),
+            ("GET", "/api/v1/items/stats/most-used", None, None),
+            ("GET", "/api/v1/items/stats/recently-used", None, None),
+            ("GET", "/api/v1/items/{item_id}", None, None),
+            ("POST", "/api/v1/items/{item_id}/check-out", None, {"quantity": 1}),
+            (
+                "POST",
+                "/api/v1/items/batch",
+                None,
+                {
+                    "items": [
+                        {
+                            "name": f"Resistor {i}",
+                            "category_id": "{category_id}",
+                            "location_id": "{location_id}",
+                        }
+                        for i in range(10)
+                    ]
+                },
+            ),
+            ("GET", "/api/v1/categories", None, None),
+            ("GET", "/api/v1/categories/tree", None, None),
+            (
+                "POST",
+                "/api/v1/categories/from-path",
+                None,
+                {"path": "Electronics > Meters > Clamp"},
+            ),
+            ("GET", "/api/v1/locations", None, None),
+            ("GET", "/api/v1/locations/tree", None, None),
+            ("GET", "/api/v1/search/suggest", {"q": "multi"}, None),
+        ],
+    )
+    async def test_endpoint_within_budget(
+        self,
+        authenticated_client: AsyncClient,
+        async_session: AsyncSession,
+        query_counter: QueryCounter,
+        test_user: User,
+        test_item: Item,
+        method: str,
+        route: str,
+        params: dict | None,
+        body: dict | None,
+    ):
+        """Endpoint should not exceed its statement budget."""
+        await _add_items(
+            async_session,
+            test_user,
+            20,
+            category=test_item.category,
+            location=test_item.location,
+        )
+        ids = {
+            "item_id": str(test_item.id),
+            "category_id": str(test_item.category_id),
+            "location_id": str(test_item.location_id),
+        }
+        if body and "items" in body:
+            body = {
+                "items": [
+                    {key: value.format(**ids) for key, value in entry.items()}
+                    for entry in body["items"]
+                ]
+            }
+
+        with query_counter.budget(BUDGETS[(method, route)], f"{method} {route}"):
+            response = await authenticated_client.request(
+                method, route.format(**ids), params=params, json=body
+            )
+
+        assert response.status_code < 400, response.text
+
+
+class TestNoNPlusOne:
+    """Statement counts should not grow with the number of rows involved."""
+
+    async def test_list_items(
+        self,
+        authenticated_client: AsyncClient,
+        async_session: AsyncSession,
+        query_counter: QueryCounter,
+        test_user: User,
+        test_item: Item,
+    ):
+        """Listing items should not query per item."""
+
+        async def request():
+            response = await authenticated_client.get(
+                "/api/v1/items", params={"limit": 100}
+            )
+            assert response.status_code == 200
+
+        await query_counter.assert_constant(
+            request,
+            lambda: _add_items(
+                async_session,
+                test_user,
+                25,
+                category=test_item.category,
+                location=test_item.location,
+            ),
+        )
+
+    async def test_search_items(
+        self,
+        authenticated_client: AsyncClient,
+        async_session: AsyncSession,
+        query_counter: QueryCounter,
+        test_user: User,
+        test_item: Item,  # noqa: ARG002
+    ):
+        """Searching should not query per match."""
+
+        async def request():
+            response = await authenticated_client.get(
+                "/api/v1/items/search", params={"q": "multimeter", "limit": 50}
+            )
+            assert response.status_code == 200
+
+        await query_counter.assert_constant(
+            request, lambda: _add_items(async_session, test_user, 25)
+        )
+
+    async def test_low_stock(
+        self,
+        authenticated_client: AsyncClient,
+        async_session: AsyncSession,
+        query_counter: QueryCounter,
+        test_user: User,
+    ):
+        """The low-stock list should not query per item."""
+        await _add_items(async_session, test_user, 1)
+
+        async def request():
+            response = await authenticated_client.get("/api/v1/items/low-stock")
+            assert response.status_code == 200
+
+        await query_counter.assert_constant(
+            request, lambda: _add_items(async_session, test_user, 25)
+        )
+
+    @pytest.mark.parametrize(
+        ("model", "route"),
+        [
+            (Category, "/api/v1/categories/tree"),
+            (Location, "/api/v1/locations/tree"),
+        ],
+    )
+    async def test_trees(
+        self,
+        authenticated_client: AsyncClient,
+        async_session: AsyncSession,
+        query_counter: QueryCounter,
+        test_user: User,
+        model,
+        route: str,
+    ):
+        """Building a tree should not query per node."""
+        await _add_tree(async_session, model, test_user, 2)
+
+        async def request():
+            response = await authenticated_client.get(route)
+            assert response.status_code == 200
+
+        await query_counter.assert_constant(
+            request, lambda: _add_tree(async_session, model, test_user, 15)
+        )
+
+    async def test_batch_create(
+        self,
+        authenticated_client: AsyncClient,
+        query_counter: QueryCounter,
+        test_category: Category,
+        test_location: Location,
+    ):
+        """Batch creation should check ownership once, not once per item."""
+        counts = []
+        for size in (2, 20):
+            items = [
+                {
+                    "name": f"Resistor {size}-{i}",
+                    "category_id": str(test_category.id),
+                    "location_id": str(test_location.id),
+                }
+                for i in range(size)
+            ]
+            with query_counter.capture() as statements:
+                response = await authenticated_client.post(
+                    "/api/v1/items/batch", json={"items": items}
+                )
+            assert response.json()["created_count"] == size
+            counts.append(len(statements))
+
+        assert counts[1] <= counts[0], counts
+
+    async def test_create_from_path_with_existing_segments(
+        self,
+        authenticated_client: AsyncClient,
+        query_counter: QueryCounter,
+        test_user: User,  # noqa: ARG002
+    ):
+        """Resolving existing segments should not query per segment."""
+        short = "Hardware > Fasteners"
+        long = "Hardware > Fasteners > Screws > Machine > Metric > M4"
+        for path in (short, long):
+            response = await authenticated_client.post(
+                "/api/v1/categories/from-path", json={"path": path}
+            )
+            assert response.status_code == 201
+
+        counts = []
+        for path in (short, long):
+            with query_counter.capture() as statements:
+                response = await authenticated_client.post(
+                    "/api/v1/categories/from-path", json={"path": path}
+                )
+            assert response.status_code == 201
+            counts.append(len(statements))
+
+        assert counts[1] <= counts[0], counts
+
+    async def test_image_lookup_by_ids(
+        self,
+        async_session: AsyncSession,
+        query_counter: QueryCounter,
+        test_user: User,
+    ):
+        """Fetching several images by id should be a single query."""
+        images = [
+            Image(
+                id=uuid.uuid4(),
+                user_id=test_user.id,
+                storage_path=f"test/{i}.jpg",
+                original_filename=f"{i}.jpg",
+                mime_type="image/jpeg",
+                size_bytes=1024,
+            )
+            for i in range(5)
+        ]
+        async_session.add_all(images)
+        await async_session.commit()
+        repo = ImageRepository(async_session, test_user.id)
+
+        with query_counter.budget(1, "get_by_ids"):
+            found = await repo.get_by_ids([image.id for image in images])
+
+        assert set(found) == {image.id for image in images}
@@ -119,6 +119,93 @@ class TestListItemsEndpoint:
         data = response.json()
         assert len(data["items"]) == 1
 
+    async def test_list_items_filter_by_attributes(
+        self, authenticated_client: AsyncClient, test_item: Item
+    ):
+        """Attribute filters should match JSONB attributes, all of them."""
+        response = await authenticated_client.get(
+            "/api/v1/items", params={"attr": ["brand:Fluke", "model:117"]}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 1
+        assert data["total"] == 1
+
+        response = await authenticated_client.get(
+            "/api/v1/items", params={"attr": ["brand:Fluke", "model:87"]}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["items"] == []
+
+    async def test_list_items_filter_by_tags(
+        self, authenticated_client: AsyncClient, test_item: Item
+    ):
+        """Tag filters should match items carrying all of the tags."""
+        response = await authenticated_client.get(
+            "/api/v1/items", params={"tags": ["tools", "electronics"]}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+
+        response = await authenticated_client.get(
+            "/api/v1/items", params={"tags": ["tools", "garden"]}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["items"] == []
+
+    async def test_list_items_serializes_related_entities(
+        self,
+        authenticated_client: AsyncClient,
+        async_session: AsyncSession,
+        test_user: User,
+        test_item: Item,
+        test_category: Category,
+        test_location: Location,
+    ):
+        """Items sharing a category and location should serialize them fully."""
+        async_session.add(
+            Item(
+                user_id=test_user.id,
+                name="Second Item",
+                quantity=3,
+                price=Decimal("4.50"),
+                tags=["spare"],
+                category_id=test_category.id,
+                location_id=test_location.id,
+            )
+        )
+        await async_session.commit()
+
+        response = await authenticated_client.get("/api/v1/items")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        items = response.json()["items"]
+        assert len(items) == 2
+        assert items[0]["category"] == items[1]["category"]
+        assert items[0]["category"]["id"] == str(test_category.id)
+        assert items[0]["category"]["path"] == str(test_category.path)
+        assert items[0]["location"]["name"] == test_location.name
+        second = next(i for i in items if i["name"] == "Second Item")
+        assert second["price"] == "4.50"
+        assert second["tags"] == ["spare"]
+        assert second["is_low_stock"] is False
+
+    async def test_list_items_response_schema_documented(
+        self, unauthenticated_client: AsyncClient
+    ):
+        """The OpenAPI schema should still describe the list response."""
+        response = await unauthenticated_client.get("/openapi.json")
+
+        content = response.json()["paths"]["/api/v1/items"]["get"]["responses"]["200"][
+            "content"
+        ]
+        assert "ItemListResponse" in content["application/json"]["schema"]["$ref"]
+
     async def test_list_items_unauthenticated(
         self, unauthenticated_client: AsyncClient
     ):
@@ -449,6 +536,94 @@ class TestFullTextSearchEndpoint:
         assert data["total"] >= 1
         assert any(item["name"] == filament_item.name for item in data["items"])
 
+    @pytest.fixture
+    async def ranked_items(
+        self, async_session: AsyncSession, test_user: User
+    ) -> dict[str, Item]:
+        """Items matching "bolt" in the name, the description or only a tag."""
+        items = {
+            "tag": Item(
+                user_id=test_user.id,
+                name="Assorted hardware box",
+                description="Mixed screws and washers",
+                tags=["bolt"],
+            ),
+            "description": Item(
+                user_id=test_user.id,
+                name="Hex nut M4",
+                description="Fits any M4 bolt <zinc & steel>",
+            ),
+            "name": Item(
+                user_id=test_user.id,
+                name="Hex bolt M4",
+                description="Zinc plated steel",
+            ),
+        }
+        async_session.add_all(items.values())
+        await async_session.commit()
+        return items
+
+    async def test_search_ranks_by_relevance(
+        self, authenticated_client: AsyncClient, ranked_items: dict[str, Item]
+    ):
+        """Name matches come before description matches, tag-only matches last."""
+        search = await authenticated_client.get(
+            "/api/v1/items/search", params={"q": "bolt"}
+        )
+        listing = await authenticated_client.get(
+            "/api/v1/items", params={"search": "bolt"}
+        )
+
+        expected = [
+            ranked_items[field].name for field in ("name", "description", "tag")
+        ]
+        assert [item["name"] for item in search.json()] == expected
+        assert [item["name"] for item in listing.json()["items"]] == expected
+
+    @pytest.mark.parametrize(
+        ("q", "expected"),
+        [
+            ('"hex bolt"', ["name"]),
+            ("washers or nut", ["description", "tag"]),
+            ("bolt -nut", ["name", "tag"]),
+            ('"unbalanced quote', []),
+        ],
+    )
+    async def test_search_web_syntax(
+        self,
+        authenticated_client: AsyncClient,
+        ranked_items: dict[str, Item],
+        q: str,
+        expected: list[str],
+    ):
+        """Phrases, OR and negation work, and malformed input does not fail."""
+        response = await authenticated_client.get(
+            "/api/v1/items/search", params={"q": q}
+        )
+
+        assert response.status_code == 200
+        names = {item["name"] for item in response.json()}
+        assert names == {ranked_items[field].name for field in expected}
+
+    async def test_search_highlight(
+        self, authenticated_client: AsyncClient, ranked_items: dict[str, Item]
+    ):
+        """Headlines mark the matched words and escape the item text."""
+        plain = await authenticated_client.get(
+            "/api/v1/items/search", params={"q": "bolt"}
+        )
+        highlighted = await authenticated_client.get(
+            "/api/v1/items/search", params={"q": "bolt", "highlight": "true"}
+        )
+
+        assert all(item["headline"] is None for item in plain.json())
+        headlines = {item["name"]: item["headline"] for item in highlighted.json()}
+        assert "<mark>bolt</mark>" in headlines[ranked_items["name"].name]
+        description_headline = headlines[ranked_items["description"].name]
+        assert "<mark>bolt</mark>" in description_headline
+        assert "&lt;zinc &amp; steel" in description_headline
+        assert "<zinc" not in description_headline
+
 
 class TestLowStockEndpoint:
     """Tests for GET /api/v1/items/low-stock."""
@@ -473,6 +648,19 @@ class TestFacetsEndpoint:
         assert "facets" in data
         assert "total_items" in data
 
+    async def test_get_facets_counts_attribute_values(
+        self, authenticated_client: AsyncClient, test_item: Item
+    ):
+        """Facets should list each attribute's values with item counts."""
+        response = await authenticated_client.get("/api/v1/items/facets")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_items"] == 1
+        facets = {facet["name"]: facet["values"] for facet in data["facets"]}
+        assert facets["brand"] == [{"value": "Fluke", "count": 1}]
+        assert facets["model"] == [{"value": "117", "count": 1}]
+
 
 class TestTagsEndpoint:
     """Tests for GET /api/v1/items/tags."""
@@ -485,6 +673,29 @@ class TestTagsEndpoint:
         data = response.json()
         assert isinstance(data, list)
 
+    async def test_get_tags_most_used_first(
+        self,
+        authenticated_client: AsyncClient,
+        async_session: AsyncSession,
+        test_user: User,
+        test_item: Item,
+    ):
+        """Tags are counted per item and ordered by count, then name."""
+        async_session.add_all(
+            Item(user_id=test_user.id, name=f"Bit {i}", tags=["tools", "bits"])
+            for i in range(2)
+        )
+        await async_session.commit()
+
+        response = await authenticated_client.get("/api/v1/items/tags")
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"value": "tools", "count": 3},
+            {"value": "bits", "count": 2},
+            {"value": "electronics", "count": 1},
+        ]
+
 
 class TestDashboardStatsEndpoint:
     """Tests for GET /api/v1/items/stats/dashboard."""
@@ -1456,6 +1667,35 @@ class TestBatchCreateItemsEndpoint:
         assert data["results"][0]["name"] == "Test Item"
         assert data["results"][0]["item_id"] is not None
 
+    async def test_batch_create_isolates_failing_row(
+        self, authenticated_client: AsyncClient
+    ):
+        """Test that a row the database rejects fails alone."""
+        response = await authenticated_client.post(
+            "/api/v1/items/batch",
+            json={
+                "items": [
+                    {"name": "Item 1"},
+                    # Prices are NUMERIC(10, 2) in the database
+                    {"name": "Item 2", "price": "1000000000"},
+                    {"name": "Item 3"},
+                ]
+            },
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created_count"] == 2
+        assert [r["success"] for r in data["results"]] == [True, False, True]
+        assert data["results"][1]["item_id"] is None
+        assert "numeric field overflow" in data["results"][1]["error"]
+
+        listed = await authenticated_client.get("/api/v1/items")
+        assert sorted(i["name"] for i in listed.json()["items"]) == [
+            "Item 1",
+            "Item 3",
+        ]
+
     async def test_batch_create_multiple_items(
         self,
         authenticated_client: AsyncClient,
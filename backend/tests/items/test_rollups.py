@@ -0,0 +1,565 @@
+"""Tests for the trigger-maintained dashboard rollups."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from httpx import AsyncClient
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy_utils import Ltree
+
+from src.categories.models import Category
+from src.items.models import (
+    Item,
+    ItemCheckInOut,
+    ItemDailyActivity,
+    ItemSpecificationKey,
+    ItemTag,
+    ItemUsageStats,
+    UserItemStats,
+)
+from src.items.rollups import rebuild_rollups
+from src.locations.models import Location
+from src.users.models import User
+
+
+async def _stats(session: AsyncSession, user_id: uuid.UUID):
+    return (
+        await session.execute(
+            select(
+                UserItemStats.total_items,
+                UserItemStats.total_quantity,
+                UserItemStats.category_counts,
+                UserItemStats.location_counts,
+            ).where(UserItemStats.user_id == user_id)
+        )
+    ).first()
+
+
+async def _created_per_day(session: AsyncSession, user_id: uuid.UUID) -> dict:
+    result = await session.execute(
+        select(ItemDailyActivity.day, ItemDailyActivity.items_created).where(
+            ItemDailyActivity.user_id == user_id
+        )
+    )
+    return dict(result.tuples().all())
+
+
+async def _usage(session: AsyncSession, item_id: uuid.UUID):
+    return (
+        await session.execute(
+            select(
+                ItemUsageStats.check_out_count,
+                ItemUsageStats.last_used_at,
+                ItemUsageStats.last_action_type,
+            ).where(ItemUsageStats.item_id == item_id)
+        )
+    ).first()
+
+
+async def _tags(session: AsyncSession, user_id: uuid.UUID) -> dict[str, int]:
+    result = await session.execute(
+        select(ItemTag.tag, ItemTag.item_count).where(ItemTag.user_id == user_id)
+    )
+    return dict(result.tuples().all())
+
+
+async def _spec_keys(session: AsyncSession, user_id: uuid.UUID) -> dict[str, int]:
+    result = await session.execute(
+        select(ItemSpecificationKey.key, ItemSpecificationKey.item_count).where(
+            ItemSpecificationKey.user_id == user_id
+        )
+    )
+    return dict(result.tuples().all())
+
+
+def _specs(*keys: str) -> dict:
+    return {"specifications": [{"key": key, "value": "x"} for key in keys]}
+
+
+def _items(user: User, count: int, **fields) -> list[Item]:
+    return [
+        Item(id=uuid.uuid4(), user_id=user.id, name=f"Item {i}", **fields)
+        for i in range(count)
+    ]
+
+
+class TestItemRollupTriggers:
+    """Tests for user_item_stats and item_daily_activity maintenance."""
+
+    async def test_insert_counts_items_and_groups(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """A new item is counted in totals, its groups and its creation day."""
+        stats = await _stats(async_session, test_item.user_id)
+
+        assert stats.total_items == 1
+        assert stats.total_quantity == test_item.quantity
+        assert stats.category_counts == {str(test_item.category_id): 1}
+        assert stats.location_counts == {str(test_item.location_id): 1}
+        today = datetime.now(UTC).date()
+        assert await _created_per_day(async_session, test_item.user_id) == {today: 1}
+
+    async def test_bulk_update_moves_items_between_groups(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        test_category: Category,
+    ):
+        """A multi-row UPDATE moves every row's counts to its new group."""
+        async_session.add_all(_items(test_user, 5, quantity=2))
+        await async_session.commit()
+
+        await async_session.execute(
+            update(Item)
+            .where(Item.user_id == test_user.id)
+            .values(category_id=test_category.id, quantity=3)
+        )
+        await async_session.commit()
+
+        stats = await _stats(async_session, test_user.id)
+        assert stats.total_items == 5
+        assert stats.total_quantity == 15
+        assert stats.category_counts == {str(test_category.id): 5}
+        assert stats.location_counts == {"": 5}
+
+    async def test_renaming_an_item_leaves_rollups_alone(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """Updates that do not touch rolled-up columns change nothing."""
+        before = await _stats(async_session, test_item.user_id)
+
+        test_item.name = "Renamed"
+        await async_session.commit()
+
+        assert await _stats(async_session, test_item.user_id) == before
+
+    async def test_deleting_category_moves_items_to_none(
+        self,
+        async_session: AsyncSession,
+        test_item: Item,
+        test_category: Category,
+    ):
+        """ON DELETE SET NULL on the category is tracked like any update."""
+        await async_session.execute(
+            delete(Category).where(Category.id == test_category.id)
+        )
+        await async_session.commit()
+
+        stats = await _stats(async_session, test_item.user_id)
+        assert stats.category_counts == {"": 1}
+
+    async def test_deleting_items_drops_empty_groups(
+        self,
+        async_session: AsyncSession,
+        test_item: Item,
+        test_user: User,
+    ):
+        """Deleted items are subtracted and groups left empty are removed."""
+        async_session.add_all(_items(test_user, 2))
+        await async_session.commit()
+
+        await async_session.delete(test_item)
+        await async_session.commit()
+
+        stats = await _stats(async_session, test_user.id)
+        assert stats.total_items == 2
+        assert stats.category_counts == {"": 2}
+        assert stats.location_counts == {"": 2}
+        today = datetime.now(UTC).date()
+        assert await _created_per_day(async_session, test_user.id) == {today: 2}
+
+    async def test_deleting_user_removes_rollups(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """A cascading user delete neither fails nor leaves rollup rows."""
+        user_id = test_item.user_id
+
+        await async_session.execute(delete(User).where(User.id == user_id))
+        await async_session.commit()
+
+        assert await _stats(async_session, user_id) is None
+        assert await _created_per_day(async_session, user_id) == {}
+
+
+class TestUsageRollupTrigger:
+    """Tests for item_usage_stats maintenance."""
+
+    async def test_counts_check_outs_and_tracks_latest_action(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """Check-outs are counted and the latest record sets last used."""
+        now = datetime.now(UTC)
+        async_session.add_all(
+            ItemCheckInOut(
+                user_id=test_item.user_id,
+                item_id=test_item.id,
+                action_type=action,
+                occurred_at=now - timedelta(hours=hours_ago),
+            )
+            for action, hours_ago in [
+                ("check_out", 3),
+                ("check_in", 2),
+                ("check_out", 1),
+            ]
+        )
+        await async_session.commit()
+
+        usage = await _usage(async_session, test_item.id)
+        assert usage.check_out_count == 2
+        assert usage.last_used_at == now - timedelta(hours=1)
+        assert usage.last_action_type == "check_out"
+
+    async def test_backdated_record_keeps_latest_action(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """A record older than the latest one does not change last used."""
+        now = datetime.now(UTC)
+        for action, occurred_at in [
+            ("check_in", now),
+            ("check_out", now - timedelta(days=1)),
+        ]:
+            async_session.add(
+                ItemCheckInOut(
+                    user_id=test_item.user_id,
+                    item_id=test_item.id,
+                    action_type=action,
+                    occurred_at=occurred_at,
+                )
+            )
+            await async_session.commit()
+
+        usage = await _usage(async_session, test_item.id)
+        assert usage.check_out_count == 1
+        assert usage.last_used_at == now
+        assert usage.last_action_type == "check_in"
+
+
+class TestItemTagsTrigger:
+    """Tests for item_tags maintenance."""
+
+    async def test_insert_counts_each_tag_once_per_item(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """Every item carrying a tag is counted once, repeats included."""
+        async_session.add_all(
+            [
+                *_items(test_user, 2, tags=["m3", "bolt"]),
+                *_items(test_user, 1, tags=["bolt", "bolt"]),
+                *_items(test_user, 1),
+            ]
+        )
+        await async_session.commit()
+
+        assert await _tags(async_session, test_user.id) == {"m3": 2, "bolt": 3}
+
+    async def test_retagging_moves_counts_and_drops_unused_tags(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """Changed tags are recounted and tags no item carries disappear."""
+        items = _items(test_user, 3, tags=["spare"])
+        async_session.add_all(items)
+        await async_session.commit()
+
+        await async_session.execute(
+            update(Item)
+            .where(Item.id.in_([items[0].id, items[1].id]))
+            .values(tags=["spare", "broken"])
+        )
+        await async_session.execute(
+            update(Item).where(Item.id == items[2].id).values(tags=[])
+        )
+        await async_session.commit()
+
+        assert await _tags(async_session, test_user.id) == {"spare": 2, "broken": 2}
+
+        await async_session.execute(delete(Item).where(Item.user_id == test_user.id))
+        await async_session.commit()
+
+        assert await _tags(async_session, test_user.id) == {}
+
+    async def test_updates_leaving_tags_alone_change_nothing(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """Quantity changes do not touch the tag counts."""
+        await async_session.execute(
+            update(ItemTag).values(item_count=ItemTag.item_count + 10)
+        )
+        await async_session.commit()
+
+        test_item.quantity += 1
+        await async_session.commit()
+
+        assert await _tags(async_session, test_item.user_id) == {
+            "electronics": 11,
+            "tools": 11,
+        }
+
+    async def test_rebuild_recounts_tags(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """Rebuilding the rollups recounts item_tags from the items."""
+        await async_session.execute(delete(ItemTag))
+        async_session.add(ItemTag(user_id=test_item.user_id, tag="stale", item_count=4))
+        await async_session.commit()
+
+        await rebuild_rollups(async_session, test_item.user_id)
+
+        assert await _tags(async_session, test_item.user_id) == {
+            "electronics": 1,
+            "tools": 1,
+        }
+
+
+class TestItemSpecificationKeysTrigger:
+    """Tests for item_specification_keys maintenance."""
+
+    async def test_insert_counts_keys_of_both_formats(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """Array and legacy object specifications count once per item."""
+        async_session.add_all(
+            [
+                *_items(test_user, 2, attributes=_specs("thread", "length")),
+                *_items(test_user, 1, attributes=_specs("thread", "thread")),
+                *_items(test_user, 1, attributes={"specifications": {"length": 5}}),
+                *_items(test_user, 1, attributes={"brand": "Würth"}),
+            ]
+        )
+        await async_session.commit()
+
+        assert await _spec_keys(async_session, test_user.id) == {
+            "thread": 3,
+            "length": 3,
+        }
+
+    async def test_only_specification_changes_are_counted(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """Changed specifications are recounted; other attributes are ignored."""
+        items = _items(test_user, 2, attributes=_specs("voltage"))
+        async_session.add_all(items)
+        await async_session.commit()
+        await async_session.execute(
+            update(ItemSpecificationKey).values(
+                item_count=ItemSpecificationKey.item_count + 10
+            )
+        )
+        await async_session.commit()
+
+        await async_session.execute(
+            update(Item)
+            .where(Item.id == items[0].id)
+            .values(attributes={**_specs("voltage"), "brand": "Mean Well"})
+        )
+        await async_session.commit()
+
+        assert await _spec_keys(async_session, test_user.id) == {"voltage": 12}
+
+        await async_session.execute(
+            update(Item)
+            .where(Item.id == items[1].id)
+            .values(attributes=_specs("power"))
+        )
+        await async_session.commit()
+
+        assert await _spec_keys(async_session, test_user.id) == {
+            "voltage": 11,
+            "power": 1,
+        }
+
+    async def test_deleting_items_drops_unused_keys(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """Keys no item has any more are removed."""
+        async_session.add_all(_items(test_user, 2, attributes=_specs("color")))
+        await async_session.commit()
+
+        await async_session.execute(delete(Item).where(Item.user_id == test_user.id))
+        await async_session.commit()
+
+        assert await _spec_keys(async_session, test_user.id) == {}
+
+    async def test_rebuild_recounts_keys(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """Rebuilding the rollups recounts item_specification_keys."""
+        async_session.add_all(_items(test_user, 2, attributes=_specs("color")))
+        await async_session.commit()
+        await async_session.execute(delete(ItemSpecificationKey))
+        async_session.add(
+            ItemSpecificationKey(user_id=test_user.id, key="stale", item_count=4)
+        )
+        await async_session.commit()
+
+        await rebuild_rollups(async_session, test_user.id)
+
+        assert await _spec_keys(async_session, test_user.id) == {"color": 2}
+
+
+class TestRebuildRollups:
+    """Tests for rebuilding drifted rollups."""
+
+    async def test_rebuild_repairs_drift(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """Rebuilding recomputes every rollup from the source tables."""
+        async_session.add(
+            ItemCheckInOut(
+                user_id=test_item.user_id,
+                item_id=test_item.id,
+                action_type="check_out",
+            )
+        )
+        await async_session.commit()
+        expected_stats = await _stats(async_session, test_item.user_id)
+        expected_days = await _created_per_day(async_session, test_item.user_id)
+        expected_usage = await _usage(async_session, test_item.id)
+
+        await async_session.execute(
+            update(UserItemStats).values(total_items=99, category_counts={})
+        )
+        await async_session.execute(delete(ItemDailyActivity))
+        await async_session.execute(update(ItemUsageStats).values(check_out_count=7))
+        await async_session.commit()
+
+        await rebuild_rollups(async_session)
+
+        assert await _stats(async_session, test_item.user_id) == expected_stats
+        assert await _created_per_day(async_session, test_item.user_id) == (
+            expected_days
+        )
+        assert await _usage(async_session, test_item.id) == expected_usage
+
+    async def test_rebuild_single_user(
+        self,
+        async_session: AsyncSession,
+        test_item: Item,
+        test_user: User,
+    ):
+        """A per-user rebuild leaves other users' rollups untouched."""
+        other = User(
+            id=uuid.uuid4(),
+            email="other@example.com",
+            name="Other",
+            oauth_provider="google",
+            oauth_id="google_other",
+        )
+        async_session.add(other)
+        await async_session.flush()
+        async_session.add_all(_items(other, 1))
+        await async_session.commit()
+        await async_session.execute(update(UserItemStats).values(total_items=99))
+        await async_session.commit()
+
+        await rebuild_rollups(async_session, test_user.id)
+
+        assert (await _stats(async_session, test_user.id)).total_items == 1
+        assert (await _stats(async_session, other.id)).total_items == 99
+
+
+class TestDashboardFromRollups:
+    """Tests for the dashboard endpoints reading the rollups."""
+
+    async def test_dashboard_stats(
+        self,
+        authenticated_client: AsyncClient,
+        async_session: AsyncSession,
+        test_user: User,
+        test_item: Item,
+    ):
+        """Totals, distributions and the time series come from the rollups."""
+        tools = Category(
+            id=uuid.uuid4(), user_id=test_user.id, name="Tools", path=Ltree("tools")
+        )
+        shelf = Location(
+            id=uuid.uuid4(), user_id=test_user.id, name="Shelf", path=Ltree("shelf")
+        )
+        async_session.add_all([tools, shelf])
+        await async_session.flush()
+        async_session.add_all(
+            [
+                *_items(test_user, 2, category_id=tools.id, quantity=2),
+                *_items(test_user, 1, category_id=tools.id, location_id=shelf.id),
+                *_items(test_user, 1),
+            ]
+        )
+        await async_session.commit()
+
+        response = await authenticated_client.get("/api/v1/items/stats/dashboard")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_items"] == 5
+        assert data["total_quantity"] == test_item.quantity + 2 * 2 + 1 + 1
+        assert data["categories_used"] == 2
+        assert data["locations_used"] == 2
+        assert data["items_by_category"][0] == {"name": "Tools", "count": 3}
+        assert sorted(data["items_by_category"][1:], key=lambda g: g["name"]) == [
+            {"name": "Electronics", "count": 1},
+            {"name": "Uncategorized", "count": 1},
+        ]
+        assert data["items_by_location"][0] == {"name": "No Location", "count": 3}
+        assert sorted(data["items_by_location"][1:], key=lambda g: g["name"]) == [
+            {"name": "Shelf", "count": 1},
+            {"name": "Workshop", "count": 1},
+        ]
+        assert len(data["items_over_time"]) == 31
+        assert data["items_over_time"][-1]["count"] == 5
+
+    async def test_dashboard_stats_without_items(
+        self, authenticated_client: AsyncClient, test_user: User
+    ):
+        """A user with no items gets zeros rather than an error."""
+        response = await authenticated_client.get(
+            "/api/v1/items/stats/dashboard", params={"days": 7}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_items"] == 0
+        assert data["items_by_category"] == []
+        assert [point["count"] for point in data["items_over_time"]] == [0] * 8
+
+    async def test_most_and_recently_used(
+        self,
+        authenticated_client: AsyncClient,
+        async_session: AsyncSession,
+        test_user: User,
+    ):
+        """Usage lists are ordered by check-outs and by latest activity."""
+        busy, quiet, unused = _items(test_user, 3)
+        async_session.add_all([busy, quiet, unused])
+        await async_session.flush()
+        now = datetime.now(UTC)
+        async_session.add_all(
+            ItemCheckInOut(
+                user_id=test_user.id,
+                item_id=item.id,
+                action_type=action,
+                occurred_at=now - timedelta(minutes=minutes_ago),
+            )
+            for item, action, minutes_ago in [
+                (busy, "check_out", 30),
+                (busy, "check_out", 20),
+                (quiet, "check_out", 15),
+                (quiet, "check_in", 10),
+            ]
+        )
+        await async_session.commit()
+
+        most_used = (
+            await authenticated_client.get("/api/v1/items/stats/most-used")
+        ).json()
+        recent = (
+            await authenticated_client.get("/api/v1/items/stats/recently-used")
+        ).json()
+
+        assert [(i["id"], i["total_check_outs"]) for i in most_used] == [
+            (str(busy.id), 2),
+            (str(quiet.id), 1),
+        ]
+        assert [(i["id"], i["action_type"]) for i in recent] == [
+            (str(quiet.id), "check_in"),
+            (str(busy.id), "check_out"),
+        ]
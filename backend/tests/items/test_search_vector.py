@@ -0,0 +1,99 @@
+"""Tests for the trigger-maintained item search vector."""
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.items.models import Item
+from src.users.models import User
+
+# Not a lexeme any item produces; survives only if the trigger skips the row
+SENTINEL = "'untouched':1"
+
+
+async def _lexemes(session: AsyncSession, item: Item) -> set[str]:
+    result = await session.execute(
+        select(func.unnest(func.tsvector_to_array(Item.search_vector))).where(
+            Item.id == item.id
+        )
+    )
+    return set(result.scalars())
+
+
+async def _mark(session: AsyncSession, item: Item) -> None:
+    """Overwrite the stored vector; the trigger does not fire for this column."""
+    await session.execute(
+        text("UPDATE items SET search_vector = CAST(:v AS tsvector) WHERE id = :id"),
+        {"v": SENTINEL, "id": item.id},
+    )
+    await session.commit()
+
+
+class TestSearchVectorTrigger:
+    """Tests for when and from what the search vector is computed."""
+
+    async def test_indexes_attribute_values_not_keys(
+        self, async_session: AsyncSession, test_user: User
+    ):
+        """Specification and attribute values are searchable; JSON keys are not."""
+        item = Item(
+            user_id=test_user.id,
+            name="Hex bolt",
+            tags=["fastener"],
+            attributes={
+                "brand": "Würth",
+                "specifications": [
+                    {"key": "thread", "value": "M4"},
+                    {"key": "length_mm", "value": 20},
+                ],
+            },
+        )
+        async_session.add(item)
+        await async_session.commit()
+
+        lexemes = await _lexemes(async_session, item)
+
+        assert {"hex", "bolt", "fasten", "würth", "thread", "m4", "20"} <= lexemes
+        assert not {"brand", "specif", "key", "valu"} & lexemes
+
+    async def test_updates_leaving_text_alone_skip_recomputation(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """Quantity changes and rewrites with equal values keep the stored vector."""
+        await _mark(async_session, test_item)
+
+        await async_session.execute(
+            update(Item).where(Item.id == test_item.id).values(quantity=42)
+        )
+        await async_session.execute(
+            update(Item)
+            .where(Item.id == test_item.id)
+            .values(
+                name=Item.name,
+                description=Item.description,
+                tags=Item.tags,
+                attributes=Item.attributes,
+            )
+        )
+        await async_session.commit()
+
+        assert await _lexemes(async_session, test_item) == {"untouched"}
+
+    async def test_text_changes_recompute(
+        self, async_session: AsyncSession, test_item: Item
+    ):
+        """Changing the name, tags or attributes rebuilds the vector."""
+        for values in (
+            {"name": "Bench power supply"},
+            {"tags": ["psu"]},
+            {"attributes": {"voltage": "30V"}},
+        ):
+            await _mark(async_session, test_item)
+
+            await async_session.execute(
+                update(Item).where(Item.id == test_item.id).values(**values)
+            )
+            await async_session.commit()
+
+            lexemes = await _lexemes(async_session, test_item)
+            assert "untouched" not in lexemes
+            assert {"bench", "power", "suppli"} <= lexemes
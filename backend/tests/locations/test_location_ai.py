@@ -5,8 +5,10 @@ features work correctly.
 """
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.items.models import Item
 from src.locations.schemas import (
     LocationAnalysisResult,
     LocationBulkCreate,
@@ -151,6 +153,63 @@ class TestBulkLocationCreation:
         assert str(children[0].path) == "garage.workbench.drawer_1"
 
 
+class TestLocationsWithSampleItems:
+    """Tests for building location context for AI location suggestions."""
+
+    async def test_returns_counts_samples_and_paths_in_one_query(
+        self,
+        location_service: LocationService,
+        async_session: AsyncSession,
+        async_engine,
+        test_user: User,
+    ):
+        """Test that query count does not scale with the number of locations."""
+        garage = await location_service.create(
+            LocationCreate(name="Garage", location_type="room")
+        )
+        parent, bins = await location_service.create_bulk(
+            LocationBulkCreate(
+                parent=LocationCreate(name="Red Toolbox", parent_id=garage.id),
+                children=[LocationCreate(name=f"Bin {i}") for i in range(10)],
+            )
+        )
+        for location in bins[:3]:
+            for n in range(7):
+                async_session.add(
+                    Item(
+                        user_id=test_user.id,
+                        name=f"{location.name} item {n}",
+                        location_id=location.id,
+                    )
+                )
+        await async_session.commit()
+
+        statements: list[str] = []
+
+        def count_statement(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+        try:
+            locations = await location_service.get_locations_with_sample_items()
+        finally:
+            event.remove(
+                async_engine.sync_engine, "before_cursor_execute", count_statement
+            )
+
+        assert len(statements) == 1
+        assert len(locations) == 12
+
+        by_name = {location["name"]: location for location in locations}
+        assert by_name["Garage"]["path_display"] == "Garage"
+        assert by_name["Bin 0"]["path_display"] == "Garage > Red Toolbox > Bin 0"
+        assert by_name["Bin 0"]["item_count"] == 7
+        assert by_name["Bin 0"]["sample_items"] == [f"Bin 0 item {n}" for n in range(5)]
+        assert by_name["Bin 9"]["item_count"] == 0
+        assert by_name["Bin 9"]["sample_items"] == []
+        assert by_name[parent.name]["type"] == "unknown"
+
+
 class TestLocationAnalysisSchemas:
     """Tests for location analysis schemas."""
 
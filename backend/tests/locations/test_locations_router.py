@@ -7,6 +7,7 @@ from httpx import AsyncClient
 
 from src.auth.service import AuthService
 from src.config import Settings
+from src.items.models import Item
 from src.locations.models import Location
 from src.users.models import User
 
@@ -64,6 +65,32 @@ class TestGetLocationTreeEndpoint:
         assert len(data) == 1
         assert data[0]["name"] == test_location.name
 
+    async def test_get_location_tree_not_modified_until_item_moves(
+        self,
+        authenticated_client: AsyncClient,
+        test_location: Location,
+        test_item: Item,
+    ):
+        """The ETag answers 304 until an item moves out of the location."""
+        response = await authenticated_client.get("/api/v1/locations/tree")
+        etag = response.headers["etag"]
+        assert response.json()[0]["item_count"] == 1
+
+        response = await authenticated_client.get(
+            "/api/v1/locations/tree", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+        await authenticated_client.put(
+            f"/api/v1/items/{test_item.id}", json={"location_id": None}
+        )
+        response = await authenticated_client.get(
+            "/api/v1/locations/tree", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0]["item_count"] == 0
+
 
 class TestCreateLocationEndpoint:
     """Tests for POST /api/v1/locations."""
@@ -0,0 +1,255 @@
+"""Tests for low stock alert delivery."""
+
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import Settings
+from src.items.models import Item
+from src.notifications.alert_service import AlertService
+from src.notifications.digests import send_low_stock_digests
+from src.notifications.email_service import EmailService
+from src.notifications.models import AlertHistory, LowStockAlertQueue
+from src.users.models import User
+
+
+@pytest.fixture
+async def low_stock_items(
+    async_session: AsyncSession,
+    test_user: User,
+    test_category,
+    test_location,
+) -> list[Item]:
+    """Create three low stock items."""
+    items = [
+        Item(
+            id=uuid.uuid4(),
+            user_id=test_user.id,
+            name=f"Low Stock {i}",
+            quantity=1,
+            min_quantity=5,
+            category_id=test_category.id,
+            location_id=test_location.id,
+        )
+        for i in range(3)
+    ]
+    async_session.add_all(items)
+    await async_session.commit()
+    return items
+
+
+def _service(
+    session: AsyncSession, user: User, settings: Settings, send_result: bool = True
+) -> AlertService:
+    service = AlertService(session, user.id, settings)
+    service.email_service.send_email = AsyncMock(return_value=send_result)
+    return service
+
+
+async def _alert_statuses(session: AsyncSession) -> list[str]:
+    result = await session.execute(select(AlertHistory.status))
+    return sorted(result.scalars().all())
+
+
+class TestTriggerLowStockAlerts:
+    """Tests for AlertService.trigger_low_stock_alerts."""
+
+    async def test_one_email_per_item(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        test_settings: Settings,
+        low_stock_items: list[Item],
+    ):
+        """Without digest mode each item should get its own email."""
+        service = _service(async_session, test_user, test_settings)
+
+        response = await service.trigger_low_stock_alerts(test_user)
+
+        assert response.triggered_count == 3
+        assert service.email_service.send_email.await_count == 3
+        assert await _alert_statuses(async_session) == ["sent"] * 3
+
+    async def test_digest_sends_single_email(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        test_settings: Settings,
+        low_stock_items: list[Item],
+    ):
+        """In digest mode all items should be folded into one email."""
+        settings = test_settings.model_copy(update={"low_stock_alert_digest": True})
+        service = _service(async_session, test_user, settings)
+
+        response = await service.trigger_low_stock_alerts(test_user)
+
+        assert response.triggered_count == 3
+        send_email = service.email_service.send_email
+        assert send_email.await_count == 1
+        kwargs = send_email.await_args.kwargs
+        assert kwargs["subject"] == "Low Stock Alert: 3 items running low"
+        for item in low_stock_items:
+            assert item.name in kwargs["text_body"]
+            assert item.name in kwargs["html_body"]
+        # Each item is still recorded, so deduplication works per item
+        assert await _alert_statuses(async_session) == ["sent"] * 3
+
+    async def test_recently_alerted_items_skipped(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        test_settings: Settings,
+        low_stock_items: list[Item],
+    ):
+        """Items alerted in the last 24 hours should not be alerted again."""
+        service = _service(async_session, test_user, test_settings)
+        await service.trigger_low_stock_alerts(test_user, [low_stock_items[0].id])
+
+        response = await service.trigger_low_stock_alerts(test_user)
+
+        assert response.triggered_count == 2
+        assert response.skipped_count == 1
+        assert service.email_service.send_email.await_count == 3
+
+    async def test_failed_send_recorded(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        test_settings: Settings,
+        low_stock_items: list[Item],
+    ):
+        """A failed send should mark the items as failed."""
+        service = _service(async_session, test_user, test_settings, send_result=False)
+
+        response = await service.trigger_low_stock_alerts(test_user)
+
+        assert response.failed_count == 3
+        assert {s.status for s in response.items} == {"failed"}
+        assert await _alert_statuses(async_session) == ["failed"] * 3
+
+    async def test_alert_writes_are_batched(
+        self,
+        async_session: AsyncSession,
+        async_engine,
+        test_user: User,
+        test_settings: Settings,
+        low_stock_items: list[Item],
+    ):
+        """Dedupe and history writes should not scale with the item count."""
+        service = _service(async_session, test_user, test_settings)
+        await service.repository.get_or_create_preferences()
+        statements: list[str] = []
+
+        def record(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await service.trigger_low_stock_alerts(test_user)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+        history_statements = [s for s in statements if "alert_history" in s]
+        assert len(history_statements) == 3
+
+
+class TestLowStockDigests:
+    """Tests for queuing check-out alerts and sending them as digests."""
+
+    @pytest.fixture
+    def digest_settings(self, test_settings: Settings) -> Settings:
+        return test_settings.model_copy(update={"low_stock_alert_digest": True})
+
+    async def _check_out(
+        self, service: AlertService, user: User, items: list[Item]
+    ) -> BackgroundTasks:
+        background_tasks = BackgroundTasks()
+        for item in items:
+            await service.check_and_send_low_stock_alert(item, user, background_tasks)
+        return background_tasks
+
+    async def _queued(self, session: AsyncSession) -> int:
+        return await session.scalar(
+            select(func.count()).select_from(LowStockAlertQueue)
+        )
+
+    async def test_check_outs_queue_instead_of_sending(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        digest_settings: Settings,
+        low_stock_items: list[Item],
+    ):
+        """Check-outs in digest mode should queue each item once, sending nothing."""
+        service = _service(async_session, test_user, digest_settings)
+
+        background_tasks = await self._check_out(
+            service, test_user, [low_stock_items[0], low_stock_items[0]]
+        )
+
+        assert not background_tasks.tasks
+        assert await self._queued(async_session) == 1
+        service.email_service.send_email.assert_not_awaited()
+
+    async def test_digest_sends_queued_items_once(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        digest_settings: Settings,
+        low_stock_items: list[Item],
+    ):
+        """A digest covers only the queued items and empties the queue."""
+        service = _service(async_session, test_user, digest_settings)
+        await self._check_out(service, test_user, low_stock_items[:2])
+
+        assert await service.send_queued_low_stock_digest() == 2
+        assert await service.send_queued_low_stock_digest() == 0
+
+        send_email = service.email_service.send_email
+        assert send_email.await_count == 1
+        text_body = send_email.await_args.kwargs["text_body"]
+        assert low_stock_items[0].name in text_body
+        assert low_stock_items[2].name not in text_body
+        assert await _alert_statuses(async_session) == ["sent"] * 2
+        assert await self._queued(async_session) == 0
+
+    async def test_restocked_items_dropped(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        digest_settings: Settings,
+        low_stock_items: list[Item],
+    ):
+        """Items restocked before the digest is sent are left out."""
+        service = _service(async_session, test_user, digest_settings)
+        await self._check_out(service, test_user, low_stock_items[:2])
+        low_stock_items[0].quantity = 10
+        await async_session.commit()
+
+        assert await service.send_queued_low_stock_digest() == 1
+        assert await self._queued(async_session) == 0
+
+    async def test_job_sends_every_users_digest(
+        self,
+        async_engine,
+        async_session: AsyncSession,
+        test_user: User,
+        digest_settings: Settings,
+        low_stock_items: list[Item],
+        monkeypatch,
+    ):
+        """The scheduled job sends each queued user one digest."""
+        service = _service(async_session, test_user, digest_settings)
+        await self._check_out(service, test_user, low_stock_items)
+        send_email = AsyncMock(return_value=True)
+        monkeypatch.setattr(EmailService, "send_email", send_email)
+
+        session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+        assert await send_low_stock_digests(session_factory, digest_settings) == 3
+
+        assert send_email.await_count == 1
+        assert await self._queued(async_session) == 0
@@ -350,6 +350,77 @@ class TestAlertDeduplication:
         assert result is False
 
 
+class TestBatchedAlertHistory:
+    """Tests for batched alert history operations."""
+
+    async def test_get_recently_alerted_item_ids(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        test_item: Item,
+    ):
+        """Only items with a recent sent alert of the type should be returned."""
+        repo = NotificationRepository(async_session, test_user.id)
+        other_item_id = uuid.uuid4()
+        sent = await repo.create_alert_history(
+            item_id=test_item.id,
+            alert_type="low_stock",
+            channel="email",
+            recipient_email=test_user.email,
+            subject="Low Stock Alert",
+            item_quantity=2,
+            item_min_quantity=5,
+        )
+        await repo.update_alert_status(sent.id, "sent")
+
+        result = await repo.get_recently_alerted_item_ids(
+            [test_item.id, other_item_id], "low_stock"
+        )
+        assert result == {test_item.id}
+        assert (
+            await repo.get_recently_alerted_item_ids([test_item.id], "other") == set()
+        )
+        assert await repo.get_recently_alerted_item_ids([], "low_stock") == set()
+
+    async def test_create_and_update_alert_histories(
+        self,
+        async_session: AsyncSession,
+        test_user: User,
+        test_item: Item,
+    ):
+        """Records should be created and updated in bulk."""
+        repo = NotificationRepository(async_session, test_user.id)
+        alerts = await repo.create_alert_histories(
+            [
+                {
+                    "item_id": test_item.id,
+                    "alert_type": "low_stock",
+                    "channel": "email",
+                    "recipient_email": test_user.email,
+                    "subject": f"Alert {i}",
+                    "item_quantity": i,
+                    "item_min_quantity": 5,
+                }
+                for i in range(2)
+            ]
+        )
+
+        assert [a.subject for a in alerts] == ["Alert 0", "Alert 1"]
+        assert all(a.status == "pending" for a in alerts)
+
+        await repo.update_alert_statuses(
+            [(alerts[0], "sent", None), (alerts[1], "failed", "Email send failed")]
+        )
+        history, total = await repo.get_alert_history()
+        statuses = {a.subject: (a.status, a.error_message) for a in history}
+
+        assert total == 2
+        assert statuses == {
+            "Alert 0": ("sent", None),
+            "Alert 1": ("failed", "Email send failed"),
+        }
+
+
 class TestAlertHistoryQuery:
     """Tests for alert history querying."""
 
@@ -0,0 +1,116 @@
+"""Tests for the pooled SMTP sender."""
+
+import socket
+from email.message import EmailMessage
+from unittest.mock import patch
+
+import aiosmtplib
+import pytest
+from aiosmtpd.controller import Controller
+
+from src.notifications.smtp_pool import SMTPConnectionPool
+
+
+class RecordingHandler:
+    """SMTP handler that records sessions and received messages."""
+
+    def __init__(self):
+        self.ehlo_count = 0
+        self.messages: list[bytes] = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.ehlo_count += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope.content)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    """Run a local SMTP server for the duration of a test."""
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    try:
+        yield controller, handler
+    finally:
+        controller.stop()
+
+
+def _pool(controller: Controller, **kwargs) -> SMTPConnectionPool:
+    return SMTPConnectionPool(
+        hostname=controller.hostname, port=controller.port, **kwargs
+    )
+
+
+def _message(subject: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "alerts@example.com"
+    message["To"] = "user@example.com"
+    message["Subject"] = subject
+    message.set_content("Body")
+    return message
+
+
+class TestSMTPConnectionPool:
+    """Tests for SMTPConnectionPool."""
+
+    async def test_connection_reused_across_messages(self, smtp_server):
+        """Sequential sends should share one SMTP session."""
+        controller, handler = smtp_server
+        pool = _pool(controller)
+
+        for i in range(3):
+            await pool.send_message(_message(f"Alert {i}"))
+        await pool.close()
+
+        assert len(handler.messages) == 3
+        assert handler.ehlo_count == 1
+
+    async def test_reconnects_after_server_disconnect(self, smtp_server):
+        """A connection dropped by the server should be replaced transparently."""
+        controller, handler = smtp_server
+        pool = _pool(controller)
+        await pool.send_message(_message("First"))
+
+        # Simulate a connection dropped while idle that still looks open
+        client, _ = pool._idle[0]
+        client.close()
+        with patch.object(type(client), "is_connected", True):
+            await pool.send_message(_message("Second"))
+        await pool.close()
+
+        assert len(handler.messages) == 2
+        assert handler.ehlo_count == 2
+
+    async def test_idle_connection_not_reused_after_timeout(self, smtp_server):
+        """Connections idle past the timeout should be reopened."""
+        controller, handler = smtp_server
+        pool = _pool(controller, idle_timeout_seconds=60)
+
+        with patch("src.notifications.smtp_pool.time.monotonic", return_value=0.0):
+            await pool.send_message(_message("First"))
+        with patch("src.notifications.smtp_pool.time.monotonic", return_value=61.0):
+            await pool.send_message(_message("Second"))
+        await pool.close()
+
+        assert len(handler.messages) == 2
+        assert handler.ehlo_count == 2
+
+    async def test_failed_connection_not_returned_to_pool(self):
+        """A send that fails should not leave a connection behind."""
+        pool = SMTPConnectionPool(hostname="127.0.0.1", port=_free_port())
+
+        with pytest.raises(aiosmtplib.SMTPConnectError):
+            await pool.send_message(_message("Unreachable"))
+
+        assert pool._idle == []
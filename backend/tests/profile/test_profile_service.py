@@ -0,0 +1,151 @@
+"""Tests for the purge recommendation service."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import Settings
+from src.items.models import Item, ItemCheckInOut
+from src.profile.models import PurgeRecommendation, UserSystemProfile
+from src.profile.service import PurgeRecommendationService
+from src.users.models import User
+
+
+@pytest.fixture
+def purge_service(
+    async_session: AsyncSession, test_settings: Settings
+) -> PurgeRecommendationService:
+    """Create a purge recommendation service."""
+    return PurgeRecommendationService(async_session, test_settings)
+
+
+@pytest.fixture
+def count_statements(async_engine):
+    """Collect the SQL statements executed while the fixture is active."""
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+class TestItemsWithUsage:
+    """Tests for loading items with usage data."""
+
+    async def test_streams_items_in_one_query(
+        self,
+        purge_service: PurgeRecommendationService,
+        async_session: AsyncSession,
+        test_user: User,
+        test_item: Item,
+        count_statements: list[str],
+    ):
+        """Test that query count does not scale with the number of items."""
+        for n in range(24):
+            async_session.add(Item(user_id=test_user.id, name=f"Spare part {n}"))
+        last_checkout = datetime.now(UTC) - timedelta(days=30)
+        for days_ago in (90, 30):
+            async_session.add(
+                ItemCheckInOut(
+                    user_id=test_user.id,
+                    item_id=test_item.id,
+                    action_type="check_out",
+                    occurred_at=datetime.now(UTC) - timedelta(days=days_ago),
+                )
+            )
+        async_session.add(
+            ItemCheckInOut(
+                user_id=test_user.id,
+                item_id=test_item.id,
+                action_type="check_in",
+                occurred_at=datetime.now(UTC),
+            )
+        )
+        await async_session.commit()
+        count_statements.clear()
+
+        batches = [
+            batch
+            async for batch in purge_service._iter_items_with_usage(
+                test_user.id, UserSystemProfile(), limit=200, batch_size=10
+            )
+        ]
+
+        assert len(count_statements) == 1
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        items = {item["name"]: item for batch in batches for item in batch}
+        assert items["Multimeter"]["category_name"] == "Electronics"
+        assert items["Multimeter"]["location_name"] == "Workshop"
+        assert abs(items["Multimeter"]["last_used"] - last_checkout) < timedelta(
+            minutes=1
+        )
+        assert items["Multimeter"]["days_since_use"] == 30
+        assert items["Spare part 0"]["category_name"] is None
+        assert items["Spare part 0"]["last_used"] is None
+        assert items["Spare part 0"]["days_since_use"] is None
+
+    async def test_respects_limit(
+        self,
+        purge_service: PurgeRecommendationService,
+        async_session: AsyncSession,
+        test_user: User,
+    ):
+        """Test that only the most recently updated items are analyzed."""
+        for n in range(5):
+            async_session.add(Item(user_id=test_user.id, name=f"Item {n}"))
+        await async_session.commit()
+
+        batches = [
+            batch
+            async for batch in purge_service._iter_items_with_usage(
+                test_user.id, UserSystemProfile(), limit=3
+            )
+        ]
+
+        assert sum(len(batch) for batch in batches) == 3
+
+
+class TestRecommendationsWithItems:
+    """Tests for enriching recommendations with item details."""
+
+    async def test_enriches_in_one_query(
+        self,
+        purge_service: PurgeRecommendationService,
+        async_session: AsyncSession,
+        test_user: User,
+        test_item: Item,
+        count_statements: list[str],
+    ):
+        """Test that recommendations are enriched with a single query."""
+        recommendations = [
+            PurgeRecommendation(
+                id=uuid.uuid4(),
+                user_id=test_user.id,
+                item_id=item_id,
+                reason="Unused",
+                confidence=Decimal("0.8"),
+                factors={},
+                status="pending",
+                created_at=datetime.now(UTC),
+            )
+            for item_id in (test_item.id, uuid.uuid4())
+        ]
+        count_statements.clear()
+
+        result = await purge_service.get_recommendations_with_items(
+            test_user.id, recommendations
+        )
+
+        assert len(count_statements) == 1
+        assert len(result) == 1
+        assert result[0].item_name == "Multimeter"
+        assert result[0].item_category_name == "Electronics"
+        assert result[0].item_location_name == "Workshop"
+        assert result[0].last_used_at is None
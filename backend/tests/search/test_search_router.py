@@ -0,0 +1,195 @@
+"""HTTP integration tests for the search suggestions endpoint."""
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy_utils import Ltree
+
+from src.categories.models import Category
+from src.items.models import Item
+from src.locations.models import Location
+from src.search.cache import SuggestionCache, get_suggestion_cache
+from src.users.models import User
+from tests.conftest import QueryCounter
+
+
+@pytest.fixture(autouse=True)
+def clear_suggestion_cache():
+    """Start every test with an empty suggestion cache."""
+    get_suggestion_cache().clear()
+    yield
+    get_suggestion_cache().clear()
+
+
+@pytest.fixture
+async def inventory(async_session: AsyncSession, test_user: User) -> dict[str, object]:
+    """Items, a category and a location whose names start with "sold"."""
+    rows = {
+        "item": Item(user_id=test_user.id, name="Soldering iron"),
+        "tagged": Item(
+            user_id=test_user.id,
+            name="Helping hands",
+            description="Holds boards while soldering",
+        ),
+        "category": Category(
+            user_id=test_user.id, name="Solder and flux", path=Ltree("solder")
+        ),
+        "location": Location(
+            user_id=test_user.id, name="Soldering station", path=Ltree("station")
+        ),
+        "other": Item(user_id=test_user.id, name="Multimeter"),
+    }
+    async_session.add_all(rows.values())
+    await async_session.commit()
+    return rows
+
+
+class TestSuggest:
+    """Tests for GET /api/v1/search/suggest."""
+
+    async def test_matches_items_categories_and_locations(
+        self, authenticated_client: AsyncClient, inventory: dict[str, object]
+    ):
+        """Names starting with the input come first, shortest first."""
+        response = await authenticated_client.get(
+            "/api/v1/search/suggest", params={"q": "sold"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id": str(inventory[key].id), "name": inventory[key].name, "kind": kind}
+            for key, kind in [
+                ("item", "item"),
+                ("category", "category"),
+                ("location", "location"),
+                ("tagged", "item"),
+            ]
+        ]
+
+    async def test_matches_word_prefixes_and_substrings(
+        self, authenticated_client: AsyncClient, inventory: dict[str, object]
+    ):
+        """A later word of the name, or text inside a word, also matches."""
+        by_word = await authenticated_client.get(
+            "/api/v1/search/suggest", params={"q": "IRON"}
+        )
+        inside = await authenticated_client.get(
+            "/api/v1/search/suggest", params={"q": "meter"}
+        )
+
+        assert [s["name"] for s in by_word.json()] == ["Soldering iron"]
+        assert [s["name"] for s in inside.json()] == ["Multimeter"]
+
+    async def test_short_input_matches_word_prefixes_only(
+        self, authenticated_client: AsyncClient, inventory: dict[str, object]
+    ):
+        """One or two characters match the start of a word, not its middle."""
+        start = await authenticated_client.get(
+            "/api/v1/search/suggest", params={"q": "ir"}
+        )
+        inside = await authenticated_client.get(
+            "/api/v1/search/suggest", params={"q": "et"}
+        )
+
+        assert [s["name"] for s in start.json()] == ["Soldering iron"]
+        assert inside.json() == []
+
+    @pytest.mark.parametrize("q", ["%", "_", "(&|!)", "':*"])
+    async def test_special_characters_are_literal(
+        self, authenticated_client: AsyncClient, inventory: dict[str, object], q: str
+    ):
+        """LIKE wildcards and tsquery operators in the input match nothing."""
+        response = await authenticated_client.get(
+            "/api/v1/search/suggest", params={"q": q}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+    async def test_limit(
+        self, authenticated_client: AsyncClient, inventory: dict[str, object]
+    ):
+        """No more than limit suggestions are returned."""
+        response = await authenticated_client.get(
+            "/api/v1/search/suggest", params={"q": "sold", "limit": 2}
+        )
+
+        assert [s["kind"] for s in response.json()] == ["item", "category"]
+
+    async def test_only_own_inventory(
+        self,
+        authenticated_client: AsyncClient,
+        async_session: AsyncSession,
+        inventory: dict[str, object],
+    ):
+        """Other users' matching names are not suggested."""
+        other = User(
+            id=uuid.uuid4(),
+            email="other@example.com",
+            name="Other",
+            oauth_provider="google",
+            oauth_id="google_other",
+        )
+        async_session.add(other)
+        await async_session.flush()
+        async_session.add(Item(user_id=other.id, name="Solder wick"))
+        await async_session.commit()
+
+        response = await authenticated_client.get(
+            "/api/v1/search/suggest", params={"q": "solder w"}
+        )
+
+        assert response.json() == []
+
+    async def test_repeated_prefix_is_served_from_cache(
+        self,
+        authenticated_client: AsyncClient,
+        inventory: dict[str, object],
+        query_counter: QueryCounter,
+    ):
+        """The same prefix again, in any case or spacing, runs no query."""
+        first = await authenticated_client.get(
+            "/api/v1/search/suggest", params={"q": "sold"}
+        )
+        with query_counter.budget(0, "cached suggestions"):
+            again = await authenticated_client.get(
+                "/api/v1/search/suggest", params={"q": " SOLD "}
+            )
+
+        assert again.json() == first.json()
+
+    async def test_requires_authentication(self, unauthenticated_client: AsyncClient):
+        """Suggestions need a signed-in user."""
+        response = await unauthenticated_client.get(
+            "/api/v1/search/suggest", params={"q": "sold"}
+        )
+
+        assert response.status_code == 401
+
+
+class TestSuggestionCache:
+    """Tests for the suggestion cache."""
+
+    def test_entries_expire(self):
+        """Entries are dropped once their TTL has passed."""
+        cache = SuggestionCache(ttl_seconds=0)
+        key = cache.make_key(uuid.uuid4(), "sold", 8)
+        cache.set(key, b"[]")
+
+        assert cache.get(key) is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_are_evicted(self):
+        """The cache stays within its size bound."""
+        cache = SuggestionCache(max_entries=2)
+        owner = uuid.uuid4()
+        keys = [cache.make_key(owner, q, 8) for q in ("a", "b", "c")]
+        cache.set(keys[0], b"a")
+        cache.set(keys[1], b"b")
+        cache.get(keys[0])
+        cache.set(keys[2], b"c")
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == b"a"
@@ -0,0 +1,284 @@
+"""Tests for read replica routing and the RLS tenant context."""
+
+import uuid
+from collections.abc import AsyncGenerator
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy_utils import Ltree
+from starlette.requests import Request
+from testcontainers.postgres import PostgresContainer
+
+import src.database as database
+from src.config import get_settings
+from src.database import (
+    Base,
+    ReplicaPins,
+    create_session_factory,
+    get_session,
+    set_session_user,
+    set_tenant_context,
+    use_replica,
+)
+from src.items.models import Item
+from src.locations.models import Location
+from src.notifications.alert_service import AlertService
+from src.notifications.models import AlertHistory
+from src.webhooks.executor import WebhookExecutor
+from src.webhooks.models import WebhookConfig
+from src.webhooks.service import WebhookService
+
+
+@pytest.fixture(scope="module")
+def replica_container():
+    """A second PostgreSQL container standing in for the read replica."""
+    with PostgresContainer("postgres:16") as postgres:
+        yield postgres
+
+
+@pytest.fixture
+async def replica_engine(replica_container):
+    """Engine for the replica, with the schema but none of the primary's rows.
+
+    Rows committed on the primary never reach it, like a replica lagging
+    behind: a read sees them only if it went to the primary.
+    """
+    url = replica_container.get_connection_url().replace("+psycopg2", "+asyncpg")
+    engine = create_async_engine(url.replace("postgresql://", "postgresql+asyncpg://"))
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS ltree"))
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(
+    async_engine, replica_engine, monkeypatch
+) -> async_sessionmaker[AsyncSession]:
+    """Routing session factory with the replica configured."""
+    factory = create_session_factory(async_engine)
+    monkeypatch.setattr(database, "_replica_engine", replica_engine)
+    monkeypatch.setattr(database, "_replica_pins", ReplicaPins(60))
+    monkeypatch.setattr(database, "_session_factory", factory)
+    return factory
+
+
+@pytest.fixture
+async def read_session(session_factory) -> AsyncGenerator[AsyncSession, None]:
+    """A session of a GET request."""
+    async with session_factory() as session:
+        use_replica(session)
+        yield session
+
+
+async def _reads_primary(session: AsyncSession, item: Item) -> bool:
+    """Whether a read in the session sees a row only the primary has."""
+    return await session.scalar(select(Item.id).where(Item.id == item.id)) is not None
+
+
+class TestReplicaRouting:
+    """Tests for which statements RoutingSession sends where."""
+
+    async def test_reads_go_to_replica(self, read_session: AsyncSession, test_item):
+        """Plain SELECTs and primary key lookups read the replica."""
+        assert not await _reads_primary(read_session, test_item)
+        assert await read_session.get(Item, test_item.id) is None
+
+    async def test_without_replica_reads_go_to_primary(
+        self, session_factory, test_item
+    ):
+        """Sessions not given the replica use the primary."""
+        async with session_factory() as session:
+            assert await _reads_primary(session, test_item)
+
+    async def test_locking_read_goes_to_primary(
+        self, read_session: AsyncSession, test_item
+    ):
+        """SELECT ... FOR UPDATE, and everything after it, use the primary."""
+        locked = await read_session.scalar(
+            select(Item).where(Item.id == test_item.id).with_for_update()
+        )
+
+        assert locked is not None
+        assert await _reads_primary(read_session, test_item)
+
+    async def test_session_reads_its_own_writes(
+        self, read_session: AsyncSession, test_item, test_user
+    ):
+        """After a flush or DML statement the session stays on the primary."""
+        location = Location(
+            id=uuid.uuid4(), user_id=test_user.id, name="Shelf", path=Ltree("shelf")
+        )
+        read_session.add(location)
+        await read_session.flush()
+
+        assert await read_session.get(Location, location.id) is location
+        assert await _reads_primary(read_session, test_item)
+
+        await read_session.execute(
+            update(Item).where(Item.id == test_item.id).values(quantity=3)
+        )
+        assert (
+            await read_session.scalar(
+                select(Item.quantity).where(Item.id == test_item.id)
+            )
+            == 3
+        )
+
+
+class TestReplicaPins:
+    """Tests for keeping a user's reads on the primary after they write."""
+
+    async def test_committed_write_pins_user(self, session_factory, test_item):
+        """A user's later GET requests read the primary during the window."""
+        async with session_factory() as session:
+            set_session_user(session, test_item.user_id)
+            await session.execute(
+                update(Item).where(Item.id == test_item.id).values(quantity=2)
+            )
+            await session.commit()
+
+        async with session_factory() as session:
+            use_replica(session)
+            set_session_user(session, test_item.user_id)
+            assert await _reads_primary(session, test_item)
+
+        async with session_factory() as session:
+            use_replica(session)
+            set_session_user(session, uuid.uuid4())
+            assert not await _reads_primary(session, test_item)
+
+    async def test_reads_and_rollbacks_do_not_pin(self, session_factory, test_item):
+        """Only committed writes pin the user."""
+        async with session_factory() as session:
+            set_session_user(session, test_item.user_id)
+            await session.scalar(select(Item.id))
+            await session.commit()
+            await session.execute(
+                update(Item).where(Item.id == test_item.id).values(quantity=2)
+            )
+            await session.rollback()
+
+        assert not database._replica_pins.is_pinned(test_item.user_id)
+
+    async def test_write_before_user_is_known(
+        self, read_session: AsyncSession, test_item
+    ):
+        """Bookkeeping committed before authentication returns to the replica."""
+        await read_session.execute(
+            update(Item).where(Item.id == test_item.id).values(quantity=2)
+        )
+        await read_session.commit()
+
+        set_session_user(read_session, test_item.user_id)
+        assert not database._replica_pins.is_pinned(test_item.user_id)
+        assert not await _reads_primary(read_session, test_item)
+
+    def test_pins_expire(self):
+        """Pins end after the window and expired ones are dropped."""
+        user_id = uuid.uuid4()
+        pins = ReplicaPins(0)
+        pins.pin(user_id)
+
+        assert not pins.is_pinned(user_id)
+        assert len(pins._until) == 0
+
+        pins = ReplicaPins(60)
+        pins.pin(user_id)
+        assert pins.is_pinned(user_id)
+
+
+class TestGetSession:
+    """Tests for which request sessions get the replica."""
+
+    @pytest.mark.parametrize(("method", "replica"), [("GET", True), ("POST", False)])
+    async def test_read_requests_use_replica(
+        self, session_factory, method: str, replica: bool
+    ):
+        """GET and HEAD request sessions read the replica, others do not."""
+        request = Request({"type": "http", "method": method, "headers": []})
+        sessions = get_session(request)
+        session = await anext(sessions)
+
+        assert ("replica" in session.info) is replica
+        await sessions.aclose()
+
+
+class TestBackgroundSession:
+    """Tests for background tasks opening their sessions with background_session."""
+
+    async def test_webhook_delivery_reads_primary(
+        self, session_factory, async_session: AsyncSession, monkeypatch
+    ):
+        """Webhook delivery loads configs the replica does not have yet."""
+        config = WebhookConfig(url="https://example.com/hook", event_type="test")
+        async_session.add(config)
+        await async_session.commit()
+        execute_many = AsyncMock()
+        monkeypatch.setattr(WebhookExecutor, "execute_many", execute_many)
+
+        await WebhookService(async_session)._execute_webhooks([config.id], "test", {})
+
+        configs, _payload = execute_many.await_args.args
+        assert [c.id for c in configs] == [config.id]
+
+    async def test_low_stock_alert_reads_primary(
+        self, session_factory, async_session: AsyncSession, test_item
+    ):
+        """Low stock alerts load items the replica does not have yet."""
+        test_item.min_quantity = test_item.quantity + 1
+        await async_session.commit()
+        service = AlertService(async_session, test_item.user_id, get_settings())
+        service.email_service.send_email = AsyncMock(return_value=True)
+
+        await service._send_low_stock_alerts_background(
+            [test_item.id], "owner@example.com", "Owner"
+        )
+
+        service.email_service.send_email.assert_awaited_once()
+        async with session_factory() as session:
+            assert await session.scalar(select(func.count(AlertHistory.id))) == 1
+
+
+class TestTenantContext:
+    """Tests for set_tenant_context."""
+
+    async def test_applies_on_replica_and_primary(
+        self, read_session: AsyncSession, test_item
+    ):
+        """The tenant is set on each database and each new transaction."""
+        current_tenant = select(func.current_setting("app.current_user_id", True))
+        await read_session.scalar(select(1))
+        await set_tenant_context(read_session, test_item.user_id)
+
+        # Replica
+        assert await read_session.scalar(current_tenant) == str(test_item.user_id)
+
+        # Primary, after a write
+        await read_session.execute(
+            update(Item).where(Item.id == test_item.id).values(quantity=2)
+        )
+        assert await _reads_primary(read_session, test_item)
+        assert await read_session.scalar(current_tenant) == str(test_item.user_id)
+
+        # A transaction begun after the commit
+        await read_session.commit()
+        assert await read_session.scalar(current_tenant) == str(test_item.user_id)
+
+    async def test_transaction_local(self, session_factory, test_user):
+        """The setting does not outlive the session on pooled connections."""
+        async with session_factory() as session:
+            await set_tenant_context(session, test_user.id)
+            await session.scalar(select(1))
+
+        async with session_factory() as session:
+            assert not await session.scalar(
+                select(func.current_setting("app.current_user_id", True))
+            )
@@ -0,0 +1,87 @@
+"""Tests for the webhook circuit breaker."""
+
+from unittest.mock import patch
+
+from src.webhooks.circuit_breaker import CircuitBreaker
+
+ENDPOINT = "https://hooks.example.com/a"
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures up to the threshold should open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=3)
+
+        for _ in range(2):
+            breaker.record_failure(ENDPOINT)
+        assert breaker.allow(ENDPOINT)
+
+        breaker.record_failure(ENDPOINT)
+        assert breaker.is_open(ENDPOINT)
+        assert not breaker.allow(ENDPOINT)
+
+    def test_success_resets_failures(self):
+        """A success should reset the failure count."""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure(ENDPOINT)
+        breaker.record_success(ENDPOINT)
+        breaker.record_failure(ENDPOINT)
+
+        assert breaker.allow(ENDPOINT)
+
+    def test_single_trial_after_timeout(self):
+        """After the timeout exactly one trial attempt should be allowed."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+        with patch("src.webhooks.circuit_breaker.time.monotonic", return_value=0.0):
+            breaker.record_failure(ENDPOINT)
+
+        with patch("src.webhooks.circuit_breaker.time.monotonic", return_value=30.0):
+            assert not breaker.allow(ENDPOINT)
+        with patch("src.webhooks.circuit_breaker.time.monotonic", return_value=61.0):
+            assert breaker.allow(ENDPOINT)
+            assert not breaker.allow(ENDPOINT)
+
+    def test_failed_trial_reopens(self):
+        """A failed trial should keep the circuit open for another timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+        with patch("src.webhooks.circuit_breaker.time.monotonic", return_value=0.0):
+            breaker.record_failure(ENDPOINT)
+        with patch("src.webhooks.circuit_breaker.time.monotonic", return_value=61.0):
+            assert breaker.allow(ENDPOINT)
+            breaker.record_failure(ENDPOINT)
+        with patch("src.webhooks.circuit_breaker.time.monotonic", return_value=100.0):
+            assert not breaker.allow(ENDPOINT)
+
+    def test_successful_trial_closes(self):
+        """A successful trial should close the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+        with patch("src.webhooks.circuit_breaker.time.monotonic", return_value=0.0):
+            breaker.record_failure(ENDPOINT)
+        with patch("src.webhooks.circuit_breaker.time.monotonic", return_value=61.0):
+            assert breaker.allow(ENDPOINT)
+        breaker.record_success(ENDPOINT)
+
+        assert not breaker.is_open(ENDPOINT)
+        assert breaker.allow(ENDPOINT)
+
+    def test_released_trial_allows_another(self):
+        """A trial that recorded no outcome should not keep rejecting attempts."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+        with patch("src.webhooks.circuit_breaker.time.monotonic", return_value=0.0):
+            breaker.record_failure(ENDPOINT)
+        with patch("src.webhooks.circuit_breaker.time.monotonic", return_value=61.0):
+            assert breaker.allow(ENDPOINT)
+            breaker.release_trial(ENDPOINT)
+
+            assert breaker.is_open(ENDPOINT)
+            assert breaker.allow(ENDPOINT)
+
+    def test_endpoints_are_independent(self):
+        """A failing endpoint should not affect other endpoints."""
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure(ENDPOINT)
+
+        assert breaker.allow("https://hooks.example.com/b")
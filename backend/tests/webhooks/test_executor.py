@@ -0,0 +1,240 @@
+"""Tests for webhook fan-out delivery."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.webhooks.circuit_breaker import CircuitBreaker
+from src.webhooks.executor import CIRCUIT_OPEN_MESSAGE, WebhookExecutor
+from src.webhooks.models import WebhookConfig, WebhookExecution
+from src.webhooks.repository import WebhookRepository
+
+
+async def _create_configs(
+    session: AsyncSession, *urls: str, event_type: str = "feedback.created"
+) -> list[WebhookConfig]:
+    """Create active webhook configs without retries."""
+    configs = [
+        WebhookConfig(url=url, event_type=event_type, retry_count=0) for url in urls
+    ]
+    session.add_all(configs)
+    await session.commit()
+    return configs
+
+
+class FakeReceivers:
+    """Stand-in for webhook receivers that records requests."""
+
+    def __init__(self, failing_hosts: tuple[str, ...] = (), delay: float = 0):
+        self.failing_hosts = failing_hosts
+        self.delay = delay
+        self.requests: list[httpx.Request] = []
+        self.in_flight: dict[str, int] = {}
+        self.max_in_flight: dict[str, int] = {}
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.requests.append(request)
+        self.in_flight[host] = self.in_flight.get(host, 0) + 1
+        self.max_in_flight[host] = max(
+            self.max_in_flight.get(host, 0), self.in_flight[host]
+        )
+        await asyncio.sleep(self.delay)
+        self.in_flight[host] -= 1
+        if host in self.failing_hosts:
+            return httpx.Response(503)
+        return httpx.Response(200, text="ok")
+
+
+@pytest.fixture
+def receivers():
+    """Patch the HTTP transport with fake receivers."""
+    fake = FakeReceivers()
+
+    async def handle_async_request(_transport, request: httpx.Request):
+        return await fake.handle(request)
+
+    with patch.object(
+        httpx.AsyncHTTPTransport, "handle_async_request", handle_async_request
+    ):
+        yield fake
+
+
+class TestWebhookFanOut:
+    """Tests for delivering one event to many subscribers."""
+
+    async def test_delivers_to_all_subscribers(
+        self, async_session: AsyncSession, receivers: FakeReceivers
+    ):
+        """Each active config for the event should receive the event."""
+        await _create_configs(
+            async_session,
+            "https://a.example.com/hook",
+            "https://b.example.com/hook",
+        )
+        await _create_configs(
+            async_session, "https://c.example.com/hook", event_type="other.event"
+        )
+        configs = await WebhookRepository(async_session).get_active_by_event_type(
+            "feedback.created"
+        )
+
+        executions = await WebhookExecutor(
+            async_session, circuit_breaker=CircuitBreaker()
+        ).execute_many(configs, {"feedback": {"subject": "Hi"}})
+
+        assert [e.status for e in executions] == ["success", "success"]
+        assert {r.url.host for r in receivers.requests} == {
+            "a.example.com",
+            "b.example.com",
+        }
+        body = json.loads(receivers.requests[0].content)
+        assert body["event"] == "feedback.created"
+        assert body["data"]["feedback"]["subject"] == "Hi"
+
+    async def test_template_rendered_once_per_fan_out(
+        self, async_session: AsyncSession, receivers: FakeReceivers
+    ):
+        """Subscribers sharing a template should share the rendered body."""
+        configs = await _create_configs(
+            async_session,
+            "https://a.example.com/hook",
+            "https://b.example.com/hook",
+        )
+        for config in configs:
+            config.body_template = '{"text": "{{feedback.subject}}"}'
+
+        with patch(
+            "src.webhooks.executor.render_template", return_value='{"text": "Hi"}'
+        ) as render:
+            await WebhookExecutor(
+                async_session, circuit_breaker=CircuitBreaker()
+            ).execute_many(configs, {"feedback": {"subject": "Hi"}})
+
+        assert render.call_count == 1
+        assert [r.content for r in receivers.requests] == [b'{"text": "Hi"}'] * 2
+
+    async def test_execution_writes_are_batched(
+        self,
+        async_session: AsyncSession,
+        async_engine,
+        receivers: FakeReceivers,
+    ):
+        """Execution records should be written once at start and once at end."""
+        configs = await _create_configs(
+            async_session, *(f"https://r{i}.example.com/hook" for i in range(5))
+        )
+        statements: list[str] = []
+
+        def record(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await WebhookExecutor(
+                async_session, circuit_breaker=CircuitBreaker()
+            ).execute_many(configs, {})
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+        writes = [s for s in statements if s.startswith(("INSERT", "UPDATE"))]
+        assert len(writes) == 2
+        result = await async_session.execute(
+            select(WebhookExecution.status).where(
+                WebhookExecution.event_type == "feedback.created"
+            )
+        )
+        assert result.scalars().all() == ["success"] * 5
+
+    async def test_connections_limited_per_host(
+        self, async_session: AsyncSession, receivers: FakeReceivers
+    ):
+        """Concurrent requests to one host should not exceed the limit."""
+        receivers.delay = 0.01
+        configs = await _create_configs(
+            async_session,
+            *(f"https://same.example.com/hook/{i}" for i in range(6)),
+            "https://other.example.com/hook",
+        )
+
+        await WebhookExecutor(
+            async_session,
+            circuit_breaker=CircuitBreaker(),
+            max_connections_per_host=2,
+        ).execute_many(configs, {})
+
+        assert len(receivers.requests) == 7
+        assert receivers.max_in_flight["same.example.com"] == 2
+
+    async def test_invalid_url_recorded_as_failed(
+        self, async_session: AsyncSession, receivers: FakeReceivers
+    ):
+        """A config failing SSRF validation should not block other deliveries."""
+        configs = await _create_configs(
+            async_session,
+            "http://127.0.0.1/hook",
+            "https://a.example.com/hook",
+        )
+
+        executions = await WebhookExecutor(
+            async_session, circuit_breaker=CircuitBreaker()
+        ).execute_many(configs, {})
+
+        assert [e.status for e in executions] == ["failed", "success"]
+        assert "URL validation failed" in executions[0].error_message
+        assert len(receivers.requests) == 1
+
+
+class TestWebhookCircuitBreaker:
+    """Tests for skipping receivers that keep failing."""
+
+    async def test_dead_receiver_skipped(
+        self, async_session: AsyncSession, receivers: FakeReceivers
+    ):
+        """After repeated failures the receiver should no longer be called."""
+        receivers.failing_hosts = ("dead.example.com",)
+        configs = await _create_configs(
+            async_session,
+            "https://dead.example.com/hook",
+            "https://a.example.com/hook",
+        )
+        executor = WebhookExecutor(
+            async_session, circuit_breaker=CircuitBreaker(failure_threshold=2)
+        )
+
+        for _ in range(2):
+            executions = await executor.execute_many(configs, {})
+            assert executions[0].error_message == "HTTP 503"
+        executions = await executor.execute_many(configs, {})
+
+        assert [e.status for e in executions] == ["failed", "success"]
+        assert executions[0].error_message == CIRCUIT_OPEN_MESSAGE
+        dead_requests = [
+            r for r in receivers.requests if r.url.host == "dead.example.com"
+        ]
+        assert len(dead_requests) == 2
+
+    async def test_cancelled_trial_frees_the_circuit(
+        self, async_session: AsyncSession, receivers: FakeReceivers
+    ):
+        """A trial delivery cancelled mid-request should not block the receiver."""
+        receivers.delay = 60
+        configs = await _create_configs(async_session, "https://slow.example.com/hook")
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0)
+        breaker.record_failure(configs[0].url)
+        executor = WebhookExecutor(async_session, circuit_breaker=breaker)
+
+        delivery = asyncio.create_task(executor.execute_many(configs, {}))
+        while not receivers.requests:
+            await asyncio.sleep(0.01)
+        delivery.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await delivery
+
+        assert breaker.is_open(configs[0].url)
+        assert breaker.allow(configs[0].url)
@@ -2,6 +2,7 @@
 
 from src.webhooks.template import (
     build_default_payload,
+    compile_template,
     escape_json_string,
     get_nested_value,
     render_template,
@@ -167,6 +168,44 @@ class TestRenderTemplate:
         assert render_template(template, context) == '{"active": True}'
 
 
+class TestCompileTemplate:
+    """Tests for compiled template render plans."""
+
+    def test_segments_are_pre_split(self):
+        """Literals and variable paths should be split at compile time."""
+        compiled = compile_template('{"a": "{{ user.name }}", "b": {{count}}}')
+
+        assert compiled.segments == (
+            '{"a": "',
+            ("user", "name"),
+            '", "b": ',
+            ("count",),
+            "}",
+        )
+
+    def test_compiled_once_per_template(self):
+        """The same template text should reuse one compiled plan."""
+        template = '{"id": "{{item.id}}"}'
+        assert compile_template(template) is compile_template(template)
+
+    def test_updated_template_recompiled(self):
+        """Changed template text should render with the new plan."""
+        context = {"item": {"id": "1", "name": "Drill"}}
+        assert render_template('{"id": "{{item.id}}"}', context) == '{"id": "1"}'
+        assert (
+            render_template('{"name": "{{item.name}}"}', context) == '{"name": "Drill"}'
+        )
+
+    def test_template_without_variables(self):
+        """Templates without placeholders should render unchanged."""
+        assert render_template('{"static": true}', {}) == '{"static": true}'
+
+    def test_unmatched_braces_kept_literal(self):
+        """Text that is not a valid placeholder should be kept as-is."""
+        template = '{"a": "{{ 1bad }}", "b": "{{ok}}"}'
+        assert render_template(template, {"ok": "x"}) == '{"a": "{{ 1bad }}", "b": "x"}'
+
+
 class TestBuildDefaultPayload:
     """Tests for build_default_payload function."""
 
@@ -3,6 +3,7 @@
 import uuid
 
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.webhooks.models import WebhookConfig
 
@@ -76,15 +77,15 @@ class TestCreateConfigEndpoint:
         assert data["event_type"] == "item.created"
         assert data["url"] == "https://webhook.example.com/new"
 
-    async def test_create_config_duplicate_event_type(
+    async def test_create_config_duplicate_event_type_and_url(
         self, admin_client: AsyncClient, test_webhook_config: WebhookConfig
     ):
-        """Test creating config with duplicate event type."""
+        """Test creating config with duplicate event type and URL."""
         response = await admin_client.post(
             "/api/v1/webhooks/configs",
             json={
                 "name": "Duplicate Webhook",
-                "url": "https://webhook.example.com/dup",
+                "url": test_webhook_config.url,
                 "event_type": test_webhook_config.event_type,
                 "http_method": "POST",
             },
@@ -93,6 +94,22 @@ class TestCreateConfigEndpoint:
         assert response.status_code == 409
         assert "already exists" in response.json()["detail"]
 
+    async def test_create_second_subscriber_for_event_type(
+        self, admin_client: AsyncClient, test_webhook_config: WebhookConfig
+    ):
+        """Test that another URL can subscribe to the same event type."""
+        response = await admin_client.post(
+            "/api/v1/webhooks/configs",
+            json={
+                "url": "https://webhook.example.com/second",
+                "event_type": test_webhook_config.event_type,
+                "http_method": "POST",
+            },
+        )
+
+        assert response.status_code == 201
+        assert response.json()["event_type"] == test_webhook_config.event_type
+
     async def test_create_config_as_non_admin(self, authenticated_client: AsyncClient):
         """Test that non-admin gets 403."""
         response = await authenticated_client.post(
@@ -159,6 +176,34 @@ class TestUpdateConfigEndpoint:
         data = response.json()
         assert data["is_active"] is False
 
+    async def test_update_config_url_to_existing_subscriber(
+        self,
+        admin_client: AsyncClient,
+        async_session: AsyncSession,
+        test_webhook_config: WebhookConfig,
+    ):
+        """Test moving a config to a URL already subscribed to its event type."""
+        other = WebhookConfig(
+            event_type=test_webhook_config.event_type,
+            url="https://webhook.example.com/other",
+        )
+        async_session.add(other)
+        await async_session.commit()
+
+        response = await admin_client.put(
+            f"/api/v1/webhooks/configs/{other.id}",
+            json={"url": test_webhook_config.url},
+        )
+        assert response.status_code == 409
+        assert "already exists" in response.json()["detail"]
+
+        # Keeping its own URL is not a conflict
+        response = await admin_client.put(
+            f"/api/v1/webhooks/configs/{other.id}",
+            json={"url": other.url},
+        )
+        assert response.status_code == 200
+
     async def test_update_config_not_found(self, admin_client: AsyncClient):
         """Test updating non-existent config."""
         response = await admin_client.put(